@@ -1,48 +1,42 @@
-from robosuite.environments.base import make
+import importlib
 
-# Manipulation environments
-from robosuite.environments.manipulation.lift import Lift
-from robosuite.environments.manipulation.stack import Stack
-from robosuite.environments.manipulation.nut_assembly import NutAssembly
-from robosuite.environments.manipulation.pick_place import PickPlace
-from robosuite.environments.manipulation.door import Door
-from robosuite.environments.manipulation.wipe import Wipe
-from robosuite.environments.manipulation.tool_hang import ToolHang
-from robosuite.environments.manipulation.two_arm_lift import TwoArmLift
-from robosuite.environments.manipulation.two_arm_peg_in_hole import TwoArmPegInHole
-from robosuite.environments.manipulation.two_arm_handover import TwoArmHandover
-from robosuite.environments.manipulation.two_arm_transport import TwoArmTransport
-from robosuite.environments.manipulation.two_arm_osx import TwoArmOSX
-from robosuite.environments.manipulation.two_arm_wiping import TwoArmWiping
-from robosuite.environments.manipulation.osx_grind import OSXGrind
+from robosuite.environments.base import make
 
 from robosuite.environments import ALL_ENVIRONMENTS
-from robosuite.controllers import (
-    ALL_PART_CONTROLLERS,
-    load_part_controller_config,
-    ALL_COMPOSITE_CONTROLLERS,
-    load_composite_controller_config,
-)
-from robosuite.robots import ALL_ROBOTS
-from robosuite.models.grippers import ALL_GRIPPERS
 from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
 
-try:
-    import robosuite_models
-except:
-    ROBOSUITE_DEFAULT_LOGGER.warning(
-        "Could not import robosuite_models. Some robots may not be available. "
-        "If you want to use these robots, please install robosuite_models from "
-        "source (https://github.com/ARISE-Initiative/robosuite_models) or through pip install."
-    )
-
-try:
-    from robosuite.examples.third_party_controller.mink_controller import WholeBodyMinkIK
-
-except:
-    ROBOSUITE_DEFAULT_LOGGER.warning(
-        "Could not load the mink-based whole-body IK. Make sure you install related import properly, otherwise you will not be able to use the default IK controller setting for GR1 robot."
-    )
+# Attributes whose modules are only imported when first accessed, e.g. robosuite.ALL_ROBOTS (environment classes, e.g.
+# robosuite.Lift, are looked up in the environment registry). Optional integrations (robosuite_models, third-party
+# controllers) are imported when the robots / controllers they define are first looked up.
+_LAZY_ATTRIBUTES = {
+    "ALL_PART_CONTROLLERS": "robosuite.controllers",
+    "load_part_controller_config": "robosuite.controllers",
+    "ALL_COMPOSITE_CONTROLLERS": "robosuite.controllers",
+    "load_composite_controller_config": "robosuite.controllers",
+    "ALL_ROBOTS": "robosuite.robots",
+    "ALL_GRIPPERS": "robosuite.models.grippers",
+}
+_LAZY_SUBMODULES = {"controllers", "models", "renderers", "robots"}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module("robosuite." + name)
+    elif name in ALL_ENVIRONMENTS:
+        from robosuite.environments import REGISTERED_ENVS
+
+        value = REGISTERED_ENVS[name]
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_SUBMODULES | set(ALL_ENVIRONMENTS))
+
 
 __version__ = "1.5.0"
 __logo__ = """
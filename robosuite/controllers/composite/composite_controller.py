@@ -10,9 +10,19 @@ from robosuite.models.grippers.gripper_model import GripperModel
 from robosuite.models.robots.robot_model import RobotModel
 from robosuite.utils.binding_utils import MjSim
 from robosuite.utils.ik_utils import IKSolver, get_nullspace_gains
+from robosuite.utils.kinematics_cache import KinematicsCache
 from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
+from robosuite.utils.registry_utils import LazyRegistry
 
-REGISTERED_COMPOSITE_CONTROLLERS_DICT = {}
+REGISTERED_COMPOSITE_CONTROLLERS_DICT = LazyRegistry()
+
+# Third-party controllers, only imported when used
+REGISTERED_COMPOSITE_CONTROLLERS_DICT.register_lazy(
+    "WHOLE_BODY_MINK_IK",
+    "robosuite.examples.third_party_controller.mink_controller",
+    hint="Make sure mink is installed properly, otherwise you will not be able to use the default IK controller "
+    "setting for GR1 robot.",
+)
 
 
 def register_composite_controller(target_class):
@@ -50,6 +60,9 @@ class CompositeController:
 
         self._applied_action_dict = {}
 
+        # Kinematic quantities shared by all the part controllers (and the robot) within a simulation substep
+        self.kinematics_cache = KinematicsCache(sim)
+
     def load_controller_config(
         self, part_controller_config, composite_controller_specific_config: Optional[Dict] = None
     ):
@@ -66,6 +79,9 @@ class CompositeController:
         self.part_controllers.clear()
         self._action_split_indexes.clear()
         self._init_controllers()
+        for controller in self.part_controllers.values():
+            if hasattr(controller, "set_kinematics_cache"):
+                controller.set_kinematics_cache(self.kinematics_cache)
         self._validate_composite_controller_specific_config()
         self.setup_action_split_idx()
 
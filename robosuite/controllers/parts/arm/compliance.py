@@ -2,6 +2,7 @@ from copy import copy
 import numpy as np
 from robosuite.utils.binding_utils import MjSim
 from robosuite.utils.buffers import RingBuffer
+from robosuite.utils.filters import ButterworthFilter
 
 from robosuite.utils.sim_utils import compensate_ft_reading
 import robosuite.utils.transform_utils as T
@@ -55,6 +56,12 @@ class ComplianceController(Controller):
             action. Can be either be a scalar (same value for all action dimensions), or a list (specific values for
             each dimension). If the latter, dimension should be the same as the control dimension for this controller
 
+        ft_filter_cutoff (None or float): If set, cutoff frequency (Hz) of a low-pass Butterworth filter applied to the
+            raw force/torque sensor readings at every controller update (i.e.: at the simulation rate), before they
+            are pushed into the wrench buffers. If None, readings are only smoothed by the @ft_buffer_size average
+
+        ft_filter_order (int): Order of the low-pass Butterworth filter, if @ft_filter_cutoff is set
+
         TODO: add additional docs
 
     Raises:
@@ -90,12 +97,16 @@ class ComplianceController(Controller):
         ik_solver="jacobian_transpose",
         desired_ft_frame="robot_base",  # or "robot_base"
         lite_physics=True,
+        ft_filter_cutoff=None,
+        ft_filter_order=5,
         **kwargs,  # does nothing; used so no error raised when dict is passed with extra terms used previously
     ):
 
         self.ft_prefix = ref_name.split('_')[0] + '_' + kwargs.get("part_name", None)
         self.wrench_in_base_frame_buf = RingBuffer(dim=6, length=ft_buffer_size)
         self.wrench_in_eef_frame_buf = RingBuffer(dim=6, length=ft_buffer_size)
+        # Built once the model timestep is known (see below), the base controller already updates the buffers
+        self.ft_filter = None
         self.desired_ft_frame = desired_ft_frame
         self.selection_matrix = selection_matrix
         self.gripper_body_name = gripper_body_name
@@ -112,6 +123,12 @@ class ComplianceController(Controller):
             naming_prefix=kwargs.get("naming_prefix", None),
         )
 
+        # Readings are filtered once per controller update, i.e.: at the model timestep
+        if ft_filter_cutoff is not None:
+            self.ft_filter = ButterworthFilter(
+                dim=6, cutoff=ft_filter_cutoff, fs=1.0 / self.model_timestep, order=ft_filter_order
+            )
+
         # Instantiate the inner position/velocity controller
         self.inner_controller_type = inner_controller_config["type"]
         if self.inner_controller_type == "JOINT_POSITION":
@@ -214,6 +231,11 @@ class ComplianceController(Controller):
         self.goal_pose = None  # Goal velocity desired, pre-compensation
         self.desired_force_torque = np.zeros(6)
 
+    def set_kinematics_cache(self, kinematics_cache):
+        super().set_kinematics_cache(kinematics_cache)
+        # The inner controller tracks the same reference site and joints, so it is served from the same cache
+        self.inner_controller.set_kinematics_cache(kinematics_cache)
+
     def update(self):
         super().update()
 
@@ -238,6 +260,8 @@ class ComplianceController(Controller):
         wFtS = T.force_frame_transform(gripper_in_robot_base)
 
         wrench_force = self.get_wrench()
+        if self.ft_filter is not None:
+            wrench_force = self.ft_filter.filter(wrench_force)
 
         if self.gripper_body_name:
             wrench_force = compensate_ft_reading(wrench_force[:3], wrench_force[3:],
@@ -590,6 +614,8 @@ class ComplianceController(Controller):
         Returns:
             np.array: sensor values
         """
+        if self.kinematics_cache is not None:
+            return np.array(self.kinematics_cache.sensor(sensor_name))
         sensor_idx = np.sum(self.sim.model.sensor_dim[: self.sim.model.sensor_name2id(sensor_name)])
         sensor_dim = self.sim.model.sensor_dim[self.sim.model.sensor_name2id(sensor_name)]
 
@@ -606,6 +632,8 @@ class ComplianceController(Controller):
         Returns:
             np.array: (4,4) array corresponding to the pose of @name in the base frame
         """
+        if self.kinematics_cache is not None:
+            return self.kinematics_cache.pose_in_base(name, f"{self.naming_prefix}base").copy()
 
         pos_in_world = self.sim.data.get_body_xpos(name)
         rot_in_world = self.sim.data.get_body_xmat(name).reshape((3, 3))
@@ -1,10 +1,10 @@
 import math
 import numpy as np
-from scipy.signal import butter, filtfilt
-from robosuite.utils.buffers import DeltaBuffer
+from robosuite.utils.buffers import DeltaBuffer, FilteredDeltaBuffer
+from robosuite.utils.filters import ButterworthFilter
 
 import robosuite.utils.transform_utils as T
-from robosuite.controllers.base_controller import Controller
+from robosuite.controllers.parts.controller import Controller
 from robosuite.utils.control_utils import *
 
 # Supported impedance modes
@@ -111,6 +111,11 @@ class OperationalSpaceControllerFT(Controller):
             leading to only direct force control; if "hybrid" the @selection_matrix will be used to select which axes are for force control and
             which for position control; any other string will lead to just position control, the original OSC
 
+        ft_filter_cutoff (float): cutoff frequency (Hz) of the low-pass Butterworth filter applied to the measured
+            force/torque, designed for samples arriving at every controller run, i.e.: every model timestep
+
+        ft_filter_order (int): order of the low-pass Butterworth filter applied to the measured force/torque
+
         **kwargs: Does nothing; placeholder to "sink" any additional arguments so that instantiating this controller
             via an argument dict that has additional extraneous arguments won't raise an error
 
@@ -146,6 +151,8 @@ class OperationalSpaceControllerFT(Controller):
         force_active_case="position",
         kp_force=np.array([10., 10., 10., 10., 10., 10.]),
         ki_force=np.array([1., 1., 1., 1., 1., 1.]),
+        ft_filter_cutoff=2,
+        ft_filter_order=5,
         **kwargs,  # does nothing; used so no error raised when dict is passed with extra terms used previously
     ):
         self.ft_prefix = eef_name.split('_')[0]
@@ -189,7 +196,13 @@ class OperationalSpaceControllerFT(Controller):
         self.force_active_case = force_active_case if self.ft_ref_flag == True else "position"
         self.ft_min = self.nums2array(ft_limits[0], 6)
         self.ft_max = self.nums2array(ft_limits[1], 6)
-        self.ee_ft = DeltaBuffer(dim=6)  # current and last values recorded for force/torque at eef
+        # current and last filtered values recorded for force/torque at eef, pushed at every run_controller() call
+        self.ee_ft = FilteredDeltaBuffer(
+            dim=6,
+            filter=ButterworthFilter(
+                dim=6, cutoff=ft_filter_cutoff, fs=1.0 / self.model_timestep, order=ft_filter_order
+            ),
+        )
         self.F_active = DeltaBuffer(dim=6)  # current and last values just for active force
 
         # Verify the proposed impedance mode is supported
@@ -404,9 +417,7 @@ class OperationalSpaceControllerFT(Controller):
             orientation_kp = np.array(self.kp[9:18]).reshape((3, 3))
 
         # filter ft measurements
-        filtered_wrench = self.butterworth_filter(self.ee_ft, self.current_wrench, 2)
-
-        self.ee_ft.push(filtered_wrench)
+        self.ee_ft.push(self.current_wrench)
         force_error = self.FT_reference - self.ee_ft.current
 
         # Fm
@@ -539,6 +550,8 @@ class OperationalSpaceControllerFT(Controller):
         Returns:
             np.array: sensor values
         """
+        if self.kinematics_cache is not None:
+            return np.array(self.kinematics_cache.sensor(sensor_name))
         sensor_idx = np.sum(self.sim.model.sensor_dim[: self.sim.model.sensor_name2id(sensor_name)])
         sensor_dim = self.sim.model.sensor_dim[self.sim.model.sensor_name2id(sensor_name)]
 
@@ -555,6 +568,8 @@ class OperationalSpaceControllerFT(Controller):
         Returns:
             np.array: (4,4) array corresponding to the pose of @name in the base frame
         """
+        if self.kinematics_cache is not None:
+            return self.kinematics_cache.pose_in_base(name, "robot0_base").copy()
 
         pos_in_world = self.sim.data.get_body_xpos(name)
         rot_in_world = self.sim.data.get_body_xmat(name).reshape((3, 3))
@@ -628,20 +643,3 @@ class OperationalSpaceControllerFT(Controller):
         filtered = (buffer.last + buffer.current + current_measurement) / 3
 
         return filtered
-
-    def butterworth_filter(self, buffer, current_measurement, w):
-        """
-        Uses current measurements to update buffer of measurements with a butterworth filter
-
-        Args:
-            buffer (DeltaBuffer): buffer of measurements
-            current_measurement (np.array): array of measurements
-            w (scalar): cutoff frequency of the filter, 0 < wn < fs/2
-
-        Returns:
-            filtered measurement
-        """
-        fsc = self.control_freq
-        b, a = butter(5, w, 'low', fs=fsc)
-        signal = np.concatenate([buffer.last, buffer.current, current_measurement]).reshape(3, 6)
-        return filtfilt(b, a, signal, axis=0, padlen=0)[2, :]
@@ -118,7 +118,12 @@ class Controller(object, metaclass=abc.ABCMeta):
             self.J_ori = np.zeros((self.num_ref_sites, 3, len(self.joint_index)))
             self.J_full = np.zeros((self.num_ref_sites, 6, len(self.joint_index)))
 
-        self.mass_matrix = None
+        # Preallocated buffers and precomputed indexes used to refresh the robot state in self.update()
+        self._setup_workspace()
+
+        # Optional KinematicsCache shared with the other part controllers of the same robot (see
+        # self.set_kinematics_cache). If None, this controller computes its own jacobians and mass matrix
+        self.kinematics_cache = None
 
         # Torques being outputted by the controller
         self.torques = None
@@ -168,34 +173,80 @@ class Controller(object, metaclass=abc.ABCMeta):
 
         return transformed_action
 
+    def _setup_workspace(self):
+        """
+        Preallocates the buffers that self.update() fills in place, and resolves everything that stays constant for
+        the lifetime of this controller (reference site ids, index arrays into the full nv x nv mass matrix), so that
+        refreshing the robot state does not allocate any new arrays.
+        """
+        nv = self.sim.model.nv
+        self._qpos_index = np.array(self.qpos_index, dtype=int)
+        self._qvel_index = np.array(self.qvel_index, dtype=int)
+
+        # Reference sites, together with the (non-batched) views of the state buffers each of them writes into
+        self._ref_site_ids = []
+        self._ref_buffers = []
+        for i, name in enumerate(self.ref_names or []):
+            self._ref_site_ids.append(self.sim.model.site_name2id(name))
+            if self.num_ref_sites == 1:
+                buffers = (self.ref_pos, self.ref_ori_mat, self.ref_pos_vel, self.ref_ori_vel)
+                buffers += (self.J_pos, self.J_ori, self.J_full)
+            else:
+                buffers = (self.ref_pos[i], self.ref_ori_mat[i], self.ref_pos_vel[i], self.ref_ori_vel[i])
+                buffers += (self.J_pos[i], self.J_ori[i], self.J_full[i])
+            self._ref_buffers.append(buffers)
+
+        # Full (over all nv dofs) site jacobian, rows 0-2 are filled with jacp and rows 3-5 with jacr
+        self._site_jac = np.zeros((6, nv))
+        self._site_jacp = self._site_jac[:3]
+        self._site_jacr = self._site_jac[3:]
+
+        # Full mass matrix, and flat indexes of this controller's dofs into it. The reduced mass matrix is kept in
+        # Fortran order (the layout M[idx, :][:, idx] produces), and is filled through its C-ordered transpose, hence
+        # the transposed index array
+        self._full_mass_matrix = np.zeros((nv, nv))
+        self._mass_matrix_index = self._qvel_index[None, :] * nv + self._qvel_index[:, None]
+        self.mass_matrix = np.zeros((len(self._qvel_index), len(self._qvel_index)), order="F")
+
+    def set_kinematics_cache(self, kinematics_cache):
+        """
+        Shares a simulation-step-scoped KinematicsCache with this controller, so that forward kinematics, site
+        jacobians and the mass matrix are computed once per substep for all the controllers using the same cache.
+
+        Args:
+            kinematics_cache (None or KinematicsCache): Cache to pull state from, or None to compute it locally
+        """
+        self.kinematics_cache = kinematics_cache
+
     def update_reference_data(self):
-        if self.num_ref_sites == 1:
-            self._update_single_reference(self.ref_name, 0)
-        else:
-            for i, name in enumerate(self.ref_name):
-                self._update_single_reference(name, i)
+        for site_id, buffers in zip(self._ref_site_ids, self._ref_buffers):
+            self._update_single_reference(site_id, buffers)
 
-    def _update_single_reference(self, name: str, index: int):
-        # TODO: remove if statement once we unify the shapes of variables when num_ref_sites == 1 and num_ref_sites > 1
-        ref_id = self.sim.model.site_name2id(name)
+    def _update_single_reference(self, site_id, buffers):
+        """
+        Fills the state buffers of a single reference site in place.
 
-        if self.num_ref_sites == 1:
-            self.ref_pos[:] = np.array(self.sim.data.site_xpos[ref_id])
-            self.ref_ori_mat[:, :] = np.array(self.sim.data.site_xmat[ref_id].reshape([3, 3]))
-            self.ref_pos_vel[:] = np.array(self.sim.data.get_site_xvelp(name))
-            self.ref_ori_vel[:] = np.array(self.sim.data.get_site_xvelr(name))
-            self.J_pos[:, :] = np.array(self.sim.data.get_site_jacp(name).reshape((3, -1))[:, self.qvel_index])
-            self.J_ori[:, :] = np.array(self.sim.data.get_site_jacr(name).reshape((3, -1))[:, self.qvel_index])
-            self.J_full[:, :] = np.vstack([self.J_pos, self.J_ori])
+        Args:
+            site_id (int): Mujoco id of the reference site
+            buffers (7-tuple): (pos, ori_mat, pos_vel, ori_vel, J_pos, J_ori, J_full) buffers of this site, as set up
+                by self._setup_workspace()
+        """
+        ref_pos, ref_ori_mat, ref_pos_vel, ref_ori_vel, J_pos, J_ori, J_full = buffers
+        data = self.sim.data
+        ref_pos[:] = data.site_xpos[site_id]
+        ref_ori_mat[:] = data.site_xmat[site_id].reshape(3, 3)
+
+        # A single jacobian evaluation gives both the site velocities and the jacobians w.r.t. this controller's dofs
+        if self.kinematics_cache is not None:
+            site_jac = self.kinematics_cache.site_jacobian(site_id)
         else:
-            self.ref_pos[index, :] = np.array(self.sim.data.site_xpos[ref_id])
-            self.ref_ori_mat[index, :, :] = np.array(self.sim.data.site_xmat[ref_id].reshape([3, 3]))
-            self.ref_pos_vel[index, :] = np.array(self.sim.data.get_site_xvelp(name))
-            self.ref_ori_vel[index, :] = np.array(self.sim.data.get_site_xvelr(name))
-
-            self.J_pos[index, :, :] = np.array(self.sim.data.get_site_jacp(name).reshape((3, -1))[:, self.qvel_index])
-            self.J_ori[index, :, :] = np.array(self.sim.data.get_site_jacr(name).reshape((3, -1))[:, self.qvel_index])
-            self.J_full[index, :, :] = np.vstack([self.J_pos[index], self.J_ori[index]])
+            mujoco.mj_jacSite(self.sim.model._model, data._data, self._site_jacp, self._site_jacr, site_id)
+            site_jac = self._site_jac
+        np.dot(site_jac[:3], data.qvel, out=ref_pos_vel)
+        np.dot(site_jac[3:], data.qvel, out=ref_ori_vel)
+        np.take(site_jac, self._qvel_index, axis=1, out=J_full)
+        J_pos[:] = J_full[:3]
+        J_ori[:] = J_full[3:]
 
     def update(self, force=False):
         """
@@ -214,20 +265,27 @@ class Controller(object, metaclass=abc.ABCMeta):
             # no need to call sim.forward if using lite_physics
             if self.lite_physics and not force:
                 pass
+            elif self.kinematics_cache is not None and not force:
+                # Controllers sharing the cache only forward the simulation once per substep
+                self.kinematics_cache.forward()
             else:
-                # BUG: Potential bug here. If there are more than two controlllers, the simulation will be forwarded multiple times.
                 self.sim.forward()
+                if self.kinematics_cache is not None:
+                    self.kinematics_cache.invalidate()
 
             if self.ref_name is not None:
                 self.update_reference_data()
 
-            self.joint_pos = np.array(self.sim.data.qpos[self.qpos_index])
-            self.joint_vel = np.array(self.sim.data.qvel[self.qvel_index])
+            # New arrays on purpose: controllers keep references to past joint states (e.g.: initial_joint)
+            self.joint_pos = self.sim.data.qpos[self._qpos_index]
+            self.joint_vel = self.sim.data.qvel[self._qvel_index]
 
-            mass_matrix = np.ndarray(shape=(self.sim.model.nv, self.sim.model.nv), dtype=np.float64, order="C")
-            mujoco.mj_fullM(self.sim.model._model, mass_matrix, self.sim.data.qM)
-            mass_matrix = np.reshape(mass_matrix, (len(self.sim.data.qvel), len(self.sim.data.qvel)))
-            self.mass_matrix = mass_matrix[self.qvel_index, :][:, self.qvel_index]
+            if self.kinematics_cache is not None:
+                full_mass_matrix = self.kinematics_cache.mass_matrix()
+            else:
+                mujoco.mj_fullM(self.sim.model._model, self._full_mass_matrix, self.sim.data.qM)
+                full_mass_matrix = self._full_mass_matrix
+            np.take(full_mass_matrix, self._mass_matrix_index, out=self.mass_matrix.T)
 
             # Clear self.new_update
             self.new_update = False
@@ -1,3 +1,31 @@
 from .base import REGISTERED_ENVS, MujocoEnv
 
+# Environments shipped with robosuite, whose modules are only imported when one of their environments is first made
+MANIPULATION_ENVS = {
+    "lift": ["Lift"],
+    "stack": ["Stack"],
+    "nut_assembly": ["NutAssembly", "NutAssemblySingle", "NutAssemblySquare", "NutAssemblyRound"],
+    "pick_place": [
+        "PickPlace",
+        "PickPlaceSingle",
+        "PickPlaceMilk",
+        "PickPlaceBread",
+        "PickPlaceCereal",
+        "PickPlaceCan",
+    ],
+    "door": ["Door"],
+    "wipe": ["Wipe"],
+    "tool_hang": ["ToolHang"],
+    "two_arm_lift": ["TwoArmLift"],
+    "two_arm_peg_in_hole": ["TwoArmPegInHole"],
+    "two_arm_handover": ["TwoArmHandover"],
+    "two_arm_transport": ["TwoArmTransport"],
+    "two_arm_osx": ["TwoArmOSX"],
+    "two_arm_wiping": ["TwoArmWiping"],
+    "osx_grind": ["OSXGrind"],
+}
+for module, env_names in MANIPULATION_ENVS.items():
+    for env_name in env_names:
+        REGISTERED_ENVS.register_lazy(env_name, "robosuite.environments.manipulation." + module)
+
 ALL_ENVIRONMENTS = REGISTERED_ENVS.keys()
@@ -13,8 +13,10 @@ from robosuite.renderers.base import load_renderer_config
 from robosuite.utils import OpenCVRenderer, SimulationError, XMLError
 from robosuite.utils.binding_utils import MjRenderContextOffscreen, MjSim
 from robosuite.utils.binding_utils import MjSimInteractive  # simulator with interactive GUI
+from robosuite.utils.observables import ObservableCache, ObservableScheduler
+from robosuite.utils.registry_utils import LazyRegistry
 
-REGISTERED_ENVS = {}
+REGISTERED_ENVS = LazyRegistry()
 
 
 def register_env(target_class):
@@ -81,8 +83,10 @@ class MujocoEnv(metaclass=EnvMeta):
             Set to False to preserve backward compatibility with datasets collected in robosuite <= 1.4.1.
         horizon (int): Every episode lasts for exactly @horizon timesteps.
         ignore_done (bool): True if never terminating the environment (ignore @horizon).
-        hard_reset (bool): If True, re-loads model, sim, and render object upon a reset call, else,
-            only calls sim.reset and resets all robosuite-internal variables
+        hard_reset (bool or str): If True, re-loads model, sim, and render object upon a reset call, else,
+            only calls sim.reset and resets all robosuite-internal variables. If "snapshot", the model is only
+            compiled once, and every reset restores the simulation state captured after the first reset (a plain
+            memory copy) before re-running the per-episode randomization (robot joint noise, object placements)
         renderer (str): string for the renderer to use
         renderer_config (dict): dictionary for the renderer configurations
         seed (int): environment seed. Default is None, where environment is unseeded, ie. random
@@ -129,12 +133,17 @@ class MujocoEnv(metaclass=EnvMeta):
 
         # Simulation-specific attributes
         self._observables = {}  # Maps observable names to observable objects
-        self._obs_cache = {}  # Maps observable names to pre-/partially-computed observable values
+        self._obs_cache = ObservableCache()  # Maps observable names to pre-/partially-computed observable values
+        self._obs_scheduler = ObservableScheduler(self._observables)  # Decides which observables to update when
         self.control_freq = control_freq
         self.lite_physics = lite_physics
         self.horizon = horizon
         self.ignore_done = ignore_done
+        if hard_reset not in {True, False, "snapshot"}:
+            raise ValueError("hard_reset must be one of True, False or 'snapshot', got {}".format(hard_reset))
         self.hard_reset = hard_reset
+        self._reset_snapshot = None  # Integration state captured after the first reset when using snapshot resets
+        self._restoring_snapshot = False  # Whether the current reset started from the reset snapshot
         # Function to process model xml in _initialize_sim() call
         # include edit_model_xml function by default
         self._xml_processors = [self.edit_model_xml]
@@ -266,6 +275,9 @@ class MujocoEnv(metaclass=EnvMeta):
         # run a single step to make sure changes have propagated through sim state
         self.sim.forward()
 
+        # Any reset snapshot refers to the previous simulation instance
+        self._reset_snapshot = None
+
         # Setup sim time based on control frequency
         self.initialize_time(self.control_freq)
 
@@ -276,9 +288,14 @@ class MujocoEnv(metaclass=EnvMeta):
             OrderedDict: Environment observation space after reset occurs
         """
         # TODO(yukez): investigate black screen of death
-        # Use hard reset if requested
+        snapshot_reset = self.hard_reset == "snapshot" and not self.deterministic_reset
+        restore_snapshot = snapshot_reset and self._reset_snapshot is not None
 
-        if self.hard_reset and not self.deterministic_reset:
+        # Restore the state captured after the first reset if we're using snapshot resets
+        if restore_snapshot:
+            self.sim.set_integration_state(self._reset_snapshot)
+        # Use hard reset if requested
+        elif self.hard_reset and self.hard_reset != "snapshot" and not self.deterministic_reset:
             if self.renderer == "mujoco":
                 self._destroy_viewer()
                 self._destroy_sim()
@@ -289,10 +306,23 @@ class MujocoEnv(metaclass=EnvMeta):
             self.sim.reset()
 
         # Reset necessary robosuite-centric variables
-        self._reset_internal()
+        self._restoring_snapshot = restore_snapshot
+        try:
+            self._reset_internal()
+        finally:
+            self._restoring_snapshot = False
+        if restore_snapshot:
+            # Forward calls made while resetting may have seen objects at their previous episode's placement, make
+            # sure that does not leak into this episode through the solver warmstart
+            self.sim.data.qacc_warmstart[:] = 0
         self.sim.forward()
+
+        # The first snapshot reset captures the state every following reset starts from
+        if snapshot_reset and self._reset_snapshot is None:
+            self._reset_snapshot = self.sim.get_integration_state()
+
         # Setup observables, reloading if
-        self._obs_cache = {}
+        self._obs_cache = ObservableCache()
         self._reset_observables()
 
         # Make sure that all sites are toggled OFF by default
@@ -314,7 +344,7 @@ class MujocoEnv(metaclass=EnvMeta):
         return observations
 
     def _reset_observables(self):
-        if self.hard_reset:
+        if self.hard_reset and self.hard_reset != "snapshot":
             # If we're using hard reset, must re-update sensor object references
             if hasattr(self.viewer, "_setup_observables"):
                 _observables = self.viewer._setup_observables()
@@ -352,13 +382,15 @@ class MujocoEnv(metaclass=EnvMeta):
 
         # additional housekeeping
         self.sim_state_initial = self.sim.get_state()
-        self._setup_references()
+        # References only depend on the model, which is unchanged when restoring the reset snapshot
+        if not self._restoring_snapshot:
+            self._setup_references()
         self.cur_time = 0
         self.timestep = 0
         self.done = False
 
         # Empty observation cache and reset all observables
-        self._obs_cache = {}
+        self._obs_cache = ObservableCache()
         for observable in self._observables.values():
             observable.reset()
 
@@ -386,14 +418,17 @@ class MujocoEnv(metaclass=EnvMeta):
 
     def _update_observables(self, force=False):
         """
-        Updates all observables in this environment
+        Updates all observables in this environment. Observables are only evaluated on the substeps where they
+        sample (see ObservableScheduler)
         Args:
             force (bool): If True, will force all the observables to update their internal values to the newest
                 value. This is useful if, e.g., you want to grab observations when directly setting simulation states
                 without actually stepping the simulation.
         """
-        for observable in self._observables.values():
-            observable.update(timestep=self.model_timestep, obs_cache=self._obs_cache, force=force)
+        # The observables dict may have been replaced (e.g.: when loading observables)
+        if self._obs_scheduler.observables is not self._observables:
+            self._obs_scheduler = ObservableScheduler(self._observables)
+        self._obs_scheduler.update(timestep=self.model_timestep, obs_cache=self._obs_cache, force=force)
 
     def _get_observations(self, force_update=False):
         """
@@ -686,6 +721,7 @@ class MujocoEnv(metaclass=EnvMeta):
             "to modify a pre-existing observable.".format(observable.name)
         )
         self._observables[observable.name] = observable
+        self._obs_scheduler.invalidate()
 
     def modify_observable(self, observable_name, attribute, modifier):
         """
@@ -92,8 +92,10 @@ class Door(ManipulationEnv):
 
         ignore_done (bool): True if never terminating the environment (ignore @horizon).
 
-        hard_reset (bool): If True, re-loads model, sim, and render object upon a reset call, else,
-            only calls sim.reset and resets all robosuite-internal variables
+        hard_reset (bool or str): If True, re-loads model, sim, and render object upon a reset call, else,
+            only calls sim.reset and resets all robosuite-internal variables. If "snapshot", the model is only
+            compiled once, and every reset restores the simulation state captured after the first reset (a plain
+            memory copy) before re-running the per-episode randomization (robot joint noise, object placements)
 
         camera_names (str or list of str): name of camera to be rendered. Should either be single str if
             same name is to be used for all cameras' rendering or else it should be a list of cameras to render.
@@ -80,8 +80,10 @@ class ManipulationEnv(RobotEnv):
 
         ignore_done (bool): True if never terminating the environment (ignore @horizon).
 
-        hard_reset (bool): If True, re-loads model, sim, and render object upon a reset call, else,
-            only calls sim.reset and resets all robosuite-internal variables
+        hard_reset (bool or str): If True, re-loads model, sim, and render object upon a reset call, else,
+            only calls sim.reset and resets all robosuite-internal variables. If "snapshot", the model is only
+            compiled once, and every reset restores the simulation state captured after the first reset (a plain
+            memory copy) before re-running the per-episode randomization (robot joint noise, object placements)
 
         camera_names (str or list of str): name of camera to be rendered. Should either be single str if
             same name is to be used for all cameras' rendering or else it should be a list of cameras to render.
@@ -224,7 +226,7 @@ class ManipulationEnv(RobotEnv):
             function: Sensor function that returns the relative position between the object and the end effector
         """
 
-        @sensor(modality)
+        @sensor(modality, requires=[obj_key, f"{prefix}eef_pos"])
         def sensor_fn(obs_cache):
             return (
                 obs_cache[obj_key] - obs_cache[f"{prefix}eef_pos"]
@@ -248,7 +250,7 @@ class ManipulationEnv(RobotEnv):
             function: Sensor function that returns the relative pose between the world and the gripper
         """
 
-        @sensor(modality=modality)
+        @sensor(modality=modality, requires=[f"{prefix}eef_pos", f"{prefix}eef_quat"])
         def fn(obs_cache):
             return (
                 T.pose_inv(T.pose2mat((obs_cache[f"{prefix}eef_pos"], obs_cache[f"{prefix}eef_quat"])))
@@ -277,7 +279,7 @@ class ManipulationEnv(RobotEnv):
             function: Sensor function that returns the relative position between the object and the end effector
         """
 
-        @sensor(modality=modality)
+        @sensor(modality=modality, requires=[f"{obj_key}_pos", f"{obj_key}_quat", f"world_pose_in_{prefix}gripper"])
         def fn(obs_cache):
             # Immediately return default value if cache is empty
             if any(
@@ -311,7 +313,7 @@ class ManipulationEnv(RobotEnv):
             function: Sensor function that returns the relative quaternion between the object and the end effector
         """
 
-        @sensor(modality)
+        @sensor(modality, requires=[f"{obj_key}_to_{prefix}eef_quat"])
         def sensor_fn(obs_cache):
             return (
                 obs_cache[f"{obj_key}_to_{prefix}eef_quat"]
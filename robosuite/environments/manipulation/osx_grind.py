@@ -1,15 +1,19 @@
+import itertools
 import multiprocessing
+import os
 import numpy as np
-import scipy.spatial as spsp
 
 from robosuite.environments.manipulation.manipulation_env import ManipulationEnv
 from robosuite.models.arenas import TableArena
 from robosuite.models.objects import MortarObject, CylinderObject
 from robosuite.models.objects.xml_objects import MortarSDFObject
 from robosuite.models.tasks import ManipulationTask
-from robosuite.utils.ik_solver import MuJoCoIKSolver
+from robosuite.utils.ik_solver import IKWarmStartCache, LevenbergMarquardtIKSolver
+from robosuite.utils.episode_logger import EpisodeLogger
 from robosuite.utils.observables import Observable, sensor
 from robosuite.utils.placement_samplers import UniformRandomSampler
+from robosuite.utils.surface_utils import get_mortar_surface
+from robosuite.utils.trajectory_library import ReferenceTrajectory, get_trajectory_library
 import robosuite.utils.transform_utils as T
 
 
@@ -47,18 +51,34 @@ DEFAULT_GRIND_CONFIG = {
 
     "reset_with_ik": True,
 
+    # reference trajectory randomization: every episode, follow a circle of random radius and number of waypoints,
+    # pushing with a random (integer) load. Radii and numbers of waypoints are sampled on a grid, so that the
+    # trajectories can be cached and shared by the envs of a process (see robosuite/utils/trajectory_library.py)
+    "randomize_reference_trajectory": False,
+    "reference_radius_range": [0.008, 0.018],  # (m)
+    "reference_radius_step": 0.001,  # (m)
+    "reference_num_waypoints_range": [100, 500],
+    "reference_num_waypoints_step": 50,
+    "reference_load_range": [1, 20],  # (N), upper bound excluded
+
     # misc settings
     "evaluate": False,
     "print_results": False,  # Whether to print results or not
     "log_rewards": False,
     "log_details": True,
-    "log_dir": "log",
+    "log_dir": "log",  # each env writes to its own <log_dir>/step_actions[_eval]_<pid>_<index> directory
+    "log_flush_interval": 1000,  # number of logged steps kept in memory before they are written to disk
+    "save_logs": False,  # write the logged details / rewards to disk during training too (always done if evaluate)
     "get_info": False,  # Whether to grab info after each env step if not
     "use_robot_obs": True,  # if we use robot observations (proprioception) as input to the policy
     "early_terminations": True,  # Whether we allow for early terminations or not
 }
 
 
+# Index of the envs created by this process, so that each of them logs to its own directory
+_LOG_INDEX = itertools.count()
+
+
 TRACKING_METHODS = [
     'per_step',  # update waypoints after every step
     'per_error_threshold'  # update waypoints after the tracking error is smaller than `tracking_trajectory_threshold`
@@ -144,8 +164,10 @@ class OSXGrind(ManipulationEnv):
 
         ignore_done (bool): True if never terminating the environment (ignore @horizon).
 
-        hard_reset (bool): If True, re-loads model, sim, and render object upon a reset call, else,
-            only calls sim.reset and resets all robosuite-internal variables
+        hard_reset (bool or str): If True, re-loads model, sim, and render object upon a reset call, else,
+            only calls sim.reset and resets all robosuite-internal variables. If "snapshot", the model is only
+            compiled once, and every reset restores the simulation state captured after the first reset (a plain
+            memory copy) before re-running the per-episode randomization (robot joint noise, object placements)
 
         camera_names (str or list of str): name of camera to be rendered. Should either be single str if
             same name is to be used for all cameras' rendering or else it should be a list of cameras to render.
@@ -260,21 +282,41 @@ class OSXGrind(ManipulationEnv):
         self.spawn_mortar = self.task_config["spawn_mortar"]
 
         self.reset_with_ik = self.task_config["reset_with_ik"]
+        # IK solver of the current model (created at the first reset after each model load), and solutions of previous
+        # resets to warm start it with
+        self._ik_solver = None
+        self._ik_cache = IKWarmStartCache()
+        self.randomize_reference_trajectory = self.task_config.get("randomize_reference_trajectory", False)
 
         # settings for table top
         self.table_full_size = self.task_config["table_full_size"]
         self.table_offset = np.array([0, 0, 0.8])
         self.table_friction = self.task_config["table_friction"]
         self.task_box = np.array([self.mortar_radius, self.mortar_radius, self.mortar_height+self.table_offset[2]]) + self.mortar_space_threshold_max
+        # closest point / normal queries on the mortar surface, shared by all envs with the same mortar geometry
+        self.mortar_surface = get_mortar_surface(max_radius=self.mortar_radius)
+
+        # half length of the cylinder marker of the reference force direction
+        self.cylinder_radius = 0.002
+        self.cylinder_length = 0.005
+
+        # reference trajectories generated by this env (if randomized) are cached and shared by all the envs of the
+        # process with the same mortar
+        self.trajectory_library = get_trajectory_library(
+            max_radius=self.mortar_radius, table_height=self.table_offset[2], marker_length=self.cylinder_length
+        )
 
         # references to follow
         self.current_waypoint_index = 0
         self.ft_action = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
-        # Add an extra waypoint to make sure that every waypoint is
-        # tracked before considering the tracking completed
-        self.reference_trajectory = reference_trajectory
-        self.trajectory_len = len(self.reference_trajectory)
-        self.reference_force = reference_force
+        if reference_trajectory is not None:
+            self._set_reference(ReferenceTrajectory(reference_trajectory, marker_length=self.cylinder_length), reference_force)
+        else:
+            # With randomized references, the first one is sampled from the trajectory library like the later ones
+            assert self.randomize_reference_trajectory, (
+                "A reference_trajectory must be given unless task_config['randomize_reference_trajectory'] is set"
+            )
+            self._sample_reference()
         self.tracking_trajectory_threshold = self.task_config['tracking_trajectory_threshold']
         self.tracking_trajectory_method = self.task_config['tracking_trajectory_method']
         # Verify the proposed impedance mode is supported
@@ -289,30 +331,18 @@ class OSXGrind(ManipulationEnv):
         self.placement_initializer = None
 
         # log data
-        self.prev_quat = self.reference_trajectory[0, 3:]
         self.evaluate = self.task_config['evaluate']
         self.log_dir = self.task_config['log_dir']
-        self.log_dict = {
-            'rewards': {
-                'traj_error': [],
-                'force_error': [],
-            },
-            'details': {
-                'timesteps': [],
-                'waypoint': [],
-                'action_in': [],
-                'res_action': [],
-                'scl_action': [],
-                'current_ref': [],
-                'current_pos': [],
-                'current_quat': [],
-                'current_force_ref': [],
-                'kp': [],
-                'current_force': [],
-                'current_force_ref_eef_frame': [],
-                'current_force_eef_frame': [],
-            }
-        }
+        self.log_flush_interval = self.task_config.get('log_flush_interval', 1000)
+        self.save_logs = self.evaluate or self.task_config.get('save_logs', False)
+        self.log_filename = None
+        self.episode_logger = None
+        if self.save_logs and (self.log_details or self.log_rewards):
+            log_name = "step_actions_eval" if self.evaluate else "step_actions"
+            self.log_filename = os.path.join(
+                self.log_dir, "{}_{}_{}".format(log_name, os.getpid(), next(_LOG_INDEX))
+            )
+            self.episode_logger = EpisodeLogger(self.log_filename, flush_interval=self.log_flush_interval)
 
         super().__init__(
             robots=robots,
@@ -371,13 +401,13 @@ class OSXGrind(ManipulationEnv):
 
         else:
             # if no force reference given, compute it at each step wrt world frame orientation
-            self.ft_action = self.compute_force_ref(self.robots[0]._hand_pos['right'])
+            # (from the world frame grip site position, as the mortar surface origin is in the world frame)
+            self.ft_action = self.compute_force_ref(self.eef_pos)
 
         # update in rendering the cylinder representing the normal force/direction
-        # assume orientation is given perpendicular to mortar surface
-        offset_cylinder_half_size = T.rotate_vector_by_quaternion([0, 0, -self.cylinder_length], self.reference_trajectory[self.current_waypoint_index][3:])
-        self.sim.model.body_pos[self.force_cylinder_body_id] = self.reference_trajectory[self.current_waypoint_index][:3] + offset_cylinder_half_size
-        self.sim.model.body_quat[self.force_cylinder_body_id] = T.convert_quat(self.reference_trajectory[self.current_waypoint_index][3:], "wxyz")
+        # assume orientation is given perpendicular to mortar surface (marker poses are precomputed per waypoint)
+        self.sim.model.body_pos[self.force_cylinder_body_id] = self.reference.marker_pos[self.current_waypoint_index]
+        self.sim.model.body_quat[self.force_cylinder_body_id] = self.reference.marker_quat[self.current_waypoint_index]
 
         # send action with both pose and wrench to the env
         # send the ft action already in base frame
@@ -394,31 +424,33 @@ class OSXGrind(ManipulationEnv):
         return super().step(ctr_action)
 
     def compute_force_ref(self, eef_pose):
+        """
+        Computes the force reference direction as the normal to the mortar surface at the point closest to @eef_pose.
 
-        # Calculating  the force at every step
-
-        # Define the bowl surface function and its derivatives
-        def f(xy): return (xy[0]**4 + xy[1]**4) * 11445.39 + (xy[1]**2 * xy[0]**2 * 22890.7) + xy[0]**2 * 3.11558 + xy[1]**2 * 3.11558 - 0.038811
-        def fx(x, y): return 4*x**3 * 11445.39 + y**2 * 2*x * 22890.7 + 2*x * 3.11558
-        def fy(x, y): return 4*y**3 * 11445.39 + 2*y * x**2 * 22890.7 + 2*y * 3.11558
-
-        def normal_vector(x, y):
-            grad = np.array([fx(x, y), fy(x, y), -1])
-            return grad / np.linalg.norm(grad)
-
-        # search in vicinity of eef pose xyz TODO change from search to assumption
-        XY = np.mgrid[eef_pose[0]-0.03:eef_pose[0]+0.03:0.001, eef_pose[0]-0.03:eef_pose[0]+0.03:0.001].reshape(2, -1).T
-        Z = [f(xy) for xy in XY]
-        Z = np.array(Z).reshape(-1, 1)
-        A = np.concatenate([XY, Z], axis=1)
+        Args:
+            eef_pose (np.array): (3,) position of the end effector in the world frame (e.g.: @eef_pos, not the base
+                frame Robot._hand_pos)
 
+        Returns:
+            np.array: (6,) force / torque reference, with unit force along the surface normal and zero torque
+        """
         # find closest point on the mortar to the tip of the eef and calculate normal to surface in that point
-        distance, index = spsp.KDTree(A).query(eef_pose)
-        closest_point = A[index]
-        normal_vect_direction = normal_vector(closest_point[0], closest_point[1])
+        _, normal_vect_direction = self.mortar_surface.closest_point(eef_pose - self._mortar_surface_origin())
 
         return np.concatenate([normal_vect_direction, np.array([0, 0, 0])])  # is it zeroes or sth else
 
+    def _mortar_surface_origin(self):
+        """
+        Origin of the frame in which the mortar surface polynomial is expressed, i.e.: the mortar body position.
+
+        Returns:
+            np.array: (3,) origin of the mortar surface frame in the world frame
+        """
+        if self.spawn_mortar:
+            return self.sim.data.body_xpos[self.mortar_body_id]
+        # Where the placement initializer would have put the mortar
+        return self.table_offset - self.mortar.bottom_offset
+
     def reward(self, action=None):
 
         reward = 0.0
@@ -459,9 +491,8 @@ class OSXGrind(ManipulationEnv):
 
                 reward += force_reward + traj_reward
 
-                if self.log_rewards:
-                    self.log_dict['rewards']['traj_error'].append(traj_reward)
-                    self.log_dict['rewards']['force_error'].append(force_reward)
+                if self.log_rewards and self.episode_logger is not None:
+                    self.episode_logger.log("rewards", p_rew=traj_reward, f_rew=force_reward)
 
                 # Printing results
                 if self.print_results:
@@ -542,8 +573,6 @@ class OSXGrind(ManipulationEnv):
             raise ValueError(f"Unsupported mortar_mode '{self.mortar_mode}'. Only CDA and SDF are supported.")
 
         # add the "ref force arrow in rendering"
-        self.cylinder_radius = 0.002
-        self.cylinder_length = 0.005
         self.force_cylinder = CylinderObject(
             name="force_cylinder",
             size=(self.cylinder_radius, self.cylinder_length),
@@ -597,7 +626,8 @@ class OSXGrind(ManipulationEnv):
         super()._setup_references()
 
         # Additional object references from this env
-        # self.mortar_body_id = self.sim.model.body_name2id(self.mortar.root_body)
+        if self.spawn_mortar:
+            self.mortar_body_id = self.sim.model.body_name2id(self.mortar.root_body)
         self.force_cylinder_body_id = self.sim.model.body_name2id(self.force_cylinder.root_body)
 
     def _setup_observables(self):
@@ -653,11 +683,18 @@ class OSXGrind(ManipulationEnv):
         self.sim.model._model.vis.scale.contactwidth = 0.01
         self.sim.model._model.vis.scale.contactheight = 0.01
 
+        # sample the reference trajectory of this episode first, since the IK reset targets its first waypoint
+        if self.randomize_reference_trajectory and not self.deterministic_reset:
+            self._sample_reference()
+
         if self.reset_with_ik and self.robots[0].robot_joints is not None:
-            ik = MuJoCoIKSolver(self.sim.model, self.sim.data, "gripper0_right_grip_site", joint_indexes=self.robots[0].joint_indexes)
-            result = ik.solve_ik(target_pos=self.reference_trajectory[0][:3],
-                                 target_rot=T.quat2mat(self.reference_trajectory[0][3:]),
-                                 initial_guess=self.robots[0].init_qpos)
+            if self._ik_solver is None or self._ik_solver.model is not self.sim.model:
+                self._ik_solver = LevenbergMarquardtIKSolver(self.sim.model, "gripper0_right_grip_site",
+                                                             joint_indexes=self.robots[0].joint_indexes,
+                                                             cache=self._ik_cache)
+            result = self._ik_solver.solve_ik(target_pos=self.reference_trajectory[0][:3],
+                                              target_rot=T.quat2mat(self.reference_trajectory[0][3:]),
+                                              initial_guess=self.robots[0].init_qpos)
 
             if result.success:
                 self.robots[0].init_qpos = result.joint_angles
@@ -676,85 +713,63 @@ class OSXGrind(ManipulationEnv):
             for obj_pos, obj_quat, obj in object_placements.values():
                 self.sim.data.set_joint_qpos(obj.joints[0], np.concatenate([np.array(obj_pos), np.array(obj_quat)]))
 
-        # recompute the referece trajectory for each episode, with height dependent on radius
-        y = np.array([0.026, 0.027, 0.03, 0.032])
-        x = np.array([0.008, 0.01, 0.012, 0.015])
-        coefficients = np.polyfit(x, y, deg=2)
-        f = np.poly1d(coefficients)
-
-        # R = 0.01 * np.random.random_sample() + 0.008  # take a random radius inside the mortar
-        # self.num_waypoints = np.random.randint(low=100, high=500)  # take a random number of points for the trajectory
-        # reference_trajectory, self.reference_force = self.recompute_trajectory(R, f(R), self.num_waypoints)
-        # reference_trajectory = np.append(reference_trajectory, [reference_trajectory[-1]], axis=0)
-        # self.reference_trajectory = reference_trajectory
-        # self.trajectory_len = len(self.reference_trajectory)
+        # Flush the steps logged in the previous episode, if it was interrupted by a reset
+        self._save_details()
 
         self.current_waypoint_index = 0
         self.collisions = 0
         self.f_excess = 0
         self.task_space_exits = 0
 
-    def recompute_trajectory(self, R, h, num_waypoints):
-        # Compute reference trajectory and reference force profile
-
-        # mortar surface function and derivatives
-        def fx(x, y): return 4*x**3 * 11445.39 + y**2 * 2*x * 22890.7 + 2*x * 3.11558
-        def fy(x, y): return 4*y**3 * 11445.39 + 2*y * x**2 * 22890.7 + 2*y * 3.11558
-
-        def get_orientation_quaternion_smooth(n, prev_quat=None, prev_R=None):
-            if prev_R is None:
-                # If no previous rotation
-                R = np.zeros((3, 3))
-                R[:, 2] = n
-                R[:, 0] = np.cross([0, 1, 0], n)
-                R[:, 0] /= np.linalg.norm(R[:, 0])
-                R[:, 1] = np.cross(n, R[:, 0])
-            else:
-                # If we have a previous rotation, try to minimize the change
-                R = prev_R.copy()
-                R[:, 2] = n  # Set the new normal
-                R[:, 1] = np.cross(n, R[:, 0])  # Adjust the y-axis
-                R[:, 1] /= np.linalg.norm(R[:, 1])
-                R[:, 0] = np.cross(R[:, 1], n)  # Adjust the x-axis
-
-            quat = T.mat2quat(R)
-
-            # Ensure consistent quaternion sign
-            if prev_quat is not None and np.dot(quat, prev_quat) < 0:
-                quat = -quat
-
-            return quat, R
-
-        h = np.clip(h, 0.01, 0.04)  # make sure it's still inside the mortar as height
-        table_height = 0.8
-        initial_pose = [0.0, R, table_height+h, 0.0, 0.9990052, 0.04459406, 0.0]
+    def _set_reference(self, reference, reference_force):
+        """
+        Sets the reference trajectory (and force profile) to follow.
 
-        ref_traj = compute_trajectory(initial_pose,
-                                      plane='XY',
-                                      radius=R,
-                                      radius_direction='-Y',
-                                      steps=num_waypoints,
-                                      revolutions=1, from_center=False, trajectory_type='circular')
+        Args:
+            reference (ReferenceTrajectory): reference poses, and their precomputed per-waypoint quantities
+            reference_force (None or np.array): (N, 6) force / torque reference at each waypoint. If None, the force
+                reference is the mortar surface normal closest to the end effector (see compute_force_ref)
+        """
+        self.reference = reference
+        self.reference_trajectory = reference.poses
+        self.trajectory_len = len(reference)
+        self.reference_force = None if reference_force is None else np.asarray(reference_force, dtype=np.float64)
+        self.prev_quat = self.reference_trajectory[0, 3:]
 
-        ind = 0
+    def _sample_reference(self):
+        """
+        Samples the reference trajectory of an episode: one revolution of a circle inside the mortar, at a random
+        radius (with height dependent on the radius) and with a random number of waypoints, pushing with a random load.
+        """
+        r_low, r_high = self.task_config["reference_radius_range"]
+        radii = np.arange(r_low, r_high + 1e-9, self.task_config["reference_radius_step"])
+        n_low, n_high = self.task_config["reference_num_waypoints_range"]
+        num_waypoints = np.arange(n_low, n_high, self.task_config["reference_num_waypoints_step"])
+        # Add an extra waypoint to make sure that every waypoint is
+        # tracked before considering the tracking completed
+        reference = self.trajectory_library.get(
+            np.random.choice(radii), np.random.choice(num_waypoints), repeat_last=True
+        )
+        load_N = np.random.randint(*self.task_config["reference_load_range"])  # take a random force reference
+        self._set_reference(reference, np.tile([0, 0, load_N, 0, 0, 0], (len(reference), 1)))
 
-        # recalculate orientation in every point to be perpendicular to surface;
-        for point in ref_traj:
-            # point to evaluate in
-            px, py = point[0], point[1]
+    def recompute_trajectory(self, R, h, num_waypoints):
+        """
+        Computes a reference trajectory along one revolution of a circle of radius @R at height @h above the table,
+        with orientations perpendicular to the mortar surface, and a random force profile.
 
-            # calculate the normal and tangents vectors to the surface of the mortar
-            n = np.array([fx(px, py), fy(px, py), -1])
-            normal_vect_direction = n/np.linalg.norm(n)
+        Args:
+            R (float): radius of the circle
+            h (float): height of the circle above the table, clipped to stay inside the mortar
+            num_waypoints (int): number of waypoints
 
-            try:
-                quat_ref, R = get_orientation_quaternion_smooth(normal_vect_direction, quat_ref, R)
-            except:
-                # first point won't have a rotation matrix to refer to
-                quat_ref, R = get_orientation_quaternion_smooth(normal_vect_direction)
+        Returns:
+            2-tuple:
 
-            ref_traj[ind, 3:] = quat_ref
-            ind += 1
+                - (np.array) (@num_waypoints, 7) reference trajectory (positions and (x, y, z, w) quaternions)
+                - (np.array) (@num_waypoints, 6) reference force / torque
+        """
+        ref_traj = self.trajectory_library.get(R, num_waypoints, height=h).poses.copy()
 
         load_N = np.random.randint(low=1, high=20)  # take a random force reference
         ref_force = np.array([[0, 0, load_N, 0, 0, 0]]*num_waypoints)
@@ -784,6 +799,10 @@ class OSXGrind(ManipulationEnv):
         if done and self.print_results:
             print("Max steps per episode reached")
 
+        # Episode-close flush of the logged steps
+        if done:
+            self._save_details()
+
         if self.current_waypoint_index < self.trajectory_len - 1:
             if self.tracking_trajectory_method == 'per_step':
                 self.current_waypoint_index += 1
@@ -919,58 +938,48 @@ class OSXGrind(ManipulationEnv):
         # return np.concatenate([self.robots[0].ee_force['right'], self.robots[0].ee_torque['right']])
 
     def __log_details__(self, action, residual_action):
-        if self.log_details:
-            # save variables during training
-            self.log_dict['details']['timesteps'].append(self.timestep)
-            self.log_dict['details']['waypoint'].append(self.current_waypoint_index)
-            self.log_dict['details']['action_in'].append(action)
-            self.log_dict['details']['res_action'].append(residual_action)
-            self.log_dict['details']['current_ref'].append(self.reference_trajectory[self.current_waypoint_index])
-            self.log_dict['details']['current_pos'].append(self.robots[0]._hand_pos['right'])
-
+        if self.log_details and self.episode_logger is not None:
             # just for plotting, make quat affine
             curr_quat = self.robots[0]._hand_quat['right']
             if np.dot(curr_quat,  self.prev_quat) < 0:  # if pointing in opposite directions
                 curr_quat = -curr_quat
             self.prev_quat = curr_quat
 
-            self.log_dict['details']['current_quat'].append(curr_quat)
-
-            self.log_dict['details']['current_force_ref'].append(self.ft_action)
-            self.log_dict['details']['current_force'].append(self.eef_wrench)
-
-            # TODO separate case hand from base
-            self.log_dict['details']['current_force_ref_eef_frame'].append(self.reference_force[self.current_waypoint_index])
-            self.log_dict['details']['current_force_eef_frame'].append(self.eef_wrench)
-
-            # controller params
-            self.log_dict['details']['kp'].append(self.robots[0].composite_controller.part_controllers['right'].kp.copy())
-
-            if self.evaluate:
-                self.log_filename = self.log_dir + "/step_actions_eval.npz"
-                self._save_details()
-            else:
-                self.log_filename = self.log_dir + "/step_actions.npz"
+            # save variables during training, rows are buffered and written to disk in chunks
+            self.episode_logger.log(
+                "details",
+                timesteps=self.timestep,
+                waypoint=self.current_waypoint_index,
+                action_in=action,
+                res_action=residual_action,
+                crnt_ref=self.reference_trajectory[self.current_waypoint_index],
+                crnt_pos=self.robots[0]._hand_pos['right'],
+                crnt_quat=curr_quat,
+                crnt_f_ref=self.ft_action,
+                crnt_f=self.eef_wrench,
+                # TODO separate case hand from base
+                crnt_f_ref_eef=self.reference_force[self.current_waypoint_index],
+                crnt_f_eef=self.eef_wrench,
+                # controller params
+                contr_kp=self.robots[0].composite_controller.part_controllers['right'].kp,
+            )
 
     def _save_details(self):
-        np.savez(
-            self.log_filename,
-            timesteps=self.log_dict['details']['timesteps'],
-            waypoint=self.log_dict['details']['waypoint'],
-            action_in=self.log_dict['details']['action_in'],
-            res_action=self.log_dict['details']['res_action'],
-            scl_action=self.log_dict['details']['scl_action'],
-            crnt_ref=self.log_dict['details']['current_ref'],
-            crnt_pos=self.log_dict['details']['current_pos'],
-            crnt_quat=self.log_dict['details']['current_quat'],
-            crnt_f_ref=self.log_dict['details']['current_force_ref'],
-            crnt_f_ref_eef=self.log_dict['details']['current_force_ref_eef_frame'],
-            crnt_f_eef=self.log_dict['details']['current_force_eef_frame'],
-            crnt_f=self.log_dict['details']['current_force'],
-            contr_kp=self.log_dict['details']['kp'],
-            f_rew=self.log_dict['rewards']['force_error'],
-            p_rew=self.log_dict['rewards']['traj_error']
-        )
+        """
+        Writes all the logged steps of the current episode to the log store (see @load_episode_log), and starts a
+        new episode in the store.
+        """
+        if self.episode_logger is not None:
+            self.episode_logger.end_episode()
+
+    def close(self):
+        """
+        Writes the remaining logged steps and closes the log store, before closing the environment
+        """
+        if self.episode_logger is not None:
+            self.episode_logger.close()
+            self.episode_logger = None
+        super().close()
 
     @property
     def eef_pos(self):
@@ -96,8 +96,10 @@ class Stack(ManipulationEnv):
 
         ignore_done (bool): True if never terminating the environment (ignore @horizon).
 
-        hard_reset (bool): If True, re-loads model, sim, and render object upon a reset call, else,
-            only calls sim.reset and resets all robosuite-internal variables
+        hard_reset (bool or str): If True, re-loads model, sim, and render object upon a reset call, else,
+            only calls sim.reset and resets all robosuite-internal variables. If "snapshot", the model is only
+            compiled once, and every reset restores the simulation state captured after the first reset (a plain
+            memory copy) before re-running the per-episode randomization (robot joint noise, object placements)
 
         camera_names (str or list of str): name of camera to be rendered. Should either be single str if
             same name is to be used for all cameras' rendering or else it should be a list of cameras to render.
@@ -443,7 +445,7 @@ class Stack(ManipulationEnv):
             def cubeB_quat(obs_cache):
                 return convert_quat(np.array(self.sim.data.body_xquat[self.cubeB_body_id]), to="xyzw")
 
-            @sensor(modality=modality)
+            @sensor(modality=modality, requires=["cubeA_pos", "cubeB_pos"])
             def cubeA_to_cubeB(obs_cache):
                 return (
                     obs_cache["cubeB_pos"] - obs_cache["cubeA_pos"]
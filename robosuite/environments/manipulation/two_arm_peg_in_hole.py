@@ -118,8 +118,10 @@ class TwoArmPegInHole(TwoArmEnv):
 
         ignore_done (bool): True if never terminating the environment (ignore @horizon).
 
-        hard_reset (bool): If True, re-loads model, sim, and render object upon a reset call, else,
-            only calls sim.reset and resets all robosuite-internal variables
+        hard_reset (bool or str): If True, re-loads model, sim, and render object upon a reset call, else,
+            only calls sim.reset and resets all robosuite-internal variables. If "snapshot", the model is only
+            compiled once, and every reset restores the simulation state captured after the first reset (a plain
+            memory copy) before re-running the per-episode randomization (robot joint noise, object placements)
 
         camera_names (str or list of str): name of camera to be rendered. Should either be single str if
             same name is to be used for all cameras' rendering or else it should be a list of cameras to render.
@@ -435,7 +437,7 @@ class TwoArmPegInHole(TwoArmEnv):
             def hole_quat(obs_cache):
                 return T.convert_quat(self.sim.data.body_xquat[self.hole_body_id], to="xyzw")
 
-            @sensor(modality=modality)
+            @sensor(modality=modality, requires=["hole_pos"])
             def peg_to_hole(obs_cache):
                 return (
                     obs_cache["hole_pos"] - np.array(self.sim.data.body_xpos[self.peg_body_id])
@@ -455,11 +457,12 @@ class TwoArmPegInHole(TwoArmEnv):
                 obs_cache["d"] = d
                 return cos
 
-            @sensor(modality=modality)
+            # t and d are written to the cache by the angle sensor
+            @sensor(modality=modality, requires=["angle"])
             def t(obs_cache):
                 return obs_cache["t"] if "t" in obs_cache else 0.0
 
-            @sensor(modality=modality)
+            @sensor(modality=modality, requires=["angle"])
             def d(obs_cache):
                 return obs_cache["d"] if "d" in obs_cache else 0.0
 
@@ -3,6 +3,7 @@ import multiprocessing
 import numpy as np
 from robosuite.models.arenas.osx_wipe_arena import OSXWipeArena
 from robosuite.models.objects.composite.hammer import HammerObject
+from robosuite.utils.marker_field import MarkerField
 from robosuite.utils.mjcf_utils import xml_path_completion
 
 import robosuite.utils.transform_utils as T
@@ -132,8 +133,10 @@ class TwoArmWiping(TwoArmEnv):
 
         ignore_done (bool): True if never terminating the environment (ignore @horizon).
 
-        hard_reset (bool): If True, re-loads model, sim, and render object upon a reset call, else,
-            only calls sim.reset and resets all robosuite-internal variables
+        hard_reset (bool or str): If True, re-loads model, sim, and render object upon a reset call, else,
+            only calls sim.reset and resets all robosuite-internal variables. If "snapshot", the model is only
+            compiled once, and every reset restores the simulation state captured after the first reset (a plain
+            memory copy) before re-running the per-episode randomization (robot joint noise, object placements)
 
         camera_names (str or list of str): name of camera to be rendered. Should either be single str if
             same name is to be used for all cameras' rendering or else it should be a list of cameras to render.
@@ -272,6 +275,8 @@ class TwoArmWiping(TwoArmEnv):
 
         # set other wipe-specific attributes
         self.wiped_markers = []
+        self.marker_field = None  # MarkerField of the arena's markers, set in _setup_references
+        self._corner_geom_ids = None  # ids of the corner geoms of the wiping tool
         self.collisions = 0
         self.f_excess = 0
         self.metadata = []
@@ -396,92 +401,21 @@ class TwoArmWiping(TwoArmEnv):
         else:
             # If the arm is not colliding or in joint limits, we check if we are wiping
             # (we don't want to reward wiping if there are unsafe situations)
-            active_markers = []
-
-            # Current 3D location of the corners of the wiping tool in world frame
-            c_geoms = self.robots[1].gripper.important_geoms["corners"]
-            corner1_id = self.sim.model.geom_name2id(c_geoms[0])
-            corner1_pos = np.array(self.sim.data.geom_xpos[corner1_id])
-            corner2_id = self.sim.model.geom_name2id(c_geoms[1])
-            corner2_pos = np.array(self.sim.data.geom_xpos[corner2_id])
-            corner3_id = self.sim.model.geom_name2id(c_geoms[2])
-            corner3_pos = np.array(self.sim.data.geom_xpos[corner3_id])
-            corner4_id = self.sim.model.geom_name2id(c_geoms[3])
-            corner4_pos = np.array(self.sim.data.geom_xpos[corner4_id])
-
-            # Unit vectors on my plane
-            v1 = corner1_pos - corner2_pos
-            v1 /= np.linalg.norm(v1)
-            v2 = corner4_pos - corner2_pos
-            v2 /= np.linalg.norm(v2)
-
-            # Corners of the tool in the coordinate frame of the plane
-            t1 = np.array([np.dot(corner1_pos - corner2_pos, v1), np.dot(corner1_pos - corner2_pos, v2)])
-            t2 = np.array([np.dot(corner2_pos - corner2_pos, v1), np.dot(corner2_pos - corner2_pos, v2)])
-            t3 = np.array([np.dot(corner3_pos - corner2_pos, v1), np.dot(corner3_pos - corner2_pos, v2)])
-            t4 = np.array([np.dot(corner4_pos - corner2_pos, v1), np.dot(corner4_pos - corner2_pos, v2)])
-
-            pp = [t1, t2, t4, t3]
-
-            # Normal of the plane defined by v1 and v2
-            n = np.cross(v1, v2)
-            n /= np.linalg.norm(n)
-
-            def isLeft(P0, P1, P2):
-                return (P1[0] - P0[0]) * (P2[1] - P0[1]) - (P2[0] - P0[0]) * (P1[1] - P0[1])
-
-            def PointInRectangle(X, Y, Z, W, P):
-                return isLeft(X, Y, P) < 0 and isLeft(Y, Z, P) < 0 and isLeft(Z, W, P) < 0 and isLeft(W, X, P) < 0
+            active_markers = np.zeros(len(self.marker_field), dtype=bool)
 
             # Only go into this computation if there are contact points
             if self.sim.data.ncon != 0:
-
-                # Check each marker that is still active
-                for marker in self.model.mujoco_arena.markers:
-
-                    # Current marker 3D location in world frame
-                    marker_pos = np.array(self.sim.data.body_xpos[self.sim.model.body_name2id(marker.root_body)])
-
-                    # We use the second tool corner as point on the plane and define the vector connecting
-                    # the marker position to that point
-                    v = marker_pos - corner2_pos
-
-                    # Shortest distance between the center of the marker and the plane
-                    dist = np.dot(v, n)
-
-                    # Projection of the center of the marker onto the plane
-                    projected_point = np.array(marker_pos) - dist * n
-
-                    # Positive distances means the center of the marker is over the plane
-                    # The plane is aligned with the bottom of the wiper and pointing up, so the marker would be over it
-                    if dist > 0.0:
-                        # Distance smaller than this threshold means we are close to the plane on the upper part
-                        if dist < 0.02:
-                            # Write touching points and projected point in coordinates of the plane
-                            pp_2 = np.array(
-                                [np.dot(projected_point - corner2_pos, v1), np.dot(projected_point - corner2_pos, v2)]
-                            )
-                            # Check if marker is within the tool center:
-                            if PointInRectangle(pp[0], pp[1], pp[2], pp[3], pp_2):
-                                active_markers.append(marker)
-                                # print('active_markers', active_markers)
-
-            # Obtain the list of currently active (wiped) markers that where not wiped before
-            # These are the markers we are wiping at this step
-            lall = np.where(np.isin(active_markers, self.wiped_markers, invert=True))
-            new_active_markers = np.array(active_markers)[lall]
-
-            # Loop through all new markers we are wiping at this step
-            for new_active_marker in new_active_markers:
-                # Grab relevant marker id info
-                new_active_marker_geom_id = self.sim.model.geom_name2id(new_active_marker.visual_geoms[0])
-                # Make this marker transparent since we wiped it (alpha = 0)
-                self.sim.model.geom_rgba[new_active_marker_geom_id][3] = 0
-                # Add this marker the wiped list
-                self.wiped_markers.append(new_active_marker)
-                # Add reward if we're using the dense reward
-                if self.reward_shaping:
-                    reward += self.unit_wiped_reward
+                # Markers under the wiping tool, given the current 3D location of its corners in world frame
+                self.marker_field.update_positions()
+                active_markers = self.marker_field.under_tool(self.sim.data.geom_xpos[self._corner_geom_ids])
+
+            # Mark the active markers that where not wiped before (these are the markers we are wiping at this step)
+            # as wiped, which also makes them transparent
+            new_active_markers = self.marker_field.wipe(active_markers)
+            self.wiped_markers += [self.marker_field.markers[i] for i in new_active_markers]
+            # Add reward if we're using the dense reward
+            if self.reward_shaping:
+                reward += self.unit_wiped_reward * len(new_active_markers)
 
             # Additional reward components if using dense rewards
             if self.reward_shaping:
@@ -540,6 +474,19 @@ class TwoArmWiping(TwoArmEnv):
             reward *= self.reward_scale * self.reward_normalization_factor
         return reward
 
+    def _setup_references(self):
+        """
+        Sets up references to important components. A reference is typically an
+        index or a list of indices that point to the corresponding elements
+        in a flatten array, which is how MuJoCo stores physical simulation data.
+        """
+        super()._setup_references()
+
+        self.marker_field = MarkerField(self.sim, self.model.mujoco_arena.markers)
+        self._corner_geom_ids = [
+            self.sim.model.geom_name2id(geom) for geom in self.robots[1].gripper.important_geoms["corners"]
+        ]
+
     def _load_model(self):
         """
         Loads an xml model, puts it in self.model
@@ -644,7 +591,7 @@ class TwoArmWiping(TwoArmEnv):
                     obs_cache["wipe_centroid"] = wipe_cent
                     return wipe_rad
 
-                @sensor(modality=modality)
+                @sensor(modality=modality, requires=["wipe_centroid"])
                 def wipe_centroid(obs_cache):
                     return obs_cache["wipe_centroid"] if "wipe_centroid" in obs_cache else np.zeros(3)
 
@@ -657,7 +604,7 @@ class TwoArmWiping(TwoArmEnv):
 
                 if self.use_robot_obs:
                     # also use ego-centric obs
-                    @sensor(modality=modality)
+                    @sensor(modality=modality, requires=["wipe_centroid", f"{pf}eef_pos"])
                     def gripper_to_wipe_centroid(obs_cache):
                         return (
                             obs_cache["wipe_centroid"] - obs_cache[f"{pf}eef_pos"]
@@ -704,18 +651,18 @@ class TwoArmWiping(TwoArmEnv):
 
         @sensor(modality=modality)
         def marker_pos(obs_cache):
-            return np.array(self.sim.data.body_xpos[self.sim.model.body_name2id(marker.root_body)])
+            return np.array(self.sim.data.body_xpos[self.marker_field.body_ids[i]])
 
         @sensor(modality=modality)
         def marker_wiped(obs_cache):
-            return [0, 1][marker in self.wiped_markers]
+            return int(self.marker_field.wiped[i])
 
         sensors = [marker_pos, marker_wiped]
         names = [f"marker{i}_pos", f"marker{i}_wiped"]
 
         if self.use_robot_obs:
             # also use ego-centric obs
-            @sensor(modality=modality)
+            @sensor(modality=modality, requires=[f"marker{i}_pos", f"{pf}eef_pos"])
             def gripper_to_marker(obs_cache):
                 return (
                     obs_cache[f"marker{i}_pos"] - obs_cache[f"{pf}eef_pos"]
@@ -762,6 +709,7 @@ class TwoArmWiping(TwoArmEnv):
         # Reset all internal vars for this wipe task
         self.timestep = 0
         self.wiped_markers = []
+        self.marker_field.reset()
         self.collisions = 0
         self.f_excess = 0
 
@@ -860,22 +808,11 @@ class TwoArmWiping(TwoArmEnv):
     def _get_wipe_information(self):
         """Returns set of wiping information"""
         mean_pos_to_things_to_wipe = np.zeros(3)
-        wipe_centroid = np.zeros(3)
-        marker_positions = []
-        num_non_wiped_markers = 0
+        self.marker_field.update_positions()
+        # Radius of circle from centroid capturing all remaining wiping markers
+        max_radius, wipe_centroid = self.marker_field.remaining_information()
         if len(self.wiped_markers) < self.num_markers:
-            for marker in self.model.mujoco_arena.markers:
-                if marker not in self.wiped_markers:
-                    marker_pos = np.array(self.sim.data.body_xpos[self.sim.model.body_name2id(marker.root_body)])
-                    wipe_centroid += marker_pos
-                    marker_positions.append(marker_pos)
-                    num_non_wiped_markers += 1
-            wipe_centroid /= max(1, num_non_wiped_markers)
             mean_pos_to_things_to_wipe = wipe_centroid - self._eef1_xpos  # left arm
-        # Radius of circle from centroid capturing all remaining wiping markers
-        max_radius = 0
-        if num_non_wiped_markers > 0:
-            max_radius = np.max(np.linalg.norm(np.array(marker_positions) - wipe_centroid, axis=1))
         # Return all values
         return max_radius, wipe_centroid, mean_pos_to_things_to_wipe
 
@@ -77,8 +77,10 @@ class RobotEnv(MujocoEnv):
 
         ignore_done (bool): True if never terminating the environment (ignore @horizon).
 
-        hard_reset (bool): If True, re-loads model, sim, and render object upon a reset call, else,
-            only calls sim.reset and resets all robosuite-internal variables
+        hard_reset (bool or str): If True, re-loads model, sim, and render object upon a reset call, else,
+            only calls sim.reset and resets all robosuite-internal variables. If "snapshot", the model is only
+            compiled once, and every reset restores the simulation state captured after the first reset (a plain
+            memory copy) before re-running the per-episode randomization (robot joint noise, object placements)
 
         camera_names (str or list of str): name of camera to be rendered. Should either be single str if
             same name is to be used for all cameras' rendering or else it should be a list of cameras to render.
@@ -410,27 +412,40 @@ class RobotEnv(MujocoEnv):
         depth_sensor_name = f"{cam_name}_depth"
         segmentation_sensor_name = f"{cam_name}_segmentation"
 
+        # Raw (object type, object id) segmentation, rendered along with the rgb image and shared by all the
+        # segmentation sensors of this camera (see @_create_segementation_sensor)
+        raw_segmentation_name = f"{segmentation_sensor_name}_raw"
+        # Only consumed by the segmentation sensors within the same timestep, so it is reused across timesteps
+        raw_segmentation = np.empty((cam_h, cam_w, 2), dtype=np.int32) if cam_segs is not None else None
+
         @sensor(modality=modality)
         def camera_rgb(obs_cache):
-            img = self.sim.render(
+            # Render all image types of this camera from a single scene update, directly into arrays in the right
+            # image convention (through row-reversed views if needed)
+            rgb = np.empty((cam_h, cam_w, 3), dtype=np.uint8)
+            depth = np.empty((cam_h, cam_w, 1), dtype=np.float32) if cam_d else None
+            self.sim.render_images(
                 camera_name=cam_name,
                 width=cam_w,
                 height=cam_h,
                 depth=cam_d,
+                segmentation=cam_segs is not None,
+                rgb_out=rgb[::convention],
+                depth_out=depth[::convention, :, 0] if cam_d else None,
+                seg_out=raw_segmentation[::convention] if cam_segs is not None else None,
             )
             if cam_d:
-                rgb, depth = img
-                obs_cache[depth_sensor_name] = np.expand_dims(depth[::convention], axis=-1)
-                return rgb[::convention]
-            else:
-                return img[::convention]
+                obs_cache[depth_sensor_name] = depth
+            if cam_segs is not None:
+                obs_cache[raw_segmentation_name] = (self.sim.data.time, raw_segmentation)
+            return rgb
 
         sensors.append(camera_rgb)
         names.append(rgb_sensor_name)
 
         if cam_d:
 
-            @sensor(modality=modality)
+            @sensor(modality=modality, requires=[depth_sensor_name])
             def camera_depth(obs_cache):
                 return obs_cache[depth_sensor_name] if depth_sensor_name in obs_cache else np.zeros((cam_h, cam_w, 1))
 
@@ -489,25 +504,34 @@ class RobotEnv(MujocoEnv):
             # No additional mapping needed
             mapping = None
 
-        @sensor(modality=modality)
+        if mapping is not None:
+            # Dense lookup table from raw ids to grouped ids, both shifted by one so that the background (-1) is at
+            # index 0 and maps to 0. Ids without a group map to 0 as well, including any id past the end of the table
+            lut = np.zeros(max(self.sim.model.ngeom, max(mapping, default=-1) + 1) + 2, dtype=np.int32)
+            lut[np.fromiter(mapping.keys(), dtype=np.int64) + 1] = np.fromiter(mapping.values(), dtype=np.int32) + 1
+
+        raw_segmentation_name = f"{seg_name_root}_raw"
+        raw_segmentation = np.empty((cam_h, cam_w, 2), dtype=np.int32)
+        shifted_ids = np.empty((cam_h, cam_w, 1), dtype=np.intp)
+
+        @sensor(modality=modality, requires=[raw_segmentation_name])
         def camera_segmentation(obs_cache):
-            seg = self.sim.render(
-                camera_name=cam_name,
-                width=cam_w,
-                height=cam_h,
-                depth=False,
-                segmentation=True,
-            )
-            seg = np.expand_dims(seg[::convention, :, 1], axis=-1)
+            # Reuse the segmentation rendered along with the rgb image at this timestep, if any
+            time, seg = obs_cache.get(raw_segmentation_name, (None, None))
+            if time != self.sim.data.time:
+                self.sim.render_images(
+                    camera_name=cam_name,
+                    width=cam_w,
+                    height=cam_h,
+                    segmentation=True,
+                    seg_out=raw_segmentation[::convention],
+                )
+                seg = raw_segmentation
+                obs_cache[raw_segmentation_name] = (self.sim.data.time, seg)
             # Map raw IDs to grouped IDs if we're using instance or class-level segmentation
             if mapping is not None:
-                seg = (
-                    np.fromiter(map(lambda x: mapping.get(x, -1), seg.flatten()), dtype=np.int32).reshape(
-                        cam_h, cam_w, 1
-                    )
-                    + 1
-                )
-            return seg
+                return np.take(lut, np.add(seg[:, :, 1:], 1, out=shifted_ids), mode="clip")
+            return seg[:, :, 1:].copy()
 
         name = f"{seg_name_root}_{cam_s}"
 
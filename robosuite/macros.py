@@ -20,6 +20,28 @@ USING_INSTANCE_RANDOMIZATION = False
 ENABLE_NUMBA = True
 CACHE_NUMBA = True
 
+# Transform / control kernels
+# If True, the hot helpers of transform_utils and control_utils (e.g.: mat2quat, quat2mat, opspace_matrices) delegate
+# to the kernels of robosuite/utils/kernels.py, which are faster but compute in double precision (and mat2quat in
+# closed form). This changes the numerics of every controller and observation, so that demonstrations recorded without
+# it will not replay to the same states. False keeps the reference implementations
+USE_FAST_KERNELS = False
+
+# Force / torque filtering
+# If set to a cutoff frequency (Hz), the eef force / torque readings pushed into Robot.recent_ee_forcetorques at every
+# policy step are smoothed with a streaming low-pass Butterworth filter (see robosuite/utils/filters.py).
+# None keeps the raw readings
+EE_FT_FILTER_CUTOFF = None
+EE_FT_FILTER_ORDER = 5
+
+# Compiled model cache
+# If MODEL_CACHE_SIZE > 0, MjSim.from_xml_string keeps up to this many compiled models (keyed by a hash of the XML) in
+# memory, so that byte-identical XML (e.g.: repeated hard resets, reset_from_xml_string) is only compiled once. If
+# MODEL_CACHE_DIR is set, compiled models are also saved there as MuJoCo binary (.mjb) files, which are shared by all
+# processes on the machine (e.g.: vectorized env workers). See robosuite/utils/model_cache.py
+MODEL_CACHE_SIZE = 0
+MODEL_CACHE_DIR = None
+
 # Image Convention
 # Robosuite (Mujoco)-rendered images are based on the OpenGL coordinate frame convention, whereas many downstream
 # applications assume an OpenCV coordinate frame convention. For consistency, you can set the image convention
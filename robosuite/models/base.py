@@ -14,6 +14,7 @@ from robosuite.utils.mjcf_utils import (
     sort_elements,
     string_to_array,
 )
+from robosuite.utils.model_cache import compile_model
 
 
 class MujocoXML(object):
@@ -141,9 +142,8 @@ class MujocoXML(object):
         with io.StringIO() as string:
             string.write(ET.tostring(self.root, encoding="unicode"))
             if mode == "mujoco":
-                import mujoco
-
-                model = mujoco.MjModel.from_xml_string(string.getvalue())
+                # Skips compilation if this xml was compiled before and the model cache is enabled
+                model, _ = compile_model(string.getvalue())
                 return model
             raise ValueError("Unkown model mode: {}. Available options are: {}".format(mode, ",".join(available_modes)))
 
@@ -15,23 +15,29 @@ from .null_gripper import NullGripper
 from .inspire_hands import InspireLeftHand, InspireRightHand
 from .grinder import UR5eGrinder
 
-GRIPPER_MAPPING = {
-    "RethinkGripper": RethinkGripper,
-    "PandaGripper": PandaGripper,
-    "JacoThreeFingerGripper": JacoThreeFingerGripper,
-    "JacoThreeFingerDexterousGripper": JacoThreeFingerDexterousGripper,
-    "WipingGripper": WipingGripper,
-    "Robotiq85Gripper": Robotiq85Gripper,
-    "Robotiq140Gripper": Robotiq140Gripper,
-    "RobotiqThreeFingerGripper": RobotiqThreeFingerGripper,
-    "RobotiqThreeFingerDexterousGripper": RobotiqThreeFingerDexterousGripper,
-    "BDGripper": BDGripper,
-    "InspireLeftHand": InspireLeftHand,
-    "InspireRightHand": InspireRightHand,
-    None: NullGripper,
-    "Grinder": UR5eGrinder,
-    None: NullGripper,
-}
+from robosuite.utils.registry_utils import ROBOT_FALLBACK_MODULES, LazyRegistry
+
+# Grippers of robosuite_models are registered when it is imported, the first time one of them is looked up
+GRIPPER_MAPPING = LazyRegistry(fallback_modules=ROBOT_FALLBACK_MODULES)
+GRIPPER_MAPPING.update(
+    {
+        "RethinkGripper": RethinkGripper,
+        "PandaGripper": PandaGripper,
+        "JacoThreeFingerGripper": JacoThreeFingerGripper,
+        "JacoThreeFingerDexterousGripper": JacoThreeFingerDexterousGripper,
+        "WipingGripper": WipingGripper,
+        "Robotiq85Gripper": Robotiq85Gripper,
+        "Robotiq140Gripper": Robotiq140Gripper,
+        "RobotiqThreeFingerGripper": RobotiqThreeFingerGripper,
+        "RobotiqThreeFingerDexterousGripper": RobotiqThreeFingerDexterousGripper,
+        "BDGripper": BDGripper,
+        "InspireLeftHand": InspireLeftHand,
+        "InspireRightHand": InspireRightHand,
+        None: NullGripper,
+        "Grinder": UR5eGrinder,
+        None: NullGripper,
+    }
+)
 
 ALL_GRIPPERS = GRIPPER_MAPPING.keys()
 
@@ -7,9 +7,10 @@ import numpy as np
 from robosuite.models.base import MujocoXMLModel
 from robosuite.models.bases import LegBaseModel, MobileBaseModel, MountModel, RobotBaseModel
 from robosuite.utils.mjcf_utils import ROBOT_COLLISION_COLOR, array_to_string, find_elements, find_parent
+from robosuite.utils.registry_utils import ROBOT_FALLBACK_MODULES, LazyRegistry
 from robosuite.utils.transform_utils import euler2mat, mat2quat
 
-REGISTERED_ROBOTS = {}
+REGISTERED_ROBOTS = LazyRegistry(fallback_modules=ROBOT_FALLBACK_MODULES)
 
 
 def register_robot(target_class):
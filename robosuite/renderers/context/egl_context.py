@@ -141,6 +141,10 @@ class EGLGLContext:
         if not EGL.eglMakeCurrent(EGL_DISPLAY, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, self._context):
             raise RuntimeError("Failed to make the EGL context current.")
 
+    def release(self):
+        """Releases this context from the calling thread, so that it can be made current on another thread."""
+        EGL.eglMakeCurrent(EGL_DISPLAY, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+
     def free(self):
         """Frees resources associated with this context."""
         if self._context:
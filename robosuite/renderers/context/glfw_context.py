@@ -14,6 +14,7 @@
 # ==============================================================================
 """An OpenGL context created via GLFW."""
 
+import glfw
 from mujoco.glfw import GLContext
 
 
@@ -22,3 +23,7 @@ class GLFWGLContext(GLContext):
 
     def __init__(self, max_width, max_height, device_id=0):
         super().__init__(max_width, max_height)
+
+    def release(self):
+        """Releases this context from the calling thread, so that it can be made current on another thread."""
+        glfw.make_context_current(None)
@@ -17,6 +17,7 @@
 import os
 
 from mujoco.osmesa import GLContext
+from OpenGL import GL, osmesa
 
 
 class OSMesaGLContext(GLContext):
@@ -24,3 +25,7 @@ class OSMesaGLContext(GLContext):
 
     def __init__(self, max_width, max_height, device_id=-1):
         super().__init__(max_width, max_height)
+
+    def release(self):
+        """Releases this context from the calling thread, so that it can be made current on another thread."""
+        osmesa.OSMesaMakeCurrent(None, None, GL.GL_FLOAT, 0, 0)
@@ -52,6 +52,12 @@ class MjviewerRenderer:
 
             # self.viewer.cam.type = 0
 
+            # the viewer uploads all the textures when launched
+            self.texture_versions = self.env.sim.texture_versions.copy()
+
+        # upload the textures modified since the last update, see MjSim.mark_textures_dirty
+        for tex_id in self.env.sim.get_dirty_textures(self.texture_versions):
+            self.viewer.update_texture(tex_id)
         self.viewer.sync()
 
     def reset(self):
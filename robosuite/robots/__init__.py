@@ -6,31 +6,35 @@ from .legged_robot import LeggedRobot
 from robosuite.models.robots.robot_model import REGISTERED_ROBOTS
 
 from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
+from robosuite.utils.registry_utils import ROBOT_FALLBACK_MODULES, LazyRegistry
 
 ALL_ROBOTS = REGISTERED_ROBOTS.keys()
 
 # Robot class mappings -- must be maintained manually
 # These are the main robot used. Remaining robots are located in
-# https://github.com/ARISE-Initiative/robosuite_models
-ROBOT_CLASS_MAPPING = {
-    "Baxter": FixedBaseRobot,
-    "IIWA": FixedBaseRobot,
-    "Jaco": FixedBaseRobot,
-    "Kinova3": FixedBaseRobot,
-    "Panda": FixedBaseRobot,
-    "Sawyer": FixedBaseRobot,
-    "UR5e": FixedBaseRobot,
-    "SpotWithArm": LeggedRobot,
-    "SpotWithArmFloating": LeggedRobot,
-    "PandaOmron": WheeledRobot,
-    "Tiago": WheeledRobot,
-    "GR1": LeggedRobot,
-    "GR1FixedLowerBody": LeggedRobot,
-    "GR1ArmsOnly": LeggedRobot,
-    "GR1FloatingBody": LeggedRobot,
-    "PandaDexRH": FixedBaseRobot,
-    "PandaDexLH": FixedBaseRobot,
-}
+# https://github.com/ARISE-Initiative/robosuite_models, which is imported the first time one of them is looked up
+ROBOT_CLASS_MAPPING = LazyRegistry(fallback_modules=ROBOT_FALLBACK_MODULES)
+ROBOT_CLASS_MAPPING.update(
+    {
+        "Baxter": FixedBaseRobot,
+        "IIWA": FixedBaseRobot,
+        "Jaco": FixedBaseRobot,
+        "Kinova3": FixedBaseRobot,
+        "Panda": FixedBaseRobot,
+        "Sawyer": FixedBaseRobot,
+        "UR5e": FixedBaseRobot,
+        "SpotWithArm": LeggedRobot,
+        "SpotWithArmFloating": LeggedRobot,
+        "PandaOmron": WheeledRobot,
+        "Tiago": WheeledRobot,
+        "GR1": LeggedRobot,
+        "GR1FixedLowerBody": LeggedRobot,
+        "GR1ArmsOnly": LeggedRobot,
+        "GR1FloatingBody": LeggedRobot,
+        "PandaDexRH": FixedBaseRobot,
+        "PandaDexLH": FixedBaseRobot,
+    }
+)
 
 target_type_mapping = {
     "FixedBaseRobot": FixedBaseRobot,
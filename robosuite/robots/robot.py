@@ -6,6 +6,7 @@ from typing import Optional
 
 import numpy as np
 
+import robosuite.macros as macros
 import robosuite.utils.transform_utils as T
 from robosuite.controllers import load_composite_controller_config, load_part_controller_config
 from robosuite.models.bases import robot_base_factory
@@ -13,7 +14,8 @@ from robosuite.models.grippers import gripper_factory
 from robosuite.models.robots import create_robot
 from robosuite.models.robots.robot_model import REGISTERED_ROBOTS
 from robosuite.utils.binding_utils import MjSim
-from robosuite.utils.buffers import DeltaBuffer, RingBuffer
+from robosuite.utils.buffers import HistoryBuffer, HistorySpec
+from robosuite.utils.filters import ButterworthFilter
 from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
 from robosuite.utils.mjcf_utils import array_to_string
 from robosuite.utils.observables import Observable, sensor
@@ -90,8 +92,9 @@ class Robot(object):
         self.recent_ee_forcetorques = self._input2dict(None)  # Current and last forces / torques sensed at eef
         self.recent_ee_pose = self._input2dict(None)  # Current and last eef pose (pos + ori (quat))
         self.recent_ee_vel = self._input2dict(None)  # Current and last eef velocity
-        self.recent_ee_vel_buffer = self._input2dict(None)  # RingBuffer holding prior 10 values of velocity values
+        self.recent_ee_vel_buffer = self._input2dict(None)  # Ring holding prior 10 values of velocity values
         self.recent_ee_acc = self._input2dict(None)  # Current and last eef acceleration
+        self.history = None  # HistoryBuffer holding all the recent_* values
 
         # Set relevant attributes
         self.sim = None  # MjSim this robot is tied to
@@ -271,10 +274,12 @@ class Robot(object):
         self.base_pos = self.sim.data.get_body_xpos(self.robot_model.root_body)
         self.base_ori = self.sim.data.get_body_xmat(self.robot_model.root_body).reshape((3, 3))
 
-        # Setup buffers to hold recent values
-        self.recent_qpos = DeltaBuffer(dim=len(self.joint_indexes))
-        self.recent_actions = DeltaBuffer(dim=self.action_dim)
-        self.recent_torques = DeltaBuffer(dim=len(self.joint_indexes))
+        # Setup the history holding recent values (see _update_proprioception)
+        specs = [
+            HistorySpec("qpos", dim=len(self.joint_indexes)),
+            HistorySpec("actions", dim=self.action_dim),
+            HistorySpec("torques", dim=len(self.joint_indexes)),
+        ]
 
         # Setup arm-specific values
         for arm in self.arms:
@@ -285,12 +290,30 @@ class Robot(object):
 
                 self.gripper[arm].current_action = np.zeros(self.gripper[arm].dof)
 
-            # Setup buffers for eef values
-            self.recent_ee_forcetorques[arm] = DeltaBuffer(dim=6)
-            self.recent_ee_pose[arm] = DeltaBuffer(dim=7)
-            self.recent_ee_vel[arm] = DeltaBuffer(dim=6)
-            self.recent_ee_vel_buffer[arm] = RingBuffer(dim=6, length=10)
-            self.recent_ee_acc[arm] = DeltaBuffer(dim=6)
+            # Setup histories of eef values
+            ft_filter = None
+            if macros.EE_FT_FILTER_CUTOFF is not None:
+                ft_filter = ButterworthFilter(
+                    dim=6, cutoff=macros.EE_FT_FILTER_CUTOFF, fs=self.control_freq, order=macros.EE_FT_FILTER_ORDER
+                )
+            specs += [
+                HistorySpec(f"{arm}_ee_forcetorques", dim=6, filter=ft_filter),
+                HistorySpec(f"{arm}_ee_pose", dim=7),
+                HistorySpec(f"{arm}_ee_vel", dim=6),
+                HistorySpec(f"{arm}_ee_vel_buffer", dim=6, length=10, zero_filled=False),
+                HistorySpec(f"{arm}_ee_acc", dim=6),
+            ]
+
+        self.history = HistoryBuffer(specs)
+        self.recent_qpos = self.history["qpos"]
+        self.recent_actions = self.history["actions"]
+        self.recent_torques = self.history["torques"]
+        for arm in self.arms:
+            self.recent_ee_forcetorques[arm] = self.history[f"{arm}_ee_forcetorques"]
+            self.recent_ee_pose[arm] = self.history[f"{arm}_ee_pose"]
+            self.recent_ee_vel[arm] = self.history[f"{arm}_ee_vel"]
+            self.recent_ee_vel_buffer[arm] = self.history[f"{arm}_ee_vel_buffer"]
+            self.recent_ee_acc[arm] = self.history[f"{arm}_ee_acc"]
 
         # reset internal variables for composite controller
         self.composite_controller.update_state()
@@ -341,19 +364,19 @@ class Robot(object):
         # proprioceptive features
         @sensor(modality=modality)
         def joint_pos(obs_cache):
-            return np.array([self.sim.data.qpos[x] for x in self._ref_joint_pos_indexes])
+            return self.sim.data.qpos[self._ref_joint_pos_indexes]
 
-        @sensor(modality=modality)
+        @sensor(modality=modality, requires=[pre_compute])
         def joint_pos_cos(obs_cache):
             return np.cos(obs_cache[pre_compute]) if pre_compute in obs_cache else np.zeros(self.robot_model.dof)
 
-        @sensor(modality=modality)
+        @sensor(modality=modality, requires=[pre_compute])
         def joint_pos_sin(obs_cache):
             return np.sin(obs_cache[pre_compute]) if pre_compute in obs_cache else np.zeros(self.robot_model.dof)
 
         @sensor(modality=modality)
         def joint_vel(obs_cache):
-            return np.array([self.sim.data.qvel[x] for x in self._ref_joint_vel_indexes])
+            return self.sim.data.qvel[self._ref_joint_vel_indexes]
 
         sensors = [joint_pos, joint_pos_cos, joint_pos_sin, joint_vel]
         names = ["joint_pos", "joint_pos_cos", "joint_pos_sin", "joint_vel"]
@@ -504,6 +527,37 @@ class Robot(object):
         """
         raise NotImplementedError
 
+    def _update_proprioception(self, action):
+        """
+        Pushes the values of the current policy step into the histories of recent values (see @self.history)
+
+        Args:
+            action (np.array): The action applied in this policy step
+        """
+        self.recent_qpos.push(self._joint_positions)
+        self.recent_actions.push(action)
+        self.recent_torques.push(self.torques)
+
+        ee_force, ee_torque = self.ee_force, self.ee_torque
+        for arm in self.arms:
+            controller = self.part_controllers.get(arm, None)
+            if controller is None:
+                # TODO: enable buffer update for whole body controllers not using individual arm controllers
+                continue
+
+            # Update arm-specific proprioceptive values
+            ee_vel = np.concatenate((controller.ref_pos_vel, controller.ref_ori_vel))
+            self.recent_ee_forcetorques[arm].push(np.concatenate((ee_force[arm], ee_torque[arm])))
+            self.recent_ee_pose[arm].push(np.concatenate((controller.ref_pos, T.mat2quat(controller.ref_ori_mat))))
+            self.recent_ee_vel[arm].push(ee_vel)
+
+            # Estimation of eef acceleration: moving average of the last estimate and of the finite differences of the
+            # velocities in the ring (in storage order), whose sum telescopes to its last row minus its first one
+            vel_buffer = self.recent_ee_vel_buffer[arm]
+            vel_buffer.push(ee_vel)
+            ee_acc = self.recent_ee_acc[arm].current + self.control_freq * (vel_buffer.buf[-1] - vel_buffer.buf[0])
+            self.recent_ee_acc[arm].push(ee_acc / vel_buffer.length)
+
     def check_q_limits(self):
         """
         Check if this robot is either very close or at the joint limits
@@ -598,6 +652,8 @@ class Robot(object):
         Returns:
             np.array: (4,4) array corresponding to the pose of @name in the base frame
         """
+        if self._kinematics_cache is not None:
+            return self._kinematics_cache.pose_in_base(name, self.robot_model.root_body).copy()
 
         pos_in_world = self.sim.data.get_body_xpos(name)
         rot_in_world = self.sim.data.get_body_xmat(name).reshape((3, 3))
@@ -650,6 +706,14 @@ class Robot(object):
         # Note that we use mean torque
         return np.abs((1.0 / self.control_freq) * self.recent_torques.average)
 
+    @property
+    def _kinematics_cache(self):
+        """
+        Returns:
+            None or KinematicsCache: simulation-step-scoped cache shared with this robot's part controllers, if any
+        """
+        return getattr(self.composite_controller, "kinematics_cache", None)
+
     @property
     def _joint_positions(self):
         """
@@ -692,6 +756,8 @@ class Robot(object):
         Returns:
             np.array: sensor values
         """
+        if self._kinematics_cache is not None:
+            return np.array(self._kinematics_cache.sensor(sensor_name))
         sensor_idx = np.sum(self.sim.model.sensor_dim[: self.sim.model.sensor_name2id(sensor_name)])
         sensor_dim = self.sim.model.sensor_dim[self.sim.model.sensor_name2id(sensor_name)]
         return np.array(self.sim.data.sensordata[sensor_idx: sensor_idx + sensor_dim])
@@ -795,10 +861,13 @@ class Robot(object):
             (start, end) = (None, self._joint_split_idx) if arm == "right" else (self._joint_split_idx, None)
 
             # Use jacobian to translate joint velocities to end effector velocities.
-            Jp = self.sim.data.get_body_jacp(self.robot_model.eef_name[arm]).reshape((3, -1))
+            if self._kinematics_cache is not None:
+                J = self._kinematics_cache.body_jacobian(self.sim.model.body_name2id(self.robot_model.eef_name[arm]))
+                Jp, Jr = J[:3], J[3:]
+            else:
+                Jp = self.sim.data.get_body_jacp(self.robot_model.eef_name[arm]).reshape((3, -1))
+                Jr = self.sim.data.get_body_jacr(self.robot_model.eef_name[arm]).reshape((3, -1))
             Jp_joint = Jp[:, self._ref_joint_vel_indexes[start:end]]
-
-            Jr = self.sim.data.get_body_jacr(self.robot_model.eef_name[arm]).reshape((3, -1))
             Jr_joint = Jr[:, self._ref_joint_vel_indexes[start:end]]
 
             eef_lin_vel = Jp_joint.dot(self._joint_velocities)
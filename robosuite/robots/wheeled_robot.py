@@ -4,7 +4,6 @@ from collections import OrderedDict
 
 import numpy as np
 
-import robosuite.utils.transform_utils as T
 from robosuite.controllers import composite_controller_factory
 from robosuite.robots.mobile_robot import MobileRobot
 from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
@@ -129,32 +128,7 @@ class WheeledRobot(MobileRobot):
 
         # If this is a policy step, also update buffers holding recent values of interest
         if policy_step:
-            # Update proprioceptive values
-            self.recent_qpos.push(self._joint_positions)
-            self.recent_actions.push(action)
-            self.recent_torques.push(self.torques)
-
-            for arm in self.arms:
-                controller = self.part_controllers.get(arm, None)
-                if controller is None:
-                    # TODO: enable buffer update for whole body controllers not using individual arm controllers
-                    continue
-
-                # Update arm-specific proprioceptive values
-                self.recent_ee_forcetorques[arm].push(np.concatenate((self.ee_force[arm], self.ee_torque[arm])))
-                self.recent_ee_pose[arm].push(np.concatenate((controller.ref_pos, T.mat2quat(controller.ref_ori_mat))))
-                self.recent_ee_vel[arm].push(np.concatenate((controller.ref_pos_vel, controller.ref_ori_vel)))
-
-                # Estimation of eef acceleration (averaged derivative of recent velocities)
-                self.recent_ee_vel_buffer[arm].push(np.concatenate((controller.ref_pos_vel, controller.ref_ori_vel)))
-                diffs = np.vstack(
-                    [
-                        self.recent_ee_acc[arm].current,
-                        self.control_freq * np.diff(self.recent_ee_vel_buffer[arm].buf, axis=0),
-                    ]
-                )
-                ee_acc = np.array([np.convolve(col, np.ones(10) / 10.0, mode="valid")[0] for col in diffs.transpose()])
-                self.recent_ee_acc[arm].push(ee_acc)
+            self._update_proprioception(action)
 
     def setup_observables(self):
         """
@@ -0,0 +1,112 @@
+"""
+Benchmarks the arm controller loop of a single-arm environment running at 500 Hz (one simulation substep per control
+step), comparing Controller.update (preallocated workspace, site ids resolved once, jacobians and mass matrix filled in
+place) against the previous implementation, which allocated the full mass matrix and looked up / re-evaluated the site
+jacobians on every call.
+
+Arguments:
+    --env (str): Environment to benchmark
+    --robots (str): Robot to use in the environment
+    --steps (int): Number of control steps to time for each configuration
+
+Example:
+    $ python benchmark_controller.py --robots UR5e --steps 5000
+"""
+
+import argparse
+import time
+import types
+
+import mujoco
+import numpy as np
+
+import robosuite as suite
+
+
+def legacy_update(self, force=False):
+    """
+    Reference implementation of Controller.update without the preallocated workspace.
+    """
+    if self.new_update or force:
+        if not self.lite_physics or force:
+            self.sim.forward()
+
+        if self.ref_name is not None:
+            name = self.ref_name
+            ref_id = self.sim.model.site_name2id(name)
+            self.ref_pos[:] = np.array(self.sim.data.site_xpos[ref_id])
+            self.ref_ori_mat[:, :] = np.array(self.sim.data.site_xmat[ref_id].reshape([3, 3]))
+            self.ref_pos_vel[:] = np.array(self.sim.data.get_site_xvelp(name))
+            self.ref_ori_vel[:] = np.array(self.sim.data.get_site_xvelr(name))
+            self.J_pos[:, :] = np.array(self.sim.data.get_site_jacp(name).reshape((3, -1))[:, self.qvel_index])
+            self.J_ori[:, :] = np.array(self.sim.data.get_site_jacr(name).reshape((3, -1))[:, self.qvel_index])
+            self.J_full[:, :] = np.vstack([self.J_pos, self.J_ori])
+
+        self.joint_pos = np.array(self.sim.data.qpos[self.qpos_index])
+        self.joint_vel = np.array(self.sim.data.qvel[self.qvel_index])
+
+        mass_matrix = np.ndarray(shape=(self.sim.model.nv, self.sim.model.nv), dtype=np.float64, order="C")
+        mujoco.mj_fullM(self.sim.model._model, mass_matrix, self.sim.data.qM)
+        mass_matrix = np.reshape(mass_matrix, (len(self.sim.data.qvel), len(self.sim.data.qvel)))
+        self.mass_matrix = mass_matrix[self.qvel_index, :][:, self.qvel_index]
+
+        self.new_update = False
+
+
+def benchmark(env, num_steps, legacy):
+    """
+    Runs @num_steps control steps of @env with zero actions, using the legacy update if @legacy is set.
+
+    Returns:
+        2-tuple:
+
+            - (float) average Controller.update time (us)
+            - (float) average env.step time (us)
+    """
+    env.reset()
+    controller = env.robots[0].composite_controller.part_controllers["right"]
+    update = types.MethodType(legacy_update, controller) if legacy else controller.update
+    update_time = [0.0]
+
+    def timed_update(force=False):
+        start = time.perf_counter()
+        update(force=force)
+        update_time[0] += time.perf_counter() - start
+
+    controller.update = timed_update
+    action = np.zeros(env.action_dim)
+    for _ in range(10):
+        env.step(action)
+    update_time[0] = 0.0
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        env.step(action)
+    step_time = (time.perf_counter() - start) / num_steps
+    return update_time[0] / num_steps * 1e6, step_time * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, default="Lift")
+    parser.add_argument("--robots", type=str, default="Panda")
+    parser.add_argument("--steps", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = []
+    for legacy in (True, False):
+        env = suite.make(
+            args.env,
+            robots=args.robots,
+            has_renderer=False,
+            has_offscreen_renderer=False,
+            use_camera_obs=False,
+            ignore_done=True,
+            control_freq=500,
+        )
+        results.append(benchmark(env, args.steps, legacy=legacy))
+        env.close()
+    (legacy_update_time, legacy_step_time), (update_time, step_time) = results
+
+    print("{:>24} {:>12} {:>12}".format("", "update (us)", "step (us)"))
+    print("{:>24} {:>12.2f} {:>12.2f}".format("previous update", legacy_update_time, legacy_step_time))
+    print("{:>24} {:>12.2f} {:>12.2f}".format("preallocated workspace", update_time, step_time))
@@ -0,0 +1,156 @@
+"""
+Benchmarks demonstration collection with DataCollectionWrapper, for each of its storage backends:
+
+    - npz: writes a state_*.npz chunk every @flush_freq steps in a directory per episode, which are then gathered
+      into a single HDF5 file (as gather_demonstrations_as_hdf5 in collect_human_demonstrations.py does, but keeping
+      every episode since random actions rarely succeed). The gathering time is included in the reported throughput
+    - hdf5: streams every episode into a single HDF5 file (see HDF5DemoWriter), from a background writer thread
+
+For each, collection throughput (episodes / s and steps / s), the peak resident memory of the collecting process, and
+the size of the final HDF5 file are reported. Since peak memory is per process, each backend runs in a separate
+process, in a temporary directory. Note that once a process runs several threads (e.g.: the writer thread of the
+hdf5 backend), glibc serves allocations from other threads (such as MuJoCo's model compiler) from separate malloc
+arenas, which raises the peak memory of every episode reset by a constant amount. Run with MALLOC_ARENA_MAX=1 to
+compare the memory used by the backends themselves.
+
+Arguments:
+    --backends (str): Comma-separated list of backends to benchmark, among npz and hdf5
+    --env (str): Environment to collect demonstrations in
+    --robots (str): Robot to use in the environment
+    --episodes (int): Number of episodes to collect
+    --horizon (int): Number of (random action) steps per episode
+    --flush-freq (int): How often the npz backend writes a chunk to disk, in terms of environment steps
+    --store-obs: If set, the hdf5 backend also stores observations
+    --camera-obs: If set, observations include camera images (implies an offscreen renderer)
+    --model-cache-size (int): If > 0, enables the compiled model cache (see macros.MODEL_CACHE_SIZE). Every episode
+        resets from the model xml, so this avoids recompiling the same model once per episode
+    --backend (str): Internal, benchmarks this single backend in the current process
+
+Example:
+    $ python benchmark_data_collection.py --episodes 1000 --horizon 100 --model-cache-size 8
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from glob import glob
+
+
+def gather_npz(directory, hdf5_path):
+    """
+    Gathers all the episodes collected in @directory by the npz backend into @hdf5_path.
+    """
+    import h5py
+    import numpy as np
+
+    with h5py.File(hdf5_path, "w") as f:
+        grp = f.create_group("data")
+        for i, ep_directory in enumerate(sorted(glob(os.path.join(directory, "ep_*")))):
+            states, actions = [], []
+            for state_file in sorted(glob(os.path.join(ep_directory, "state_*.npz"))):
+                dic = np.load(state_file, allow_pickle=True)
+                states.extend(dic["states"])
+                actions.extend(ai["actions"] for ai in dic["action_infos"])
+            # The npz backend also records the state after the last action
+            del states[-1]
+            ep_data_grp = grp.create_group("demo_{}".format(i))
+            with open(os.path.join(ep_directory, "model.xml"), "r") as xml_file:
+                ep_data_grp.attrs["model_file"] = xml_file.read()
+            ep_data_grp.create_dataset("states", data=np.array(states))
+            ep_data_grp.create_dataset("actions", data=np.array(actions))
+
+
+def benchmark_backend(args, directory):
+    """
+    Collects @args.episodes episodes with the @args.backend backend in @directory, and prints one row of results.
+    """
+    import numpy as np
+
+    import robosuite as suite
+    import robosuite.macros as macros
+    from robosuite.wrappers import DataCollectionWrapper
+
+    macros.MODEL_CACHE_SIZE = args.model_cache_size
+    env = suite.make(
+        args.env,
+        robots=args.robots,
+        has_renderer=False,
+        has_offscreen_renderer=args.camera_obs,
+        use_camera_obs=args.camera_obs,
+        ignore_done=True,
+    )
+    env = DataCollectionWrapper(
+        env,
+        directory,
+        flush_freq=args.flush_freq,
+        backend=args.backend,
+        store_obs=args.store_obs and args.backend == "hdf5",
+    )
+    # Print the per-episode messages of the npz backend elsewhere
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+
+    start = time.perf_counter()
+    for _ in range(args.episodes):
+        env.reset()
+        for _ in range(args.horizon):
+            env.step(np.random.uniform(-1, 1, env.action_dim))
+    # Closing writes the last episode, and waits for the background writer of the hdf5 backend
+    env.close()
+    hdf5_path = os.path.join(directory, "demo.hdf5")
+    if args.backend == "npz":
+        gather_npz(directory, hdf5_path)
+    duration = time.perf_counter() - start
+
+    sys.stdout = stdout
+    # ru_maxrss is in KB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        "{:>8} {:>12.2f} {:>12.1f} {:>16.1f} {:>12.1f}".format(
+            args.backend,
+            args.episodes / duration,
+            args.episodes * args.horizon / duration,
+            peak_rss,
+            os.path.getsize(hdf5_path) / 1024**2,
+        ),
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", type=str, default="npz,hdf5")
+    parser.add_argument("--env", type=str, default="Lift")
+    parser.add_argument("--robots", type=str, default="Panda")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--horizon", type=int, default=100)
+    parser.add_argument("--flush-freq", type=int, default=100)
+    parser.add_argument("--store-obs", action="store_true")
+    parser.add_argument("--camera-obs", action="store_true")
+    parser.add_argument("--model-cache-size", type=int, default=0)
+    parser.add_argument("--backend", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.backend is not None:
+        with tempfile.TemporaryDirectory() as directory:
+            benchmark_backend(args, directory)
+    else:
+        print(
+            "{:>8} {:>12} {:>12} {:>16} {:>12}".format(
+                "backend", "episodes / s", "steps / s", "peak RSS (MB)", "file (MB)"
+            ),
+            flush=True,
+        )
+        for backend in args.backends.split(","):
+            result = subprocess.run(
+                [sys.executable, __file__, "--backend", backend] + sys.argv[1:],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            print(result.stdout, end="", flush=True)
+            if result.returncode != 0:
+                print("{:>8} failed: {}".format(backend, result.stderr.strip().splitlines()[-1]))
@@ -0,0 +1,200 @@
+"""
+Microbenchmark of dynamics randomization, comparing the array-backed DynamicsModder (one draw for all the randomized
+elements, and one assignment per MjModel array) with the per-element randomization it replaced (one mod() call per
+element and parameter, from dict-of-dicts defaults).
+
+For each environment, times DynamicsModder.randomize / restore_defaults, as well as DomainRandomizationWrapper.step
+with the dynamics being randomized at every step (randomize_every_n_steps=1), compared to stepping the unwrapped
+environment.
+
+Arguments:
+    --envs (str): Space-separated environments to benchmark
+    --robots (str): Robot to use in the environments
+    --calls (int): Number of calls to time for each function
+    --repeats (int): Number of (interleaved) timing runs, the fastest one is reported
+
+Example:
+    $ python benchmark_domain_randomization.py --envs Lift Stack --robots IIWA
+"""
+
+import argparse
+import copy
+import time
+import types
+
+import numpy as np
+
+import robosuite as suite
+from robosuite.wrappers import DomainRandomizationWrapper
+
+
+def legacy_save_defaults(modder):
+    """
+    Per-element snapshot of the default values, as before the array-backed DynamicsModder
+    """
+    model = modder.sim.model
+    modder.legacy_defaults = (
+        {None: {"density": model.opt.density, "viscosity": model.opt.viscosity}},
+        {},
+        {},
+        {},
+    )
+    for body_name in model.body_names:
+        body_id = model.body_name2id(body_name)
+        modder.legacy_defaults[1][body_name] = {
+            "position": np.array(model.body_pos[body_id]),
+            "quaternion": np.array(model.body_quat[body_id]),
+            "inertia": np.array(model.body_inertia[body_id]),
+            "mass": model.body_mass[body_id],
+        }
+    for geom_name in model.geom_names:
+        geom_id = model.geom_name2id(geom_name)
+        modder.legacy_defaults[2][geom_name] = {
+            "friction": np.array(model.geom_friction[geom_id]),
+            "solref": np.array(model.geom_solref[geom_id]),
+            "solimp": np.array(model.geom_solimp[geom_id]),
+        }
+    for joint_name in model.joint_names:
+        joint_id = model.joint_name2id(joint_name)
+        dof_idx = [i for i, v in enumerate(model.dof_jntid) if v == joint_id]
+        modder.legacy_defaults[3][joint_name] = {
+            "stiffness": model.jnt_stiffness[joint_id],
+            "frictionloss": np.array(model.dof_frictionloss[dof_idx]),
+            "damping": np.array(model.dof_damping[dof_idx]),
+            "armature": np.array(model.dof_armature[dof_idx]),
+        }
+
+
+def legacy_restore_defaults(modder):
+    """
+    Per-element restoration of the default values, as before the array-backed DynamicsModder
+    """
+    for group_defaults in modder.legacy_defaults:
+        for name, defaults in group_defaults.items():
+            for attr, default_val in defaults.items():
+                modder.mod(name=name, attr=attr, val=default_val)
+    modder.update()
+
+
+def legacy_randomize(modder):
+    """
+    Per-element randomization, as before the array-backed DynamicsModder
+    """
+    for group_defaults, group_randomizations, group_randomize_names in zip(
+        modder.legacy_defaults,
+        (
+            modder.opt_randomizations,
+            modder.body_randomizations,
+            modder.geom_randomizations,
+            modder.joint_randomizations,
+        ),
+        ([None], modder.body_names, modder.geom_names, modder.joint_names),
+    ):
+        for name in group_randomize_names:
+            for attr, default_val in group_defaults[name].items():
+                val = copy.copy(default_val)
+                settings = group_randomizations[attr]
+                if settings["randomize"]:
+                    perturbation = np.random.rand() if type(val) in {int, float} else np.random.rand(*val.shape)
+                    perturbation = settings["perturbation"] * (-1 + 2 * perturbation)
+                    val = val + perturbation if settings["type"] == "size" else val * (1.0 + perturbation)
+                    val = np.clip(val, *settings["clip"])
+                modder.mod(name=name, attr=attr, val=val)
+    modder.update()
+
+
+def use_legacy_modder(modder):
+    """
+    Replaces the array-backed functions of DynamicsModder @modder with the per-element ones
+    """
+    modder.save_defaults = types.MethodType(legacy_save_defaults, modder)
+    modder.restore_defaults = types.MethodType(legacy_restore_defaults, modder)
+    modder.randomize = types.MethodType(legacy_randomize, modder)
+    modder.save_defaults()
+
+
+def timeit(fn, num_calls):
+    """
+    Returns:
+        float: average time of a call to @fn (us)
+    """
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        fn()
+    return (time.perf_counter() - start) / num_calls * 1e6
+
+
+def benchmark(env, num_calls, legacy):
+    """
+    Times randomize() / restore_defaults() of the dynamics modder of DomainRandomizationWrapper @env, and a step of
+    the wrapper.
+
+    Returns:
+        3-tuple:
+
+            - (float) average time of randomize() (us)
+            - (float) average time of restore_defaults() (us)
+            - (float) average time of a step of the wrapper (us)
+    """
+    env.reset()
+    modder = env.dynamics_modder
+    if legacy:
+        use_legacy_modder(modder)
+    action = np.zeros(env.action_dim)
+    times = (
+        timeit(modder.randomize, num_calls),
+        timeit(modder.restore_defaults, num_calls),
+        timeit(lambda: env.step(action), num_calls),
+    )
+    # Fresh modder for the next run
+    env.modders.remove(modder)
+    env.dynamics_modder = type(modder)(sim=env.sim, random_state=env.random_state, **env.dynamics_randomization_args)
+    env.modders.append(env.dynamics_modder)
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--envs", type=str, nargs="+", default=["Lift", "Stack", "PickPlace"])
+    parser.add_argument("--robots", type=str, default="IIWA")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    row = "{:>12} {:>8} {:>10} {:>16} {:>16} {:>16} {:>16}"
+    print(row.format("env", "elements", "modder", "randomize (us)", "restore (us)", "wrapper (us)", "step (us)"))
+    for env_name in args.envs:
+        env = suite.make(
+            env_name,
+            robots=args.robots,
+            has_renderer=False,
+            has_offscreen_renderer=False,
+            use_camera_obs=False,
+            ignore_done=True,
+        )
+        env.reset()
+        action = np.zeros(env.action_dim)
+        step = min(timeit(lambda: env.step(action), args.calls) for _ in range(args.repeats))
+        model = env.sim.model
+        num_elements = model.nbody + model.ngeom + model.njnt
+
+        env = DomainRandomizationWrapper(
+            env,
+            seed=0,
+            randomize_color=False,
+            randomize_camera=False,
+            randomize_lighting=False,
+            randomize_dynamics=True,
+            randomize_every_n_steps=1,
+        )
+        results = {False: [], True: []}
+        for _ in range(args.repeats):
+            for legacy in (True, False):
+                results[legacy].append(benchmark(env, args.calls, legacy))
+        env.close()
+
+        for legacy in (True, False):
+            randomize, restore, wrapper = np.min(results[legacy], axis=0)
+            name = "legacy" if legacy else "array"
+            times = ["{:.1f}".format(t) for t in (randomize, restore, wrapper, step)]
+            print(row.format(env_name, num_elements, name, *times))
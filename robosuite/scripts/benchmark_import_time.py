@@ -0,0 +1,130 @@
+"""
+Benchmark of the time it takes to import robosuite, measured with `python -X importtime` in fresh interpreters,
+comparing the lazy import of robosuite (environments, controllers, robots, grippers and optional integrations only
+imported when first used, numba only imported when a jitted function is first called) with importing everything
+up front, as `import robosuite` used to.
+
+Reports the cumulative import time of each setup, as well as the modules taking the longest to import with the lazy
+import, and the time of the first make() call (which imports the modules the environment needs).
+
+Arguments:
+    --runs (int): Number of fresh interpreters to time for each setup, the fastest one is reported
+    --top (int): Number of slowest modules to list
+    --env (str): Environment to make
+    --robots (str): Robot to use in the environment
+
+Example:
+    $ python benchmark_import_time.py --runs 5 --top 15
+"""
+
+import argparse
+import subprocess
+import sys
+
+import numpy as np
+
+# Imports done by `import robosuite` before the lazy registries
+EAGER_IMPORTS = """
+import robosuite
+import robosuite.controllers, robosuite.robots, robosuite.models.grippers
+import numba, scipy.signal
+robosuite.environments.REGISTERED_ENVS.values()
+try:
+    import robosuite_models
+except ImportError:
+    pass
+try:
+    import robosuite.examples.third_party_controller.mink_controller
+except ImportError:
+    pass
+"""
+
+MAKE = """
+import time
+import robosuite
+start = time.perf_counter()
+robosuite.make("{env}", robots="{robots}", has_renderer=False, has_offscreen_renderer=False, use_camera_obs=False)
+print(time.perf_counter() - start)
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Parses the output of `python -X importtime`.
+
+    Args:
+        stderr (str): Standard error of the interpreter
+
+    Returns:
+        list: One 4-tuple per imported module, in import order:
+
+            - (str) name of the module
+            - (float) self import time (ms)
+            - (float) cumulative import time, including the modules it imports (ms)
+            - (int) nesting level of the import (0 for top-level imports)
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        imports.append((module.strip(), int(self_us) / 1e3, int(cumulative_us) / 1e3, depth))
+    return imports
+
+
+def run(code, importtime=False):
+    """
+    Runs @code in a fresh interpreter.
+
+    Args:
+        code (str): Code to run
+        importtime (bool): If True, runs the interpreter with `-X importtime`
+
+    Returns:
+        subprocess.CompletedProcess: completed interpreter, with its standard output and error
+    """
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(cmd, capture_output=True, text=True, check=True)
+
+
+def import_time(code):
+    """
+    Returns:
+        2-tuple:
+
+            - (float) total time of the imports of @code (ms)
+            - (list) imported modules, see @parse_importtime
+    """
+    imports = parse_importtime(run(code, importtime=True).stderr)
+    return sum(cumulative for _, _, cumulative, depth in imports if depth == 0), imports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--env", type=str, default="Lift")
+    parser.add_argument("--robots", type=str, default="IIWA")
+    args = parser.parse_args()
+
+    results = {"eager": [], "lazy": []}
+    make_times = []
+    for _ in range(args.runs):
+        results["eager"].append(import_time(EAGER_IMPORTS))
+        results["lazy"].append(import_time("import robosuite"))
+        make_times.append(float(run(MAKE.format(env=args.env, robots=args.robots)).stdout.split()[-1]) * 1e3)
+
+    row = "{:>8} {:>18} {:>10}"
+    print(row.format("import", "import time (ms)", "modules"))
+    for name, name_results in results.items():
+        total, imports = min(name_results, key=lambda result: result[0])
+        print(row.format(name, "{:.1f}".format(total), len(imports)))
+    print("first make() of {} (ms): {:.1f}".format(args.env, np.min(make_times)))
+
+    _, imports = min(results["lazy"], key=lambda result: result[0])
+    row = "{:>48} {:>10} {:>16}"
+    print("\nslowest imports of robosuite:")
+    print(row.format("module", "self (ms)", "cumulative (ms)"))
+    for module, self_time, cumulative, _ in sorted(imports, key=lambda i: -i[2])[: args.top]:
+        print(row.format(module, "{:.1f}".format(self_time), "{:.1f}".format(cumulative)))
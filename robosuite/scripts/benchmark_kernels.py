@@ -0,0 +1,272 @@
+"""
+Microbenchmark of the per-call latency of the transform / control kernels (robosuite/utils/kernels.py), compared with
+the implementations they replaced (pure NumPy functions, or numba functions compiled on their first call).
+
+For each function, reports the latency of:
+    - legacy: the previous implementation
+    - public: the transform_utils / control_utils function with macros.USE_FAST_KERNELS set, which converts its inputs
+        and calls the kernel
+    - kernel: the compiled kernel
+    - numpy: the pure NumPy kernel, used when numba is disabled
+
+For each batched kernel, reports the latency per element of a Python loop over the public function, of the compiled
+batched kernel and of the pure NumPy batched kernel.
+
+Arguments:
+    --calls (int): Number of calls to time for each function
+    --batch-size (int): Number of elements of the batches
+    --repeats (int): Number of (interleaved) timing runs, the fastest one is reported
+
+Example:
+    $ python benchmark_kernels.py --calls 10000 --batch-size 1000
+"""
+
+import argparse
+import math
+import time
+
+import numba
+import numpy as np
+
+import robosuite.macros as macros
+import robosuite.utils.control_utils as C
+import robosuite.utils.kernels as kernels
+import robosuite.utils.transform_utils as T
+
+
+@numba.njit
+def legacy_mat2quat(rmat):
+    """
+    Eigen decomposition based conversion, as before the kernels
+    """
+    M = np.asarray(rmat).astype(np.float32)[:3, :3]
+    m00, m01, m02 = M[0, 0], M[0, 1], M[0, 2]
+    m10, m11, m12 = M[1, 0], M[1, 1], M[1, 2]
+    m20, m21, m22 = M[2, 0], M[2, 1], M[2, 2]
+    K = np.array(
+        [
+            [m00 - m11 - m22, np.float32(0.0), np.float32(0.0), np.float32(0.0)],
+            [m01 + m10, m11 - m00 - m22, np.float32(0.0), np.float32(0.0)],
+            [m02 + m20, m12 + m21, m22 - m00 - m11, np.float32(0.0)],
+            [m21 - m12, m02 - m20, m10 - m01, m00 + m11 + m22],
+        ]
+    )
+    K /= 3.0
+    w, V = np.linalg.eigh(K)
+    inds = np.array([3, 0, 1, 2])
+    q1 = V[inds, np.argmax(w)]
+    if q1[0] < 0.0:
+        np.negative(q1, q1)
+    inds = np.array([1, 2, 3, 0])
+    return q1[inds]
+
+
+@numba.njit
+def legacy_quat2mat(quaternion):
+    """
+    Single precision conversion, as before the kernels
+    """
+    inds = np.array([3, 0, 1, 2])
+    q = np.asarray(quaternion).copy().astype(np.float32)[inds]
+    n = np.dot(q, q)
+    if n < T.EPS:
+        return np.identity(3)
+    q *= math.sqrt(2.0 / n)
+    q2 = np.outer(q, q)
+    return np.array(
+        [
+            [1.0 - q2[2, 2] - q2[3, 3], q2[1, 2] - q2[3, 0], q2[1, 3] + q2[2, 0]],
+            [q2[1, 2] + q2[3, 0], 1.0 - q2[1, 1] - q2[3, 3], q2[2, 3] - q2[1, 0]],
+            [q2[1, 3] - q2[2, 0], q2[2, 3] + q2[1, 0], 1.0 - q2[1, 1] - q2[2, 2]],
+        ]
+    )
+
+
+def legacy_quat_multiply(quaternion1, quaternion0):
+    x0, y0, z0, w0 = quaternion0
+    x1, y1, z1, w1 = quaternion1
+    return np.array(
+        (
+            x1 * w0 + y1 * z0 - z1 * y0 + w1 * x0,
+            -x1 * z0 + y1 * w0 + z1 * x0 + w1 * y0,
+            x1 * y0 - y1 * x0 + z1 * w0 + w1 * z0,
+            -x1 * x0 - y1 * y0 - z1 * z0 + w1 * w0,
+        ),
+        dtype=np.float32,
+    )
+
+
+def legacy_pose_inv(pose):
+    pose_inv = np.zeros((4, 4))
+    pose_inv[:3, :3] = pose[:3, :3].T
+    pose_inv[:3, 3] = -pose_inv[:3, :3].dot(pose[:3, 3])
+    pose_inv[3, 3] = 1.0
+    return pose_inv
+
+
+def legacy_force_in_A_to_force_in_B(force_A, torque_A, pose_A_in_B):
+    rot_A_in_B = pose_A_in_B[:3, :3]
+    skew_symm = T._skew_symmetric_translation(pose_A_in_B[:3, 3])
+    force_B = rot_A_in_B.T.dot(force_A)
+    torque_B = -rot_A_in_B.T.dot(skew_symm.dot(force_A)) + rot_A_in_B.T.dot(torque_A)
+    return force_B, torque_B
+
+
+def legacy_quaternions_orientation_error(target_orn, current_orn):
+    ne = current_orn[3] * target_orn[3] + np.dot(current_orn[:3], target_orn[:3])
+    ee = (
+        current_orn[3] * target_orn[:3]
+        - target_orn[3] * current_orn[:3]
+        + np.dot(T.skew(current_orn[:3]), target_orn[:3])
+    )
+    ee *= np.sign(ne)
+    return ee
+
+
+def legacy_rotate_vector_by_quaternion(vector, quaternion):
+    q = quaternion / np.linalg.norm(quaternion)
+    q_x, q_y, q_z, q_w = q
+    v_x, v_y, v_z = vector
+    temp_w = -q_x * v_x - q_y * v_y - q_z * v_z
+    temp_x = q_w * v_x + q_y * v_z - q_z * v_y
+    temp_y = q_w * v_y - q_x * v_z + q_z * v_x
+    temp_z = q_w * v_z + q_x * v_y - q_y * v_x
+    result_x = temp_w * (-q_x) + temp_y * (-q_z) - temp_z * (-q_y) + temp_x * q_w
+    result_y = temp_w * (-q_y) - temp_x * (-q_z) + temp_z * (-q_x) + temp_y * q_w
+    result_z = temp_w * (-q_z) + temp_x * (-q_y) - temp_y * (-q_x) + temp_z * q_w
+    return np.array([result_x, result_y, result_z])
+
+
+# The control kernels are unchanged numba functions, previously compiled on their first call
+LEGACY = {
+    "mat2quat": legacy_mat2quat,
+    "quat2mat": legacy_quat2mat,
+    "quat_multiply": legacy_quat_multiply,
+    "pose_inv": legacy_pose_inv,
+    "force_in_A_to_force_in_B": legacy_force_in_A_to_force_in_B,
+    "quaternions_orientation_error": legacy_quaternions_orientation_error,
+    "rotate_vector_by_quaternion": legacy_rotate_vector_by_quaternion,
+    "orientation_error": numba.njit(kernels.NUMPY_KERNELS["orientation_error"]),
+    "opspace_matrices": numba.njit(kernels.NUMPY_KERNELS["opspace_matrices"]),
+    "nullspace_torques": numba.njit(kernels.NUMPY_KERNELS["nullspace_torques"]),
+}
+
+PUBLIC = {
+    "mat2quat": T.mat2quat,
+    "quat2mat": T.quat2mat,
+    "quat_multiply": T.quat_multiply,
+    "pose_inv": T.pose_inv,
+    "force_in_A_to_force_in_B": T.force_in_A_to_force_in_B,
+    "quaternions_orientation_error": T.quaternions_orientation_error,
+    "rotate_vector_by_quaternion": T.rotate_vector_by_quaternion,
+    "orientation_error": C.orientation_error,
+    "opspace_matrices": C.opspace_matrices,
+    "nullspace_torques": C.nullspace_torques,
+}
+
+# Batched kernels and their single-element public function
+BATCHED = {
+    "mats2quats": T.mat2quat,
+    "quats2mats": T.quat2mat,
+    "quats_multiply": T.quat_multiply,
+    "poses_inv": T.pose_inv,
+    "quaternions_orientation_errors": T.quaternions_orientation_error,
+    "rotate_vectors_by_quaternions": T.rotate_vector_by_quaternion,
+    "orientation_errors": C.orientation_error,
+}
+
+
+def make_args(rng, batch_size):
+    """
+    Returns:
+        2-tuple:
+
+            - (dict) arguments of each single-element function
+            - (dict) arguments of each batched kernel
+    """
+    quats = rng.normal(size=(batch_size, 4))
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    mats = kernels.quats2mats(quats)
+    vectors = rng.normal(size=(batch_size, 3))
+    poses = np.zeros((batch_size, 4, 4))
+    poses[:, :3, :3], poses[:, :3, 3], poses[:, 3, 3] = mats, vectors, 1.0
+    # 7-dof arm
+    jacobian = rng.normal(size=(6, 7))
+    mass_matrix = np.eye(7) + 0.1 * np.ones((7, 7))
+    args = {
+        "mat2quat": (mats[0],),
+        "quat2mat": (quats[0],),
+        "quat_multiply": (quats[0], quats[1]),
+        "pose_inv": (poses[0],),
+        "force_in_A_to_force_in_B": (vectors[0], vectors[1], poses[0]),
+        "quaternions_orientation_error": (quats[0], quats[1]),
+        "rotate_vector_by_quaternion": (vectors[0], quats[0]),
+        "orientation_error": (mats[0], mats[1]),
+        "opspace_matrices": (mass_matrix, jacobian, jacobian[:3].copy(), jacobian[3:].copy()),
+        "nullspace_torques": (mass_matrix, np.eye(7), np.zeros(7), rng.normal(size=7), rng.normal(size=7), 10.0),
+    }
+    shuffled = rng.permutation(batch_size)
+    batched_args = {
+        "mats2quats": (mats,),
+        "quats2mats": (quats,),
+        "quats_multiply": (quats, quats[shuffled]),
+        "poses_inv": (poses,),
+        "quaternions_orientation_errors": (quats, quats[shuffled]),
+        "rotate_vectors_by_quaternions": (vectors, quats),
+        "orientation_errors": (mats, mats[shuffled]),
+    }
+    return args, batched_args
+
+
+def timeit(fn, args, num_calls):
+    """
+    Returns:
+        float: average time of a call to @fn with arguments @args (us)
+    """
+    fn(*args)
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        fn(*args)
+    return (time.perf_counter() - start) / num_calls * 1e6
+
+
+def loop(fn):
+    """
+    Returns:
+        function: calls @fn on each element of its batched arguments
+    """
+    return lambda *args: [fn(*element_args) for element_args in zip(*args)]
+
+
+if __name__ == "__main__":
+    # The public functions only delegate to the kernels when opted in
+    macros.USE_FAST_KERNELS = True
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    single_args, batched_args = make_args(np.random.default_rng(0), args.batch_size)
+    batch_calls = max(1, args.calls // args.batch_size)
+
+    results = {name: [] for name in list(PUBLIC) + list(BATCHED)}
+    for _ in range(args.repeats):
+        for name, fn_args in single_args.items():
+            implementations = (LEGACY[name], PUBLIC[name], getattr(kernels, name), kernels.NUMPY_KERNELS[name])
+            results[name].append([timeit(fn, fn_args, args.calls) for fn in implementations])
+        for name, fn_args in batched_args.items():
+            implementations = (loop(BATCHED[name]), getattr(kernels, name), kernels.NUMPY_KERNELS[name])
+            results[name].append([timeit(fn, fn_args, batch_calls) / args.batch_size for fn in implementations])
+
+    row = "{:>32} {:>12} {:>12} {:>12} {:>12}"
+    print(row.format("function", "legacy (us)", "public (us)", "kernel (us)", "numpy (us)"))
+    for name in PUBLIC:
+        print(row.format(name, *["{:.2f}".format(t) for t in np.min(results[name], axis=0)]))
+
+    row = "{:>32} {:>12} {:>12} {:>12}"
+    print("\nbatches of {} elements, per element:".format(args.batch_size))
+    print(row.format("kernel", "loop (us)", "kernel (us)", "numpy (us)"))
+    for name in BATCHED:
+        print(row.format(name, *["{:.3f}".format(t) for t in np.min(results[name], axis=0)]))
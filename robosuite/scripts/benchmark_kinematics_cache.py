@@ -0,0 +1,129 @@
+"""
+Benchmarks the per-substep control overhead (Robot.control, i.e.: updating and running all the part controllers) with
+and without the KinematicsCache shared by the part controllers of a robot.
+
+The cache pays off whenever several consumers query the same substep: multiple arm controllers of a bimanual /
+whole-body robot (shared mass matrix, and a single sim.forward() when lite_physics is disabled), controllers wrapping
+an inner controller (e.g.: COMPLIANCE, which shares its jacobians and mass matrix with its inner OSC), and robot
+properties such as ee_force / ee_torque and _hand_pose.
+
+Arguments:
+    --env (str): Environment to benchmark
+    --robots (str): Comma-separated robot(s) to use in the environment
+    --env-configuration (str): Environment configuration (e.g.: "single-robot" for bimanual / whole-body robots)
+    --controller (str): Arm controller, "default" for the robot's default controller or "COMPLIANCE"
+    --no-lite-physics: Forward the simulation in every controller update (lite_physics=False)
+    --steps (int): Number of environment steps to time for each configuration
+    --repeats (int): Number of (interleaved) timing runs per configuration, the fastest one is reported
+
+Example:
+    $ python benchmark_kinematics_cache.py --env TwoArmOSX --robots Baxter --env-configuration single-robot
+"""
+
+import argparse
+import time
+from copy import deepcopy
+
+import numpy as np
+
+import robosuite as suite
+from robosuite.controllers import load_composite_controller_config
+
+
+def controller_config(robot, controller, lite_physics):
+    config = load_composite_controller_config(robot=robot)
+    for part_name, part_config in config["body_parts"].items():
+        if part_name not in ("right", "left"):
+            continue
+        if controller == "COMPLIANCE":
+            inner = deepcopy(part_config)
+            gripper = inner.pop("gripper", None)
+            part_config.clear()
+            part_config.update(
+                type="COMPLIANCE",
+                inner_controller_config=inner,
+                input_max=1,
+                input_min=-1,
+                output_max=0.05,
+                output_min=-0.05,
+                interpolation=None,
+            )
+            if gripper is not None:
+                part_config["gripper"] = gripper
+        part_config["lite_physics"] = lite_physics
+    return config
+
+
+def benchmark(env, num_steps, use_cache):
+    """
+    Steps @env with zero actions, with or without the kinematics cache (@use_cache).
+
+    Returns:
+        2-tuple:
+
+            - (float) average Robot.control time per substep (us)
+            - (float) average env.step time (ms)
+    """
+    env.reset()
+    control_time = [0.0]
+    num_calls = [0]
+    for robot in env.robots:
+        if not use_cache:
+            robot.composite_controller.kinematics_cache = None
+            for controller in robot.part_controllers.values():
+                if hasattr(controller, "set_kinematics_cache"):
+                    controller.set_kinematics_cache(None)
+
+        def timed_control(action, policy_step=False, control=robot.control):
+            start = time.perf_counter()
+            control(action, policy_step=policy_step)
+            control_time[0] += time.perf_counter() - start
+            num_calls[0] += 1
+
+        robot.control = timed_control
+
+    action = np.zeros(env.action_dim)
+    for _ in range(5):
+        env.step(action)
+    control_time[0], num_calls[0] = 0.0, 0
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        env.step(action)
+    step_time = (time.perf_counter() - start) / num_steps
+    return control_time[0] / num_calls[0] * 1e6, step_time * 1e3
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, default="TwoArmOSX")
+    parser.add_argument("--robots", type=str, default="Baxter")
+    parser.add_argument("--env-configuration", type=str, default="default")
+    parser.add_argument("--controller", type=str, default="default", choices=["default", "COMPLIANCE"])
+    parser.add_argument("--no-lite-physics", action="store_true")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    robots = args.robots.split(",")
+    results = {False: [], True: []}
+    for _ in range(args.repeats):
+        for use_cache in (False, True):
+            env = suite.make(
+                args.env,
+                robots=robots,
+                env_configuration=args.env_configuration,
+                controller_configs=[
+                    controller_config(robot, args.controller, not args.no_lite_physics) for robot in robots
+                ],
+                has_renderer=False,
+                has_offscreen_renderer=False,
+                use_camera_obs=False,
+                ignore_done=True,
+            )
+            results[use_cache].append(benchmark(env, args.steps, use_cache))
+            env.close()
+    (control, step), (cached_control, cached_step) = (np.min(results[False], axis=0), np.min(results[True], axis=0))
+
+    print("{:>20} {:>22} {:>12}".format("", "control (us/substep)", "step (ms)"))
+    print("{:>20} {:>22.1f} {:>12.3f}".format("no cache", control, step))
+    print("{:>20} {:>22.1f} {:>12.3f}".format("kinematics cache", cached_control, cached_step))
@@ -0,0 +1,131 @@
+"""
+Benchmarks the environment step time with proprioceptive-only observations, comparing the ObservableScheduler
+(observables are only evaluated on the substeps where they sample, inactive observables are evaluated lazily) against
+updating every observable after every simulation substep.
+
+Arguments:
+    --envs (str): Comma-separated list of environments to benchmark
+    --robots (str): Robot to use in the environments
+    --steps (int): Number of environment steps to time for each configuration
+
+Example:
+    $ python benchmark_observables.py --envs Lift,OSXGrind --robots UR5e --steps 500
+"""
+
+import argparse
+import time
+from copy import deepcopy
+
+import numpy as np
+
+import robosuite as suite
+from robosuite.controllers import load_composite_controller_config
+
+
+def update_all_observables(env, force=False):
+    """
+    Reference implementation of MujocoEnv._update_observables without scheduling: every observable is updated after
+    every substep, and every due sensor is evaluated eagerly.
+    """
+    for observable in env._observables.values():
+        observable.update(timestep=env.model_timestep, obs_cache=env._obs_cache, force=force)
+
+
+def grind_kwargs(robot):
+    """
+    OSXGrind needs a reference trajectory and a compliance controller.
+    """
+    radius, height, num_waypoints = 0.01, 0.83, 100
+    angles = np.linspace(0, 2 * np.pi, num_waypoints)
+    trajectory = np.zeros((num_waypoints, 7))
+    trajectory[:, 0] = radius * np.sin(angles)
+    trajectory[:, 1] = radius * np.cos(angles)
+    trajectory[:, 2] = height
+    trajectory[:, 3:] = [0, 1, 0, 0]
+
+    controller_config = load_composite_controller_config(robot=robot)
+    arm = controller_config["body_parts"]["right"]
+    inner = deepcopy(arm)
+    inner.pop("gripper", None)
+    controller_config["body_parts"]["right"] = {
+        "type": "COMPLIANCE",
+        "inner_controller_config": inner,
+        "input_max": 1,
+        "input_min": -1,
+        "output_max": 0.05,
+        "output_min": -0.05,
+        "interpolation": None,
+        "gripper": {"type": "GRIP"},
+    }
+    return {
+        "reference_trajectory": trajectory,
+        "reference_force": np.tile([0, 0, 5.0, 0, 0, 0], (num_waypoints, 1)),
+        "controller_configs": controller_config,
+    }
+
+
+def benchmark(env, num_steps, scheduled):
+    """
+    Steps @env using the scheduler (@scheduled) or eagerly updating all observables.
+
+    Returns:
+        2-tuple:
+
+            - (float) average env.step time (ms)
+            - (float) average time spent updating observables per env.step (us)
+    """
+    update = env._update_observables if scheduled else lambda force=False: update_all_observables(env, force=force)
+    observables_time = [0.0]
+
+    def timed_update(force=False):
+        start = time.perf_counter()
+        update(force=force)
+        observables_time[0] += time.perf_counter() - start
+
+    env._update_observables = timed_update
+    env.reset()
+    action = np.zeros(env.action_dim)
+    # Warm up (first steps include lazy allocations / numba compilation)
+    for _ in range(5):
+        env.step(action)
+    observables_time[0] = 0.0
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        env.step(action)
+    step_time = (time.perf_counter() - start) / num_steps
+    return step_time * 1e3, observables_time[0] / num_steps * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--envs", type=str, default="Lift,OSXGrind")
+    parser.add_argument("--robots", type=str, default="UR5e")
+    parser.add_argument("--steps", type=int, default=500)
+    args = parser.parse_args()
+
+    print("{:>10} {:>12} {:>12} {:>14} {:>14}".format("env", "step (ms)", "", "observables (us/step)", ""))
+    print("{:>10} {:>12} {:>12} {:>14} {:>14}".format("", "eager", "scheduled", "eager", "scheduled"))
+    for env_name in args.envs.split(","):
+        env_kwargs = {
+            "robots": args.robots,
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "use_camera_obs": False,
+            "ignore_done": True,
+        }
+        if env_name == "OSXGrind":
+            env_kwargs.update(grind_kwargs(args.robots))
+        else:
+            env_kwargs["use_object_obs"] = False
+
+        results = []
+        for scheduled in (False, True):
+            env = suite.make(env_name, **env_kwargs)
+            results.append(benchmark(env, args.steps, scheduled))
+            env.close()
+        (eager_step, eager_obs), (sched_step, sched_obs) = results
+        print(
+            "{:>10} {:>12.3f} {:>12.3f} {:>14.1f} {:>14.1f}".format(
+                env_name, eager_step, sched_step, eager_obs, sched_obs
+            )
+        )
@@ -0,0 +1,110 @@
+"""
+Benchmarks offscreen rendering throughput (frames / s) against the number of render threads, for each of the given
+OpenGL backends (see robosuite/renderers/context). Every frame is one camera of one of the environments, rendered
+either one by one with each simulation's own render context (0 threads), or in batches with an MjRenderPool (each
+worker thread renders with its own context per simulation).
+
+Since the backend is selected when robosuite is imported (through the MUJOCO_GL environment variable), each backend
+is benchmarked in a separate process.
+
+Arguments:
+    --backends (str): Comma-separated list of backends to benchmark, among egl and osmesa
+    --threads (str): Comma-separated list of render thread counts, 0 renders serially without a pool
+    --envs (int): Number of environments to render
+    --cameras (str): Comma-separated list of cameras to render in each environment
+    --size (int): Width and height of the rendered images
+    --batches (int): Number of (timed) batches of all the cameras of all the environments
+    --backend (str): Internal, benchmarks this single backend in the current process
+
+Example:
+    $ python benchmark_render.py --backends egl,osmesa --threads 0,1,2,4,8 --envs 4 --size 256
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+def benchmark_backend(args):
+    """
+    Benchmarks the backend selected by MUJOCO_GL in this process, and prints one row of frames / s per thread count.
+    """
+    import numpy as np
+
+    import robosuite as suite
+    from robosuite.utils.binding_utils import MjRenderPool, RenderRequest
+
+    envs = []
+    for seed in range(args.envs):
+        np.random.seed(seed)
+        env = suite.make(
+            "Lift",
+            robots=args.robots,
+            has_renderer=False,
+            has_offscreen_renderer=True,
+            use_camera_obs=False,
+        )
+        env.reset()
+        envs.append(env)
+    requests = [
+        RenderRequest(env.sim, camera_name, args.size, args.size)
+        for env in envs
+        for camera_name in args.cameras.split(",")
+    ]
+
+    for num_threads in [int(n) for n in args.threads.split(",")]:
+        if num_threads == 0:
+            pool = None
+
+            def render_batch():
+                for request in requests:
+                    request.sim.render_images(request.width, request.height, camera_name=request.camera_name)
+
+        else:
+            pool = MjRenderPool(num_threads=num_threads)
+            render_batch = lambda: pool.render(requests)  # noqa: E731
+
+        # Warm up (e.g.: the pool's worker threads create their render contexts)
+        render_batch()
+        start = time.perf_counter()
+        for _ in range(args.batches):
+            render_batch()
+        fps = args.batches * len(requests) / (time.perf_counter() - start)
+        print("{:>10} {:>10} {:>12.1f}".format(os.environ["MUJOCO_GL"], num_threads, fps), flush=True)
+        if pool is not None:
+            pool.close()
+
+    for env in envs:
+        env.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", type=str, default="egl,osmesa")
+    parser.add_argument("--threads", type=str, default="0,1,2,4,8")
+    parser.add_argument("--envs", type=int, default=4)
+    parser.add_argument("--robots", type=str, default="Panda")
+    parser.add_argument("--cameras", type=str, default="agentview,frontview,robot0_eye_in_hand")
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--backend", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.backend is not None:
+        benchmark_backend(args)
+    else:
+        print("{:>10} {:>10} {:>12}".format("backend", "threads", "frames / s"), flush=True)
+        for backend in args.backends.split(","):
+            env = dict(os.environ, MUJOCO_GL=backend, PYOPENGL_PLATFORM=backend)
+            result = subprocess.run(
+                [sys.executable, __file__, "--backend", backend] + sys.argv[1:],
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            print(result.stdout, end="", flush=True)
+            if result.returncode != 0:
+                print("{:>10} failed: {}".format(backend, result.stderr.strip().splitlines()[-1]))
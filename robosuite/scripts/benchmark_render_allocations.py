@@ -0,0 +1,142 @@
+"""
+Benchmarks the memory allocated while rendering camera frames, measured with tracemalloc (which traces NumPy array
+allocations). For every frame, the rgb image, depth map and segmentation of a camera are rendered and flipped to the
+opencv convention:
+
+    - reference: reads pixels into new arrays, decodes the segmentation with temporary arrays and a Python loop over
+      the scene geoms, and flips the images with copies (read_pixels before output buffers were supported)
+    - buffers: renders with MjSim.render_images into preallocated per-camera buffers, through row-reversed views
+
+For each, the peak memory traced while rendering a frame is reported (above what was allocated before the frame), as
+well as the memory still allocated after all frames.
+
+Arguments:
+    --robots (str): Robot to use in the environment
+    --cameras (str): Comma-separated list of cameras to render
+    --size (int): Width and height of the rendered images
+    --frames (int): Number of (traced) frames per camera
+
+Example:
+    $ python benchmark_render_allocations.py --cameras agentview,frontview,robot0_eye_in_hand --size 256
+"""
+
+import argparse
+import tracemalloc
+
+import mujoco
+import numpy as np
+
+import robosuite as suite
+
+
+def reference_read_pixels(render_context, width, height, depth=False, segmentation=False):
+    """
+    Reference implementation of MjRenderContext.read_pixels without output buffers.
+    """
+    viewport = mujoco.MjrRect(0, 0, width, height)
+    rgb_img = np.empty((height, width, 3), dtype=np.uint8)
+    depth_img = np.empty((height, width), dtype=np.float32) if depth else None
+
+    mujoco.mjr_readPixels(rgb=rgb_img, depth=depth_img, viewport=viewport, con=render_context.con)
+
+    ret_img = rgb_img
+    if segmentation:
+        uint32_rgb_img = rgb_img.astype(np.int32)
+        seg_img = uint32_rgb_img[:, :, 0] + uint32_rgb_img[:, :, 1] * (2**8) + uint32_rgb_img[:, :, 2] * (2**16)
+        seg_img[seg_img >= (render_context.scn.ngeom + 1)] = 0
+        seg_ids = np.full((render_context.scn.ngeom + 1, 2), fill_value=-1, dtype=np.int32)
+
+        for i in range(render_context.scn.ngeom):
+            geom = render_context.scn.geoms[i]
+            if geom.segid != -1:
+                seg_ids[geom.segid + 1, 0] = geom.objtype
+                seg_ids[geom.segid + 1, 1] = geom.objid
+        ret_img = seg_ids[seg_img]
+
+    if depth:
+        return (ret_img, depth_img)
+    else:
+        return ret_img
+
+
+def render_reference(sim, camera_name, size, buffers):
+    camera_id = sim.model.camera_name2id(camera_name)
+    with sim._render_context_offscreen.current() as render_context:
+        render_context.update_scene(size, size, camera_id=camera_id)
+        render_context.render_scene(size, size)
+        rgb, depth = reference_read_pixels(render_context, size, size, depth=True)
+        render_context.render_scene(size, size, segmentation=True)
+        seg = reference_read_pixels(render_context, size, size, segmentation=True)
+    return np.ascontiguousarray(rgb[::-1]), np.ascontiguousarray(depth[::-1]), np.ascontiguousarray(seg[::-1])
+
+
+def render_buffers(sim, camera_name, size, buffers):
+    rgb, depth, seg = buffers
+    sim.render_images(
+        size,
+        size,
+        camera_name=camera_name,
+        depth=True,
+        segmentation=True,
+        rgb_out=rgb[::-1],
+        depth_out=depth[::-1],
+        seg_out=seg[::-1],
+    )
+    return rgb, depth, seg
+
+
+def benchmark(render, sim, camera_names, size, num_frames):
+    """
+    Returns:
+        2-tuple: mean peak KB traced per frame, and KB still traced after all the frames
+    """
+    buffers = {
+        camera_name: (
+            np.empty((size, size, 3), dtype=np.uint8),
+            np.empty((size, size), dtype=np.float32),
+            np.empty((size, size, 2), dtype=np.int32),
+        )
+        for camera_name in camera_names
+    }
+    # Warm up (e.g.: scratch buffers are allocated on first use)
+    for camera_name in camera_names:
+        render(sim, camera_name, size, buffers[camera_name])
+
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    for _ in range(num_frames):
+        for camera_name in camera_names:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            images = render(sim, camera_name, size, buffers[camera_name])
+            del images
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.mean(peaks) / 1024, (end - start) / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--robots", type=str, default="Panda")
+    parser.add_argument("--cameras", type=str, default="agentview,frontview,robot0_eye_in_hand")
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    env = suite.make(
+        "Lift",
+        robots=args.robots,
+        has_renderer=False,
+        has_offscreen_renderer=True,
+        use_camera_obs=False,
+    )
+    env.reset()
+    camera_names = args.cameras.split(",")
+
+    print("{:>10} {:>18} {:>18}".format("", "peak KB / frame", "retained KB"))
+    for name, render in (("reference", render_reference), ("buffers", render_buffers)):
+        peak, retained = benchmark(render, env.sim, camera_names, args.size, args.frames)
+        print("{:>10} {:>18.1f} {:>18.1f}".format(name, peak, retained))
+    env.close()
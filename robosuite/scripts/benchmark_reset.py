@@ -0,0 +1,117 @@
+"""
+Benchmarks environment resets per second across the manipulation suite for the three reset modes:
+
+    - hard: re-loads the model and recompiles the simulation on every reset (hard_reset=True)
+    - soft: only calls sim.reset and resets all robosuite-internal variables (hard_reset=False)
+    - snapshot: compiles the model once, and restores the state captured after the first reset before re-running the
+      per-episode randomization (hard_reset="snapshot")
+
+Two-arm environments are run with two copies of @robots, in their default configuration.
+
+Arguments:
+    --envs (str): Comma-separated list of environments to benchmark
+    --robots (str): Robot to use in the environments
+    --resets (int): Number of (timed) resets per soft / snapshot run
+    --hard-resets (int): Number of (timed) resets per hard run, since these are orders of magnitude slower
+    --repeats (int): Number of (interleaved) timing runs per configuration, the fastest one is reported
+    --model-cache-size (int): If > 0, enables the compiled model cache (see macros.MODEL_CACHE_SIZE), which lets hard
+        resets skip compiling XML they have already compiled, and reports its hit rate
+
+Example:
+    $ python benchmark_reset.py --envs Lift,Stack,TwoArmLift --robots Panda --resets 200 --model-cache-size 16
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import robosuite as suite
+import robosuite.macros as macros
+from robosuite.environments.manipulation.two_arm_env import TwoArmEnv
+from robosuite.scripts.benchmark_observables import grind_kwargs
+from robosuite.utils.model_cache import get_model_cache_stats
+
+MANIPULATION_ENVS = [
+    "Lift",
+    "Stack",
+    "Door",
+    "NutAssemblySquare",
+    "PickPlaceCan",
+    "Wipe",
+    "ToolHang",
+    "TwoArmLift",
+    "TwoArmPegInHole",
+    "TwoArmHandover",
+    "TwoArmTransport",
+    "OSXGrind",
+]
+
+RESET_MODES = {"hard": True, "soft": False, "snapshot": "snapshot"}
+
+
+def env_kwargs(env_name, robot):
+    """
+    Returns:
+        dict: keyword arguments to create @env_name with @robot (or two copies of it for two-arm environments)
+    """
+    kwargs = {
+        "robots": [robot, robot] if issubclass(suite.environments.REGISTERED_ENVS[env_name], TwoArmEnv) else robot,
+        "has_renderer": False,
+        "has_offscreen_renderer": False,
+        "use_camera_obs": False,
+        "ignore_done": True,
+    }
+    if env_name == "OSXGrind":
+        kwargs.update(grind_kwargs(robot))
+    return kwargs
+
+
+def benchmark(env, num_resets):
+    """
+    Resets @env @num_resets times, after a few warm up resets (e.g.: the first snapshot reset captures the snapshot).
+
+    Returns:
+        float: resets per second
+    """
+    for _ in range(2):
+        env.reset()
+    start = time.perf_counter()
+    for _ in range(num_resets):
+        env.reset()
+    return num_resets / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--envs", type=str, default=",".join(MANIPULATION_ENVS))
+    parser.add_argument("--robots", type=str, default="Panda")
+    parser.add_argument("--resets", type=int, default=100)
+    parser.add_argument("--hard-resets", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--model-cache-size", type=int, default=0)
+    args = parser.parse_args()
+    macros.MODEL_CACHE_SIZE = args.model_cache_size
+
+    print("{:>18} {:>12} {:>12} {:>12} {:>16}".format("", "", "resets / s", "", "snapshot speedup"))
+    print("{:>18} {:>12} {:>12} {:>12} {:>8} {:>8}".format("env", *RESET_MODES, "hard", "soft"))
+    for env_name in args.envs.split(","):
+        envs = {
+            mode: suite.make(env_name, hard_reset=hard_reset, **env_kwargs(env_name, args.robots))
+            for mode, hard_reset in RESET_MODES.items()
+        }
+        results = {mode: [] for mode in RESET_MODES}
+        for _ in range(args.repeats):
+            for mode, env in envs.items():
+                results[mode].append(benchmark(env, args.hard_resets if mode == "hard" else args.resets))
+        for env in envs.values():
+            env.close()
+        hard, soft, snapshot = (np.max(results[mode]) for mode in RESET_MODES)
+        print(
+            "{:>18} {:>12.1f} {:>12.1f} {:>12.1f} {:>7.0f}x {:>7.2f}x".format(
+                env_name, hard, soft, snapshot, snapshot / hard, snapshot / soft
+            )
+        )
+
+    if args.model_cache_size > 0:
+        print("model cache: {}".format(get_model_cache_stats()))
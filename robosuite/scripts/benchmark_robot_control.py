@@ -0,0 +1,133 @@
+"""
+Microbenchmark of Robot.control, with and without a new policy step (i.e.: with and without updating the histories
+of proprioceptive values), comparing the HistoryBuffer the robots hold these histories in with the separate
+DeltaBuffer / RingBuffer objects (and the per-column np.convolve estimation of the eef acceleration) it replaced.
+
+Robot.control is called directly (without stepping the simulation) on each robot of the environment, for robots with
+one and two arms.
+
+Arguments:
+    --configs (str): Space-separated configurations to benchmark, as env:robots[:env_configuration] (robots being
+        comma-separated)
+    --calls (int): Number of control() calls to time for each configuration
+    --repeats (int): Number of (interleaved) timing runs per configuration, the fastest one is reported
+
+Example:
+    $ python benchmark_robot_control.py --configs Lift:IIWA TwoArmLift:Baxter:single-robot
+"""
+
+import argparse
+import time
+import types
+
+import numpy as np
+
+import robosuite as suite
+import robosuite.utils.transform_utils as T
+from robosuite.utils.buffers import DeltaBuffer, RingBuffer
+
+
+def legacy_update_proprioception(robot, action):
+    """
+    Update of the proprioceptive histories of @robot with one buffer object per value, as before HistoryBuffer
+    """
+    robot.recent_qpos.push(robot._joint_positions)
+    robot.recent_actions.push(action)
+    robot.recent_torques.push(robot.torques)
+
+    for arm in robot.arms:
+        controller = robot.part_controllers.get(arm, None)
+        if controller is None:
+            continue
+        robot.recent_ee_forcetorques[arm].push(np.concatenate((robot.ee_force[arm], robot.ee_torque[arm])))
+        robot.recent_ee_pose[arm].push(np.concatenate((controller.ref_pos, T.mat2quat(controller.ref_ori_mat))))
+        robot.recent_ee_vel[arm].push(np.concatenate((controller.ref_pos_vel, controller.ref_ori_vel)))
+
+        robot.recent_ee_vel_buffer[arm].push(np.concatenate((controller.ref_pos_vel, controller.ref_ori_vel)))
+        diffs = np.vstack(
+            [
+                robot.recent_ee_acc[arm].current,
+                robot.control_freq * np.diff(robot.recent_ee_vel_buffer[arm].buf, axis=0),
+            ]
+        )
+        ee_acc = np.array([np.convolve(col, np.ones(10) / 10.0, mode="valid")[0] for col in diffs.transpose()])
+        robot.recent_ee_acc[arm].push(ee_acc)
+
+
+def use_legacy_buffers(robot):
+    """
+    Replaces the histories of @robot with separate DeltaBuffer / RingBuffer objects
+    """
+    robot.recent_qpos = DeltaBuffer(dim=len(robot.joint_indexes))
+    robot.recent_actions = DeltaBuffer(dim=robot.action_dim)
+    robot.recent_torques = DeltaBuffer(dim=len(robot.joint_indexes))
+    for arm in robot.arms:
+        robot.recent_ee_forcetorques[arm] = DeltaBuffer(dim=6)
+        robot.recent_ee_pose[arm] = DeltaBuffer(dim=7)
+        robot.recent_ee_vel[arm] = DeltaBuffer(dim=6)
+        robot.recent_ee_vel_buffer[arm] = RingBuffer(dim=6, length=10)
+        robot.recent_ee_acc[arm] = DeltaBuffer(dim=6)
+    robot._update_proprioception = types.MethodType(legacy_update_proprioception, robot)
+
+
+def benchmark(env, num_calls, legacy):
+    """
+    Calls control() of each robot of @env @num_calls times, with and without a new policy step.
+
+    Returns:
+        3-tuple:
+
+            - (float) average time of control(policy_step=False) (us)
+            - (float) average time of control(policy_step=True) (us)
+            - (float) average time of the update of the proprioceptive histories alone (us)
+    """
+    env.reset()
+    times = np.zeros(3)
+    for robot in env.robots:
+        if legacy:
+            use_legacy_buffers(robot)
+        action = np.zeros(robot.action_dim)
+        robot.control(action, policy_step=True)
+        for i, policy_step in enumerate((False, True)):
+            start = time.perf_counter()
+            for _ in range(num_calls):
+                robot.control(action, policy_step=policy_step)
+            times[i] += time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(num_calls):
+            robot._update_proprioception(action)
+        times[2] += time.perf_counter() - start
+    return times / (num_calls * len(env.robots)) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--configs", type=str, nargs="+", default=["Lift:IIWA", "TwoArmLift:Baxter:single-robot"])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    row = "{:>40} {:>6} {:>10} {:>14} {:>14} {:>14}"
+    print(row.format("configuration", "arms", "buffers", "control (us)", "+policy (us)", "update (us)"))
+    for config in args.configs:
+        env_name, robots, env_configuration = (config.split(":") + ["default"])[:3]
+        env = suite.make(
+            env_name,
+            robots=robots.split(","),
+            env_configuration=env_configuration,
+            has_renderer=False,
+            has_offscreen_renderer=False,
+            use_camera_obs=False,
+            ignore_done=True,
+        )
+        results = {False: [], True: []}
+        for _ in range(args.repeats):
+            for legacy in (True, False):
+                results[legacy].append(benchmark(env, args.calls, legacy))
+        env.close()
+
+        num_arms = len(env.robots[0].arms)
+        for legacy in (True, False):
+            control, policy_control, update = np.min(results[legacy], axis=0)
+            name = "legacy" if legacy else "history"
+            print(row.format(config, num_arms, name, *["{:.1f}".format(t) for t in (control, policy_control, update)]))
@@ -0,0 +1,144 @@
+"""
+Microbenchmark of texture randomization, comparing the batched TextureModder (all colors and materials sampled at once,
+each texture regenerated once in place with vectorized operations, and uploaded once right before the next rendering)
+with the per-geom randomization it replaced (one set_checker / set_noise / ... call per geom, each texture being
+uploaded to the GPU as soon as it is modified).
+
+For each environment, times TextureModder.randomize followed by the rendering of a camera (which is when the batched
+modder uploads the modified textures), as well as randomize alone.
+
+Arguments:
+    --envs (str): Space-separated environments to benchmark
+    --robots (str): Robot to use in the environments
+    --camera (str): Camera to render
+    --size (int): Height and width of the rendered images
+    --calls (int): Number of calls to time
+    --repeats (int): Number of (interleaved) timing runs, the fastest one is reported
+
+Example:
+    $ python benchmark_texture_randomization.py --envs Lift Stack --robots IIWA --size 84
+"""
+
+import argparse
+import time
+import types
+
+import numpy as np
+
+import robosuite as suite
+from robosuite.utils.mjmod import TextureModder
+from robosuite.wrappers.domain_randomization_wrapper import DEFAULT_COLOR_ARGS
+
+
+def legacy_randomize(modder):
+    """
+    Per-geom randomization, as before the batched TextureModder
+    """
+    for name in modder.geom_names:
+        geom_id = modder.model.geom_name2id(name)
+        modder.model.geom_rgba[geom_id, :] = 1.0
+        if modder._check_geom_for_texture(name):
+            modder.model.mat_rgba[modder.model.geom_matid[geom_id], :] = 1.0
+
+    for name in modder.geom_names:
+        if modder._check_geom_for_texture(name):
+            modder._randomize_texture(name)
+            if modder.randomize_material:
+                modder._randomize_material(name)
+        else:
+            modder._randomize_geom_color(name)
+
+    if modder.randomize_skybox:
+        modder._randomize_texture("skybox")
+
+
+def legacy_upload_texture(modder, name, device_id=0):
+    """
+    Immediate upload of the texture of geom @name to the GPU, as before the batched TextureModder
+    """
+    modder.sim._render_context_offscreen.upload_texture(modder.get_texture(name).id)
+
+
+def use_legacy_modder(modder):
+    """
+    Replaces the batched functions of TextureModder @modder with the per-geom ones
+    """
+    modder.randomize = types.MethodType(legacy_randomize, modder)
+    modder.upload_texture = types.MethodType(legacy_upload_texture, modder)
+
+
+def timeit(fn, num_calls):
+    """
+    Returns:
+        float: average time of a call to @fn (ms)
+    """
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        fn()
+    return (time.perf_counter() - start) / num_calls * 1e3
+
+
+def benchmark(env, args, legacy):
+    """
+    Times randomize() of a TextureModder of @env (with the default arguments of DomainRandomizationWrapper), with and
+    without rendering a camera after it.
+
+    Returns:
+        2-tuple:
+
+            - (float) average time of randomize() (ms)
+            - (float) average time of randomize() and a rendering (ms)
+    """
+    modder = TextureModder(env.sim, random_state=np.random.RandomState(0), **DEFAULT_COLOR_ARGS)
+    if legacy:
+        use_legacy_modder(modder)
+
+    def render():
+        env.sim.render(width=args.size, height=args.size, camera_name=args.camera)
+
+    def randomize_and_render():
+        modder.randomize()
+        render()
+
+    render()
+    times = (timeit(modder.randomize, args.calls), timeit(randomize_and_render, args.calls))
+    modder.restore_defaults()
+    render()
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--envs", type=str, nargs="+", default=["Lift", "Stack", "PickPlace"])
+    parser.add_argument("--robots", type=str, default="IIWA")
+    parser.add_argument("--camera", type=str, default="agentview")
+    parser.add_argument("--size", type=int, default=84)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    row = "{:>12} {:>10} {:>10} {:>16} {:>22}"
+    print(row.format("env", "textures", "modder", "randomize (ms)", "randomize+render (ms)"))
+    for env_name in args.envs:
+        env = suite.make(
+            env_name,
+            robots=args.robots,
+            has_renderer=False,
+            has_offscreen_renderer=True,
+            use_camera_obs=False,
+            ignore_done=True,
+        )
+        env.reset()
+        num_textures = "{} MB".format(env.sim.model.tex_data.nbytes // 2**20)
+
+        results = {False: [], True: []}
+        for _ in range(args.repeats):
+            for legacy in (True, False):
+                results[legacy].append(benchmark(env, args, legacy))
+        env.close()
+
+        for legacy in (True, False):
+            randomize, randomize_and_render = np.min(results[legacy], axis=0)
+            name = "legacy" if legacy else "batched"
+            times = ["{:.1f}".format(t) for t in (randomize, randomize_and_render)]
+            print(row.format(env_name, num_textures, name, *times))
@@ -0,0 +1,83 @@
+"""
+Benchmarks the throughput of VectorMujocoEnv (env-steps/sec) as a function of the number of worker processes.
+This is useful to size the number of environment copies / workers to run per node.
+
+Arguments:
+    --env (str): Name of the environment to benchmark
+    --robots (str): Robot(s) to use in the environment
+    --num-envs (int): Total number of environment copies
+    --workers (str): Comma-separated list of worker counts to benchmark
+    --steps (int): Number of batched steps to time for each worker count
+
+Example:
+    $ python benchmark_vector_env.py --env Lift --robots Panda --num-envs 16 --workers 1,2,4,8,16
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import robosuite as suite
+from robosuite.wrappers import VectorMujocoEnv
+
+
+def benchmark_serial(env_name, env_kwargs, num_steps):
+    """
+    Steps a single environment in the current process to get a reference env-steps/sec figure.
+    """
+    env = suite.make(env_name, **env_kwargs)
+    env.reset()
+    low, high = env.action_spec
+    start = time.time()
+    for _ in range(num_steps):
+        _, _, done, _ = env.step(np.random.uniform(low, high))
+        if done:
+            env.reset()
+    elapsed = time.time() - start
+    env.close()
+    return num_steps / elapsed
+
+
+def benchmark_vector(env_name, env_kwargs, num_envs, num_workers, num_steps):
+    """
+    Steps @num_envs environments spread over @num_workers processes, and returns the total env-steps/sec.
+    """
+    vec_env = VectorMujocoEnv(env_name, num_envs=num_envs, env_kwargs=env_kwargs, num_workers=num_workers, seeds=0)
+    low, high = vec_env.action_spec
+    actions = np.random.uniform(low, high, size=(num_steps, num_envs, vec_env.action_dim))
+    # Warm up the workers (first steps include lazy allocations / numba compilation)
+    vec_env.step(actions[0])
+    start = time.time()
+    for t in range(num_steps):
+        vec_env.step(actions[t])
+    elapsed = time.time() - start
+    vec_env.close()
+    return num_envs * num_steps / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", type=str, default="Lift")
+    parser.add_argument("--robots", nargs="+", type=str, default="Panda", help="Which robot(s) to use in the env")
+    parser.add_argument("--num-envs", type=int, default=8)
+    parser.add_argument("--workers", type=str, default="1,2,4,8")
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    env_kwargs = {
+        "robots": args.robots,
+        "has_renderer": False,
+        "has_offscreen_renderer": False,
+        "use_camera_obs": False,
+        "ignore_done": True,
+    }
+
+    serial_sps = benchmark_serial(args.env, env_kwargs, args.steps)
+    print("{:>10} {:>10} {:>16} {:>10}".format("envs", "workers", "env-steps/sec", "speedup"))
+    print("{:>10} {:>10} {:>16.1f} {:>10.2f}".format(1, "serial", serial_sps, 1.0))
+    for num_workers in [int(w) for w in args.workers.split(",")]:
+        if num_workers > args.num_envs:
+            continue
+        sps = benchmark_vector(args.env, env_kwargs, args.num_envs, num_workers, args.steps)
+        print("{:>10} {:>10} {:>16.1f} {:>10.2f}".format(args.num_envs, num_workers, sps, sps / serial_sps))
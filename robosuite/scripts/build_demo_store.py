@@ -0,0 +1,39 @@
+"""
+Converts a demo.hdf5 file into a memory-mapped demo store (see robosuite/utils/demo_store.py), which
+DemoSamplerWrapper samples reset states from. Building the store ahead of time avoids having the first workers of a
+training run convert it.
+
+Arguments:
+    --folder (str): Path to the demonstration folder that contains the demo.hdf5 file (and the models folder, if any)
+    --store (str): Directory to create the store in. Defaults to a demo_store folder in @folder
+    --force (optional): If set, rebuilds the store even if it is up to date
+
+Example:
+    $ python build_demo_store.py --folder ../models/assets/demonstrations/lift/
+"""
+
+import argparse
+import os
+import shutil
+
+from robosuite.utils.demo_store import open_demo_store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folder", type=str, required=True)
+    parser.add_argument("--store", type=str, default=None)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    hdf5_path = os.path.join(args.folder, "demo.hdf5")
+    store_path = args.store if args.store is not None else os.path.join(args.folder, "demo_store")
+    models_dir = os.path.join(args.folder, "models")
+    if args.force and os.path.exists(store_path):
+        shutil.rmtree(store_path)
+
+    store = open_demo_store(hdf5_path, store_path, models_dir=models_dir if os.path.isdir(models_dir) else None)
+    print(
+        "{}: {} demonstrations, {} states of dim {}, {} distinct model xmls".format(
+            store_path, store.num_demos, store.states.shape[0], store.states.shape[1], len(set(store.xml_ids))
+        )
+    )
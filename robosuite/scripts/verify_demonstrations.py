@@ -0,0 +1,101 @@
+"""
+Headless, parallel verification of a set of demonstrations stored in a hdf5 file: every episode's actions are
+replayed open loop in a pool of worker processes, and the states reached are compared with the recorded ones (see
+robosuite/utils/demo_playback.py). Optionally, observations (including camera images) are regenerated at every
+recorded state into a new hdf5 file.
+
+Per-episode divergence statistics are printed as episodes complete, followed by a summary.
+
+Arguments:
+    --folder (str): Path to demonstrations (the folder that contains the demo.hdf5 file)
+    --workers (int): Number of worker processes. Defaults to the number of CPUs
+    --atol (float): Largest state error (norm) that is not considered a divergence
+    --num-demos (int): If > 0, only verifies the first @num_demos demonstrations
+    --output (str): If specified, path of the hdf5 file to write the demonstrations to, with regenerated observations
+    --cameras (str): Comma-separated list of cameras to render image observations from (with --output)
+    --camera-height (int): Height of the rendered images
+    --camera-width (int): Width of the rendered images
+    --depth (optional): If set, also renders depth maps
+
+Example:
+    $ python verify_demonstrations.py --folder ../models/assets/demonstrations/lift/ --workers 16 \
+        --output lift_image.hdf5 --cameras agentview,robot0_eye_in_hand
+"""
+
+import argparse
+import os
+import time
+
+import h5py
+import numpy as np
+
+from robosuite.utils.demo_playback import playback_demonstrations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folder", type=str, required=True)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--atol", type=float, default=1e-6)
+    parser.add_argument("--num-demos", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    parser.add_argument("--cameras", type=str, default="")
+    parser.add_argument("--camera-height", type=int, default=84)
+    parser.add_argument("--camera-width", type=int, default=84)
+    parser.add_argument("--depth", action="store_true")
+    args = parser.parse_args()
+
+    hdf5_path = os.path.join(args.folder, "demo.hdf5")
+    with h5py.File(hdf5_path, "r") as f:
+        demos = list(f["data"].keys())
+    if args.num_demos > 0:
+        demos = demos[: args.num_demos]
+
+    row = "{:>12} {:>8} {:>12} {:>12} {:>12} {:>10} {:>8}"
+    print(row.format("demo", "steps", "max error", "mean error", "final error", "diverged", "success"))
+
+    def print_report(report):
+        diverged = "-" if report.first_divergence < 0 else "@{}".format(report.first_divergence)
+        print(
+            row.format(
+                report.demo,
+                report.num_steps,
+                "{:.3g}".format(report.max_error),
+                "{:.3g}".format(report.mean_error),
+                "{:.3g}".format(report.final_error),
+                diverged,
+                str(report.success),
+            ),
+            flush=True,
+        )
+
+    start = time.perf_counter()
+    reports = playback_demonstrations(
+        hdf5_path,
+        demos=demos,
+        num_workers=args.workers,
+        atol=args.atol,
+        output_path=args.output,
+        camera_names=[name for name in args.cameras.split(",") if name],
+        camera_height=args.camera_height,
+        camera_width=args.camera_width,
+        camera_depths=args.depth,
+        callback=print_report,
+    )
+    duration = time.perf_counter() - start
+
+    num_diverged = sum(report.first_divergence >= 0 for report in reports)
+    max_errors = np.array([report.max_error for report in reports])
+    print(
+        "\n{} episodes in {:.1f} s ({:.2f} episodes / s): {} diverged (atol {:g}), {} successful".format(
+            len(reports),
+            duration,
+            len(reports) / duration,
+            num_diverged,
+            args.atol,
+            sum(report.success for report in reports),
+        )
+    )
+    if len(reports) > 0:
+        print("max state error: median {:.3g}, max {:.3g}".format(np.median(max_errors), max_errors.max()))
+    if args.output is not None:
+        print("Wrote demonstrations with regenerated observations to {}".format(args.output))
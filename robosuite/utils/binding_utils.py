@@ -9,14 +9,21 @@ import ctypes.util
 import ctypes
 import gc
 import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from tempfile import TemporaryDirectory
 
-# DIRTY HACK copied from mujoco-py - a global lock on rendering
-from threading import Lock
+from threading import Lock, RLock
 
 import mujoco
 import numpy as np
 
+from robosuite.utils.model_cache import compile_model
+
+# Rendering itself is guarded by a lock per render context (see MjRenderContext.current), this global lock only
+# serializes the creation of GL contexts, since EGL initializes its display on first use
 _MjSim_render_lock = Lock()
 
 
@@ -50,7 +57,17 @@ class MjRenderContext:
     See https://github.com/openai/mujoco-py/blob/4830435a169c1f3e3b5f9b58a7c3d9c39bdf4acb/mujoco_py/mjrendercontext.pyx
     """
 
-    def __init__(self, sim, offscreen=True, device_id=-1, max_width=640, max_height=480):
+    def __init__(self, sim, offscreen=True, device_id=-1, max_width=640, max_height=480, attach=True):
+        """
+        Args:
+            sim (MjSim): simulation to render
+            offscreen (bool): must be True, only offscreen rendering is supported
+            device_id (int): id of the GPU to render with, -1 for the default one
+            max_width (int): initial width of the offscreen buffer
+            max_height (int): initial height of the offscreen buffer
+            attach (bool): if True, forwards @sim and makes this context its default render context (see
+                MjSim.render). Otherwise, the context is only used when passed explicitly, e.g.: by MjRenderPool
+        """
 
         # move this logic from outside to inside class to avoid multiprocessing issues
         if _MUJOCO_GL not in ("disable", "disabled", "off", "false", "0"):
@@ -75,15 +92,20 @@ class MjRenderContext:
         self.offscreen = offscreen
         self.device_id = device_id
 
+        # lock held while this context is current on a thread, see @current
+        self.lock = RLock()
+
         # setup GL context with defaults for now
-        self.gl_ctx = GLContext(max_width=max_width, max_height=max_height, device_id=self.device_id)
+        with _MjSim_render_lock:
+            self.gl_ctx = GLContext(max_width=max_width, max_height=max_height, device_id=self.device_id)
         self.gl_ctx.make_current()
 
-        # Ensure the model data has been updated so that there
-        # is something to render
-        sim.forward()
-        # make sure sim has this context
-        sim.add_render_context(self)
+        if attach:
+            # Ensure the model data has been updated so that there
+            # is something to render
+            sim.forward()
+            # make sure sim has this context
+            sim.add_render_context(self)
 
         self.model = sim.model
         self.data = sim.data
@@ -108,7 +130,31 @@ class MjRenderContext:
         # self._markers = []
         # self._overlay = {}
 
+        # scratch pixel buffers reused across calls to @read_pixels, keyed by (name, shape)
+        self._pixel_buffers = {}
+        # segmentation id -> (object type, object id) table of the scene, and the scene layout it was built for
+        self._seg_ids = None
+        self._seg_ids_key = None
+
+        # versions of the textures last uploaded by this context (the mujoco context below uploads all of them)
+        self._texture_versions = sim.texture_versions.copy()
+
         self._set_mujoco_context_and_buffers()
+        self.gl_ctx.release()
+
+    @contextmanager
+    def current(self):
+        """
+        Context manager that holds this context's lock and makes its GL context current on the calling thread, and
+        releases both on exit, so that different contexts can render concurrently from different threads. All the
+        rendering methods below must be called within it.
+        """
+        with self.lock:
+            self.gl_ctx.make_current()
+            try:
+                yield self
+            finally:
+                self.gl_ctx.release()
 
     def _set_mujoco_context_and_buffers(self):
         self.con = mujoco.MjrContext(self.model._model, mujoco.mjtFontScale.mjFONTSCALE_150)
@@ -123,11 +169,27 @@ class MjRenderContext:
             self._set_mujoco_context_and_buffers()
 
     def render(self, width, height, camera_id=None, segmentation=False):
-        viewport = mujoco.MjrRect(0, 0, width, height)
+        self.update_scene(width, height, camera_id=camera_id)
+        self.render_scene(width, height, segmentation=segmentation)
+
+    def update_scene(self, width, height, camera_id=None):
+        """
+        Updates the abstract scene (geoms, lights, camera) from the current simulation state. The scene can then be
+        rendered any number of times with @render_scene, e.g.: once for rgb / depth and once for segmentation.
 
+        Args:
+            width (int): width of the images to render
+            height (int): height of the images to render
+            camera_id (None or int): id of the camera to render from, -1 for the free camera. If None, the last
+                camera rendered from is used
+        """
         # if self.sim.render_callback is not None:
         #     self.sim.render_callback(self.sim, self)
 
+        # upload the textures modified since the last rendering, see MjSim.mark_textures_dirty
+        for tex_id in self.sim.get_dirty_textures(self._texture_versions):
+            mujoco.mjr_uploadTexture(self.model._model, self.con, tex_id)
+
         # update width and height of rendering context if necessary
         if width > self.con.offWidth or height > self.con.offHeight:
             new_width = max(width, self.model.vis.global_.offwidth)
@@ -145,6 +207,17 @@ class MjRenderContext:
             self.model._model, self.data._data, self.vopt, self.pert, self.cam, mujoco.mjtCatBit.mjCAT_ALL, self.scn
         )
 
+    def render_scene(self, width, height, segmentation=False):
+        """
+        Renders the scene last updated by @update_scene into the offscreen buffer, see @read_pixels.
+
+        Args:
+            width (int): width of the image to render
+            height (int): height of the image to render
+            segmentation (bool): if True, renders segmentation ids instead of colors
+        """
+        viewport = mujoco.MjrRect(0, 0, width, height)
+
         if segmentation:
             self.scn.flags[mujoco.mjtRndFlag.mjRND_SEGMENT] = 1
             self.scn.flags[mujoco.mjtRndFlag.mjRND_IDCOLOR] = 1
@@ -160,39 +233,135 @@ class MjRenderContext:
             self.scn.flags[mujoco.mjtRndFlag.mjRND_SEGMENT] = 0
             self.scn.flags[mujoco.mjtRndFlag.mjRND_IDCOLOR] = 0
 
-    def read_pixels(self, width, height, depth=False, segmentation=False):
+    def read_pixels(self, width, height, depth=False, segmentation=False, out=None, depth_out=None):
+        """
+        Reads the image rendered by the last call to @render / @render_scene.
+
+        Args:
+            width (int): width of the rendered image
+            height (int): height of the rendered image
+            depth (bool): if True, also reads the depth map
+            segmentation (bool): if True, decodes the rendered segmentation ids into (object type, object id) pairs
+            out (None or np.array): if specified, the (height, width, 3) uint8 rgb image (or the (height, width, 2)
+                int32 segmentation) is written into this array instead of a new one. It can be any view, e.g.: a
+                row-reversed view buf[::-1] of a buffer @buf, to get the image flipped to the opencv convention
+            depth_out (None or np.array): if specified, the (height, width) float32 depth map is written into this
+                array instead of a new one
+
+        Returns:
+            np.array or 2-tuple: the rgb image (or the segmentation, with -1 for the background), and the depth map if
+                @depth is True
+        """
         viewport = mujoco.MjrRect(0, 0, width, height)
-        rgb_img = np.empty((height, width, 3), dtype=np.uint8)
-        depth_img = np.empty((height, width), dtype=np.float32) if depth else None
+        # mjr_readPixels needs contiguous arrays, other outputs are filled from a scratch buffer
+        if segmentation:
+            rgb_img = self._pixel_buffer("rgb", (height, width, 3), np.uint8)
+        else:
+            rgb_img = self._read_buffer(out, "rgb", (height, width, 3), np.uint8)
+        depth_img = self._read_buffer(depth_out, "depth", (height, width), np.float32) if depth else None
 
         mujoco.mjr_readPixels(rgb=rgb_img, depth=depth_img, viewport=viewport, con=self.con)
 
-        ret_img = rgb_img
         if segmentation:
-            uint32_rgb_img = rgb_img.astype(np.int32)
-            seg_img = uint32_rgb_img[:, :, 0] + uint32_rgb_img[:, :, 1] * (2**8) + uint32_rgb_img[:, :, 2] * (2**16)
-            seg_img[seg_img >= (self.scn.ngeom + 1)] = 0
-            seg_ids = np.full((self.scn.ngeom + 1, 2), fill_value=-1, dtype=np.int32)
-
-            for i in range(self.scn.ngeom):
-                geom = self.scn.geoms[i]
-                if geom.segid != -1:
-                    seg_ids[geom.segid + 1, 0] = geom.objtype
-                    seg_ids[geom.segid + 1, 1] = geom.objid
-            ret_img = seg_ids[seg_img]
+            # Decode the segmentation ids (segid + 1, 0 for the background) from the id colors in place, as intp (which
+            # np.take would otherwise convert them to)
+            seg_img = self._pixel_buffer("segmentation", (height, width), np.intp)
+            np.copyto(seg_img, rgb_img[:, :, 2])
+            seg_img <<= 8
+            seg_img |= rgb_img[:, :, 1]
+            seg_img <<= 8
+            seg_img |= rgb_img[:, :, 0]
+
+            seg_ids = self._segmentation_table()
+            # np.take writes into a temporary copy of non-contiguous outputs, so these are filled from a scratch buffer
+            ret_img = self._read_buffer(out, "ids", (height, width, 2), np.int32)
+            np.take(seg_ids, seg_img, axis=0, mode="clip", out=ret_img)
+            if out is not None and ret_img is not out:
+                np.copyto(out, ret_img)
+                ret_img = out
+        elif out is not None and rgb_img is not out:
+            np.copyto(out, rgb_img)
+            ret_img = out
+        else:
+            ret_img = rgb_img
+
+        if depth and depth_out is not None and depth_img is not depth_out:
+            np.copyto(depth_out, depth_img)
+            depth_img = depth_out
 
         if depth:
             return (ret_img, depth_img)
         else:
             return ret_img
 
+    def _segmentation_table(self):
+        """
+        Returns the table from segmentation ids to (object type, object id) of the current scene. Its first and last
+        rows are the background, so that out-of-range ids are clipped to the background.
+
+        The table only depends on which geoms mjv_updateScene adds to the scene, and in which order: it is rebuilt
+        (with a pass over the scene geoms) only when the number of scene geoms or the visualization options change.
+
+        Returns:
+            np.array: (ngeom + 2, 2) int32 table
+        """
+        vopt = self.vopt
+        key = (
+            self.scn.ngeom,
+            vopt.flags.tobytes(),
+            vopt.geomgroup.tobytes(),
+            vopt.sitegroup.tobytes(),
+            vopt.jointgroup.tobytes(),
+            vopt.tendongroup.tobytes(),
+            vopt.actuatorgroup.tobytes(),
+            vopt.skingroup.tobytes(),
+        )
+        if key != self._seg_ids_key:
+            seg_ids = np.full((self.scn.ngeom + 2, 2), fill_value=-1, dtype=np.int32)
+            if self.scn.ngeom > 0:
+                geoms = np.array(
+                    [(geom.segid, geom.objtype, geom.objid) for geom in self.scn.geoms[: self.scn.ngeom]],
+                    dtype=np.int32,
+                )
+                geoms = geoms[geoms[:, 0] != -1]
+                seg_ids[geoms[:, 0] + 1] = geoms[:, 1:]
+            self._seg_ids, self._seg_ids_key = seg_ids, key
+        return self._seg_ids
+
+    def _pixel_buffer(self, name, shape, dtype):
+        """
+        Returns:
+            np.array: scratch buffer @name of shape @shape, allocated on first use and reused afterwards
+        """
+        key = (name, shape)
+        buffer = self._pixel_buffers.get(key)
+        if buffer is None:
+            buffer = self._pixel_buffers[key] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    def _read_buffer(self, out, name, shape, dtype):
+        """
+        Returns:
+            np.array: array mjr_readPixels can read into directly: @out if it is a contiguous array of the right dtype,
+                a new array if @out is None, or scratch buffer @name otherwise
+        """
+        if out is None:
+            return np.empty(shape, dtype=dtype)
+        if out.dtype == dtype and out.flags.c_contiguous:
+            return out
+        return self._pixel_buffer(name, shape, dtype)
+
     def upload_texture(self, tex_id):
         """Uploads given texture to the GPU."""
-        self.gl_ctx.make_current()
-        mujoco.mjr_uploadTexture(self.model._model, self.con, tex_id)
+        with self.current():
+            mujoco.mjr_uploadTexture(self.model._model, self.con, tex_id)
 
     def __del__(self):
         # free mujoco rendering context and GL rendering context
+        try:
+            self.gl_ctx.make_current()
+        except Exception:
+            pass
         self.con.free()
         try:
             self.gl_ctx.free()
@@ -208,8 +377,68 @@ class MjRenderContext:
 
 
 class MjRenderContextOffscreen(MjRenderContext):
-    def __init__(self, sim, device_id, max_width=640, max_height=480):
-        super().__init__(sim, offscreen=True, device_id=device_id, max_width=max_width, max_height=max_height)
+    def __init__(self, sim, device_id, max_width=640, max_height=480, attach=True):
+        super().__init__(
+            sim, offscreen=True, device_id=device_id, max_width=max_width, max_height=max_height, attach=attach
+        )
+
+
+# A camera to render with MjRenderPool, see MjSim.render_images for the fields
+RenderRequest = namedtuple(
+    "RenderRequest", ["sim", "camera_name", "width", "height", "depth", "segmentation"], defaults=(False, False)
+)
+
+
+class MjRenderPool:
+    """
+    Pool of worker threads that render batches of camera requests concurrently. Each worker thread renders with its
+    own offscreen context per simulation (see MjSim.get_thread_render_context), so that requests never wait on each
+    other, even when they are for the same simulation. Simulations must not be stepped while a
+    batch that renders them is in flight. The contexts created by the worker threads are freed by @close.
+
+    Args:
+        num_threads (int): number of worker threads, i.e.: of requests rendered concurrently
+        device_id (int): id of the GPU to render with, -1 for the default one
+    """
+
+    def __init__(self, num_threads=4, device_id=-1):
+        self.num_threads = num_threads
+        self.device_id = device_id
+        self._executor = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="MjRenderPool")
+        # (simulation, worker thread id) of the render contexts created by the worker threads
+        self._thread_contexts = set()
+
+    def _render(self, request):
+        self._thread_contexts.add((request.sim, threading.get_ident()))
+        return request.sim.render_images(
+            request.width,
+            request.height,
+            camera_name=request.camera_name,
+            depth=request.depth,
+            segmentation=request.segmentation,
+            render_context=request.sim.get_thread_render_context(device_id=self.device_id),
+        )
+
+    def render(self, requests):
+        """
+        Renders @requests concurrently.
+
+        Args:
+            requests (list of RenderRequest): cameras to render
+
+        Returns:
+            list of 3-tuple: (rgb, depth, segmentation) images of each request, in order (see MjSim.render_images)
+        """
+        return list(self._executor.map(self._render, requests))
+
+    def close(self):
+        """
+        Stops the worker threads, and frees the render contexts they created.
+        """
+        self._executor.shutdown(wait=True)
+        for sim, thread_id in self._thread_contexts:
+            sim.free_thread_render_contexts([thread_id])
+        self._thread_contexts.clear()
 
 
 class MjSimState:
@@ -271,9 +500,16 @@ class MjModel(metaclass=_MjModelMeta):
 
     _HAS_DYNAMIC_ATTRIBUTES = True
 
-    def __init__(self, model_ptr):
-        """Creates a new MjModel instance from a mujoco.MjModel."""
+    def __init__(self, model_ptr, xml=None):
+        """
+        Creates a new MjModel instance from a mujoco.MjModel.
+
+        Args:
+            model_ptr (mujoco.MjModel): compiled model
+            xml (None or str): XML saved by MuJoCo right after compiling @model_ptr, if known (see @get_xml)
+        """
         self._model = model_ptr
+        self._xml = xml
 
         # make useful mappings such as _body_name2id and _body_id2name
         self.make_mappings()
@@ -496,6 +732,10 @@ class MjModel(metaclass=_MjModelMeta):
     #     return self._userdata_name2id[name]
 
     def get_xml(self):
+        # mj_saveLastXML saves the last XML parsed in this process, which is not this model's when it was loaded
+        # from the model cache (or when another model was parsed since)
+        if self._xml is not None:
+            return self._xml
         with TemporaryDirectory() as td:
             filename = os.path.join(td, "model.xml")
             ret = mujoco.mj_saveLastXML(filename.encode(), self._model)
@@ -1055,22 +1295,31 @@ class MjSim:
     (see https://github.com/openai/mujoco-py/blob/master/mujoco_py/mjsim.pyx).
     """
 
-    def __init__(self, model):
+    def __init__(self, model, xml=None):
         """
         Args:
             model: should be an MjModel instance created via a factory function
                 such as mujoco.MjModel.from_xml_string(xml)
+            xml (None or str): XML saved by MuJoCo right after compiling @model, if known
         """
-        self.model: MjModel = MjModel(model)
+        self.model: MjModel = MjModel(model, xml=xml)
         self.data: MjData = MjData(self.model)
 
         # offscreen render context object
         self._render_context_offscreen = None
+        # additional offscreen render contexts, one per thread that asked for its own (see get_thread_render_context)
+        self._thread_render_contexts = {}
+        # number of times each texture was modified, see mark_textures_dirty
+        self.texture_versions = np.zeros(self.model.ntex, dtype=np.int64)
+        # number of times derived quantities may have changed without a change of the state (forward / step calls and
+        # model edits), see mark_model_modified
+        self.state_version = 0
 
     @classmethod
     def from_xml_string(cls, xml):
-        model = mujoco.MjModel.from_xml_string(xml)
-        return cls(model)
+        # Skips compilation if @xml was compiled before and the model cache is enabled (see macros.MODEL_CACHE_SIZE)
+        model, model_xml = compile_model(xml)
+        return cls(model, xml=model_xml)
 
     @classmethod
     def from_xml_file(cls, xml_file):
@@ -1082,22 +1331,34 @@ class MjSim:
     def reset(self):
         """Reset simulation."""
         mujoco.mj_resetData(self.model._model, self.data._data)
+        self.state_version += 1
 
     def forward(self):
         """Forward call to synchronize derived quantities."""
         mujoco.mj_forward(self.model._model, self.data._data)
+        self.state_version += 1
 
     def step(self, with_udd=True):
         """Step simulation."""
         mujoco.mj_step(self.model._model, self.data._data)
+        self.state_version += 1
 
     def step1(self):
         """Step1 (before actions are set)."""
         mujoco.mj_step1(self.model._model, self.data._data)
+        self.state_version += 1
 
     def step2(self):
         """Step2 (after actions are set)."""
         mujoco.mj_step2(self.model._model, self.data._data)
+        self.state_version += 1
+
+    def mark_model_modified(self):
+        """
+        Marks the model as modified (e.g.: by DynamicsModder), so that caches of derived quantities keyed on
+        @self.state_version (e.g.: KinematicsCache) drop their entries even if the state is unchanged.
+        """
+        self.state_version += 1
 
     def render(
         self,
@@ -1132,11 +1393,123 @@ class MjSim:
 
         assert mode == "offscreen", "only offscreen supported for now"
         assert self._render_context_offscreen is not None
-        with _MjSim_render_lock:
-            self._render_context_offscreen.render(
-                width=width, height=height, camera_id=camera_id, segmentation=segmentation
-            )
-            return self._render_context_offscreen.read_pixels(width, height, depth=depth, segmentation=segmentation)
+        with self._render_context_offscreen.current() as render_context:
+            render_context.render(width=width, height=height, camera_id=camera_id, segmentation=segmentation)
+            return render_context.read_pixels(width, height, depth=depth, segmentation=segmentation)
+
+    def render_images(
+        self,
+        width,
+        height,
+        camera_name=None,
+        depth=False,
+        segmentation=False,
+        render_context=None,
+        rgb_out=None,
+        depth_out=None,
+        seg_out=None,
+    ):
+        """
+        Renders the rgb image, and optionally the depth map and segmentation of a camera, all from a single scene
+        update (as opposed to calling @render once per image type).
+
+        Args:
+            width (int): desired image width
+            height (int): desired image height
+            camera_name (None or str): name of camera in model. If None, the camera last rendered from will be used
+            depth (bool): if True, also renders the depth map
+            segmentation (bool): if True, also renders the segmentation
+            render_context (None or MjRenderContext): context to render with. If None, the default offscreen render
+                context of this simulation is used
+            rgb_out (None or np.array): if specified, array the rgb image is written into (see
+                MjRenderContext.read_pixels), instead of a new one
+            depth_out (None or np.array): same as @rgb_out, for the depth map
+            seg_out (None or np.array): same as @rgb_out, for the segmentation
+
+        Returns:
+            3-tuple:
+
+                - (np.array) (height, width, 3) uint8 rgb image
+                - (None or np.array) (height, width) float32 depth map, if @depth is True
+                - (None or np.array) (height, width, 2) int32 segmentation, holding the (object type, object id) of
+                    each pixel (-1 for the background), if @segmentation is True
+        """
+        camera_id = None if camera_name is None else self.model.camera_name2id(camera_name)
+        if render_context is None:
+            render_context = self._render_context_offscreen
+        assert render_context is not None
+        with render_context.current():
+            render_context.update_scene(width, height, camera_id=camera_id)
+            render_context.render_scene(width, height)
+            if depth:
+                rgb, depth_map = render_context.read_pixels(width, height, depth=True, out=rgb_out, depth_out=depth_out)
+            else:
+                rgb, depth_map = render_context.read_pixels(width, height, out=rgb_out), None
+            seg = None
+            if segmentation:
+                render_context.render_scene(width, height, segmentation=True)
+                seg = render_context.read_pixels(width, height, segmentation=True, out=seg_out)
+        return rgb, depth_map, seg
+
+    def get_thread_render_context(self, device_id=-1):
+        """
+        Returns the calling thread's own offscreen render context for this simulation, creating it on first use, so
+        that several threads can render this simulation concurrently (see MjRenderPool). It renders the same geom
+        groups as the default render context.
+
+        Args:
+            device_id (int): id of the GPU to render with, -1 for the default one. Only used to create the context
+
+        Returns:
+            MjRenderContextOffscreen: render context of the calling thread
+        """
+        thread_id = threading.get_ident()
+        render_context = self._thread_render_contexts.get(thread_id)
+        if render_context is None:
+            render_context = MjRenderContextOffscreen(self, device_id=device_id, attach=False)
+            if self._render_context_offscreen is not None:
+                render_context.vopt.geomgroup[:] = self._render_context_offscreen.vopt.geomgroup
+            self._thread_render_contexts[thread_id] = render_context
+        return render_context
+
+    def free_thread_render_contexts(self, thread_ids=None):
+        """
+        Frees the render contexts created by @get_thread_render_context. They must not be in use.
+
+        Args:
+            thread_ids (None or iterable): ids of the threads whose render contexts to free, all of them if None
+        """
+        if thread_ids is None:
+            thread_ids = list(self._thread_render_contexts)
+        for thread_id in thread_ids:
+            # the mujoco and GL contexts are freed along with the render context (see MjRenderContext.__del__)
+            self._thread_render_contexts.pop(thread_id, None)
+
+    def mark_textures_dirty(self, tex_ids):
+        """
+        Marks textures whose bitmaps were modified in the model (e.g.: by TextureModder). Instead of being uploaded
+        to the GPU right away, each texture is uploaded once by every render context, right before its next rendering,
+        no matter how many times it was modified in between.
+
+        Args:
+            tex_ids (int or list of int): ids of the modified textures
+        """
+        self.texture_versions[tex_ids] += 1
+
+    def get_dirty_textures(self, versions):
+        """
+        Finds the textures modified since @versions was last synced by this function, and syncs it.
+
+        Args:
+            versions (np.array): versions of the textures known to the caller (e.g.: a render context), initially a
+                copy of @self.texture_versions. Updated in place
+
+        Returns:
+            np.array: ids of the textures modified since then
+        """
+        dirty = np.flatnonzero(versions != self.texture_versions)
+        versions[dirty] = self.texture_versions[dirty]
+        return dirty
 
     def add_render_context(self, render_context):
         assert render_context.offscreen
@@ -1176,8 +1549,36 @@ class MjSim:
         self.data.qpos[:] = state.qpos
         self.data.qvel[:] = state.qvel
 
+    def get_integration_state(self, out=None):
+        """
+        Return the full integration state of the simulation (time, qpos, qvel, act, warmstart, controls, applied
+        forces, mocap poses, equality activations, userdata and plugin state) as a flat array, see mj_getState.
+
+        Args:
+            out (None or np.array): If specified, buffer (of size mj_stateSize) the state is written into
+
+        Returns:
+            np.array: flat integration state
+        """
+        spec = mujoco.mjtState.mjSTATE_INTEGRATION
+        if out is None:
+            out = np.zeros(mujoco.mj_stateSize(self.model._model, spec))
+        mujoco.mj_getState(self.model._model, self.data._data, out, spec)
+        return out
+
+    def set_integration_state(self, value):
+        """
+        Set the full integration state of the simulation from a flat array returned by @get_integration_state. This
+        is a plain memory copy, and should be followed by @forward to synchronize derived quantities.
+
+        Args:
+            value (np.array): flat integration state
+        """
+        mujoco.mj_setState(self.model._model, self.data._data, value, mujoco.mjtState.mjSTATE_INTEGRATION)
+
     def free(self):
         # clean up here to prevent memory leaks
+        self.free_thread_render_contexts()
         del self._render_context_offscreen
         del self.data
         del self.model
@@ -1231,12 +1632,15 @@ class MjSimInteractive(MjSim):
     Modified version of MjSim that enables interactive visualization through mujoco.viewer
     """
 
-    def __init__(self, model):
-        super().__init__(model)
+    def __init__(self, model, xml=None):
+        super().__init__(model, xml=xml)
 
         import mujoco.viewer
         self.viewer = mujoco.viewer.launch_passive(self.model._model, self.data._data)
+        self._viewer_texture_versions = self.texture_versions.copy()
 
     def step(self, with_udd=True):
         super().step(with_udd=with_udd)
+        for tex_id in self.get_dirty_textures(self._viewer_texture_versions):
+            self.viewer.update_texture(tex_id)
         self.viewer.sync()
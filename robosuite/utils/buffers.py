@@ -2,6 +2,7 @@
 Collection of Buffer objects with general functionality
 """
 
+from collections import OrderedDict, namedtuple
 
 import numpy as np
 
@@ -171,3 +172,202 @@ class DelayBuffer(RingBuffer):
         assert delay < self.length, "Requested delay must be less than buffer's length!"
         # Grab delayed value
         return self.buf[(self.ptr - delay) % self.length]
+
+
+class FilteredDeltaBuffer(DeltaBuffer):
+    """
+    DeltaBuffer whose pushed values are first passed through a streaming filter (e.g.: a ButterworthFilter), so that
+    "current" and "last" hold filtered values
+
+    Args:
+        dim (int): Size of numerical arrays being inputted
+        filter (ButterworthFilter): Streaming filter with a filter(value) and reset() method
+        init_value (None or Iterable): Initial value to fill "last" value with initially.
+            If None (default), last array will be filled with zeros
+    """
+
+    def __init__(self, dim, filter, init_value=None):
+        super().__init__(dim=dim, init_value=init_value)
+        self.filter = filter
+
+    def push(self, value):
+        """
+        Filters @value and pushes the result into the buffer; current becomes last and the filtered value becomes
+        current
+
+        Args:
+            value (int or float or array): Value(s) to filter and push into the array
+        """
+        super().push(self.filter.filter(value))
+
+    def clear(self):
+        """
+        Clears last and current value, and resets the filter state
+        """
+        super().clear()
+        self.filter.reset()
+
+
+# Specification of a field of a HistoryBuffer:
+#   name (str): Name of the field
+#   dim (int): Size of the values of the field
+#   length (int): Number of most recent values held
+#   zero_filled (bool): Whether the history counts as filled with zeros from the start (as DeltaBuffer, whose "last"
+#       value starts at zeros) or as empty (as RingBuffer). This only affects averages until @length values are pushed
+#   filter (None or ButterworthFilter): If specified, streaming filter pushed values are first passed through
+HistorySpec = namedtuple("HistorySpec", ["name", "dim", "length", "zero_filled", "filter"], defaults=(2, True, None))
+
+
+class HistoryField(Buffer):
+    """
+    Ring of the most recent values of one field of a HistoryBuffer, with the API of both RingBuffer (buf, ptr, current,
+    average) and DeltaBuffer (current, last, delta, average). Values are stored in (views of) the arrays of the
+    HistoryBuffer, and the sum of the values in the ring is maintained incrementally, so that pushing is a single row
+    copy and averages do not need to go through the whole ring.
+
+    Note that, as for RingBuffer, @current and @last are views of the ring, which are overwritten once @length more
+    values are pushed.
+
+    Args:
+        spec (HistorySpec): Specification of the field
+        buf (np.array): (length, dim) array to store the values in
+        total (np.array): (dim,) array to store the sum of the values in
+    """
+
+    # Number of pushes after which the running sum is recomputed from scratch
+    RESUM_INTERVAL = 1000
+
+    def __init__(self, spec, buf, total):
+        self.name = spec.name
+        self.dim = spec.dim
+        self.length = spec.length
+        self.zero_filled = spec.zero_filled
+        self.filter = spec.filter
+        self.buf = buf
+        self._total = total
+        self.clear()
+
+    def push(self, value):
+        """
+        Pushes a new value into the ring, overwriting the oldest one
+
+        Args:
+            value (int or float or array): Value(s) to push into the ring (taken as a single new element)
+        """
+        if self.filter is not None:
+            value = self.filter.filter(value)
+        self.ptr += 1
+        if self.ptr == self.length:
+            self.ptr = 0
+        row = self.buf[self.ptr]
+        self._total -= row
+        row[:] = value
+        self._total += row
+        if self._size < self.length:
+            self._size += 1
+        # Periodically recompute the sum, so that rounding errors of the running sum do not accumulate
+        self._pushes_since_sum += 1
+        if self._pushes_since_sum == self.RESUM_INTERVAL:
+            np.sum(self.buf, axis=0, out=self._total)
+            self._pushes_since_sum = 0
+
+    def clear(self):
+        """
+        Clears the ring (and resets the filter state, if any)
+        """
+        self.buf[:] = 0.0
+        self._total[:] = 0.0
+        self.ptr = self.length - 1
+        self._size = self.length if self.zero_filled else 0
+        self._pushes_since_sum = 0
+        if self.filter is not None:
+            self.filter.reset()
+
+    @property
+    def current(self):
+        """
+        Returns:
+            np.array: Most recent value in the ring
+        """
+        return self.buf[self.ptr]
+
+    @property
+    def last(self):
+        """
+        Returns:
+            np.array: Value pushed before the most recent one
+        """
+        return self.buf[self.ptr - 1]
+
+    @property
+    def delta(self):
+        """
+        Returns:
+            np.array: Difference between the current and last values
+        """
+        return self.buf[self.ptr] - self.buf[self.ptr - 1]
+
+    @property
+    def average(self):
+        """
+        Returns:
+            np.array: Average of the values in the ring (including the initial zeros if @zero_filled)
+        """
+        if self._size == 0:
+            return np.zeros(self.dim)
+        return self._total / self._size
+
+
+class HistoryBuffer(Buffer):
+    """
+    Preallocated, struct-of-arrays store of the recent values of several named fields, e.g.: the proprioceptive
+    histories of a robot. The rings of all the fields (see HistoryField) live in a single contiguous array allocated
+    once, and fields are accessed by name:
+
+        history = HistoryBuffer([HistorySpec("qpos", dim=7), HistorySpec("ee_vel", dim=6, length=10)])
+        history["qpos"].push(qpos)
+        history["ee_vel"].average
+
+    Args:
+        specs (list of HistorySpec or tuple): Specifications of the fields, in the order they are laid out in memory
+    """
+
+    def __init__(self, specs):
+        specs = [spec if isinstance(spec, HistorySpec) else HistorySpec(*spec) for spec in specs]
+        assert len(set(spec.name for spec in specs)) == len(specs), "History field names must be unique!"
+        self.data = np.zeros(sum(spec.length * spec.dim for spec in specs))
+        self.totals = np.zeros(sum(spec.dim for spec in specs))
+
+        self.fields = OrderedDict()
+        data_start, total_start = 0, 0
+        for spec in specs:
+            data_end, total_end = data_start + spec.length * spec.dim, total_start + spec.dim
+            self.fields[spec.name] = HistoryField(
+                spec,
+                buf=self.data[data_start:data_end].reshape(spec.length, spec.dim),
+                total=self.totals[total_start:total_end],
+            )
+            data_start, total_start = data_end, total_end
+
+    def __getitem__(self, name):
+        return self.fields[name]
+
+    def __contains__(self, name):
+        return name in self.fields
+
+    def push(self, values):
+        """
+        Pushes new values into several fields
+
+        Args:
+            values (dict): Maps field names to the value to push into them
+        """
+        for name, value in values.items():
+            self.fields[name].push(value)
+
+    def clear(self):
+        """
+        Clears all the fields
+        """
+        for field in self.fields.values():
+            field.clear()
@@ -13,7 +13,10 @@ import h5py
 import numpy as np
 
 import robosuite
+import robosuite.macros as macros
 import robosuite.utils.transform_utils as T
+from robosuite.utils.mjcf_utils import IMAGE_CONVENTION_MAPPING
+from robosuite.utils.observables import Observable, sensor
 from robosuite.wrappers import DomainRandomizationWrapper, VisualizationWrapper
 
 
@@ -117,8 +120,8 @@ def get_real_depth_map(sim, depth_map):
     Return:
         depth_map (np.array): depth map that corresponds to actual distances
     """
-    # Make sure that depth values are normalized
-    assert np.all(depth_map >= 0.0) and np.all(depth_map <= 1.0)
+    # Make sure that depth values are normalized (min / max avoid allocating boolean images)
+    assert depth_map.min() >= 0.0 and depth_map.max() <= 1.0
     extent = sim.model.stat.extent
     far = sim.model.vis.map.zfar * extent
     near = sim.model.vis.map.znear * extent
@@ -243,6 +246,315 @@ def bilinear_interpolate(im, x, y):
     return wa * Ia + wb * Ib + wc * Ic + wd * Id
 
 
+class CameraGeometry:
+    """
+    Cached geometry of a camera, to convert its depth maps into world-frame points without recomputing the camera
+    matrices on every frame. The intrinsics (and the depth range) only depend on the model, so they are computed once.
+    The extrinsics are recomputed by @refresh only if the camera moved since the last call.
+
+    Args:
+        sim (MjSim): simulator instance
+        camera_name (str): name of camera
+        camera_height (int): height of camera images in pixels
+        camera_width (int): width of camera images in pixels
+        image_convention (None or str): convention of the depth maps passed to this camera geometry, among
+            {"opengl", "opencv"} (see macros.IMAGE_CONVENTION). Defaults to macros.IMAGE_CONVENTION, which is the one
+            of the depth observations
+    """
+
+    def __init__(self, sim, camera_name, camera_height, camera_width, image_convention=None):
+        self.sim = sim
+        self.camera_name = camera_name
+        self.camera_height = camera_height
+        self.camera_width = camera_width
+        self.camera_id = sim.model.camera_name2id(camera_name)
+
+        self.intrinsic_matrix = get_camera_intrinsic_matrix(sim, camera_name, camera_height, camera_width)
+        extent = sim.model.stat.extent
+        self.near = sim.model.vis.map.znear * extent
+        self.far = sim.model.vis.map.zfar * extent
+
+        # Camera-frame rays (x / z, y / z, 1) through every pixel, in the row order of the depth maps
+        f = self.intrinsic_matrix[0, 0]
+        rows, cols = np.meshgrid(np.arange(camera_height), np.arange(camera_width), indexing="ij")
+        if image_convention is None:
+            image_convention = macros.IMAGE_CONVENTION
+        if IMAGE_CONVENTION_MAPPING[image_convention] == 1:
+            # opengl depth maps start with the bottom row of the image
+            rows = rows[::-1]
+        self._camera_rays = np.stack(
+            [
+                (cols.ravel() - self.intrinsic_matrix[0, 2]) / f,
+                (rows.ravel() - self.intrinsic_matrix[1, 2]) / f,
+                np.ones(camera_height * camera_width),
+            ],
+            axis=-1,
+        )
+
+        self._camera_pos = None
+        self._camera_mat = None
+        self.refresh()
+
+    def refresh(self):
+        """
+        Recomputes the extrinsics if the camera moved since the last call.
+
+        Returns:
+            bool: True if the extrinsics changed
+        """
+        camera_pos = self.sim.data.cam_xpos[self.camera_id]
+        camera_mat = self.sim.data.cam_xmat[self.camera_id]
+        if (
+            self._camera_pos is not None
+            and np.array_equal(camera_pos, self._camera_pos)
+            and np.array_equal(camera_mat, self._camera_mat)
+        ):
+            return False
+        self._camera_pos = camera_pos.copy()
+        self._camera_mat = camera_mat.copy()
+        self.extrinsic_matrix = get_camera_extrinsic_matrix(self.sim, self.camera_name)
+        self.transform_matrix = get_camera_transform_matrix(
+            self.sim, self.camera_name, self.camera_height, self.camera_width
+        )
+        # Pixel rays in the world frame: a pixel at depth z is at world_rays * z + world_origin
+        self.world_rays = self._camera_rays @ self.extrinsic_matrix[:3, :3].T
+        self.world_origin = self.extrinsic_matrix[:3, 3]
+        return True
+
+    def real_depth(self, depth_map, out=None):
+        """
+        Converts a depth map normalized in [0, 1] into actual distances, like @get_real_depth_map but without checking
+        its range.
+
+        Args:
+            depth_map (np.array): normalized depth map, as returned by MuJoCo
+            out (None or np.array): if specified, array the distances are written into
+
+        Returns:
+            np.array: depth map of actual distances
+        """
+        out = np.multiply(depth_map, self.near / self.far - 1.0, out=out)
+        out += 1.0
+        return np.divide(self.near, out, out=out)
+
+    def point_cloud(self, depth_map):
+        """
+        Converts a depth map of this camera into world-frame points.
+
+        Args:
+            depth_map (np.array): (H, W) or (H, W, 1) normalized depth map, as returned by MuJoCo
+
+        Returns:
+            np.array: (H * W, 3) world-frame points, in the pixel order of @depth_map
+        """
+        self.refresh()
+        z = self.real_depth(np.asarray(depth_map).reshape(-1, 1))
+        points = np.multiply(self.world_rays, z)
+        points += self.world_origin
+        return points
+
+    def project_points(self, points):
+        """
+        Projects world-frame points into pixels of this camera, see @project_points_from_world_to_camera.
+
+        Args:
+            points (np.array): 3D points in world frame of shape [..., 3]
+
+        Returns:
+            np.array: (row, column) pixel indices of shape [..., 2], in the opencv convention
+        """
+        self.refresh()
+        return project_points_from_world_to_camera(points, self.transform_matrix, self.camera_height, self.camera_width)
+
+
+class PointCloudGenerator:
+    """
+    Fuses the depth maps of several cameras into a single world-frame point cloud, in one vectorized pass over all
+    the pixels. The pixel rays of all the cameras are stacked once, and only the slices of cameras that moved are
+    updated (see CameraGeometry).
+
+    Args:
+        sim (MjSim): simulator instance
+        camera_names (list of str): names of the cameras to fuse
+        camera_heights (int or list of int): height of the camera images in pixels, for each camera
+        camera_widths (int or list of int): width of the camera images in pixels, for each camera
+        voxel_size (None or float): if specified, the points are downsampled to one (averaged) point per voxel of
+            this size, see @voxel_downsample
+        bounds (None or 2-array of 3-array): if specified, (min, max) corners of the world-frame box outside of which
+            points are dropped (e.g.: the background, or the table)
+        image_convention (None or str): convention of the depth maps, see CameraGeometry
+    """
+
+    def __init__(
+        self,
+        sim,
+        camera_names,
+        camera_heights,
+        camera_widths,
+        voxel_size=None,
+        bounds=None,
+        image_convention=None,
+    ):
+        num_cameras = len(camera_names)
+        if isinstance(camera_heights, int):
+            camera_heights = [camera_heights] * num_cameras
+        if isinstance(camera_widths, int):
+            camera_widths = [camera_widths] * num_cameras
+        self.voxel_size = voxel_size
+        self.bounds = None if bounds is None else np.asarray(bounds, dtype=float)
+        self.geometries = [
+            CameraGeometry(sim, camera_name, height, width, image_convention=image_convention)
+            for camera_name, height, width in zip(camera_names, camera_heights, camera_widths)
+        ]
+
+        # Per-pixel (stacked over all cameras) rays, origins and depth conversion constants, in single precision like
+        # the depth maps, which halves the memory traffic of every frame
+        sizes = [height * width for height, width in zip(camera_heights, camera_widths)]
+        self._slices = [slice(start, start + size) for start, size in zip(np.cumsum([0] + sizes[:-1]), sizes)]
+        num_points = sum(sizes)
+        self._rays = np.empty((num_points, 3), dtype=np.float32)
+        self._origins = np.empty((num_points, 3), dtype=np.float32)
+        self._depth_scale = np.empty((num_points, 1), dtype=np.float32)
+        self._near = np.empty((num_points, 1), dtype=np.float32)
+        self._depth = np.empty((num_points, 1), dtype=np.float32)
+        self._points = np.empty((num_points, 3), dtype=np.float32)
+        for geometry, pixels in zip(self.geometries, self._slices):
+            self._depth_scale[pixels] = geometry.near / geometry.far - 1.0
+            self._near[pixels] = geometry.near
+            self._update_camera(geometry, pixels)
+
+    def _update_camera(self, geometry, pixels):
+        self._rays[pixels] = geometry.world_rays
+        self._origins[pixels] = geometry.world_origin
+
+    def __call__(self, depth_maps):
+        """
+        Args:
+            depth_maps (list of np.array): normalized depth map of each camera, as returned by MuJoCo
+
+        Returns:
+            np.array: (N, 3) world-frame points
+        """
+        for geometry, pixels, depth_map in zip(self.geometries, self._slices, depth_maps):
+            if geometry.refresh():
+                self._update_camera(geometry, pixels)
+            self._depth[pixels] = np.asarray(depth_map).reshape(-1, 1)
+
+        # Real depth (see CameraGeometry.real_depth) and world-frame points of all the pixels at once
+        z = self._depth
+        z *= self._depth_scale
+        z += 1.0
+        np.divide(self._near, z, out=z)
+        points = np.multiply(self._rays, z, out=self._points)
+        points += self._origins
+
+        if self.bounds is not None:
+            # Compare coordinate by coordinate, which is much faster than reducing an (N, 3) boolean array
+            inside = np.greater_equal(points[:, 0], self.bounds[0, 0])
+            for i in range(3):
+                if i > 0:
+                    inside &= points[:, i] >= self.bounds[0, i]
+                inside &= points[:, i] <= self.bounds[1, i]
+            points = points[inside]
+        else:
+            points = points.copy()
+        if self.voxel_size is not None:
+            points = voxel_downsample(points, self.voxel_size, origin=None if self.bounds is None else self.bounds[0])
+        return points
+
+
+def voxel_downsample(points, voxel_size, origin=None):
+    """
+    Downsamples a point cloud to the centroid of the points in each occupied voxel.
+
+    Args:
+        points (np.array): (N, 3) points
+        voxel_size (float): edge length of the (cubic) voxels
+        origin (None or 3-array): if specified, corner of the voxel grid, which must be below all the points (e.g.:
+            the lower corner of the bounds the points were cropped to). Defaults to the minimum of the points
+
+    Returns:
+        np.array: (M, 3) centroids of the M occupied voxels, sorted by voxel
+    """
+    if len(points) == 0:
+        return points
+    if origin is None:
+        origin = points.min(axis=0)
+    voxels = points - origin
+    voxels /= voxel_size
+    voxels = voxels.astype(np.int64)
+    # Flatten the voxel coordinates into a single key
+    dims = voxels.max(axis=0) + 1
+    keys = voxels[:, 0] * dims[1]
+    keys += voxels[:, 1]
+    keys *= dims[2]
+    keys += voxels[:, 2]
+    if np.prod(dims) <= 8 * len(points):
+        # Small grid (e.g.: cropped workspace): accumulate over all its voxels, which avoids sorting the points
+        counts = np.bincount(keys)
+        occupied = counts > 0
+        counts = counts[occupied]
+        sums = [np.bincount(keys, weights=points[:, i])[occupied] for i in range(3)]
+    else:
+        # Otherwise, find the occupied voxels with one sort
+        _, keys, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        keys = keys.ravel()
+        sums = [np.bincount(keys, weights=points[:, i]) for i in range(3)]
+    centroids = np.stack(sums, axis=-1)
+    centroids /= counts[:, None]
+    return centroids
+
+
+def create_point_cloud_observable(
+    env,
+    camera_names,
+    name="point_cloud",
+    voxel_size=None,
+    bounds=None,
+    modality="image",
+):
+    """
+    Creates an observable of the world-frame point cloud fused from the depth observations of several cameras (see
+    PointCloudGenerator), to be added with env.add_observable. The cameras must be part of @env's camera observations,
+    with depth enabled.
+
+    Args:
+        env (MujocoEnv): environment to observe
+        camera_names (list of str): names of the cameras to fuse
+        name (str): name of the observable
+        voxel_size (None or float): if specified, size of the voxels to downsample the point cloud with
+        bounds (None or 2-array of 3-array): if specified, (min, max) corners of the world-frame box to crop to
+        modality (str): modality of the observable
+
+    Returns:
+        Observable: point cloud observable, sampled along with the camera observations
+    """
+    depth_names = [f"{camera_name}_depth" for camera_name in camera_names]
+    camera_ids = [env.camera_names.index(camera_name) for camera_name in camera_names]
+    for camera_name, camera_id in zip(camera_names, camera_ids):
+        assert env.camera_depths[camera_id], f"Camera {camera_name} must have depth enabled"
+    generator = None
+
+    @sensor(modality=modality, requires=depth_names)
+    def point_cloud(obs_cache):
+        nonlocal generator
+        if not all(depth_name in obs_cache for depth_name in depth_names):
+            return np.zeros((0, 3))
+        # The simulation is re-created by hard resets
+        if generator is None or generator.geometries[0].sim is not env.sim:
+            generator = PointCloudGenerator(
+                env.sim,
+                camera_names,
+                [env.camera_heights[camera_id] for camera_id in camera_ids],
+                [env.camera_widths[camera_id] for camera_id in camera_ids],
+                voxel_size=voxel_size,
+                bounds=bounds,
+            )
+        return generator([obs_cache[depth_name] for depth_name in depth_names])
+
+    return Observable(name=name, sensor=point_cloud, sampling_rate=env.control_freq)
+
+
 class CameraMover:
     """
     A class for manipulating a camera.
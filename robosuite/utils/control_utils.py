@@ -1,10 +1,11 @@
 import numpy as np
 
+import robosuite.macros as macros
+import robosuite.utils.kernels as kernels
 import robosuite.utils.transform_utils as trans
 from robosuite.utils.numba import jit_decorator
 
 
-@jit_decorator
 def nullspace_torques(mass_matrix, nullspace_matrix, initial_joint, joint_pos, joint_vel, joint_kp=10):
     """
     For a robot with redundant DOF(s), a nullspace exists which is orthogonal to the remainder of the controllable
@@ -28,6 +29,18 @@ def nullspace_torques(mass_matrix, nullspace_matrix, initial_joint, joint_pos, j
     Returns:
           np.array: nullspace torques
     """
+    if macros.USE_FAST_KERNELS:
+        return kernels.nullspace_torques(
+            mass_matrix, nullspace_matrix, initial_joint, joint_pos, joint_vel, float(joint_kp)
+        )
+    return _nullspace_torques(mass_matrix, nullspace_matrix, initial_joint, joint_pos, joint_vel, joint_kp)
+
+
+@jit_decorator
+def _nullspace_torques(mass_matrix, nullspace_matrix, initial_joint, joint_pos, joint_vel, joint_kp=10):
+    """
+    Reference implementation of @nullspace_torques, see its docstring.
+    """
 
     # kv calculated below corresponds to critical damping
     joint_kv = np.sqrt(joint_kp) * 2
@@ -40,7 +53,6 @@ def nullspace_torques(mass_matrix, nullspace_matrix, initial_joint, joint_pos, j
     return nullspace_torques
 
 
-@jit_decorator
 def opspace_matrices(mass_matrix, J_full, J_pos, J_ori):
     """
     Calculates the relevant matrices used in the operational space control algorithm
@@ -59,6 +71,16 @@ def opspace_matrices(mass_matrix, J_full, J_pos, J_ori):
             - (np.array): orientation components of lambda matrix (as 2d array)
             - (np.array): nullspace matrix (as 2d array)
     """
+    if macros.USE_FAST_KERNELS:
+        return kernels.opspace_matrices(mass_matrix, J_full, J_pos, J_ori)
+    return _opspace_matrices(mass_matrix, J_full, J_pos, J_ori)
+
+
+@jit_decorator
+def _opspace_matrices(mass_matrix, J_full, J_pos, J_ori):
+    """
+    Reference implementation of @opspace_matrices, see its docstring.
+    """
     mass_matrix_inv = np.linalg.inv(mass_matrix)
 
     # J M^-1 J^T
@@ -82,7 +104,6 @@ def opspace_matrices(mass_matrix, J_full, J_pos, J_ori):
     return lambda_full, lambda_pos, lambda_ori, nullspace_matrix
 
 
-@jit_decorator
 def orientation_error(desired, current):
     """
     This function calculates a 3-dimensional orientation error vector for use in the
@@ -99,6 +120,16 @@ def orientation_error(desired, current):
     Returns:
         np.array: 2d array representing orientation error as a matrix
     """
+    if macros.USE_FAST_KERNELS:
+        return kernels.orientation_error(desired, current)
+    return _orientation_error(desired, current)
+
+
+@jit_decorator
+def _orientation_error(desired, current):
+    """
+    Reference implementation of @orientation_error, see its docstring.
+    """
     rc1 = current[0:3, 0]
     rc2 = current[0:3, 1]
     rc3 = current[0:3, 2]
@@ -0,0 +1,304 @@
+"""
+Headless, parallel playback of the demonstrations of a demo.hdf5 file (see collect_human_demonstrations.py or
+HDF5DemoWriter for its layout), to verify that they can still be replayed after changes to an environment, and to
+regenerate their observations (e.g.: with new cameras) into a new file.
+
+Each worker process opens the source file and creates its own (offscreen) environment once, then plays back the
+episodes it is handed:
+
+    - actions are replayed open loop from the initial state of the episode, and the simulation states reached are
+      compared with the recorded ones, which gives per-episode divergence statistics (see PlaybackReport)
+    - if observations are regenerated, the recorded states are set one by one and the observations at each of them
+      are sent back to the main process, which streams them into the new file
+
+Environments are only reloaded from an episode's model xml if it differs from the one of the previous episode
+played back by the same worker, and compiled models are otherwise reused through the model cache (see
+robosuite/utils/model_cache.py).
+"""
+
+import json
+import multiprocessing as mp
+from collections import namedtuple
+
+import h5py
+import numpy as np
+
+import robosuite
+import robosuite.macros as macros
+from robosuite.utils.hdf5_demo_writer import HDF5DemoWriter
+
+# Per-episode result of a playback. first_divergence is the first step whose state error exceeds the tolerance (-1
+# if there is none), and errors are the norms of the differences between replayed and recorded states
+PlaybackReport = namedtuple(
+    "PlaybackReport",
+    ["demo", "num_steps", "max_error", "mean_error", "final_error", "first_divergence", "success"],
+)
+
+# State of the playback worker of the current process, set by _init_worker
+_WORKER = None
+
+
+def env_kwargs_from_hdf5(hdf5_file):
+    """
+    Args:
+        hdf5_file (h5py.File): Opened demo.hdf5 file
+
+    Returns:
+        dict: keyword arguments of robosuite.make (including env_name) of the environment the demonstrations were
+            collected in
+    """
+    attrs = hdf5_file["data"].attrs
+    if "env_info" in attrs:
+        env_kwargs = json.loads(attrs["env_info"])
+    else:
+        env_args = json.loads(attrs["env_args"])
+        env_kwargs = dict(env_args["env_kwargs"])
+    env_kwargs.setdefault("env_name", attrs["env"])
+    return env_kwargs
+
+
+def make_playback_env(env_kwargs, camera_names=None, camera_height=84, camera_width=84, camera_depths=False):
+    """
+    Creates a headless environment to play demonstrations back in.
+
+    Args:
+        env_kwargs (dict): Keyword arguments of robosuite.make, see env_kwargs_from_hdf5
+        camera_names (None or list of str): Cameras to render observations from. If None, no images are rendered
+        camera_height (int): Height of the rendered images
+        camera_width (int): Width of the rendered images
+        camera_depths (bool): Whether to also render depth maps
+
+    Returns:
+        MujocoEnv: the environment
+    """
+    env_kwargs = dict(env_kwargs)
+    env_kwargs.update(has_renderer=False, ignore_done=True, use_camera_obs=bool(camera_names))
+    env_kwargs["has_offscreen_renderer"] = bool(camera_names)
+    if camera_names:
+        env_kwargs.update(
+            camera_names=camera_names,
+            camera_heights=camera_height,
+            camera_widths=camera_width,
+            camera_depths=camera_depths,
+        )
+    return robosuite.make(**env_kwargs)
+
+
+def load_episode(env, model_xml, initial_state, current_xml=None):
+    """
+    Resets @env to the start of an episode.
+
+    Args:
+        env (MujocoEnv): Environment to reset
+        model_xml (str): Model xml of the episode, as recorded (i.e.: before edit_model_xml)
+        initial_state (np.array): Flattened mujoco state the episode starts from
+        current_xml (None or str): Model xml @env was last loaded from by this function. If it matches @model_xml,
+            the simulation is reset in place instead of being reloaded
+
+    Returns:
+        str: @model_xml, to pass as @current_xml for the next episode
+    """
+    if model_xml == current_xml:
+        env.deterministic_reset = True
+        try:
+            env.reset()
+        finally:
+            env.deterministic_reset = False
+    else:
+        env.reset_from_xml_string(env.edit_model_xml(model_xml))
+    env.sim.reset()
+    env.sim.set_state_from_flattened(initial_state)
+    env.sim.forward()
+    return model_xml
+
+
+def replay_actions(env, states, actions, atol=0.0):
+    """
+    Replays @actions open loop from @states[0], and compares the states reached with the recorded @states.
+
+    Args:
+        env (MujocoEnv): Environment, already reset to @states[0] (see load_episode)
+        states (np.array): (T, state dim) recorded flattened states, states[t] being the state @actions[t] was applied
+            in
+        actions (np.array): (T, action dim) recorded actions
+        atol (float): Largest state error (norm) that is not considered a divergence
+
+    Returns:
+        3-tuple:
+
+            - (np.array) (T - 1,) norms of the errors between the replayed and recorded states, after each action but
+                the last one
+            - (int) index of the first action after which the error exceeds @atol, or -1
+            - (bool) whether the task is successful at the end of the replay
+    """
+    replayed = np.empty((max(len(actions) - 1, 0), states.shape[1]), dtype=np.float64)
+    for t, action in enumerate(actions):
+        env.step(action)
+        if t < len(replayed):
+            replayed[t] = env.sim.get_state().flatten()
+    errors = np.linalg.norm(replayed - states[1 : len(replayed) + 1], axis=1)
+    diverged = np.flatnonzero(errors > atol)
+    return errors, int(diverged[0]) if len(diverged) > 0 else -1, bool(env._check_success())
+
+
+def observe_states(env, states):
+    """
+    Sets @states one by one, and collects the observations at each of them.
+
+    Args:
+        env (MujocoEnv): Environment to observe
+        states (np.array): (T, state dim) flattened states
+
+    Returns:
+        dict: observation name -> (T, ...) array of the observations at each state
+    """
+    obs = {}
+    for t, state in enumerate(states):
+        env.sim.set_state_from_flattened(state)
+        env.sim.forward()
+        for key, value in env._get_observations(force_update=True).items():
+            if key not in obs:
+                value = np.asarray(value)
+                obs[key] = np.empty((len(states),) + value.shape, dtype=value.dtype)
+            obs[key][t] = value
+    return obs
+
+
+def _init_worker(hdf5_path, env_kwargs, env_options, model_cache_size):
+    global _WORKER
+    macros.MODEL_CACHE_SIZE = max(macros.MODEL_CACHE_SIZE, model_cache_size)
+    _WORKER = {
+        "file": h5py.File(hdf5_path, "r"),
+        "env": make_playback_env(env_kwargs, **env_options),
+        "xml": None,
+    }
+
+
+def _playback_demo(args):
+    """
+    Plays back demonstration @demo in the worker's environment (see module docstring).
+
+    Returns:
+        2-tuple:
+
+            - (PlaybackReport) divergence statistics of the episode
+            - (None or dict) observations at each recorded state, if @regenerate_obs
+    """
+    demo, atol, regenerate_obs = args
+    env, group = _WORKER["env"], _WORKER["file"]["data"][demo]
+    states, actions = group["states"][()], group["actions"][()]
+    model_xml = group.attrs["model_file"]
+
+    _WORKER["xml"] = load_episode(env, model_xml, states[0], current_xml=_WORKER["xml"])
+    errors, first_divergence, success = replay_actions(env, states, actions, atol=atol)
+    report = PlaybackReport(
+        demo=demo,
+        num_steps=len(actions),
+        max_error=float(errors.max()) if len(errors) > 0 else 0.0,
+        mean_error=float(errors.mean()) if len(errors) > 0 else 0.0,
+        final_error=float(errors[-1]) if len(errors) > 0 else 0.0,
+        first_divergence=first_divergence,
+        success=success,
+    )
+    obs = observe_states(env, states) if regenerate_obs else None
+    return report, obs
+
+
+def _write_demo(writer, group, obs):
+    """
+    Copies demonstration @group (an h5py group of the source file) and its regenerated observations @obs into
+    @writer.
+    """
+    states, actions = group["states"][()], group["actions"][()]
+    num_steps = len(actions)
+    rewards = group["rewards"][()] if "rewards" in group else np.zeros(num_steps)
+    dones = group["dones"][()] if "dones" in group else np.arange(num_steps) == num_steps - 1
+    ep_meta = json.loads(group.attrs["ep_meta"]) if "ep_meta" in group.attrs else None
+    writer.start_episode(group.attrs["model_file"], ep_meta=ep_meta)
+    for t in range(num_steps):
+        writer.add_step(
+            states[t],
+            actions[t],
+            reward=rewards[t],
+            done=dones[t],
+            obs={key: value[t] for key, value in obs.items()},
+        )
+    writer.end_episode(success=bool(group.attrs.get("success", False)))
+
+
+def playback_demonstrations(
+    hdf5_path,
+    demos=None,
+    num_workers=None,
+    atol=0.0,
+    output_path=None,
+    camera_names=None,
+    camera_height=84,
+    camera_width=84,
+    camera_depths=False,
+    model_cache_size=8,
+    start_method=None,
+    callback=None,
+):
+    """
+    Plays back demonstrations across a pool of worker processes (see module docstring).
+
+    Args:
+        hdf5_path (str): Path of the demo.hdf5 file
+        demos (None or list of str): Names of the demonstrations to play back. Defaults to all of them
+        num_workers (None or int): Number of worker processes. Defaults to min(number of demonstrations, cpu_count)
+        atol (float): Largest state error (norm) that is not considered a divergence
+        output_path (None or str): If specified, path of the HDF5 file to write the demonstrations to, along with
+            their observations regenerated at every recorded state
+        camera_names (None or list of str): Cameras to render image observations from, if @output_path is specified
+        camera_height (int): Height of the rendered images
+        camera_width (int): Width of the rendered images
+        camera_depths (bool): Whether to also render depth maps
+        model_cache_size (int): Minimum size of the compiled model cache of each worker (see
+            macros.MODEL_CACHE_SIZE)
+        start_method (None or str): multiprocessing start method to use for the workers ("fork", "spawn",
+            "forkserver"). If None, uses the platform default
+        callback (None or function): If specified, called with the PlaybackReport of each episode as soon as it is
+            played back
+
+    Returns:
+        list of PlaybackReport: one report per demonstration, in the order of @demos
+    """
+    with h5py.File(hdf5_path, "r") as f:
+        env_kwargs = env_kwargs_from_hdf5(f)
+        if demos is None:
+            demos = list(f["data"].keys())
+        env_info = f["data"].attrs.get("env_info", None)
+    if len(demos) == 0:
+        return []
+    num_workers = min(len(demos), mp.cpu_count()) if num_workers is None else num_workers
+    regenerate_obs = output_path is not None
+    env_options = dict(
+        camera_names=camera_names if regenerate_obs else None,
+        camera_height=camera_height,
+        camera_width=camera_width,
+        camera_depths=camera_depths,
+    )
+
+    writer, source = None, None
+    if regenerate_obs:
+        writer = HDF5DemoWriter(output_path, env_name=env_kwargs["env_name"], env_info=env_info)
+        source = h5py.File(hdf5_path, "r")
+    reports = []
+    ctx = mp.get_context(start_method)
+    try:
+        with ctx.Pool(
+            num_workers, initializer=_init_worker, initargs=(hdf5_path, env_kwargs, env_options, model_cache_size)
+        ) as pool:
+            # Results come back in order, so that the output file keeps the order of the source file
+            for report, obs in pool.imap(_playback_demo, [(demo, atol, regenerate_obs) for demo in demos]):
+                reports.append(report)
+                if writer is not None:
+                    _write_demo(writer, source["data"][report.demo], obs)
+                if callback is not None:
+                    callback(report)
+    finally:
+        if writer is not None:
+            writer.close()
+            source.close()
+    return reports
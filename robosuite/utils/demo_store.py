@@ -0,0 +1,216 @@
+"""
+Indexed, memory-mapped store of demonstration states, built once from a demo.hdf5 file (see
+collect_human_demonstrations.py or HDF5DemoWriter for its layout).
+
+Sampling states from the HDF5 file directly means keeping an open file handle (and its chunk caches) per process, and
+going through h5py for every sample. Instead, the states of all the demonstrations are concatenated into a single
+.npy array that is memory-mapped read-only, so that any state is an O(1) slice, and so that all the processes that
+sample from the same store share its pages through the OS page cache. The store is a directory with:
+
+    states.npy - (total number of states, state dim) float64 array of all the states, demonstration after demonstration
+    index.npz - offsets (the first state of each demonstration, plus the total number of states), xml_ids (index of
+        the model xml of each demonstration in the xml table), demo_names, env, and the size and modification time of
+        the HDF5 file the store was built from
+    xmls.json - deduplicated list of model xml strings, only loaded if needed
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import h5py
+import numpy as np
+
+from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
+
+STATES_FILE = "states.npy"
+INDEX_FILE = "index.npz"
+XMLS_FILE = "xmls.json"
+
+
+def _source_stamp(hdf5_path):
+    stat = os.stat(hdf5_path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def _model_xml(demo, models_dir):
+    """
+    Returns:
+        str: model xml of HDF5 group @demo. Its model_file attribute is either the xml string itself, or (in older
+            datasets) the name of an xml file in @models_dir
+    """
+    model_file = demo.attrs["model_file"]
+    if isinstance(model_file, bytes):
+        model_file = model_file.decode("utf-8")
+    if models_dir is not None and not model_file.lstrip().startswith("<"):
+        with open(os.path.join(models_dir, model_file), "r") as f:
+            return f.read()
+    return model_file
+
+
+def build_demo_store(hdf5_path, store_path, models_dir=None):
+    """
+    Converts the demonstrations of @hdf5_path into a demo store at @store_path. The store is written into a temporary
+    directory first and then renamed, so that concurrent processes never see a partial store (if several processes
+    build the same store, the first one to finish wins).
+
+    Args:
+        hdf5_path (str): Path of the demo.hdf5 file to convert
+        store_path (str): Directory to create the store in. Must not exist yet
+        models_dir (None or str): Directory of the model xml files, for datasets whose model_file attributes are file
+            names
+    """
+    parent = os.path.dirname(os.path.abspath(store_path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=".demo_store_", dir=parent)
+    try:
+        stamp = _source_stamp(hdf5_path)
+        with h5py.File(hdf5_path, "r") as f:
+            data = f["data"]
+            demo_names = list(data.keys())
+            lengths = [data[name]["states"].shape[0] for name in demo_names]
+            offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64)
+            state_dim = data[demo_names[0]]["states"].shape[1] if demo_names else 0
+
+            # Copy the states demonstration by demonstration, straight into the (memory-mapped) output array
+            states = np.lib.format.open_memmap(
+                os.path.join(tmp_path, STATES_FILE), mode="w+", dtype=np.float64, shape=(int(offsets[-1]), state_dim)
+            )
+            xml_ids, xml_table = np.zeros(len(demo_names), dtype=np.int32), {}
+            for i, name in enumerate(demo_names):
+                demo = data[name]
+                if lengths[i] > 0:
+                    demo["states"].read_direct(states, dest_sel=np.s_[offsets[i] : offsets[i + 1]])
+                xml_ids[i] = xml_table.setdefault(_model_xml(demo, models_dir), len(xml_table))
+            states.flush()
+            del states
+
+            np.savez(
+                os.path.join(tmp_path, INDEX_FILE),
+                offsets=offsets,
+                xml_ids=xml_ids,
+                demo_names=np.array(demo_names, dtype=str),
+                env=np.array(data.attrs.get("env", "")),
+                source_stamp=stamp,
+            )
+        with open(os.path.join(tmp_path, XMLS_FILE), "w") as f:
+            # Dicts keep insertion order, i.e.: the order of the xml ids
+            json.dump(list(xml_table.keys()), f)
+
+        try:
+            os.rename(tmp_path, store_path)
+        except OSError:
+            if not os.path.exists(os.path.join(store_path, INDEX_FILE)):
+                raise
+    finally:
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+
+
+def open_demo_store(hdf5_path, store_path=None, models_dir=None):
+    """
+    Opens the demo store built from @hdf5_path, building it first if it does not exist yet, or (re)building it if
+    @hdf5_path changed since.
+
+    Args:
+        hdf5_path (str): Path of the demo.hdf5 file
+        store_path (None or str): Directory of the store. Defaults to a demo_store directory next to @hdf5_path
+        models_dir (None or str): See build_demo_store
+
+    Returns:
+        DemoStore: the opened store
+    """
+    if store_path is None:
+        store_path = os.path.join(os.path.dirname(os.path.abspath(hdf5_path)), "demo_store")
+    if os.path.exists(os.path.join(store_path, INDEX_FILE)):
+        store = DemoStore(store_path)
+        if np.array_equal(store.source_stamp, _source_stamp(hdf5_path)):
+            return store
+        ROBOSUITE_DEFAULT_LOGGER.warning("{} changed, rebuilding demo store {}".format(hdf5_path, store_path))
+        del store
+        stale_path = tempfile.mkdtemp(prefix=".demo_store_stale_", dir=os.path.dirname(os.path.abspath(store_path)))
+        try:
+            os.replace(store_path, stale_path)
+        except OSError:
+            # Another process is rebuilding it
+            pass
+        shutil.rmtree(stale_path, ignore_errors=True)
+    if not os.path.exists(os.path.join(store_path, INDEX_FILE)):
+        build_demo_store(hdf5_path, store_path, models_dir=models_dir)
+    return DemoStore(store_path)
+
+
+class DemoStore:
+    """
+    Read-only view of a demo store (see module docstring), with the states memory-mapped.
+
+    Args:
+        store_path (str): Directory of the store, as created by build_demo_store
+    """
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        self.states = np.load(os.path.join(store_path, STATES_FILE), mmap_mode="r")
+        with np.load(os.path.join(store_path, INDEX_FILE)) as index:
+            self.offsets = index["offsets"]
+            self.xml_ids = index["xml_ids"]
+            self.demo_names = [str(name) for name in index["demo_names"]]
+            self.env_name = str(index["env"])
+            self.source_stamp = index["source_stamp"]
+        self.lengths = np.diff(self.offsets)
+        self._name_to_index = {name: i for i, name in enumerate(self.demo_names)}
+        self._xmls = None
+
+    @property
+    def num_demos(self):
+        """
+        Returns:
+            int: number of demonstrations in the store
+        """
+        return len(self.demo_names)
+
+    def demo_index(self, demo_name):
+        """
+        Args:
+            demo_name (str): Name of a demonstration group in the source HDF5 file, e.g.: "demo_3"
+
+        Returns:
+            int: index of the demonstration in the store
+        """
+        return self._name_to_index[demo_name]
+
+    def demo_states(self, demo_index):
+        """
+        Args:
+            demo_index (int): Index of the demonstration
+
+        Returns:
+            np.array: (length, state dim) read-only view of all the states of the demonstration
+        """
+        return self.states[self.offsets[demo_index] : self.offsets[demo_index + 1]]
+
+    def state(self, demo_index, t):
+        """
+        Args:
+            demo_index (int): Index of the demonstration
+            t (int): Time step in the demonstration
+
+        Returns:
+            np.array: copy of the flattened mujoco state at step @t of the demonstration
+        """
+        assert 0 <= t < self.lengths[demo_index], "Step {} out of range for demonstration {}".format(t, demo_index)
+        return np.array(self.states[self.offsets[demo_index] + t])
+
+    def xml(self, demo_index):
+        """
+        Args:
+            demo_index (int): Index of the demonstration
+
+        Returns:
+            str: model xml of the demonstration
+        """
+        if self._xmls is None:
+            with open(os.path.join(self.store_path, XMLS_FILE), "r") as f:
+                self._xmls = json.load(f)
+        return self._xmls[self.xml_ids[demo_index]]
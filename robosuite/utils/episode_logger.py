@@ -0,0 +1,251 @@
+"""
+Append-only, chunked logging of per-step episode data.
+
+Each logged quantity is stored as a column, i.e.: a standard .npy file that grows by one row per logged step.
+Rows are first accumulated into preallocated buffers and written out in chunks (every @flush_interval rows, or
+explicitly at the end of an episode) by a background thread, so the cost of logging a step is a copy into memory,
+and the total amount of I/O is linear in the number of logged steps. The .npy headers are kept up to date after
+every chunk, so a store can be read (e.g.: memory-mapped with @load_episode_log) while it is still being written.
+
+Store layout:
+
+    <path>/<table>/<column>.npy
+
+where each table holds columns with the same number of rows, plus an "episode" column with the episode index of
+each row.
+"""
+
+import os
+import queue
+import threading
+
+import numpy as np
+
+# Fixed size reserved for the .npy headers, so that the row count can be rewritten in place after each chunk
+NPY_HEADER_SIZE = 128
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def _npy_header(dtype, shape):
+    """
+    Builds a .npy (version 1.0) header padded to NPY_HEADER_SIZE bytes.
+
+    Args:
+        dtype (np.dtype): Data type of the array
+        shape (tuple): Shape of the array
+
+    Returns:
+        bytes: Header to write at the beginning of the .npy file
+    """
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': {!r}, }}".format(
+        np.lib.format.dtype_to_descr(dtype), tuple(shape)
+    )
+    # magic string + 2 bytes for the header length, the header itself is terminated by a newline
+    header_len = NPY_HEADER_SIZE - len(NPY_MAGIC) - 2
+    assert len(header) < header_len, "Shape {} too large for the .npy header".format(shape)
+    header = header.ljust(header_len - 1) + "\n"
+    return NPY_MAGIC + header_len.to_bytes(2, "little") + header.encode("latin1")
+
+
+class _Column:
+    """
+    Preallocated buffer for a single column, together with its backing .npy file.
+
+    Args:
+        filename (str): Path to the .npy file
+        value (np.array): First value logged in this column, used to infer the shape and dtype of the rows
+        capacity (int): Number of rows held in memory before they need to be flushed
+    """
+
+    def __init__(self, filename, value, capacity):
+        value = np.asarray(value)
+        self.filename = filename
+        self.row_shape = value.shape
+        self.dtype = value.dtype
+        self.buffer = np.zeros((capacity,) + self.row_shape, dtype=self.dtype)
+        self.rows_written = 0
+        self.file = open(filename, "wb")
+        self.file.write(_npy_header(self.dtype, (0,) + self.row_shape))
+        self.file.flush()
+
+    def write(self, rows):
+        """
+        Appends @rows to the file and updates the header. Only ever called from the writer thread.
+
+        Args:
+            rows (np.array): (n,) + row_shape array of rows to append
+        """
+        self.file.seek(0, os.SEEK_END)
+        self.file.write(np.ascontiguousarray(rows).tobytes())
+        self.rows_written += len(rows)
+        self.file.seek(0)
+        self.file.write(_npy_header(self.dtype, (self.rows_written,) + self.row_shape))
+        self.file.flush()
+
+
+class EpisodeLogger:
+    """
+    Append-only logger of per-step quantities, with bounded memory usage and background writes.
+
+    Args:
+        path (str): Directory in which to store the logged data. Existing data in this directory is overwritten
+        flush_interval (int): Number of rows buffered in memory (per table) before they are written to disk
+        background (bool): If True, chunks are written to disk by a background thread. Else, writes are synchronous
+    """
+
+    def __init__(self, path, flush_interval=1000, background=True):
+        assert flush_interval > 0, "flush_interval must be positive, got {}".format(flush_interval)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.episode = 0
+        self._episode_rows = 0
+
+        # table name -> {"columns": {name: _Column}, "names": names of the logged columns, "size": number of buffered
+        # rows}
+        self._tables = {}
+
+        self._queue = None
+        self._writer = None
+        self._error = None
+        if background:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        """
+        Writer thread: writes the chunks that are handed over by @flush, until a None sentinel is received.
+        """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                for column, rows in item:
+                    column.write(rows)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _check_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Failed to write episode log to {}".format(self.path)) from error
+
+    def _create_table(self, table, values):
+        table_dir = os.path.join(self.path, table)
+        os.makedirs(table_dir, exist_ok=True)
+        names = frozenset(values)
+        values = dict(values, episode=self.episode)
+        columns = {
+            name: _Column(os.path.join(table_dir, name + ".npy"), value, self.flush_interval)
+            for name, value in values.items()
+        }
+        self._tables[table] = {"columns": columns, "names": names, "size": 0}
+
+    def log(self, table, **values):
+        """
+        Appends one row to @table. The columns of a table are defined by the first row logged into it, and every
+        subsequent row must provide values for the same columns, with the same shapes.
+
+        Args:
+            table (str): Name of the table to log into (e.g.: "details" or "rewards")
+            values: Column name -> value of this row
+
+        Raises:
+            ValueError: [Columns differ from the first row of the table]
+        """
+        if table not in self._tables:
+            self._create_table(table, values)
+        entry = self._tables[table]
+        if values.keys() != entry["names"]:
+            raise ValueError(
+                "Row of table {} logs columns {} and is missing columns {}, compared to its first row".format(
+                    table, sorted(values.keys() - entry["names"]), sorted(entry["names"] - values.keys())
+                )
+            )
+        columns, size = entry["columns"], entry["size"]
+        for name, value in values.items():
+            columns[name].buffer[size] = value
+        columns["episode"].buffer[size] = self.episode
+        entry["size"] = size + 1
+        self._episode_rows += 1
+        if entry["size"] == self.flush_interval:
+            self._flush_table(entry)
+
+    def _flush_table(self, entry):
+        if entry["size"] == 0:
+            return
+        size = entry["size"]
+        # Copies are handed over, so that the buffers can immediately be reused for the next rows
+        chunk = [(column, column.buffer[:size].copy()) for column in entry["columns"].values()]
+        entry["size"] = 0
+        if self._queue is not None:
+            self._queue.put(chunk)
+        else:
+            for column, rows in chunk:
+                column.write(rows)
+
+    def flush(self, wait=False):
+        """
+        Writes all the buffered rows.
+
+        Args:
+            wait (bool): If True, blocks until all the rows logged so far are on disk
+        """
+        self._check_error()
+        for entry in self._tables.values():
+            self._flush_table(entry)
+        if wait and self._queue is not None:
+            self._queue.join()
+            self._check_error()
+
+    def end_episode(self):
+        """
+        Flushes all the rows of the current episode to disk, and starts a new episode. Does nothing if no rows were
+        logged since the last call, so that it can safely be called both on termination and on reset.
+        """
+        if self._episode_rows == 0:
+            return
+        self.flush(wait=True)
+        self.episode += 1
+        self._episode_rows = 0
+
+    def close(self):
+        """
+        Flushes all the buffered rows, stops the writer thread and closes the column files.
+        """
+        self.flush(wait=True)
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        for entry in self._tables.values():
+            for column in entry["columns"].values():
+                column.file.close()
+        self._tables = {}
+
+
+def load_episode_log(path, mmap_mode="r"):
+    """
+    Loads a store written by an EpisodeLogger.
+
+    Args:
+        path (str): Directory the EpisodeLogger wrote to
+        mmap_mode (None or str): Memory-map mode passed to np.load. Use None to load the arrays in memory
+
+    Returns:
+        dict: table name -> {column name -> np.array} of all the rows written so far
+    """
+    log = {}
+    for table in sorted(os.listdir(path)):
+        table_dir = os.path.join(path, table)
+        if not os.path.isdir(table_dir):
+            continue
+        log[table] = {
+            os.path.splitext(name)[0]: np.load(os.path.join(table_dir, name), mmap_mode=mmap_mode)
+            for name in sorted(os.listdir(table_dir))
+            if name.endswith(".npy")
+        }
+    return log
@@ -0,0 +1,120 @@
+"""
+Collection of streaming (sample-by-sample) signal filters, e.g. for smoothing force / torque readings
+inside the control loop.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from robosuite.utils.numba import jit_decorator
+
+
+@lru_cache(maxsize=None)
+def butterworth_sos(order, cutoff, fs):
+    """
+    Designs a low-pass Butterworth filter in second-order sections. Designs are cached, so all filters sharing the
+    same (order, cutoff, fs) reuse a single design.
+
+    Args:
+        order (int): Order of the filter
+        cutoff (float): Cutoff frequency (Hz), 0 < cutoff < fs / 2
+        fs (float): Sampling frequency (Hz) of the filtered signal
+
+    Returns:
+        2-tuple:
+
+            - (np.array) (n_sections, 6) array of second-order section coefficients
+            - (np.array) (n_sections, 2) steady-state initial conditions for a unit step input
+    """
+    # scipy.signal is slow to import, and only needed when designing a filter
+    from scipy.signal import butter, sosfilt_zi
+
+    sos = butter(order, cutoff, btype="low", fs=fs, output="sos")
+    zi = sosfilt_zi(sos)
+    sos.flags.writeable = False
+    zi.flags.writeable = False
+    return sos, zi
+
+
+@jit_decorator
+def sos_filter_step(sos, state, x):
+    """
+    Filters a single multi-channel sample through a cascade of second-order sections (transposed direct form II),
+    updating the filter @state in place.
+
+    Args:
+        sos (np.array): (n_sections, 6) second-order section coefficients [b0, b1, b2, a0, a1, a2]
+        state (np.array): (n_sections, 2, n_channels) filter state, modified in place
+        x (np.array): (n_channels,) input sample
+
+    Returns:
+        np.array: (n_channels,) filtered sample
+    """
+    y = x.copy()
+    for s in range(sos.shape[0]):
+        b0, b1, b2, a1, a2 = sos[s, 0], sos[s, 1], sos[s, 2], sos[s, 4], sos[s, 5]
+        for c in range(y.shape[0]):
+            xc = y[c]
+            yc = b0 * xc + state[s, 0, c]
+            state[s, 0, c] = b1 * xc - a1 * yc + state[s, 1, c]
+            state[s, 1, c] = b2 * xc - a2 * yc
+            y[c] = yc
+    return y
+
+
+class ButterworthFilter:
+    """
+    Causal low-pass Butterworth filter that processes one multi-channel sample at a time.
+
+    The filter is designed once at construction (see @butterworth_sos) and keeps its own IIR state, so every call
+    to filter() is a single pass through the second-order sections for all channels at once.
+
+    Args:
+        dim (int): Number of channels being filtered (e.g.: 6 for a force / torque reading)
+        cutoff (float): Cutoff frequency (Hz)
+        fs (float): Frequency (Hz) at which new samples are fed into the filter
+        order (int): Order of the filter
+    """
+
+    def __init__(self, dim, cutoff, fs, order=5):
+        self.dim = dim
+        self.cutoff = cutoff
+        self.fs = fs
+        self.order = order
+        sos, zi = butterworth_sos(order, float(cutoff), float(fs))
+        # The cached design is read-only, keep a private copy
+        self.sos, self._zi = sos.copy(), zi.copy()
+        self.state = np.zeros((self.sos.shape[0], 2, dim))
+        self._initialized = False
+
+    def reset(self, value=None):
+        """
+        Resets the filter state. If @value is specified, the state is set as if the filter had been fed @value
+        forever (i.e.: the output starts at @value with no transient). Else, the state is set from the next sample.
+
+        Args:
+            value (None or np.array): Optional steady-state value to initialize the filter with
+        """
+        if value is None:
+            self.state[:] = 0.0
+            self._initialized = False
+        else:
+            self.state[:] = self._zi[:, :, None] * np.asarray(value, dtype=np.float64)[None, None, :]
+            self._initialized = True
+
+    def filter(self, value):
+        """
+        Filters a new sample.
+
+        Args:
+            value (np.array): (dim,) new sample
+
+        Returns:
+            np.array: (dim,) filtered sample
+        """
+        value = np.asarray(value, dtype=np.float64)
+        # Start from steady state on the first sample to avoid the transient from zero
+        if not self._initialized:
+            self.reset(value)
+        return sos_filter_step(self.sos, self.state, value)
@@ -0,0 +1,296 @@
+"""
+Streaming writer of demonstrations into a single HDF5 file, in the robomimic dataset layout.
+
+Per-step data is first accumulated into preallocated buffers and appended in chunks (every @chunk_size steps, or at
+the end of an episode) to resizable, chunked and compressed datasets by a background thread, so that recording a
+step only costs a copy into memory, and nothing needs to be gathered / concatenated once collection is over. The
+number of chunks waiting to be written is bounded, so that recording blocks when the disk cannot keep up instead of
+buffering without limit.
+
+Every step of a demonstration must record the same keys (those of its first step), so that all the datasets of a
+demonstration have one row per step.
+
+File layout:
+
+    data (group)
+        total (attribute) - total number of samples over all demonstrations
+        env (attribute) - environment name on which demos were collected
+        env_args (attribute) - JSON-encoded {"env_name", "type", "env_kwargs"}, as expected by robomimic
+        env_info (attribute) - JSON-encoded environment information (e.g.: controller and robot info), if given
+        date / time / repository_version (attributes) - when and with which version demos were collected
+
+        demo_0 (group) - every demonstration has a group
+            num_samples (attribute) - number of steps in the demonstration
+            model_file (attribute) - model xml string for the demonstration
+            ep_meta (attribute) - JSON-encoded episode metadata
+            success (attribute) - whether the demonstration was successful
+            states (dataset) - flattened mujoco states, before each action
+            actions (dataset) - actions applied during the demonstration
+            rewards (dataset) - rewards received after each action
+            dones (dataset) - whether the episode was done after each action
+            obs (group) - (optional) one dataset per observation, before each action
+
+        demo_1 (group)
+        ...
+
+    mask (group)
+        successful (dataset) - names of the successful demonstrations (robomimic filter key)
+"""
+
+import datetime
+import json
+import queue
+import threading
+
+import h5py
+import numpy as np
+
+import robosuite
+
+# robomimic's EnvType.ROBOSUITE_TYPE
+ROBOMIMIC_ROBOSUITE_ENV_TYPE = 1
+
+
+class HDF5DemoWriter:
+    """
+    Streams demonstrations into an HDF5 file (see module docstring for the layout), with background writes.
+
+    Args:
+        path (str): Path of the HDF5 file to write. An existing file is overwritten
+        env_name (None or str): Name of the environment the demonstrations are collected in
+        env_info (None or str): JSON-encoded environment information, e.g.: the kwargs used to create the environment
+        chunk_size (int): Number of steps buffered in memory before they are appended to the file. Also the chunk
+            size of the datasets
+        compression (None or str): HDF5 compression filter of the datasets, e.g.: "lzf" (fast) or "gzip" (smaller)
+        background (bool): If True, the file is written by a background thread. Else, writes are synchronous
+        max_pending (int): Maximum number of file operations (mostly chunks) waiting for the background thread.
+            Recording blocks once it is reached, until the writer catches up
+    """
+
+    def __init__(
+        self,
+        path,
+        env_name=None,
+        env_info=None,
+        chunk_size=256,
+        compression="lzf",
+        background=True,
+        max_pending=8,
+    ):
+        assert chunk_size > 0, "chunk_size must be positive, got {}".format(chunk_size)
+        assert max_pending > 0, "max_pending must be positive, got {}".format(max_pending)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.num_demos = 0
+        self.total = 0
+        self._successful = []
+
+        # Current episode: name, key -> (buffer, row count) of the buffered steps, and step count
+        self._demo = None
+        self._buffers = {}
+        self._size = 0
+        self._num_samples = 0
+
+        self._queue = None
+        self._writer = None
+        self._error = None
+        if background:
+            self._queue = queue.Queue(maxsize=max_pending)
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+        env_args = {"env_name": env_name, "type": ROBOMIMIC_ROBOSUITE_ENV_TYPE, "env_kwargs": {}}
+        if env_info is not None:
+            env_args["env_kwargs"] = json.loads(env_info)
+        now = datetime.datetime.now()
+        attrs = {
+            "total": 0,
+            "env": env_name or "",
+            "env_args": json.dumps(env_args),
+            "date": "{}-{}-{}".format(now.month, now.day, now.year),
+            "time": "{}:{}:{}".format(now.hour, now.minute, now.second),
+            "repository_version": robosuite.__version__,
+        }
+        if env_info is not None:
+            attrs["env_info"] = env_info
+        self._submit(self._open, attrs)
+
+    def _write_loop(self):
+        """
+        Writer thread: runs the file operations handed over by @_submit, until a None sentinel is received.
+        """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                fn, args = item
+                fn(*args)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _submit(self, fn, *args):
+        """
+        Runs file operation @fn(*args) on the writer thread, or right away if writes are synchronous.
+        """
+        if self._queue is not None:
+            self._queue.put((fn, args))
+        else:
+            fn(*args)
+
+    def _check_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Failed to write demonstrations to {}".format(self.path)) from error
+
+    # File operations, only ever run by the writer thread (or synchronously)
+
+    def _open(self, attrs):
+        self._file = h5py.File(self.path, "w")
+        data = self._file.create_group("data")
+        data.attrs.update(attrs)
+
+    def _create_demo(self, demo, attrs):
+        self._file["data"].create_group(demo).attrs.update(attrs)
+
+    def _append(self, demo, chunk):
+        group = self._file["data"][demo]
+        for key, rows in chunk.items():
+            if key not in group:
+                group.create_dataset(
+                    key,
+                    data=rows,
+                    maxshape=(None,) + rows.shape[1:],
+                    chunks=(self.chunk_size,) + rows.shape[1:],
+                    compression=self.compression,
+                )
+            else:
+                dataset = group[key]
+                start = dataset.shape[0]
+                dataset.resize(start + len(rows), axis=0)
+                dataset[start:] = rows
+
+    def _finish_demo(self, demo, attrs, total, successful):
+        self._file["data"][demo].attrs.update(attrs)
+        self._file["data"].attrs["total"] = total
+        if "mask" in self._file and "successful" in self._file["mask"]:
+            del self._file["mask"]["successful"]
+        self._file.require_group("mask").create_dataset("successful", data=np.array(successful, dtype="S"))
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+    # Public API, called from the collecting thread
+
+    def start_episode(self, model_xml, ep_meta=None):
+        """
+        Starts recording a new demonstration. Ends the current one (as unsuccessful) if it was not ended.
+
+        Args:
+            model_xml (str): Model xml string of the demonstration
+            ep_meta (None or dict): Episode metadata
+
+        Returns:
+            str: name of the demonstration group
+        """
+        self._check_error()
+        if self._demo is not None:
+            self.end_episode(success=False)
+        self._demo = "demo_{}".format(self.num_demos)
+        self.num_demos += 1
+        self._num_samples = 0
+        self._submit(self._create_demo, self._demo, {"model_file": model_xml, "ep_meta": json.dumps(ep_meta or {})})
+        return self._demo
+
+    def add_step(self, state, action, reward=0.0, done=False, obs=None, **extras):
+        """
+        Records one step of the current demonstration.
+
+        Args:
+            state (np.array): Flattened mujoco state before @action was applied
+            action (np.array): Action applied
+            reward (float): Reward received after @action
+            done (bool): Whether the episode was done after @action
+            obs (None or dict): If specified, observations (before @action) to store in the obs group
+            extras: Additional per-step arrays to store, e.g.: actions_abs
+
+        Raises:
+            ValueError: [Keys differ from the first step of the demonstration]
+        """
+        assert self._demo is not None, "start_episode must be called before add_step"
+        values = {"states": state, "actions": action, "rewards": reward, "dones": done}
+        values.update(extras)
+        if obs is not None:
+            values.update({"obs/" + key: value for key, value in obs.items()})
+        # The buffers of an episode are created on its first step, so they hold exactly the keys of that step
+        if self._num_samples > 0 and values.keys() != self._buffers.keys():
+            raise ValueError(
+                "Step {} of {} records keys {} and is missing keys {}, compared to its first step".format(
+                    self._num_samples,
+                    self._demo,
+                    sorted(values.keys() - self._buffers.keys()),
+                    sorted(self._buffers.keys() - values.keys()),
+                )
+            )
+        for key, value in values.items():
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                value = np.asarray(value)
+                buffer = self._buffers[key] = np.zeros((self.chunk_size,) + value.shape, dtype=value.dtype)
+            buffer[self._size] = value
+        self._size += 1
+        self._num_samples += 1
+        if self._size == self.chunk_size:
+            self._flush_buffers()
+
+    def _flush_buffers(self):
+        if self._size == 0:
+            return
+        # Copies are handed over, so that the buffers can immediately be reused for the next steps
+        chunk = {key: buffer[: self._size].copy() for key, buffer in self._buffers.items()}
+        self._size = 0
+        self._submit(self._append, self._demo, chunk)
+
+    def end_episode(self, success=False):
+        """
+        Writes the rest of the current demonstration, and its metadata. Does nothing if no episode is in progress.
+
+        Args:
+            success (bool): Whether the demonstration was successful
+        """
+        self._check_error()
+        if self._demo is None:
+            return
+        self._flush_buffers()
+        # The observation keys of the next episode may differ (e.g.: after observables were enabled / disabled)
+        self._buffers = {}
+        self.total += self._num_samples
+        if success:
+            self._successful.append(self._demo)
+        attrs = {"num_samples": self._num_samples, "success": bool(success)}
+        self._submit(self._finish_demo, self._demo, attrs, self.total, list(self._successful))
+        self._demo = None
+
+    def flush(self):
+        """
+        Blocks until everything recorded so far is written to the file.
+        """
+        if self._queue is not None:
+            self._queue.join()
+        self._check_error()
+
+    def close(self):
+        """
+        Ends the current demonstration (as unsuccessful) if any, stops the writer thread and closes the file.
+        """
+        self.end_episode(success=False)
+        self._submit(self._close)
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        self._check_error()
@@ -6,6 +6,7 @@ import warnings
 from dataclasses import dataclass
 from typing import Optional, Tuple, Union
 import logging
+from collections import OrderedDict
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +21,7 @@ class IKResult:
     error_pos: Optional[float] = None
     error_rot: Optional[float] = None
     message: str = ""
+    iterations: int = 0
 
 
 class IKError(Exception):
@@ -56,6 +58,10 @@ class MuJoCoIKSolver:
         except Exception as e:
             raise IKError(f"End effector site '{end_effector_site}' not found in model: {str(e)}")
 
+        # Maximum reach of the arm (sum of all link lengths), from the base (assumed to be the first body)
+        self.reach_radius = np.sum(np.linalg.norm(model.body_pos, axis=1))
+        self.base_pos = model.body_pos[0].copy()
+
     def check_target_reachability(self, target_pos: np.ndarray) -> bool:
         """
         Perform a basic reachability check for the target position.
@@ -66,17 +72,10 @@ class MuJoCoIKSolver:
         Returns:
             bool: True if target might be reachable, False if definitely unreachable
         """
-        # Calculate maximum reach of the arm (sum of all link lengths)
-        total_reach = 0
-        for i in range(self.model.nbody):
-            pos = self.model.body_pos[i]
-            total_reach += np.linalg.norm(pos)
-
-        # Check if target is within maximum reach
-        base_pos = self.model.body_pos[0]  # assume first body is base
-        distance_to_target = np.linalg.norm(target_pos - base_pos)
+        # Check if target is within maximum reach (see reach_radius)
+        distance_to_target = np.linalg.norm(target_pos - self.base_pos)
 
-        return distance_to_target <= total_reach
+        return distance_to_target <= self.reach_radius
 
     def forward_kinematics(self, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -310,3 +309,248 @@ class MuJoCoIKSolver:
 
         except Exception as e:
             raise IKError(f"Jacobian computation failed: {str(e)}")
+
+
+class IKWarmStartCache:
+    def __init__(self, position_resolution: float = 0.005, rotation_resolution: float = 0.05, max_size: int = 1024):
+        """
+        LRU cache of IK solutions keyed by discretized target pose, used to warm start the solves of targets close to
+        previously solved ones (e.g.: the initial poses of episodes).
+
+        Args:
+            position_resolution: Size (meters) of the grid target positions are discretized on
+            rotation_resolution: Size of the grid the components of target (unit) quaternions are discretized on
+            max_size: Maximum number of cached solutions, the least recently used ones are evicted first
+        """
+        self.position_resolution = position_resolution
+        self.rotation_resolution = rotation_resolution
+        self.max_size = max_size
+        self._solutions = OrderedDict()
+
+    def key(self, target_pos: np.ndarray, target_rot: Optional[np.ndarray] = None) -> tuple:
+        """
+        Args:
+            target_pos: Target position
+            target_rot: Target rotation matrix (optional)
+
+        Returns:
+            Cache key of the target pose
+        """
+        key = tuple(np.round(np.asarray(target_pos) / self.position_resolution).astype(int).tolist())
+        if target_rot is not None:
+            quat = np.empty(4)
+            mujoco.mju_mat2Quat(quat, np.asarray(target_rot, dtype=np.float64).flatten())
+            # q and -q are the same rotation
+            if quat[np.argmax(np.abs(quat))] < 0:
+                quat = -quat
+            key += tuple(np.round(quat / self.rotation_resolution).astype(int).tolist())
+        return key
+
+    def get(self, target_pos: np.ndarray, target_rot: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Returns:
+            Cached joint angles of the target pose's cell, or None
+        """
+        key = self.key(target_pos, target_rot)
+        q = self._solutions.get(key)
+        if q is not None:
+            self._solutions.move_to_end(key)
+        return q
+
+    def put(self, target_pos: np.ndarray, target_rot: Optional[np.ndarray], q: np.ndarray):
+        """
+        Caches joint angles @q as the solution of the target pose's cell
+        """
+        self._solutions[self.key(target_pos, target_rot)] = np.array(q, dtype=np.float64)
+        while len(self._solutions) > self.max_size:
+            self._solutions.popitem(last=False)
+
+    def clear(self):
+        self._solutions.clear()
+
+    def __len__(self):
+        return len(self._solutions)
+
+
+class LevenbergMarquardtIKSolver(MuJoCoIKSolver):
+    def __init__(self, model: MjModel, end_effector_site: str,
+                 position_threshold: float = 1e-4,
+                 rotation_threshold: float = 1e-3,
+                 max_iterations: int = 100,
+                 joint_indexes=None,
+                 damping: float = 1e-3,
+                 cache: Optional[IKWarmStartCache] = None):
+        """
+        Levenberg-Marquardt IK solver using the analytic jacobian of the end effector site (mj_jacSite). Kinematics
+        are computed on a private MjData, so that solving does not modify the simulation state.
+
+        Args:
+            model: MuJoCo model (or robosuite MjModel wrapper)
+            end_effector_site: Name of the site marking the end effector
+            position_threshold: Maximum acceptable position error (meters)
+            rotation_threshold: Maximum acceptable rotation error (radians)
+            max_iterations: Maximum number of iterations (i.e.: of jacobian evaluations)
+            joint_indexes: Ids of the joints to solve for (hinge or slide joints). Defaults to all the joints
+            damping: Initial damping factor, which is decreased after successful steps and increased otherwise
+            cache: If specified, cache of solutions to warm start solves with, and to store solutions into
+        """
+        self._model = getattr(model, "_model", model)
+        joint_indexes = list(range(self._model.njnt)) if joint_indexes is None else list(joint_indexes)
+        super().__init__(model, mujoco.MjData(self._model), end_effector_site,
+                         position_threshold=position_threshold,
+                         rotation_threshold=rotation_threshold,
+                         max_iterations=max_iterations,
+                         joint_indexes=joint_indexes)
+        self.damping = damping
+        self.cache = cache
+
+        self._qpos_indexes = self._model.jnt_qposadr[joint_indexes]
+        self._dof_indexes = self._model.jnt_dofadr[joint_indexes]
+        limited = self._model.jnt_limited[joint_indexes].astype(bool)
+        self.lower = np.where(limited, self._model.jnt_range[joint_indexes, 0], -np.inf)
+        self.upper = np.where(limited, self._model.jnt_range[joint_indexes, 1], np.inf)
+
+        self._jacp = np.zeros((3, self._model.nv))
+        self._jacr = np.zeros((3, self._model.nv))
+        self._site_quat = np.empty(4)
+        self._neg_quat = np.empty(4)
+        self._error_quat = np.empty(4)
+
+    def forward_kinematics(self, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute forward kinematics (on the private MjData) for given joint angles.
+
+        Args:
+            q: Joint angles
+
+        Returns:
+            Tuple of end effector position and orientation
+        """
+        if not np.all(np.isfinite(q)):
+            raise IKError("Joint angles contain NaN or inf values")
+        self.data.qpos[self._qpos_indexes] = q
+        mujoco.mj_kinematics(self._model, self.data)
+        # Needed by the jacobian, which is taken about the center of mass of the kinematic tree
+        mujoco.mj_comPos(self._model, self.data)
+        return self.data.site_xpos[self.ee_site_id].copy(), self.data.site_xmat[self.ee_site_id].reshape(3, 3).copy()
+
+    def get_jacobian(self, q: np.ndarray) -> np.ndarray:
+        """
+        Get the Jacobian matrix (w.r.t. the solved joints) at given joint angles.
+
+        Args:
+            q: Joint angles
+
+        Returns:
+            Geometric Jacobian matrix
+        """
+        self.forward_kinematics(q)
+        mujoco.mj_jacSite(self._model, self.data, self._jacp, self._jacr, self.ee_site_id)
+        return np.vstack([self._jacp[:, self._dof_indexes], self._jacr[:, self._dof_indexes]])
+
+    def _evaluate(self, q: np.ndarray, target_pos: np.ndarray, target_quat: Optional[np.ndarray]):
+        """
+        Returns:
+            Tuple of the (world frame) pose error at @q (position error, then rotation error as a rotation vector)
+            and its jacobian w.r.t. the joint angles
+        """
+        self.forward_kinematics(q)
+        error = np.empty(3 if target_quat is None else 6)
+        error[:3] = target_pos - self.data.site_xpos[self.ee_site_id]
+        mujoco.mj_jacSite(self._model, self.data, self._jacp, self._jacr, self.ee_site_id)
+        if target_quat is None:
+            return error, self._jacp[:, self._dof_indexes]
+        mujoco.mju_mat2Quat(self._site_quat, self.data.site_xmat[self.ee_site_id])
+        mujoco.mju_negQuat(self._neg_quat, self._site_quat)
+        mujoco.mju_mulQuat(self._error_quat, target_quat, self._neg_quat)
+        mujoco.mju_quat2Vel(error[3:], self._error_quat, 1.0)
+        return error, np.vstack([self._jacp[:, self._dof_indexes], self._jacr[:, self._dof_indexes]])
+
+    def _converged(self, error: np.ndarray) -> bool:
+        return (np.linalg.norm(error[:3]) <= self.position_threshold and
+                (len(error) == 3 or np.linalg.norm(error[3:]) <= self.rotation_threshold))
+
+    def _solve(self, q: np.ndarray, target_pos: np.ndarray, target_quat: Optional[np.ndarray]):
+        """
+        Levenberg-Marquardt iterations from @q, projecting every step onto the joint limits.
+
+        Returns:
+            Tuple of the joint angles reached, their pose error, and the number of iterations
+        """
+        q = np.clip(np.asarray(q, dtype=np.float64), self.lower, self.upper)
+        error, jac = self._evaluate(q, target_pos, target_quat)
+        cost = error @ error
+        damping = self.damping
+        eye = np.eye(len(q))
+        iterations = 0
+        while iterations < self.max_iterations and not self._converged(error):
+            iterations += 1
+            step = np.linalg.solve(jac.T @ jac + damping * eye, jac.T @ error)
+            q_new = np.clip(q + step, self.lower, self.upper)
+            error_new, jac_new = self._evaluate(q_new, target_pos, target_quat)
+            cost_new = error_new @ error_new
+            if cost_new < cost:
+                q, error, jac, cost = q_new, error_new, jac_new, cost_new
+                damping = max(damping * 0.1, 1e-12)
+            else:
+                damping *= 10.0
+                if damping > 1e10:
+                    # No descent direction left, e.g.: at a joint limit
+                    break
+        return q, error, iterations
+
+    def solve_ik(self, target_pos: np.ndarray, target_rot: Optional[np.ndarray] = None,
+                 initial_guess: Optional[np.ndarray] = None) -> IKResult:
+        """
+        Solve inverse kinematics, starting from the cached solution of the target pose if there is one (falling back
+        to @initial_guess if it does not converge).
+
+        Args:
+            target_pos: Target position
+            target_rot: Target rotation matrix (optional)
+            initial_guess: Initial joint angles (optional). Defaults to the joint angles of the model's qpos0
+
+        Returns:
+            IKResult object containing solution status and details
+        """
+        target_pos = np.asarray(target_pos, dtype=np.float64)
+        if not np.all(np.isfinite(target_pos)):
+            return IKResult(success=False, message="IK Error: Target position contains NaN or inf values")
+        target_quat = None
+        if target_rot is not None:
+            if not np.all(np.isfinite(target_rot)):
+                return IKResult(success=False, message="IK Error: Target rotation contains NaN or inf values")
+            target_quat = np.empty(4)
+            mujoco.mju_mat2Quat(target_quat, np.asarray(target_rot, dtype=np.float64).flatten())
+
+        if not self.check_target_reachability(target_pos):
+            return IKResult(
+                success=False,
+                message="Target position appears to be outside robot's reachable workspace"
+            )
+
+        if initial_guess is None:
+            initial_guess = self._model.qpos0[self._qpos_indexes]
+        guesses = [initial_guess]
+        cached = self.cache.get(target_pos, target_rot) if self.cache is not None else None
+        if cached is not None:
+            guesses.insert(0, cached)
+
+        iterations = 0
+        for guess in guesses:
+            q, error, n = self._solve(guess, target_pos, target_quat)
+            iterations += n
+            if self._converged(error):
+                break
+        success = self._converged(error)
+        if success and self.cache is not None:
+            self.cache.put(target_pos, target_rot, q)
+
+        return IKResult(
+            success=success,
+            joint_angles=q,
+            error_pos=float(np.linalg.norm(error[:3])),
+            error_rot=float(np.linalg.norm(error[3:])) if target_quat is not None else None,
+            message="Successfully found IK solution" if success else "Solution found but exceeds error thresholds",
+            iterations=iterations,
+        )
@@ -0,0 +1,587 @@
+"""
+Compiled kernels of the hot transform / control helpers of transform_utils and control_utils, along with batched
+variants (plural names, e.g. mats2quats) operating on stacks of quaternions / vectors / matrices.
+
+Kernels take float64 arrays and return float64 arrays. If macros.ENABLE_NUMBA, they are compiled with numba on first
+use, or ahead of their first call with @precompile (numba itself is only imported then). If macros.CACHE_NUMBA, the compiled code is loaded from numba's
+on-disk cache, so that only the first process ever compiles them. Otherwise, the kernels are pure NumPy functions
+(see NUMPY_KERNELS).
+
+NOTE: convention for quaternions is (x, y, z, w)
+"""
+
+import math
+
+import numpy as np
+
+import robosuite.macros as macros
+
+EPS = np.finfo(float).eps * 4.0
+
+
+def mat2quat(rmat):
+    """
+    Converts a rotation matrix to a quaternion (closed-form conversion, from the best conditioned of the four
+    largest-diagonal cases), with w >= 0.
+
+    Args:
+        rmat (np.array): 3x3 rotation matrix
+
+    Returns:
+        np.array: (x,y,z,w) quaternion
+    """
+    m00, m01, m02 = rmat[0, 0], rmat[0, 1], rmat[0, 2]
+    m10, m11, m12 = rmat[1, 0], rmat[1, 1], rmat[1, 2]
+    m20, m21, m22 = rmat[2, 0], rmat[2, 1], rmat[2, 2]
+    # The diagonal element of each candidate is 4 * (its largest component)^2
+    d0, d1, d2, d3 = 1.0 + m00 - m11 - m22, 1.0 - m00 + m11 - m22, 1.0 - m00 - m11 + m22, 1.0 + m00 + m11 + m22
+    if d0 >= d1 and d0 >= d2 and d0 >= d3:
+        q = np.array([d0, m01 + m10, m02 + m20, m21 - m12])
+    elif d1 >= d2 and d1 >= d3:
+        q = np.array([m01 + m10, d1, m12 + m21, m02 - m20])
+    elif d2 >= d3:
+        q = np.array([m02 + m20, m12 + m21, d2, m10 - m01])
+    else:
+        q = np.array([m21 - m12, m02 - m20, m10 - m01, d3])
+    scale = 1.0 / math.sqrt(q[0] * q[0] + q[1] * q[1] + q[2] * q[2] + q[3] * q[3])
+    return q * (scale if q[3] >= 0.0 else -scale)
+
+
+def quat2mat(quaternion):
+    """
+    Converts a quaternion (normalized by this function) to a rotation matrix.
+
+    Args:
+        quaternion (np.array): (x,y,z,w) quaternion
+
+    Returns:
+        np.array: 3x3 rotation matrix, identity for a (near) zero quaternion
+    """
+    x, y, z, w = quaternion[0], quaternion[1], quaternion[2], quaternion[3]
+    n = x * x + y * y + z * z + w * w
+    if n < EPS:
+        return np.identity(3)
+    s = 2.0 / n
+    return np.array(
+        [
+            [1.0 - s * (y * y + z * z), s * (x * y - z * w), s * (x * z + y * w)],
+            [s * (x * y + z * w), 1.0 - s * (x * x + z * z), s * (y * z - x * w)],
+            [s * (x * z - y * w), s * (y * z + x * w), 1.0 - s * (x * x + y * y)],
+        ]
+    )
+
+
+def quat_multiply(quaternion1, quaternion0):
+    """
+    Multiplies two quaternions (q1 * q0).
+
+    Args:
+        quaternion1 (np.array): (x,y,z,w) quaternion
+        quaternion0 (np.array): (x,y,z,w) quaternion
+
+    Returns:
+        np.array: (x,y,z,w) multiplied quaternion
+    """
+    x0, y0, z0, w0 = quaternion0[0], quaternion0[1], quaternion0[2], quaternion0[3]
+    x1, y1, z1, w1 = quaternion1[0], quaternion1[1], quaternion1[2], quaternion1[3]
+    return np.array(
+        [
+            x1 * w0 + y1 * z0 - z1 * y0 + w1 * x0,
+            -x1 * z0 + y1 * w0 + z1 * x0 + w1 * y0,
+            x1 * y0 - y1 * x0 + z1 * w0 + w1 * z0,
+            -x1 * x0 - y1 * y0 - z1 * z0 + w1 * w0,
+        ]
+    )
+
+
+def pose_inv(pose):
+    """
+    Inverts a homogeneous pose matrix: [R t; 0 1]^-1 = [R.T -R.T*t; 0 1].
+
+    Args:
+        pose (np.array): 4x4 pose matrix
+
+    Returns:
+        np.array: 4x4 inverse pose matrix
+    """
+    inv = np.zeros((4, 4))
+    inv[:3, :3] = pose[:3, :3].T
+    inv[:3, 3] = -(inv[:3, 0] * pose[0, 3] + inv[:3, 1] * pose[1, 3] + inv[:3, 2] * pose[2, 3])
+    inv[3, 3] = 1.0
+    return inv
+
+
+def force_in_A_to_force_in_B(force_A, torque_A, pose_A_in_B):
+    """
+    Converts linear and rotational force at a point in frame A to the equivalent in frame B.
+
+    Args:
+        force_A (np.array): (fx,fy,fz) linear force in A
+        torque_A (np.array): (tx,ty,tz) rotational force (moment) in A
+        pose_A_in_B (np.array): 4x4 matrix corresponding to the pose of A in frame B
+
+    Returns:
+        2-tuple:
+
+            - (np.array) (fx,fy,fz) linear forces in frame B
+            - (np.array) (tx,ty,tz) moments in frame B
+    """
+    rot = pose_A_in_B[:3, :3]
+    moment = torque_A - np.cross(pose_A_in_B[:3, 3], force_A)
+    # R.T * v = sum of the rows of R weighted by v
+    force_B = rot[0] * force_A[0] + rot[1] * force_A[1] + rot[2] * force_A[2]
+    torque_B = rot[0] * moment[0] + rot[1] * moment[1] + rot[2] * moment[2]
+    return force_B, torque_B
+
+
+def quaternions_orientation_error(target_orn, current_orn):
+    """
+    Computes the orientation error between two quaternions, both with respect to the same fixed frame.
+
+    Args:
+        target_orn (np.array): (x,y,z,w) desired quaternion
+        current_orn (np.array): (x,y,z,w) current quaternion
+
+    Returns:
+        np.array: (ex,ey,ez) vector part of the error quaternion
+    """
+    ne = (
+        current_orn[3] * target_orn[3]
+        + current_orn[0] * target_orn[0]
+        + current_orn[1] * target_orn[1]
+        + current_orn[2] * target_orn[2]
+    )
+    ee = current_orn[3] * target_orn[:3] - target_orn[3] * current_orn[:3] + np.cross(current_orn[:3], target_orn[:3])
+    # disambiguate the sign of the quaternion
+    return ee * np.sign(ne)
+
+
+def rotate_vector_by_quaternion(vector, quaternion):
+    """
+    Rotates a 3D vector by a quaternion (normalized by this function).
+
+    Args:
+        vector (np.array): (x,y,z) vector
+        quaternion (np.array): (x,y,z,w) quaternion
+
+    Returns:
+        np.array: (x,y,z) rotated vector
+    """
+    q = quaternion / math.sqrt(np.sum(quaternion * quaternion))
+    # v' = v + w * t + q_xyz x t, with t = 2 * q_xyz x v
+    t = 2.0 * np.cross(q[:3], vector)
+    return vector + q[3] * t + np.cross(q[:3], t)
+
+
+def orientation_error(desired, current):
+    """
+    Computes the orientation error between two rotation matrices, as the axis * angle vector of their delta rotation.
+
+    Args:
+        desired (np.array): 3x3 target orientation matrix
+        current (np.array): 3x3 current orientation matrix
+
+    Returns:
+        np.array: (ax,ay,az) orientation error
+    """
+    return 0.5 * (
+        np.cross(current[:3, 0], desired[:3, 0])
+        + np.cross(current[:3, 1], desired[:3, 1])
+        + np.cross(current[:3, 2], desired[:3, 2])
+    )
+
+
+def opspace_matrices(mass_matrix, J_full, J_pos, J_ori):
+    """
+    Computes the matrices of the operational space control algorithm, see control_utils.opspace_matrices.
+
+    Args:
+        mass_matrix (np.array): 2d array representing the mass matrix of the robot
+        J_full (np.array): 2d array representing the full Jacobian matrix of the robot
+        J_pos (np.array): 2d array representing the position components of the Jacobian matrix of the robot
+        J_ori (np.array): 2d array representing the orientation components of the Jacobian matrix of the robot
+
+    Returns:
+        4-tuple:
+
+            - (np.array): full lambda matrix (as 2d array)
+            - (np.array): position components of lambda matrix (as 2d array)
+            - (np.array): orientation components of lambda matrix (as 2d array)
+            - (np.array): nullspace matrix (as 2d array)
+    """
+    mass_matrix_inv = np.linalg.inv(mass_matrix)
+
+    # J M^-1 J^T, and its position / orientation components
+    lambda_full_inv = np.dot(np.dot(J_full, mass_matrix_inv), J_full.transpose())
+    lambda_pos_inv = np.dot(np.dot(J_pos, mass_matrix_inv), J_pos.transpose())
+    lambda_ori_inv = np.dot(np.dot(J_ori, mass_matrix_inv), J_ori.transpose())
+
+    # take the inverses, but zero out small singular values for stability
+    lambda_full = np.linalg.pinv(lambda_full_inv)
+    lambda_pos = np.linalg.pinv(lambda_pos_inv)
+    lambda_ori = np.linalg.pinv(lambda_ori_inv)
+
+    # nullspace
+    Jbar = np.dot(mass_matrix_inv, J_full.transpose()).dot(lambda_full)
+    nullspace_matrix = np.eye(J_full.shape[-1], J_full.shape[-1]) - np.dot(Jbar, J_full)
+
+    return lambda_full, lambda_pos, lambda_ori, nullspace_matrix
+
+
+def nullspace_torques(mass_matrix, nullspace_matrix, initial_joint, joint_pos, joint_vel, joint_kp):
+    """
+    Computes the nullspace torques maintaining joint positions @initial_joint with zero velocity, see
+    control_utils.nullspace_torques.
+
+    Args:
+        mass_matrix (np.array): 2d array representing the mass matrix of the robot
+        nullspace_matrix (np.array): 2d array representing the nullspace matrix of the robot
+        initial_joint (np.array): Joint configuration to be used for calculating nullspace torques
+        joint_pos (np.array): Current joint positions
+        joint_vel (np.array): Current joint velocities
+        joint_kp (float): Proportional control gain when calculating nullspace torques
+
+    Returns:
+        np.array: nullspace torques
+    """
+    # kv corresponds to critical damping
+    joint_kv = np.sqrt(joint_kp) * 2
+    pose_torques = np.dot(mass_matrix, (joint_kp * (initial_joint - joint_pos) - joint_kv * joint_vel))
+    return np.dot(nullspace_matrix.transpose(), pose_torques)
+
+
+def mats2quats(mats):
+    """
+    Batched mat2quat.
+
+    Args:
+        mats (np.array): (N, 3, 3) rotation matrices
+
+    Returns:
+        np.array: (N, 4) (x,y,z,w) quaternions, with w >= 0
+    """
+    m00, m11, m22 = mats[:, 0, 0], mats[:, 1, 1], mats[:, 2, 2]
+    m01, m02, m10, m12, m20, m21 = (
+        mats[:, 0, 1],
+        mats[:, 0, 2],
+        mats[:, 1, 0],
+        mats[:, 1, 2],
+        mats[:, 2, 0],
+        mats[:, 2, 1],
+    )
+    candidates = np.stack(
+        [
+            [1.0 + m00 - m11 - m22, m01 + m10, m02 + m20, m21 - m12],
+            [m01 + m10, 1.0 - m00 + m11 - m22, m12 + m21, m02 - m20],
+            [m02 + m20, m12 + m21, 1.0 - m00 - m11 + m22, m10 - m01],
+            [m21 - m12, m02 - m20, m10 - m01, 1.0 + m00 + m11 + m22],
+        ]
+    )
+    best = np.argmax(np.stack([candidates[i, i] for i in range(4)]), axis=0)
+    quats = candidates[best, :, np.arange(len(mats))]
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    quats[quats[:, 3] < 0] *= -1
+    return quats
+
+
+def quats2mats(quats):
+    """
+    Batched quat2mat.
+
+    Args:
+        quats (np.array): (N, 4) (x,y,z,w) quaternions, normalized by this function
+
+    Returns:
+        np.array: (N, 3, 3) rotation matrices, identity for (near) zero quaternions
+    """
+    x, y, z, w = quats[:, 0], quats[:, 1], quats[:, 2], quats[:, 3]
+    n = np.sum(quats * quats, axis=1)
+    s = np.where(n < EPS, 0.0, 2.0 / np.maximum(n, EPS))
+    mats = np.empty((len(quats), 3, 3))
+    mats[:, 0, 0] = 1.0 - s * (y * y + z * z)
+    mats[:, 0, 1] = s * (x * y - z * w)
+    mats[:, 0, 2] = s * (x * z + y * w)
+    mats[:, 1, 0] = s * (x * y + z * w)
+    mats[:, 1, 1] = 1.0 - s * (x * x + z * z)
+    mats[:, 1, 2] = s * (y * z - x * w)
+    mats[:, 2, 0] = s * (x * z - y * w)
+    mats[:, 2, 1] = s * (y * z + x * w)
+    mats[:, 2, 2] = 1.0 - s * (x * x + y * y)
+    return mats
+
+
+def quats_multiply(quats1, quats0):
+    """
+    Batched quat_multiply.
+
+    Args:
+        quats1 (np.array): (N, 4) (x,y,z,w) quaternions
+        quats0 (np.array): (N, 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (N, 4) (x,y,z,w) products quats1 * quats0
+    """
+    x0, y0, z0, w0 = quats0[:, 0], quats0[:, 1], quats0[:, 2], quats0[:, 3]
+    x1, y1, z1, w1 = quats1[:, 0], quats1[:, 1], quats1[:, 2], quats1[:, 3]
+    return np.stack(
+        [
+            x1 * w0 + y1 * z0 - z1 * y0 + w1 * x0,
+            -x1 * z0 + y1 * w0 + z1 * x0 + w1 * y0,
+            x1 * y0 - y1 * x0 + z1 * w0 + w1 * z0,
+            -x1 * x0 - y1 * y0 - z1 * z0 + w1 * w0,
+        ],
+        axis=1,
+    )
+
+
+def poses_inv(poses):
+    """
+    Batched pose_inv.
+
+    Args:
+        poses (np.array): (N, 4, 4) pose matrices
+
+    Returns:
+        np.array: (N, 4, 4) inverse pose matrices
+    """
+    inv = np.zeros((len(poses), 4, 4))
+    inv[:, :3, :3] = np.transpose(poses[:, :3, :3], (0, 2, 1))
+    inv[:, :3, 3] = -np.einsum("nij,nj->ni", inv[:, :3, :3], poses[:, :3, 3])
+    inv[:, 3, 3] = 1.0
+    return inv
+
+
+def quaternions_orientation_errors(target_orns, current_orns):
+    """
+    Batched quaternions_orientation_error.
+
+    Args:
+        target_orns (np.array): (N, 4) (x,y,z,w) desired quaternions
+        current_orns (np.array): (N, 4) (x,y,z,w) current quaternions
+
+    Returns:
+        np.array: (N, 3) vector parts of the error quaternions
+    """
+    ne = np.sum(current_orns * target_orns, axis=1)
+    ee = (
+        current_orns[:, 3:] * target_orns[:, :3]
+        - target_orns[:, 3:] * current_orns[:, :3]
+        + np.cross(current_orns[:, :3], target_orns[:, :3])
+    )
+    return ee * np.sign(ne)[:, None]
+
+
+def rotate_vectors_by_quaternions(vectors, quats):
+    """
+    Batched rotate_vector_by_quaternion.
+
+    Args:
+        vectors (np.array): (N, 3) vectors
+        quats (np.array): (N, 4) (x,y,z,w) quaternions, normalized by this function
+
+    Returns:
+        np.array: (N, 3) rotated vectors
+    """
+    q = quats / np.linalg.norm(quats, axis=1, keepdims=True)
+    t = 2.0 * np.cross(q[:, :3], vectors)
+    return vectors + q[:, 3:] * t + np.cross(q[:, :3], t)
+
+
+def orientation_errors(desired, current):
+    """
+    Batched orientation_error.
+
+    Args:
+        desired (np.array): (N, 3, 3) target orientation matrices
+        current (np.array): (N, 3, 3) current orientation matrices
+
+    Returns:
+        np.array: (N, 3) orientation errors
+    """
+    return 0.5 * np.sum(np.cross(current, desired, axisa=1, axisb=1, axisc=1), axis=2)
+
+
+# Pure NumPy implementations, also used when numba is disabled
+NUMPY_KERNELS = {
+    func.__name__: func
+    for func in (
+        mat2quat,
+        quat2mat,
+        quat_multiply,
+        pose_inv,
+        force_in_A_to_force_in_B,
+        quaternions_orientation_error,
+        rotate_vector_by_quaternion,
+        orientation_error,
+        opspace_matrices,
+        nullspace_torques,
+        mats2quats,
+        quats2mats,
+        quats_multiply,
+        poses_inv,
+        quaternions_orientation_errors,
+        rotate_vectors_by_quaternions,
+        orientation_errors,
+    )
+}
+
+
+# Argument types each kernel is compiled for by @precompile, i.e.: the C-contiguous float64 arrays the kernels are
+# called with by transform_utils / control_utils (filled in when the numba kernels are built)
+SIGNATURES = {}
+BATCHED_SIGNATURES = {}
+
+
+# Compiled batched kernels loop over the compiled single-element kernels, instead of allocating temporaries
+def _mats2quats(mats):
+    quats = np.empty((mats.shape[0], 4))
+    for i in range(mats.shape[0]):
+        quats[i] = mat2quat(mats[i])
+    return quats
+
+
+def _quats2mats(quats):
+    mats = np.empty((quats.shape[0], 3, 3))
+    for i in range(quats.shape[0]):
+        mats[i] = quat2mat(quats[i])
+    return mats
+
+
+def _quats_multiply(quats1, quats0):
+    quats = np.empty((quats1.shape[0], 4))
+    for i in range(quats1.shape[0]):
+        quats[i] = quat_multiply(quats1[i], quats0[i])
+    return quats
+
+
+def _poses_inv(poses):
+    inv = np.empty((poses.shape[0], 4, 4))
+    for i in range(poses.shape[0]):
+        inv[i] = pose_inv(poses[i])
+    return inv
+
+
+def _quaternions_orientation_errors(target_orns, current_orns):
+    errors = np.empty((target_orns.shape[0], 3))
+    for i in range(target_orns.shape[0]):
+        errors[i] = quaternions_orientation_error(target_orns[i], current_orns[i])
+    return errors
+
+
+def _rotate_vectors_by_quaternions(vectors, quats):
+    rotated = np.empty((vectors.shape[0], 3))
+    for i in range(vectors.shape[0]):
+        rotated[i] = rotate_vector_by_quaternion(vectors[i], quats[i])
+    return rotated
+
+
+def _orientation_errors(desired, current):
+    errors = np.empty((desired.shape[0], 3))
+    for i in range(desired.shape[0]):
+        errors[i] = orientation_error(desired[i], current[i])
+    return errors
+
+
+_BATCHED_LOOPS = {
+    "mats2quats": _mats2quats,
+    "quats2mats": _quats2mats,
+    "quats_multiply": _quats_multiply,
+    "poses_inv": _poses_inv,
+    "quaternions_orientation_errors": _quaternions_orientation_errors,
+    "rotate_vectors_by_quaternions": _rotate_vectors_by_quaternions,
+    "orientation_errors": _orientation_errors,
+}
+
+_numba_built = False
+
+
+def _build_numba_kernels():
+    """
+    Imports numba and replaces the kernels of this module with numba dispatchers (which compile on their first call,
+    or in @precompile). Called once, by the first kernel call or by @precompile, so that importing this module (e.g.:
+    through transform_utils) does not import numba.
+    """
+    global _numba_built
+    if _numba_built:
+        return
+    import numba
+
+    jit = numba.njit(cache=macros.CACHE_NUMBA)
+    vec = numba.float64[::1]
+    mat = numba.float64[:, ::1]
+    mats = numba.float64[:, :, ::1]
+
+    # Single-element kernels first, since the batched loops call them
+    kernels = globals()
+    for name, func in NUMPY_KERNELS.items():
+        if name not in _BATCHED_LOOPS:
+            kernels[name] = jit(func)
+    for name, func in _BATCHED_LOOPS.items():
+        kernels[name] = jit(func)
+
+    SIGNATURES.update(
+        {
+            # transform_utils.mat2quat also accepts the rotation block of homogeneous matrices
+            "mat2quat": [(mat,), (numba.float64[:, :],)],
+            "quat2mat": [(vec,)],
+            "quat_multiply": [(vec, vec)],
+            "pose_inv": [(mat,)],
+            "force_in_A_to_force_in_B": [(vec, vec, mat)],
+            "quaternions_orientation_error": [(vec, vec)],
+            "rotate_vector_by_quaternion": [(vec, vec)],
+            "orientation_error": [(mat, mat)],
+            "opspace_matrices": [(mat, mat, mat, mat)],
+            "nullspace_torques": [(mat, mat, vec, vec, vec, numba.float64)],
+        }
+    )
+    BATCHED_SIGNATURES.update(
+        {
+            "mats2quats": [(mats,)],
+            "quats2mats": [(mat,)],
+            "quats_multiply": [(mat, mat)],
+            "poses_inv": [(mats,)],
+            "quaternions_orientation_errors": [(mat, mat)],
+            "rotate_vectors_by_quaternions": [(mat, mat)],
+            "orientation_errors": [(mats, mats)],
+        }
+    )
+    _numba_built = True
+
+
+def _lazy_kernel(name):
+    """
+    Returns:
+        function: placeholder of kernel @name, which builds the numba kernels and then calls the compiled one
+    """
+
+    def kernel(*args):
+        _build_numba_kernels()
+        return globals()[name](*args)
+
+    kernel.__name__ = name
+    kernel.__doc__ = NUMPY_KERNELS[name].__doc__
+    return kernel
+
+
+def precompile(batched=False):
+    """
+    Compiles the kernels for their argument types in SIGNATURES, so that no compilation happens on their first call.
+    If macros.CACHE_NUMBA, the compiled code is loaded from (or written to) numba's on-disk cache. This can be done
+    as a build step, or in the main process before starting parallel workers, so that the workers only load the
+    kernels from the cache. Does nothing if numba is disabled.
+
+    Args:
+        batched (bool): If True, also compiles the batched kernels for their argument types in BATCHED_SIGNATURES
+    """
+    if not macros.ENABLE_NUMBA:
+        return
+    _build_numba_kernels()
+    signatures = dict(SIGNATURES, **BATCHED_SIGNATURES) if batched else SIGNATURES
+    for name, name_signatures in signatures.items():
+        for signature in name_signatures:
+            globals()[name].compile(signature)
+
+
+if macros.ENABLE_NUMBA:
+    for _name in NUMPY_KERNELS:
+        globals()[_name] = _lazy_kernel(_name)
@@ -0,0 +1,180 @@
+"""
+Simulation-step-scoped cache of kinematic quantities (forward kinematics, jacobians, mass matrix, poses) shared by
+all the part controllers of a robot and by the robot's own properties.
+"""
+
+import mujoco
+import numpy as np
+
+import robosuite.utils.transform_utils as T
+
+
+class KinematicsCache:
+    """
+    Caches the derived quantities that several part controllers (and robot properties) query on every simulation
+    substep, so that each of them is computed once per substep instead of once per consumer.
+
+    Entries are keyed on the simulation state: they stay valid as long as sim.data.time, sim.data.qpos,
+    sim.data.qvel and sim.state_version are unchanged, and are dropped as soon as any of them changes (i.e.: after
+    every simulation step, whenever the robot state is set directly, after every sim.forward() that was not issued by
+    this cache, and after model edits such as domain randomization).
+
+    Returned arrays are the cache's own buffers, and must be treated as read-only by the callers.
+
+    Args:
+        sim (MjSim): Simulator instance the cached quantities are computed from
+    """
+
+    def __init__(self, sim):
+        self.sim = sim
+        nv = self.sim.model.nv
+
+        self._time = None
+        self._qpos = None
+        self._qvel = None
+        self._state_version = None
+        self._forwarded = False
+
+        self._mass_matrix = np.zeros((nv, nv))
+        self._mass_matrix_valid = False
+
+        # site / body id -> (6, nv) jacobian buffer (jacp stacked over jacr), and the ids filled for the current state
+        self._site_jacobians = {}
+        self._valid_site_jacobians = set()
+        self._body_jacobians = {}
+        self._valid_body_jacobians = set()
+
+        # (name, base name) -> (4, 4) pose of body @name in the frame of body @base name
+        self._poses_in_base = {}
+
+        # sensor name -> slice into sim.data.sensordata, this does not depend on the simulation state
+        self._sensor_slices = {}
+
+    def _check_state(self):
+        """
+        Drops all cached entries if the simulation state changed since they were computed.
+        """
+        # Comparing the raw bytes of qpos / qvel is much cheaper than an elementwise comparison for arrays of this size
+        data = self.sim.data._data
+        qpos = data.qpos.tobytes()
+        qvel = data.qvel.tobytes()
+        if (
+            data.time != self._time
+            or qpos != self._qpos
+            or qvel != self._qvel
+            or self.sim.state_version != self._state_version
+        ):
+            self._time = data.time
+            self._qpos = qpos
+            self._qvel = qvel
+            self._state_version = self.sim.state_version
+            self._forwarded = False
+            self._clear()
+
+    def _clear(self):
+        self._mass_matrix_valid = False
+        self._valid_site_jacobians.clear()
+        self._valid_body_jacobians.clear()
+        self._poses_in_base.clear()
+
+    def invalidate(self):
+        """
+        Drops all cached entries, and makes the next @forward call forward the simulation again.
+        """
+        self._time = None
+        self._forwarded = False
+        self._clear()
+
+    def forward(self):
+        """
+        Calls sim.forward() at most once for the current simulation state.
+        """
+        self._check_state()
+        if not self._forwarded:
+            self.sim.forward()
+            self._clear()
+            # This forward call is the one the entries computed from now on are based on
+            self._state_version = self.sim.state_version
+            self._forwarded = True
+
+    def mass_matrix(self):
+        """
+        Returns:
+            np.array: (nv, nv) full mass matrix of the simulation
+        """
+        self._check_state()
+        if not self._mass_matrix_valid:
+            mujoco.mj_fullM(self.sim.model._model, self._mass_matrix, self.sim.data.qM)
+            self._mass_matrix_valid = True
+        return self._mass_matrix
+
+    def site_jacobian(self, site_id):
+        """
+        Args:
+            site_id (int): Mujoco id of the site
+
+        Returns:
+            np.array: (6, nv) jacobian of the site, positional rows (jacp) first, followed by rotational rows (jacr)
+        """
+        self._check_state()
+        jac = self._site_jacobians.get(site_id)
+        if jac is None:
+            jac = self._site_jacobians[site_id] = np.zeros((6, self.sim.model.nv))
+        if site_id not in self._valid_site_jacobians:
+            mujoco.mj_jacSite(self.sim.model._model, self.sim.data._data, jac[:3], jac[3:], site_id)
+            self._valid_site_jacobians.add(site_id)
+        return jac
+
+    def body_jacobian(self, body_id):
+        """
+        Args:
+            body_id (int): Mujoco id of the body
+
+        Returns:
+            np.array: (6, nv) jacobian of the body, positional rows (jacp) first, followed by rotational rows (jacr)
+        """
+        self._check_state()
+        jac = self._body_jacobians.get(body_id)
+        if jac is None:
+            jac = self._body_jacobians[body_id] = np.zeros((6, self.sim.model.nv))
+        if body_id not in self._valid_body_jacobians:
+            mujoco.mj_jacBody(self.sim.model._model, self.sim.data._data, jac[:3], jac[3:], body_id)
+            self._valid_body_jacobians.add(body_id)
+        return jac
+
+    def pose_in_base(self, name, base_name):
+        """
+        Args:
+            name (str): Name of the body whose pose to grab
+            base_name (str): Name of the body defining the base frame
+
+        Returns:
+            np.array: (4, 4) pose of body @name in the frame of body @base_name
+        """
+        self._check_state()
+        key = (name, base_name)
+        pose = self._poses_in_base.get(key)
+        if pose is None:
+            data = self.sim.data
+            pose_in_world = T.make_pose(data.get_body_xpos(name), data.get_body_xmat(name).reshape((3, 3)))
+            base_pose_in_world = T.make_pose(
+                data.get_body_xpos(base_name), data.get_body_xmat(base_name).reshape((3, 3))
+            )
+            pose = T.pose_in_A_to_pose_in_B(pose_in_world, T.pose_inv(base_pose_in_world))
+            self._poses_in_base[key] = pose
+        return pose
+
+    def sensor(self, sensor_name):
+        """
+        Args:
+            sensor_name (str): Name of the sensor
+
+        Returns:
+            np.array: view of the current readings of the sensor in sim.data.sensordata
+        """
+        sensor_slice = self._sensor_slices.get(sensor_name)
+        if sensor_slice is None:
+            sensor_id = self.sim.model.sensor_name2id(sensor_name)
+            start = self.sim.model.sensor_adr[sensor_id]
+            sensor_slice = self._sensor_slices[sensor_name] = slice(start, start + self.sim.model.sensor_dim[sensor_id])
+        return self.sim.data.sensordata[sensor_slice]
@@ -0,0 +1,118 @@
+"""
+Vectorized bookkeeping of the dirt markers of wiping tasks (see WipeArena): which markers are under a wiping tool, which
+ones have been wiped so far, and the centroid / spread of the remaining ones.
+"""
+
+import numpy as np
+
+
+class MarkerField:
+    """
+    Holds the markers of a WipeArena as arrays: their body / visual geom ids are resolved once, and their positions are
+    gathered into a single contiguous array, so that all the markers are tested against a wiping tool at once. The set
+    of wiped markers is maintained incrementally as a boolean mask.
+
+    Args:
+        sim (MjSim): Simulation instance containing the markers
+        markers (list of MujocoObject): Markers of the arena (WipeArena.markers)
+    """
+
+    def __init__(self, sim, markers):
+        self.sim = sim
+        self.markers = list(markers)
+        self.body_ids = np.array([sim.model.body_name2id(marker.root_body) for marker in self.markers], dtype=int)
+        self.geom_ids = np.array([sim.model.geom_name2id(marker.visual_geoms[0]) for marker in self.markers], dtype=int)
+        self.positions = np.zeros((len(self.markers), 3))
+        self.wiped = np.zeros(len(self.markers), dtype=bool)
+        self.num_wiped = 0
+
+    def __len__(self):
+        return len(self.markers)
+
+    def reset(self):
+        """
+        Marks all markers as not wiped
+        """
+        self.wiped[:] = False
+        self.num_wiped = 0
+
+    def update_positions(self):
+        """
+        Gathers the current (world frame) positions of the markers into @self.positions
+
+        Returns:
+            np.array: (N, 3) positions of the markers
+        """
+        np.take(self.sim.data.body_xpos, self.body_ids, axis=0, out=self.positions)
+        return self.positions
+
+    def under_tool(self, corners, max_distance=0.02):
+        """
+        Finds the markers under a rectangular wiping tool: markers whose center is above the plane of the tool (less
+        than @max_distance away from it), and whose projection onto that plane is inside the tool.
+
+        Args:
+            corners (np.array): (4, 3) positions of the corners of the tool. The plane of the tool is spanned by the
+                unit vectors from the second corner to the first and fourth ones, and its normal (their cross product)
+                points towards the side markers are wiped from
+            max_distance (float): Maximum distance between the center of a marker and the plane of the tool
+
+        Returns:
+            np.array: (N,) boolean mask of the markers under the tool
+        """
+        corners = np.asarray(corners)
+        origin = corners[1]
+
+        # Unit vectors on the plane, and normal of the plane
+        v1 = corners[0] - origin
+        v1 /= np.linalg.norm(v1)
+        v2 = corners[3] - origin
+        v2 /= np.linalg.norm(v2)
+        n = np.cross(v1, v2)
+        n /= np.linalg.norm(n)
+        basis = np.stack([v1, v2], axis=1)
+
+        # Distances of the markers to the plane, and their projections in the coordinate frame of the plane
+        offsets = self.positions - origin
+        dists = offsets @ n
+        points = (offsets - dists[:, None] * n) @ basis
+
+        # Corners of the tool in the coordinate frame of the plane, in order around the rectangle
+        rectangle = (corners[[0, 1, 3, 2]] - origin) @ basis
+        edges = np.roll(rectangle, -1, axis=0) - rectangle
+
+        # A point is inside if it is strictly on the same side of every edge
+        sides = edges[:, 0] * (points[:, 1:2] - rectangle[:, 1]) - (points[:, 0:1] - rectangle[:, 0]) * edges[:, 1]
+        return (dists > 0.0) & (dists < max_distance) & np.all(sides < 0, axis=1)
+
+    def wipe(self, mask):
+        """
+        Marks the markers of @mask as wiped, and makes the newly wiped ones transparent
+
+        Args:
+            mask (np.array): (N,) boolean mask of the markers being wiped
+
+        Returns:
+            np.array: indexes of the markers that were not wiped before, in increasing order
+        """
+        new = np.flatnonzero(mask & ~self.wiped)
+        if len(new) > 0:
+            self.wiped[new] = True
+            self.num_wiped += len(new)
+            self.sim.model.geom_rgba[self.geom_ids[new], 3] = 0
+        return new
+
+    def remaining_information(self):
+        """
+        Returns:
+            2-tuple:
+
+                - (float) radius of the circle centered at the centroid of the remaining (not wiped) markers that
+                    contains all of them, 0 if there is none left
+                - (np.array) centroid of the remaining markers, zeros if there is none left
+        """
+        remaining = self.positions[~self.wiped]
+        if len(remaining) == 0:
+            return 0, np.zeros(3)
+        centroid = remaining.mean(axis=0)
+        return np.max(np.linalg.norm(remaining - centroid, axis=1)), centroid
@@ -5,16 +5,15 @@ implementation below.
 https://github.com/openai/mujoco-py/blob/1fe312b09ae7365f0dd9d4d0e453f8da59fae0bf/mujoco_py/modder.py
 """
 
-import copy
 import os
 from collections import defaultdict
 
+import mujoco
 import numpy as np
 from PIL import Image
 
 import robosuite
 import robosuite.utils.transform_utils as trans
-from robosuite.utils.binding_utils import MjRenderContextOffscreen
 
 
 class BaseModder:
@@ -793,6 +792,10 @@ class TextureModder(BaseModder):
     colors will be modulated by the material colors. Call the
     `whiten_materials` helper method to set all material colors to white.
 
+    Note: modified textures are not uploaded to the GPU right away. They are marked
+    as dirty in the sim (see MjSim.mark_textures_dirty), and uploaded once by each
+    render context right before its next rendering.
+
     Args:
         sim (MjSim): MjSim object
 
@@ -891,39 +894,159 @@ class TextureModder(BaseModder):
             tex_id = self._name_to_tex_id("skybox")
             self._defaults["skybox"]["texture"] = self._default_texture_bitmaps[tex_id]
 
+        # Ids of the geoms, materials and textures to randomize, so that all of them are randomized at once. Geoms
+        # sharing a material (texture) have it randomized once
+        self._geom_ids = np.array([self.model.geom_name2id(name) for name in self.geom_names], dtype=int)
+        textured = np.array([self._check_geom_for_texture(name) for name in self.geom_names], dtype=bool)
+        self._color_geom_ids = self._geom_ids[~textured]
+        self._color_defaults = np.array(self.model.geom_rgba[self._color_geom_ids, :3])
+        self._mat_ids = np.unique(self.model.geom_matid[self._geom_ids[textured]])
+        self._material_defaults = np.stack(
+            (
+                self.model.mat_reflectance[self._mat_ids],
+                self.model.mat_shininess[self._mat_ids],
+                self.model.mat_specular[self._mat_ids],
+            ),
+            axis=1,
+        )
+        tex_ids = list(self.model.mat_texid[self._mat_ids, mujoco.mjtTextureRole.mjTEXROLE_RGB])
+        if self.randomize_skybox:
+            tex_ids.append(self._name_to_tex_id("skybox"))
+        self._tex_ids = np.unique(np.array(tex_ids, dtype=int))
+
+        # Float buffer perturbed bitmaps are blended in, see _blend_buffer
+        self._blend_scratch = None
+
+    def update_sim(self, sim):
+        """
+        In addition to super method, update internal default values to match the current values from
+        (the presumably new) @sim.
+
+        Args:
+            sim (MjSim): MjSim object
+        """
+        super().update_sim(sim=sim)
+        self.save_defaults()
+
     def restore_defaults(self):
         """
         Reloads the saved parameter values.
         """
-        for name in self.geom_names:
-            if self._check_geom_for_texture(name):
-                self.set_texture(name, self._defaults[name]["texture"], perturb=False)
-                self.set_material(name, self._defaults[name]["material"], perturb=False)
-            else:
-                self.set_geom_rgb(name, self._defaults[name]["rgb"])
-
-        if self.randomize_skybox:
-            self.set_texture("skybox", self._defaults["skybox"]["texture"], perturb=False)
+        self.model.geom_rgba[self._color_geom_ids, :3] = self._color_defaults
+        self._set_materials(self._material_defaults)
+        for tex_id in self._tex_ids:
+            self.textures[tex_id].bitmap[:] = self._default_texture_bitmaps[tex_id]
+        self.sim.mark_textures_dirty(self._tex_ids)
 
     def randomize(self):
         """
         Overrides mujoco-py implementation to also randomize color
-        for geoms that have no material.
+        for geoms that have no material. All the geom colors and materials
+        are sampled at once, and all the textures are regenerated in place
+        before being uploaded together right before the next rendering.
         """
         self.whiten_materials()
-        for name in self.geom_names:
-            if self._check_geom_for_texture(name):
-                # geom has valid texture that can be randomized
-                self._randomize_texture(name)
-                # randomize material if requested
-                if self.randomize_material:
-                    self._randomize_material(name)
+
+        # Colors of the geoms without texture
+        rgb = self.random_state.uniform(0, 1, size=(len(self._color_geom_ids), 3))
+        if self.randomize_local:
+            rgb = (1.0 - self.local_rgb_interpolation) * self._color_defaults + self.local_rgb_interpolation * rgb
+        self.model.geom_rgba[self._color_geom_ids, :3] = rgb
+
+        # Textures, each with a random variation and pair of colors
+        choices = self.random_state.randint(len(self.texture_variations), size=len(self._tex_ids))
+        colors = np.array(self.random_state.uniform(size=(len(self._tex_ids), 2, 3)) * 255, dtype=np.uint8)
+        for tex_id, choice, (rgb1, rgb2) in zip(self._tex_ids, choices, colors):
+            self._generate_bitmap(tex_id, self.texture_variations[choice], rgb1, rgb2)
+        self.sim.mark_textures_dirty(self._tex_ids)
+
+        # Materials (reflectance, shininess, specular)
+        if self.randomize_material:
+            material = self.random_state.uniform(0, 1, size=(len(self._mat_ids), 3))
+            if self.randomize_local:
+                material = (
+                    1.0 - self.local_material_interpolation
+                ) * self._material_defaults + self.local_material_interpolation * material
+            self._set_materials(material)
+
+    def _set_materials(self, materials):
+        """
+        Helper function to set the properties of all the randomized materials
+
+        Args:
+            materials (np.array): (N, 3) (reflectance, shininess, specular) properties of the materials
+        """
+        self.model.mat_reflectance[self._mat_ids] = materials[:, 0]
+        self.model.mat_shininess[self._mat_ids] = materials[:, 1]
+        self.model.mat_specular[self._mat_ids] = materials[:, 2]
+
+    def _generate_bitmap(self, tex_id, variation, rgb1, rgb2):
+        """
+        Helper function to generate a new bitmap in place for texture @tex_id, with vectorized operations only. The
+        new bitmap is blended with the default one if @self.randomize_local is True.
+
+        Args:
+            tex_id (int): id of the texture
+            variation (str): texture variation, either 'rgb', 'checker', 'noise', or 'gradient'
+            rgb1 (3-array): (r,g,b) uint8 first color of the pattern (the only one for 'rgb')
+            rgb2 (3-array): (r,g,b) uint8 second color of the pattern
+        """
+        bitmap = self.textures[tex_id].bitmap[..., :3]
+        h, w = bitmap.shape[:2]
+
+        # Patterns are either a constant / linearly varying color, or a mask indexing a two-color palette
+        mask = None
+        if variation == "rgb":
+            pattern = rgb1
+        elif variation == "gradient":
+            vertical = bool(self.random_state.uniform() > 0.5)
+            p = np.linspace(0, 1, h if vertical else w)[:, None]
+            line = rgb2 * p + rgb1 * (1.0 - p)
+            pattern = line[:, None, :] if vertical else line[None, :, :]
+        elif variation == "checker":
+            mask = self._texture_checker_mats[tex_id][1][..., 0]
+        elif variation == "noise":
+            fraction = 0.1 + self.random_state.uniform() * 0.8
+            mask = self.random_state.uniform(size=(h, w)) < fraction
+        else:
+            raise ValueError("Invalid texture variation: {}".format(variation))
+        if mask is not None:
+            palette = np.stack((rgb1, rgb2))
+            mask = mask.view(np.uint8)
+
+        if not self.randomize_local:
+            if mask is None:
+                bitmap[:] = pattern
             else:
-                # randomize geom color
-                self._randomize_geom_color(name)
+                np.take(palette, mask, axis=0, out=bitmap)
+            return
 
-        if self.randomize_skybox:
-            self._randomize_texture("skybox")
+        # Blend with the default bitmap, see @set_texture
+        a = np.float32(self.local_rgb_interpolation)
+        default = self._default_texture_bitmaps[tex_id][..., :3]
+        blended = self._blend_buffer(bitmap.shape)
+        if mask is None:
+            np.multiply(default, 1 - a, out=blended)
+            blended += a * np.asarray(pattern, dtype=np.float32)
+        else:
+            np.take(a * palette.astype(np.float32), mask, axis=0, out=blended)
+            blended += default * (1 - a)
+        np.copyto(bitmap, blended, casting="unsafe")
+
+    def _blend_buffer(self, shape):
+        """
+        Helper function to grab a float buffer of shape @shape, reused across textures
+
+        Args:
+            shape (tuple): shape of the buffer
+
+        Returns:
+            np.array: float32 buffer (with arbitrary values)
+        """
+        size = int(np.prod(shape))
+        if self._blend_scratch is None or self._blend_scratch.size < size:
+            self._blend_scratch = np.empty(size, dtype=np.float32)
+        return self._blend_scratch[:size].reshape(shape)
 
     def _randomize_geom_color(self, name):
         """
@@ -1017,15 +1140,8 @@ class TextureModder(BaseModder):
         Helper method for setting all material colors to white, otherwise
         the texture modifications won't take full effect.
         """
-        for name in self.geom_names:
-            # whiten geom
-            geom_id = self.model.geom_name2id(name)
-            self.model.geom_rgba[geom_id, :] = 1.0
-
-            if self._check_geom_for_texture(name):
-                # whiten material
-                mat_id = self.model.geom_matid[geom_id]
-                self.model.mat_rgba[mat_id, :] = 1.0
+        self.model.geom_rgba[self._geom_ids, :] = 1.0
+        self.model.mat_rgba[self._mat_ids, :] = 1.0
 
     def get_geom_rgb(self, name):
         """
@@ -1244,15 +1360,14 @@ class TextureModder(BaseModder):
 
     def upload_texture(self, name, device_id=0):
         """
-        Uploads the texture to the GPU so it's available in the rendering.
+        Marks the texture as modified, so that it gets uploaded to the GPU right before the next rendering (see
+        MjSim.mark_textures_dirty).
 
         Args:
             name (str): name of geom
+            device_id (int): unused, render contexts upload textures on their own device
         """
-        texture = self.get_texture(name)
-        if self.sim._render_context_offscreen is None:
-            render_context = MjRenderContextOffscreen(self.sim, device_id)
-            render_context.upload_texture(texture.id)
+        self.sim.mark_textures_dirty(self.get_texture(name).id)
 
     def _check_geom_for_texture(self, name):
         """
@@ -1270,7 +1385,7 @@ class TextureModder(BaseModder):
         mat_id = self.model.geom_matid[geom_id]
         if mat_id < 0:
             return False
-        tex_id = self.model.mat_texid[mat_id]
+        tex_id = self.model.mat_texid[mat_id, mujoco.mjtTextureRole.mjTEXROLE_RGB]
         if tex_id < 0:
             return False
         return True
@@ -1302,7 +1417,7 @@ class TextureModder(BaseModder):
         assert self._check_geom_for_texture(name)
         geom_id = self.model.geom_name2id(name)
         mat_id = self.model.geom_matid[geom_id]
-        tex_id = self.model.mat_texid[mat_id]
+        tex_id = self.model.mat_texid[mat_id, mujoco.mjtTextureRole.mjTEXROLE_RGB]
         return tex_id
 
     def _name_to_mat_id(self, name):
@@ -1359,10 +1474,10 @@ class TextureModder(BaseModder):
                 - (np.array): 2d-array representing first half of checker matrix
                 - (np.array): 2d-array representing second half of checker matrix
         """
-        re = np.r_[((w + 1) // 2) * [0, 1]]
-        ro = np.r_[((w + 1) // 2) * [1, 0]]
-        cbd1 = np.expand_dims(np.row_stack(((h + 1) // 2) * [re, ro]), -1)[:h, :w]
-        cbd2 = np.expand_dims(np.row_stack(((h + 1) // 2) * [ro, re]), -1)[:h, :w]
+        re = np.r_[((w + 1) // 2) * [False, True]]
+        ro = np.r_[((w + 1) // 2) * [True, False]]
+        cbd1 = np.expand_dims(np.vstack(((h + 1) // 2) * [re, ro]), -1)[:h, :w]
+        cbd2 = np.expand_dims(np.vstack(((h + 1) // 2) * [ro, re]), -1)[:h, :w]
         return cbd1, cbd2
 
 
@@ -1379,15 +1494,16 @@ class Texture:
         tex_id (int): id of specific texture in mujoco sim
     """
 
-    __slots__ = ["id", "type", "height", "width", "tex_adr", "tex_rgb"]
+    __slots__ = ["id", "type", "height", "width", "nchannel", "tex_adr", "tex_data"]
 
     def __init__(self, model, tex_id):
         self.id = tex_id
         self.type = MJT_TEXTURE_ENUM[model.tex_type[tex_id]]
         self.height = model.tex_height[tex_id]
         self.width = model.tex_width[tex_id]
+        self.nchannel = model.tex_nchannel[tex_id]
         self.tex_adr = model.tex_adr[tex_id]
-        self.tex_rgb = model.tex_rgb
+        self.tex_data = model.tex_data
 
     @property
     def bitmap(self):
@@ -1395,11 +1511,11 @@ class Texture:
         Grabs color bitmap associated with this texture from the mujoco sim.
 
         Returns:
-            np.array: 3d-array representing the rgb texture bitmap
+            np.array: 3d-array representing the (rgb or rgba) texture bitmap
         """
-        size = self.height * self.width * 3
-        data = self.tex_rgb[self.tex_adr : self.tex_adr + size]
-        return data.reshape((self.height, self.width, 3))
+        size = self.height * self.width * self.nchannel
+        data = self.tex_data[self.tex_adr : self.tex_adr + size]
+        return data.reshape((self.height, self.width, self.nchannel))
 
 
 class DynamicsModder(BaseModder):
@@ -1422,6 +1538,10 @@ class DynamicsModder(BaseModder):
 
     NOTE: A full list of supported randomizable parameters can be seen by calling modder.dynamics_parameters
 
+    NOTE: Default values are stored as snapshots of the full MjModel arrays (e.g.: body_mass, geom_friction), so that
+        randomize() and restore_defaults() write all the values of a parameter at once rather than calling self.mod
+        for each element. Perturbations are sampled from @random_state
+
     NOTE: When modifying parameters belonging to MjModel.opt (e.g.: density, viscosity), no name should
         be specified (set it as None in mod(...)). This is because opt does not have a name attribute
         associated with it
@@ -1641,93 +1761,149 @@ class DynamicsModder(BaseModder):
             },
         }
 
-        # Store defaults so we don't loss track of the original (non-perturbed) values
-        self.opt_defaults = None
-        self.body_defaults = None
-        self.geom_defaults = None
-        self.joint_defaults = None
+        # Store defaults so we don't loss track of the original (non-perturbed) values. Defaults are snapshots of the
+        # full MjModel arrays (see @_parameter_columns), and randomized elements are held as row indexes into them
+        self.defaults = None
+        self.randomized_indexes = None
         self.save_defaults()
 
+    # MjModel array holding each (non-opt) dynamics parameter, one row per body / geom / joint / dof
+    _parameter_columns = {
+        # Body parameters
+        "position": "body_pos",
+        "quaternion": "body_quat",
+        "inertia": "body_inertia",
+        "mass": "body_mass",
+        # Geom parameters
+        "friction": "geom_friction",
+        "solref": "geom_solref",
+        "solimp": "geom_solimp",
+        # Joint parameters
+        "stiffness": "jnt_stiffness",
+        "frictionloss": "dof_frictionloss",
+        "damping": "dof_damping",
+        "armature": "dof_armature",
+    }
+
     def save_defaults(self):
         """
-        Grabs the current values for all parameters in sim and stores them as default values
-        """
-        self.opt_defaults = {
-            None: {  # no name associated with the opt parameters
-                "density": self.sim.model.opt.density,
-                "viscosity": self.sim.model.opt.viscosity,
-            }
+        Grabs the current values for all parameters in sim and stores them as default values, and resolves the rows of
+        the elements to randomize
+        """
+        model = self.sim.model
+        self.defaults = {attr: np.array(getattr(model, column)) for attr, column in self._parameter_columns.items()}
+        self.defaults["density"] = model.opt.density
+        self.defaults["viscosity"] = model.opt.viscosity
+
+        # Rows of the selected elements, excluding the ones mod() leaves untouched (mass / inertia of massless bodies,
+        # stiffness of non-stiff joints, and dofs of free joints)
+        body_ids = np.array([model.body_name2id(name) for name in self.body_names], dtype=int)
+        massive_body_ids = body_ids[np.array([name not in self.dummy_bodies for name in self.body_names], dtype=bool)]
+        geom_ids = np.array([model.geom_name2id(name) for name in self.geom_names], dtype=int)
+        joint_ids = np.array([model.joint_name2id(name) for name in self.joint_names], dtype=int)
+        stiff_joint_ids = joint_ids[self.defaults["stiffness"][joint_ids] != 0]
+        dof_ids = np.flatnonzero(np.isin(model.dof_jntid, joint_ids[model.jnt_type[joint_ids] != 0]))
+
+        self.randomized_indexes = {
+            "position": body_ids,
+            "quaternion": body_ids,
+            "inertia": massive_body_ids,
+            "mass": massive_body_ids,
+            "friction": geom_ids,
+            "solref": geom_ids,
+            "solimp": geom_ids,
+            "stiffness": stiff_joint_ids,
+            "frictionloss": dof_ids,
+            "damping": dof_ids,
+            "armature": dof_ids,
         }
-
-        self.body_defaults = {}
-        for body_name in self.sim.model.body_names:
-            body_id = self.sim.model.body_name2id(body_name)
-            self.body_defaults[body_name] = {
-                "position": np.array(self.sim.model.body_pos[body_id]),
-                "quaternion": np.array(self.sim.model.body_quat[body_id]),
-                "inertia": np.array(self.sim.model.body_inertia[body_id]),
-                "mass": self.sim.model.body_mass[body_id],
-            }
-
-        self.geom_defaults = {}
-        for geom_name in self.sim.model.geom_names:
-            geom_id = self.sim.model.geom_name2id(geom_name)
-            self.geom_defaults[geom_name] = {
-                "friction": np.array(self.sim.model.geom_friction[geom_id]),
-                "solref": np.array(self.sim.model.geom_solref[geom_id]),
-                "solimp": np.array(self.sim.model.geom_solimp[geom_id]),
-            }
-
-        self.joint_defaults = {}
-        for joint_name in self.sim.model.joint_names:
-            joint_id = self.sim.model.joint_name2id(joint_name)
-            dof_idx = [i for i, v in enumerate(self.sim.model.dof_jntid) if v == joint_id]
-            self.joint_defaults[joint_name] = {
-                "stiffness": self.sim.model.jnt_stiffness[joint_id],
-                "frictionloss": np.array(self.sim.model.dof_frictionloss[dof_idx]),
-                "damping": np.array(self.sim.model.dof_damping[dof_idx]),
-                "armature": np.array(self.sim.model.dof_armature[dof_idx]),
-            }
+        # Randomized elements need to be gathered again
+        self._plan_key = None
 
     def restore_defaults(self):
         """
         Restores the default values curently saved in this modder
         """
-        # Loop through all defaults and set the default value in sim
-        for group_defaults in (self.opt_defaults, self.body_defaults, self.geom_defaults, self.joint_defaults):
-            for name, defaults in group_defaults.items():
-                for attr, default_val in defaults.items():
-                    self.mod(name=name, attr=attr, val=default_val)
+        # Write back the full snapshots
+        model = self.sim.model
+        for attr, column in self._parameter_columns.items():
+            getattr(model, column)[:] = self.defaults[attr]
+        model.opt.density = self.defaults["density"]
+        model.opt.viscosity = self.defaults["viscosity"]
 
         # Make sure changes propagate in sim
         self.update()
 
     def randomize(self):
         """
-        Randomizes all enabled dynamics parameters in the simulation
-        """
-        for group_defaults, group_randomizations, group_randomize_names in zip(
-            (self.opt_defaults, self.body_defaults, self.geom_defaults, self.joint_defaults),
-            (self.opt_randomizations, self.body_randomizations, self.geom_randomizations, self.joint_randomizations),
-            ([None], self.body_names, self.geom_names, self.joint_names),
-        ):
-            for name in group_randomize_names:
-                # Randomize all parameters associated with this element
-                for attr, default_val in group_defaults[name].items():
-                    val = copy.copy(default_val)
-                    settings = group_randomizations[attr]
-                    if settings["randomize"]:
-                        # Randomize accordingly, and clip the final perturbed value
-                        perturbation = np.random.rand() if type(val) in {int, float} else np.random.rand(*val.shape)
-                        perturbation = settings["perturbation"] * (-1 + 2 * perturbation)
-                        val = val + perturbation if settings["type"] == "size" else val * (1.0 + perturbation)
-                        val = np.clip(val, *settings["clip"])
-                    # Modify this value
-                    self.mod(name=name, attr=attr, val=val)
+        Randomizes all enabled dynamics parameters in the simulation. Perturbations of all the randomized elements are
+        sampled in a single draw, and written back with one assignment per MjModel array.
+        """
+        self._update_randomization_plan()
+        model = self.sim.model
+
+        # Perturb and clip all values at once (the scale is zero for parameters that are not randomized)
+        val = self.random_state.rand(len(self._plan_defaults))
+        val = self._plan_defaults + self._plan_scales * (2 * val - 1)
+        np.clip(val, self._plan_low, self._plan_high, out=val)
+
+        for attr, rows, segment in self._plan_segments:
+            if rows is None:
+                setattr(model.opt, attr, val[segment.start])
+                continue
+            values = val[segment].reshape((len(rows),) + self.defaults[attr].shape[1:])
+            if attr == "quaternion":
+                values /= np.linalg.norm(values, axis=-1, keepdims=True)
+            getattr(model, self._parameter_columns[attr])[rows] = values
 
         # Make sure changes propagate in sim
         self.update()
 
+    def _update_randomization_plan(self):
+        """
+        Helper function to gather the default values of all the randomized elements into flat arrays, along with the
+        magnitudes and ranges of their perturbations. This is only done again when the defaults or the randomization
+        settings change.
+        """
+        groups = (
+            self.opt_randomizations,
+            self.body_randomizations,
+            self.geom_randomizations,
+            self.joint_randomizations,
+        )
+        key = tuple(
+            (attr, settings["randomize"], settings["perturbation"], settings["type"], tuple(settings["clip"]))
+            for group_randomizations in groups
+            for attr, settings in group_randomizations.items()
+        )
+        if key == self._plan_key:
+            return
+
+        defaults, scales, low, high, segments = [], [], [], [], []
+        start = 0
+        for attr, randomize, perturbation, perturbation_type, clip in key:
+            if attr in self._parameter_columns:
+                rows = self.randomized_indexes[attr]
+                default = self.defaults[attr][rows].ravel()
+            else:
+                rows = None
+                default = np.array([self.defaults[attr]], dtype=float)
+            # Ratio perturbations are relative to the default values, and only randomized values are clipped
+            scale = perturbation * (default if perturbation_type == "ratio" else np.ones_like(default))
+            defaults.append(default)
+            scales.append(scale if randomize else np.zeros_like(default))
+            low.append(np.full_like(default, clip[0] if randomize else -np.inf))
+            high.append(np.full_like(default, clip[1] if randomize else np.inf))
+            segments.append((attr, rows, slice(start, start + len(default))))
+            start += len(default)
+
+        self._plan_defaults = np.concatenate(defaults)
+        self._plan_scales = np.concatenate(scales)
+        self._plan_low = np.concatenate(low)
+        self._plan_high = np.concatenate(high)
+        self._plan_segments = segments
+        self._plan_key = key
+
     def update_sim(self, sim):
         """
         In addition to super method, update internal default values to match the current values from
@@ -1764,6 +1940,7 @@ class DynamicsModder(BaseModder):
         )
         # Modify the requested parameter (uses a clean way to programmatically call the appropriate method)
         getattr(self, f"mod_{attr}")(name, val)
+        self.sim.mark_model_modified()
 
     def mod_density(self, name=None, val=0.0):
         """
@@ -1925,7 +2102,7 @@ class DynamicsModder(BaseModder):
         # Modify this value (only if it's not a free joint)
         jnt_id = self.sim.model.joint_name2id(name)
         if self.sim.model.jnt_type[jnt_id] != 0:
-            dof_idx = [i for i, v in enumerate(self.sim.model.dof_jntid) if v == jnt_id]
+            dof_idx = np.flatnonzero(self.sim.model.dof_jntid == jnt_id)
             self.sim.model.dof_frictionloss[dof_idx] = val
 
     def mod_damping(self, name, val):
@@ -1944,7 +2121,7 @@ class DynamicsModder(BaseModder):
         # Modify this value (only if it's not a free joint)
         jnt_id = self.sim.model.joint_name2id(name)
         if self.sim.model.jnt_type[jnt_id] != 0:
-            dof_idx = [i for i, v in enumerate(self.sim.model.dof_jntid) if v == jnt_id]
+            dof_idx = np.flatnonzero(self.sim.model.dof_jntid == jnt_id)
             self.sim.model.dof_damping[dof_idx] = val
 
     def mod_armature(self, name, val):
@@ -1959,7 +2136,7 @@ class DynamicsModder(BaseModder):
         # Modify this value (only if it's not a free joint)
         jnt_id = self.sim.model.joint_name2id(name)
         if self.sim.model.jnt_type[jnt_id] != 0:
-            dof_idx = [i for i, v in enumerate(self.sim.model.dof_jntid) if v == jnt_id]
+            dof_idx = np.flatnonzero(self.sim.model.dof_jntid == jnt_id)
             self.sim.model.dof_armature[dof_idx] = val
 
     @property
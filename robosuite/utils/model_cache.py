@@ -0,0 +1,267 @@
+"""
+Cache of compiled MuJoCo models keyed by a hash of their (processed) XML, so that byte-identical XML is only compiled
+once per process (in-memory LRU), or once per machine (MuJoCo binary .mjb files in a cache directory).
+
+The cache is opt-in and configured through macros.MODEL_CACHE_SIZE and macros.MODEL_CACHE_DIR. Note that the XML
+only references mesh / texture files by path: if an asset file changes without its path changing, the on-disk cache
+should be cleared.
+"""
+
+import copy
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+
+import mujoco
+
+import robosuite.macros as macros
+from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
+
+
+class ModelCache:
+    """
+    LRU cache of compiled MjModel instances, optionally backed by a directory of MuJoCo binary (.mjb) files.
+
+    Models handed out by the cache are private copies of the cached model, so that in-place model modifications (e.g.:
+    domain randomization) never leak into the cache or into other simulations. Every model is stored along with the
+    XML MuJoCo saves right after compiling it (mj_saveLastXML), since that is only available while the model is the
+    last one parsed in the process (see MjModel.get_xml).
+
+    Args:
+        max_size (int): Maximum number of compiled models kept in memory. 0 disables the in-memory cache
+
+        cache_dir (None or str): If specified, directory where compiled models are saved to / loaded from as .mjb files
+    """
+
+    def __init__(self, max_size=16, cache_dir=None):
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._models = OrderedDict()
+        self._lock = Lock()
+        self.reset_stats()
+
+    @staticmethod
+    def key(xml):
+        """
+        Args:
+            xml (str): MJCF model
+
+        Returns:
+            str: cache key of @xml. Includes the MuJoCo version, since compiled (and binary) models are version-specific
+        """
+        return hashlib.sha256("{}\0{}".format(mujoco.__version__, xml).encode("utf-8")).hexdigest()
+
+    def get(self, xml):
+        """
+        Returns the compiled model for @xml, compiling it only if it is neither in memory nor on disk.
+
+        Args:
+            xml (str): MJCF model
+
+        Returns:
+            2-tuple:
+
+                - (mujoco.MjModel) compiled model, owned by the caller
+                - (str) XML saved by MuJoCo right after compiling the model
+        """
+        key = self.key(xml)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self._hits += 1
+                return copy.copy(entry[0]), entry[1]
+
+        # Loading / compiling happens outside of the lock, only the bookkeeping is serialized
+        entry = self._load(key)
+        from_disk = entry is not None
+        if not from_disk:
+            entry = compile_xml(xml)
+            self._save(key, *entry)
+
+        with self._lock:
+            if from_disk:
+                self._disk_hits += 1
+            else:
+                self._misses += 1
+            if self.max_size > 0:
+                self._models[key] = entry
+                self._models.move_to_end(key)
+                while len(self._models) > self.max_size:
+                    self._models.popitem(last=False)
+                    self._evictions += 1
+        return copy.copy(entry[0]), entry[1]
+
+    def _path(self, key, extension):
+        return os.path.join(self.cache_dir, "{}.{}".format(key, extension))
+
+    def _load(self, key):
+        """
+        Returns:
+            None or 2-tuple: (model, saved XML) loaded from the on-disk cache, if any
+        """
+        if self.cache_dir is None or not os.path.exists(self._path(key, "mjb")):
+            return None
+        try:
+            with open(self._path(key, "xml")) as f:
+                model_xml = f.read()
+            return mujoco.MjModel.from_binary_path(self._path(key, "mjb")), model_xml
+        except Exception as e:
+            ROBOSUITE_DEFAULT_LOGGER.warning(
+                "Ignoring unreadable cached model {}: {}".format(self._path(key, "mjb"), e)
+            )
+            return None
+
+    def _save(self, key, model, model_xml):
+        """
+        Saves @model and its saved XML @model_xml to the on-disk cache. Files are written under a temporary name and
+        then renamed (the .mjb last), so that concurrent processes never read a partially written model.
+        """
+        if self.cache_dir is None:
+            return
+        tmp_paths = []
+        try:
+            for extension in ("xml", "mjb"):
+                fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+                tmp_paths.append(tmp_path)
+                if extension == "xml":
+                    with os.fdopen(fd, "w") as f:
+                        f.write(model_xml)
+                else:
+                    os.close(fd)
+                    mujoco.mj_saveModel(model, tmp_path, None)
+                os.replace(tmp_path, self._path(key, extension))
+        except Exception as e:
+            ROBOSUITE_DEFAULT_LOGGER.warning("Could not save compiled model to {}: {}".format(self.cache_dir, e))
+            for tmp_path in tmp_paths:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def clear(self, disk=False):
+        """
+        Drops all models kept in memory.
+
+        Args:
+            disk (bool): If True, also removes all the models saved in the cache directory
+        """
+        with self._lock:
+            self._models.clear()
+        if disk and self.cache_dir is not None:
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(".mjb") or filename.endswith(".xml"):
+                    os.remove(os.path.join(self.cache_dir, filename))
+
+    def reset_stats(self):
+        """
+        Resets the hit / miss counters.
+        """
+        with self._lock:
+            self._hits = 0
+            self._disk_hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: cache statistics:
+
+                :`'hits'`: number of models served from memory
+                :`'disk_hits'`: number of models loaded from the cache directory
+                :`'misses'`: number of models that had to be compiled
+                :`'evictions'`: number of models evicted from memory
+                :`'size'`: number of models currently kept in memory
+                :`'hit_rate'`: fraction of requests that skipped compilation
+        """
+        with self._lock:
+            hits, disk_hits, misses = self._hits, self._disk_hits, self._misses
+            evictions, size = self._evictions, len(self._models)
+        requests = hits + disk_hits + misses
+        return {
+            "hits": hits,
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "evictions": evictions,
+            "size": size,
+            "hit_rate": (hits + disk_hits) / requests if requests > 0 else 0.0,
+        }
+
+
+_MODEL_CACHE = None
+
+# MuJoCo keeps the last parsed XML in a global, so compiling and saving it must not interleave across threads
+_COMPILE_LOCK = Lock()
+
+
+def compile_xml(xml):
+    """
+    Compiles @xml without going through the model cache.
+
+    Args:
+        xml (str): MJCF model
+
+    Returns:
+        2-tuple:
+
+            - (mujoco.MjModel) compiled model
+            - (str) XML saved by MuJoCo right after compiling the model
+    """
+    with _COMPILE_LOCK, tempfile.TemporaryDirectory() as td:
+        model = mujoco.MjModel.from_xml_string(xml)
+        filename = os.path.join(td, "model.xml")
+        mujoco.mj_saveLastXML(filename, model)
+        with open(filename) as f:
+            return model, f.read()
+
+
+def get_model_cache():
+    """
+    Returns the process-wide model cache, (re-)created according to macros.MODEL_CACHE_SIZE / macros.MODEL_CACHE_DIR.
+
+    Returns:
+        None or ModelCache: the cache, or None if it is disabled
+    """
+    global _MODEL_CACHE
+    if macros.MODEL_CACHE_SIZE <= 0 and macros.MODEL_CACHE_DIR is None:
+        return None
+    if (
+        _MODEL_CACHE is None
+        or _MODEL_CACHE.max_size != macros.MODEL_CACHE_SIZE
+        or _MODEL_CACHE.cache_dir != macros.MODEL_CACHE_DIR
+    ):
+        _MODEL_CACHE = ModelCache(max_size=max(macros.MODEL_CACHE_SIZE, 0), cache_dir=macros.MODEL_CACHE_DIR)
+    return _MODEL_CACHE
+
+
+def compile_model(xml):
+    """
+    Compiles @xml, going through the process-wide model cache if it is enabled.
+
+    Args:
+        xml (str): MJCF model
+
+    Returns:
+        2-tuple:
+
+            - (mujoco.MjModel) compiled model, owned by the caller
+            - (None or str) XML saved by MuJoCo right after compiling the model, None if the cache is disabled (in
+                which case it can still be retrieved with mj_saveLastXML until another model is parsed)
+    """
+    cache = get_model_cache()
+    if cache is None:
+        return mujoco.MjModel.from_xml_string(xml), None
+    return cache.get(xml)
+
+
+def get_model_cache_stats():
+    """
+    Returns:
+        dict: statistics of the process-wide model cache (see ModelCache.stats), empty if the cache is disabled
+    """
+    cache = get_model_cache()
+    return {} if cache is None else cache.stats()
@@ -1,12 +1,39 @@
 """
 Numba utils.
 """
-import numba
+import functools
 
 import robosuite.macros as macros
 
 
 def jit_decorator(func):
-    if macros.ENABLE_NUMBA:
-        return numba.jit(nopython=True, cache=macros.CACHE_NUMBA)(func)
-    return func
+    """
+    Compiles @func with numba (in nopython mode) if macros.ENABLE_NUMBA.
+
+    Compilation is deferred to the first call of @func, so that importing the modules defining jitted functions neither
+    imports numba nor compiles anything. The compiled function then replaces @func in its module, so that later calls
+    through the module go straight to it.
+
+    Args:
+        func (function): Function to compile
+
+    Returns:
+        function: @func if numba is disabled, otherwise a wrapper compiling @func on its first call
+    """
+    if not macros.ENABLE_NUMBA:
+        return func
+
+    compiled = None
+
+    @functools.wraps(func)
+    def lazy_jit(*args, **kwargs):
+        nonlocal compiled
+        if compiled is None:
+            import numba
+
+            compiled = numba.jit(nopython=True, cache=macros.CACHE_NUMBA)(func)
+            if func.__globals__.get(func.__name__) is lazy_jit:
+                func.__globals__[func.__name__] = compiled
+        return compiled(*args, **kwargs)
+
+    return lazy_jit
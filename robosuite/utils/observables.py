@@ -1,7 +1,7 @@
 import numpy as np
 
 
-def sensor(modality):
+def sensor(modality, requires=()):
     """
     Decorator that should be added to any sensors that will be an observable.
 
@@ -24,16 +24,34 @@ def sensor(modality):
                 out = ...
                 return out
 
+    Sensors that read values computed by other sensors from @obs_cache can declare the corresponding keys in
+    @requires. This does not reorder the sensors: @obs_cache holds whatever was last written under those keys. It only
+    ensures that (see ObservableScheduler and ObservableCache):
+
+        - producers of those keys are never deferred, i.e.: they keep being sampled on their own schedule even if
+          they are inactive
+        - if @obs_cache is an ObservableCache in which a producer was deferred on the current substep, that producer
+          is evaluated before this sensor runs
+
+    A producer that is itself due on the same substep but comes later in the observables' order is still sampled
+    after this sensor, which then reads its previous value:
+
+        >>> @sensor(modality="object", requires=["robot0_eef_pos"])
+        >>> def cube_to_eef_pos(obs_cache):
+                ...
+
     Args:
         modality (str): Modality for this sensor
+        requires (list of str): Keys of @obs_cache read by this sensor
 
     Returns:
         function: decorator function
     """
     # Define standard decorator (with no args)
     def decorator(func):
-        # Add modality attribute
+        # Add modality and dependency attributes
         func.__modality__ = modality
+        func.__requires__ = tuple(requires)
         # Return function
         return func
 
@@ -211,7 +229,10 @@ class Observable:
         self._current_observed_value = 0 if self._is_number else np.zeros(self._data_shape)
         self._sampled = False
 
-    def update(self, timestep, obs_cache, force=False):
+        # Scheduler (if any) that skips the calls to update() that would only advance the internal time counter
+        self._scheduler = None
+
+    def update(self, timestep, obs_cache, force=False, lazy=False):
         """
         Updates internal values for this observable, if enabled.
 
@@ -220,6 +241,8 @@ class Observable:
             obs_cache (dict): Observation cache mapping observable names to pre-computed values to pass to sensor. This
                 will be updated in-place during this call.
             force (bool): If True, will force the observable to update its internal value to the newest value.
+            lazy (bool): If True and @obs_cache is an ObservableCache, new readings are only computed when they are
+                first accessed from @obs_cache (see ObservableCache.defer)
         """
         if self._enabled:
             # Increment internal time counter
@@ -230,11 +253,7 @@ class Observable:
             if (
                 not self._sampled and self._sampling_timestep - self._current_delay >= self._time_since_last_sample
             ) or force:
-                # Get newest raw value, corrupt it, filter it, and set it as our current observed value
-                obs = np.array(self._filter(self._corrupter(self._sensor(obs_cache))))
-                self._current_observed_value = obs[0] if len(obs.shape) == 1 and obs.shape[0] == 1 else obs
-                # Update cache entry as well
-                obs_cache[self.name] = np.array(self._current_observed_value)
+                self._sample_into(obs_cache, lazy=lazy and not force)
                 # Toggle sampled and re-sample next time delay
                 self._sampled = True
                 self._current_delay = self._delayer()
@@ -248,20 +267,94 @@ class Observable:
                         f"Warning: sampling rate for observable {self.name} is either too low or delay is too high. "
                         f"Please adjust one (or both)"
                     )
-                    # Get newest raw value, corrupt it, filter it, and set it as our current observed value
-                    obs = np.array(self._filter(self._corrupter(self._sensor(obs_cache))))
-                    self._current_observed_value = obs[0] if len(obs.shape) == 1 and obs.shape[0] == 1 else obs
-                    # Update cache entry as well
-                    obs_cache[self.name] = np.array(self._current_observed_value)
+                    self._sample_into(obs_cache, lazy=lazy)
                     # Re-sample next time delay
                     self._current_delay = self._delayer()
                 self._time_since_last_sample %= self._sampling_timestep
                 self._sampled = False
 
+    def sample(self, obs_cache):
+        """
+        Grabs a new reading from the sensor, corrupts it, filters it, and sets it as the current observed value. The
+        observed value is also stored in @obs_cache under this observable's name.
+
+        Args:
+            obs_cache (dict): Observation cache mapping observable names to pre-computed values to pass to sensor. This
+                will be updated in-place during this call.
+        """
+        obs = np.array(self._filter(self._corrupter(self._sensor(obs_cache))))
+        if len(obs.shape) == 1 and obs.shape[0] == 1:
+            self._current_observed_value = obs[0]
+            obs_cache[self.name] = np.array(obs[0])
+        else:
+            # obs is already a private copy, so it can be shared with the cache
+            self._current_observed_value = obs
+            obs_cache[self.name] = obs
+
+    def _sample_into(self, obs_cache, lazy=False):
+        if isinstance(obs_cache, ObservableCache):
+            if lazy:
+                obs_cache.defer(self)
+            else:
+                obs_cache.evaluate(self)
+        else:
+            self.sample(obs_cache)
+
+    def idle_updates(self, timestep, max_updates):
+        """
+        Computes how many of the next calls to update() with @timestep would only advance the internal time counter,
+        i.e.: would neither sample the sensor nor start a new sampling period.
+
+        Args:
+            timestep (float): Amount of simulation time (in sec) that passes between update() calls
+            max_updates (int): Maximum number of updates to look ahead
+
+        Returns:
+            2-tuple:
+
+                - (int) number of idle updates
+                - (float) value of the internal time counter after those idle updates
+        """
+        t = self._time_since_last_sample
+        if not self._enabled:
+            return max_updates, t
+        sample_time = -np.inf if self._sampled else self._sampling_timestep - self._current_delay
+        for n in range(max_updates):
+            t_next = t + timestep
+            if sample_time >= t_next or t_next >= self._sampling_timestep:
+                return n, t
+            t = t_next
+        return max_updates, t
+
+    def skip_updates(self, num_updates, timestep, time_since_last_sample=None):
+        """
+        Applies @num_updates idle calls to update() (see @idle_updates), i.e.: only advances the internal time counter.
+
+        Args:
+            num_updates (int): Number of idle updates to apply
+            timestep (float): Amount of simulation time (in sec) that passes between update() calls
+            time_since_last_sample (None or float): If specified, precomputed value of the internal time counter after
+                the idle updates (as returned by @idle_updates), which avoids recomputing it
+        """
+        if not self._enabled or num_updates <= 0:
+            return
+        if time_since_last_sample is not None:
+            self._time_since_last_sample = time_since_last_sample
+        else:
+            # Repeated additions, to get the exact same counter values as when calling update()
+            for _ in range(num_updates):
+                self._time_since_last_sample += timestep
+
+    def _on_change(self):
+        # Let the scheduler catch this observable up before its timing settings change
+        if self._scheduler is not None:
+            self._scheduler.sync(self)
+
     def reset(self):
         """
         Resets this observable's internal values (but does not reset its sensor, corrupter, delayer, or filter)
         """
+        self._on_change()
         self._time_since_last_sample = 0.0
         self._current_delay = self._delayer()
         self._current_observed_value = 0 if self._is_number else np.zeros(self._data_shape)
@@ -294,6 +387,7 @@ class Observable:
         Args:
             enabled (bool): True if this observable should be enabled
         """
+        self._on_change()
         self._enabled = enabled
         # Reset values
         self.reset()
@@ -318,6 +412,8 @@ class Observable:
                 sensor data for the current timestep. Must handle case if inputted argument is empty ({}), and should
                 have `sensor` decorator when defined
         """
+        # The new sensor may require other observables
+        self._on_change()
         self._sensor = sensor
         self._check_sensor_validity()
 
@@ -353,6 +449,7 @@ class Observable:
                 in no arguments and return a float, for the number of seconds to delay the measurement by.
                 If None, results in default no filter
         """
+        self._on_change()
         self._delayer = delayer if delayer is not None else NO_DELAY
 
     def set_sampling_rate(self, rate):
@@ -362,6 +459,7 @@ class Observable:
         Args:
             rate (int): New sampling rate for this observable (Hz)
         """
+        self._on_change()
         self._sampling_timestep = 1.0 / rate
 
     def _check_sensor_validity(self):
@@ -401,3 +499,245 @@ class Observable:
             str: Modality name for this observable
         """
         return self._sensor.__modality__
+
+    @property
+    def requires(self):
+        """
+        Observation cache keys read by this sensor, as declared with the sensor decorator
+
+        Returns:
+            tuple: Keys of the observation cache this observable depends on
+        """
+        return getattr(self._sensor, "__requires__", ())
+
+
+class ObservableCache(dict):
+    """
+    Observation cache (see Observable.update) that supports lazy evaluation of observables.
+
+    Observables can be deferred (see @defer) instead of being sampled right away. A deferred observable is only
+    sampled once its value (or any other cache entry it produces as a side effect) is first accessed, either by a
+    sensor reading it or by @evaluate_pending, and deferred observables that are never accessed are dropped by
+    @clear_pending. Cache entries written by a sensor under other keys than its own name are recorded, so that those
+    keys can also trigger the evaluation of their (deferred) producer.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = {}  # observable name -> deferred observable
+        self._producers = {}  # cache key -> name of the observable that wrote it
+        self._evaluating = []  # stack of observables being evaluated
+
+    def defer(self, observable):
+        """
+        Defers the sampling of @observable until it is first accessed.
+
+        Args:
+            observable (Observable): Observable to sample lazily
+        """
+        self._pending[observable.name] = observable
+
+    def evaluate(self, observable):
+        """
+        Samples @observable now, after the observables it declares as requirements.
+
+        Args:
+            observable (Observable): Observable to sample
+        """
+        self._pending.pop(observable.name, None)
+        for key in observable.requires:
+            self._resolve(key)
+        self._evaluating.append(observable)
+        try:
+            observable.sample(self)
+        finally:
+            self._evaluating.pop()
+
+    def evaluate_pending(self, names):
+        """
+        Samples all the deferred observables whose names are in @names.
+
+        Args:
+            names (iterable): Names of the observables to evaluate if they are deferred
+        """
+        for name in names:
+            observable = self._pending.get(name)
+            if observable is not None:
+                self.evaluate(observable)
+
+    def clear_pending(self):
+        """
+        Drops all the deferred observables that have not been accessed.
+        """
+        self._pending.clear()
+
+    def producer(self, key):
+        """
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str: Name of the observable that writes @key, as recorded when it was last evaluated (@key itself if
+                it is not written as a side effect of another observable)
+        """
+        return self._producers.get(key, key)
+
+    def _resolve(self, key):
+        if self._pending:
+            name = key if key in self._pending else self._producers.get(key)
+            if name is not None and name in self._pending:
+                self.evaluate(self._pending[name])
+
+    def __setitem__(self, key, value):
+        if self._evaluating and key != self._evaluating[-1].name:
+            self._producers[key] = self._evaluating[-1].name
+        super().__setitem__(key, value)
+
+    def __getitem__(self, key):
+        self._resolve(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self._resolve(key)
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        self._resolve(key)
+        return super().get(key, default)
+
+
+class ObservableScheduler:
+    """
+    Updates a set of observables once per simulation substep, only calling into the observables that need to do
+    something on that substep.
+
+    For each enabled observable, the scheduler computes from its sampling rate and current delay the next substep on
+    which it has to sample or start a new sampling period, and skips all the update() calls in between (they would
+    only advance the observable's time counter, which is caught up exactly when the observable is next updated or
+    modified). Disabled observables are never updated.
+
+    If the observation cache is an ObservableCache, sampling is also lazy: inactive observables that are due on a
+    substep are deferred, and only evaluated if their value is accessed from the cache on that same substep (e.g.: by
+    an active observable due on that substep). Inactive observables that an enabled observable declares as
+    requirements through the sensor decorator are never deferred, since their last reading can be read on any later
+    substep (e.g.: by an observable with a different sampling rate or delay).
+
+    Args:
+        observables (dict): Maps observable names to observable objects. The scheduler keeps a reference to this dict,
+            @invalidate should be called if observables are added or removed
+        max_lookahead (int): Maximum number of substeps an observable can be skipped for before being updated
+    """
+
+    def __init__(self, observables, max_lookahead=10000):
+        self.observables = observables
+        self.max_lookahead = max_lookahead
+        self._timestep = None
+        self._substep = 0
+        self._schedule = None  # substep -> list of observables to update on that substep
+        self._idle = {}  # observable name -> (number of idle updates, time counter after them) until next substep
+        self._last = {}  # observable name -> last substep it was updated on
+        self._required = set()  # names of the observables required by enabled observables, never deferred
+
+    def invalidate(self):
+        """
+        Drops the current schedule, all observables will be updated on the next call to @update.
+        """
+        self._catch_up()
+        self._schedule = None
+
+    def sync(self, observable):
+        """
+        Catches @observable up with the updates it skipped so far, and invalidates the schedule. Called by
+        observables before their timing settings change.
+
+        Args:
+            observable (Observable): Observable about to be modified
+        """
+        if self._schedule is None:
+            return
+        # Disabled observables are not scheduled, but the schedule must still be rebuilt when they are re-enabled
+        if observable.name in self._last:
+            observable.skip_updates(self._substep - self._last[observable.name], self._timestep)
+            self._last[observable.name] = self._substep
+        self.invalidate()
+
+    def _catch_up(self):
+        if self._schedule is None:
+            return
+        for name, observable in self.observables.items():
+            if name in self._last:
+                observable.skip_updates(self._substep - self._last[name], self._timestep)
+                self._last[name] = self._substep
+
+    def _update_required(self, obs_cache):
+        producer = obs_cache.producer if isinstance(obs_cache, ObservableCache) else lambda key: key
+        self._required = {
+            producer(key)
+            for observable in self.observables.values()
+            if observable.is_enabled()
+            for key in observable.requires
+        }
+
+    def _is_lazy(self, observable, lazy):
+        return lazy and not observable.is_active() and observable.name not in self._required
+
+    def _schedule_observable(self, observable):
+        num_idle, time_after_idle = observable.idle_updates(self._timestep, self.max_lookahead)
+        self._idle[observable.name] = (num_idle, time_after_idle)
+        self._schedule.setdefault(self._substep + num_idle + 1, []).append(observable)
+
+    def _rebuild(self, timestep):
+        self._timestep = timestep
+        self._substep = 0
+        self._schedule = {}
+        self._idle = {}
+        self._last = {}
+        for name, observable in self.observables.items():
+            observable._scheduler = self
+            if observable.is_enabled():
+                self._last[name] = 0
+                self._schedule_observable(observable)
+
+    def update(self, timestep, obs_cache, force=False):
+        """
+        Equivalent to calling update() on all observables (see Observable.update), in order.
+
+        Args:
+            timestep (float): Amount of simulation time (in sec) that has passed since last call.
+            obs_cache (dict): Observation cache mapping observable names to pre-computed values to pass to sensors.
+                This will be updated in-place during this call.
+            force (bool): If True, will force all observables to update their internal value to the newest value.
+        """
+        lazy = isinstance(obs_cache, ObservableCache) and not force
+        if force or self._schedule is None or timestep != self._timestep:
+            self._catch_up()
+            self._update_required(obs_cache)
+            for observable in self.observables.values():
+                observable.update(
+                    timestep=timestep, obs_cache=obs_cache, force=force, lazy=self._is_lazy(observable, lazy)
+                )
+            if lazy:
+                obs_cache.clear_pending()
+            # Required keys written as side effects are only attributed to their producer once it has been evaluated
+            self._update_required(obs_cache)
+            self._rebuild(timestep)
+            return
+
+        self._substep += 1
+        due = self._schedule.pop(self._substep, None)
+        if due is None:
+            return
+
+        # Keep the original ordering of the observables, which matters for sensors relying on the cache
+        if len(due) > 1:
+            order = {name: i for i, name in enumerate(self.observables)}
+            due.sort(key=lambda obs: order[obs.name])
+        for observable in due:
+            name = observable.name
+            # All the updates since the last one were idle, so the time counter can directly be set
+            observable.skip_updates(self._substep - self._last[name] - 1, timestep, self._idle[name][1])
+            observable.update(timestep=timestep, obs_cache=obs_cache, lazy=self._is_lazy(observable, lazy))
+            self._last[name] = self._substep
+            self._schedule_observable(observable)
+        if lazy:
+            obs_cache.clear_pending()
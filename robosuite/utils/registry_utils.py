@@ -0,0 +1,147 @@
+"""
+Registries of named classes (environments, robots, grippers, composite controllers) whose defining modules are only
+imported on demand, so that importing robosuite does not import every environment, robot, controller and optional
+integration up front.
+"""
+import importlib
+
+from robosuite.utils.log_utils import ROBOSUITE_DEFAULT_LOGGER
+
+ROBOSUITE_MODELS_WARNING = (
+    "Could not import robosuite_models. Some robots may not be available. "
+    "If you want to use these robots, please install robosuite_models from "
+    "source (https://github.com/ARISE-Initiative/robosuite_models) or through pip install."
+)
+
+# Optional modules registering additional robots / grippers, imported the first time an unknown name is looked up
+ROBOT_FALLBACK_MODULES = {"robosuite_models": ROBOSUITE_MODELS_WARNING}
+
+# Optional modules that could not be imported, so that their import is only attempted (and warned about) once
+_FAILED_IMPORTS = set()
+
+
+def import_optional_module(module, warning=None):
+    """
+    Imports optional module @module, logging @warning if it cannot be imported. A failed import is not retried.
+
+    Args:
+        module (str): Name of the module to import
+        warning (None or str): Message to log if the module cannot be imported
+
+    Returns:
+        bool: True if the module was imported
+    """
+    if module in _FAILED_IMPORTS:
+        return False
+    try:
+        importlib.import_module(module)
+    except Exception:
+        _FAILED_IMPORTS.add(module)
+        if warning is not None:
+            ROBOSUITE_DEFAULT_LOGGER.warning(warning)
+        return False
+    return True
+
+
+class LazyEntry:
+    """
+    Placeholder for a class that is registered by a module that has not been imported yet.
+
+    Args:
+        module (str): Name of the module registering the class when imported
+        hint (None or str): Additional explanation given if the module cannot be imported
+    """
+
+    __slots__ = ("module", "hint")
+
+    def __init__(self, module, hint=None):
+        self.module = module
+        self.hint = hint
+
+    def __repr__(self):
+        return "LazyEntry({!r})".format(self.module)
+
+
+class LazyRegistry(dict):
+    """
+    Registry mapping names to classes, where names can be registered before the modules defining their classes are
+    imported (see @register_lazy). A lazy entry is resolved the first time it is accessed (e.g.: by make()), by
+    importing its module: the module registers the class as usual, replacing the lazy entry.
+
+    Names and membership tests are available without importing anything. Looking up a name that is not registered
+    imports the optional @fallback_modules (once), which may register it.
+
+    Args:
+        fallback_modules (None or dict): Maps optional modules to import when an unknown name is looked up, to the
+            warning logged if they cannot be imported
+    """
+
+    def __init__(self, fallback_modules=None):
+        super().__init__()
+        self.fallback_modules = dict(fallback_modules or {})
+
+    def register_lazy(self, name, module, hint=None):
+        """
+        Registers @name as defined by @module, which is only imported once @name is looked up. Does nothing if
+        @name is already registered.
+
+        Args:
+            name (str): Name of the registered class
+            module (str): Name of the module registering @name when imported
+            hint (None or str): Additional explanation given if @module cannot be imported
+        """
+        if not dict.__contains__(self, name):
+            dict.__setitem__(self, name, LazyEntry(module, hint))
+
+    def _import_fallbacks(self, name):
+        """
+        Imports the fallback modules until @name is registered.
+
+        Returns:
+            bool: True if @name is registered
+        """
+        for module, warning in self.fallback_modules.items():
+            if dict.__contains__(self, name):
+                break
+            import_optional_module(module, warning)
+        return dict.__contains__(self, name)
+
+    def _resolve(self, name):
+        """
+        Returns the class registered as @name, importing its module if it is a lazy entry.
+
+        Raises:
+            ImportError: [Module of the lazy entry cannot be imported or does not register @name]
+        """
+        value = dict.__getitem__(self, name)
+        if isinstance(value, LazyEntry):
+            try:
+                importlib.import_module(value.module)
+            except ImportError as e:
+                msg = "Could not import {}, which defines {}".format(value.module, name)
+                raise ImportError(msg if value.hint is None else "{}. {}".format(msg, value.hint)) from e
+            value = dict.__getitem__(self, name)
+            if isinstance(value, LazyEntry):
+                raise ImportError("Module {} does not register {}".format(value.module, name))
+        return value
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or self._import_fallbacks(name)
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        return self._resolve(name)
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def values(self):
+        for name in list(self.keys()):
+            self._resolve(name)
+        return super().values()
+
+    def items(self):
+        for name in list(self.keys()):
+            self._resolve(name)
+        return super().items()
@@ -2,10 +2,155 @@
 Collection of useful simulation utilities
 """
 
+import weakref
+
 import numpy as np
 from robosuite.models.base import MujocoModel
 
 
+class ContactQuery:
+    """
+    Answers contact queries between geom groups of a simulation with vectorized operations on the active contact
+    pairs (sim.data.contact.geom), instead of looping over the contacts and comparing geom names in Python.
+
+    Each geom group (a geom name, a collection of geom names, or a MujocoModel's contact_geoms) is converted once into
+    a boolean mask over all the geoms of the model. Query results are cached until the set of active contact pairs
+    changes, so that several reward / termination checks within a single step share one pass over the contacts.
+
+    Use @get_contact_query to get the (shared) ContactQuery of a simulation.
+
+    Args:
+        sim (MjSim): Simulation to query contacts from
+    """
+
+    def __init__(self, sim):
+        # Weak reference, since the query is kept in a map keyed (weakly) on @sim itself (see get_contact_query)
+        self._sim = weakref.ref(sim)
+        # group key -> (ngeom,) boolean mask of the geoms in the group
+        self._masks = {}
+        # active contact pairs the cached results were computed for, and (query key -> result)
+        self._pairs_key = None
+        self._pairs = np.zeros((0, 2), dtype=int)
+        self._results = {}
+
+    @property
+    def sim(self):
+        """
+        Returns:
+            MjSim: Simulation this query answers for
+        """
+        return self._sim()
+
+    def _group_key(self, geoms):
+        """
+        Hashable key of a geom group: names and models are used as is, collections of names as frozensets.
+        """
+        if geoms is None or isinstance(geoms, (str, MujocoModel)):
+            return geoms
+        return frozenset(geoms)
+
+    def _mask(self, key):
+        """
+        Returns the geom mask of the group with key @key (see @_group_key), building it on first use.
+        """
+        mask = self._masks.get(key)
+        if mask is None:
+            if isinstance(key, str):
+                names = [key]
+            elif isinstance(key, MujocoModel):
+                names = key.contact_geoms
+            else:
+                names = key
+            mask = np.zeros(self.sim.model.ngeom, dtype=bool)
+            name2id = self.sim.model._geom_name2id
+            # Names that do not exist in the model (or unnamed geoms) can never be in contact
+            mask[[name2id[name] for name in names if name is not None and name in name2id]] = True
+            self._masks[key] = mask
+        return mask
+
+    def _update_pairs(self):
+        """
+        Fetches the active contact pairs, dropping the cached results if they changed since the last query.
+        """
+        pairs = self.sim.data._data.contact.geom
+        pairs_key = pairs.tobytes()
+        if pairs_key != self._pairs_key:
+            self._pairs_key = pairs_key
+            self._pairs = pairs.copy()
+            self._results.clear()
+
+    def check_contact(self, geoms_1, geoms_2=None):
+        """
+        Finds contact between two geom groups.
+
+        Args:
+            geoms_1 (str or list of str or MujocoModel): an individual geom name or list of geom names or a model. If
+                a MujocoModel is specified, the geoms checked will be its contact_geoms
+            geoms_2 (str or list of str or MujocoModel or None): another individual geom name or list of geom names.
+                If a MujocoModel is specified, the geoms checked will be its contact_geoms. If None, will check
+                any collision with @geoms_1 to any other geom in the environment
+
+        Returns:
+            bool: True if any geom in @geoms_1 is in contact with any geom in @geoms_2.
+        """
+        self._update_pairs()
+        key_1, key_2 = self._group_key(geoms_1), self._group_key(geoms_2)
+        query = ("check_contact", key_1, key_2)
+        result = self._results.get(query)
+        if result is None:
+            mask_1 = self._mask(key_1)
+            g1, g2 = self._pairs[:, 0], self._pairs[:, 1]
+            if geoms_2 is None:
+                result = bool(np.any(mask_1[g1] | mask_1[g2]))
+            else:
+                mask_2 = self._mask(key_2)
+                result = bool(np.any((mask_1[g1] & mask_2[g2]) | (mask_2[g1] & mask_1[g2])))
+            self._results[query] = result
+        return result
+
+    def get_contacts(self, model):
+        """
+        Checks for any contacts with @model (as defined by @model's contact_geoms) and returns the set of
+        geom names currently in contact with that model (excluding the geoms that are part of the model itself).
+
+        Args:
+            model (MujocoModel): Model to check contacts for.
+
+        Returns:
+            set: Unique geoms that are actively in contact with this model.
+        """
+        self._update_pairs()
+        query = ("get_contacts", model)
+        contact_ids = self._results.get(query)
+        if contact_ids is None:
+            mask = self._mask(model)
+            g1, g2 = self._pairs[:, 0], self._pairs[:, 1]
+            in_1, in_2 = mask[g1], mask[g2]
+            contact_ids = np.unique(np.concatenate([g2[in_1 & ~in_2], g1[in_2 & ~in_1]]))
+            self._results[query] = contact_ids
+        return {self.sim.model.geom_id2name(geom_id) for geom_id in contact_ids}
+
+
+# MjSim -> ContactQuery, entries are dropped together with their simulation (e.g.: on hard resets)
+_CONTACT_QUERIES = weakref.WeakKeyDictionary()
+
+
+def get_contact_query(sim):
+    """
+    Returns the ContactQuery shared by all contact checks on @sim, creating it on first use.
+
+    Args:
+        sim (MjSim): Current simulation object
+
+    Returns:
+        ContactQuery: contact query engine of @sim
+    """
+    query = _CONTACT_QUERIES.get(sim)
+    if query is None:
+        query = _CONTACT_QUERIES[sim] = ContactQuery(sim)
+    return query
+
+
 def check_contact(sim, geoms_1, geoms_2=None):
     """
     Finds contact between two geom groups.
@@ -19,26 +164,7 @@ def check_contact(sim, geoms_1, geoms_2=None):
     Returns:
         bool: True if any geom in @geoms_1 is in contact with any geom in @geoms_2.
     """
-    # Check if either geoms_1 or geoms_2 is a string, convert to list if so
-    if type(geoms_1) is str:
-        geoms_1 = [geoms_1]
-    elif isinstance(geoms_1, MujocoModel):
-        geoms_1 = geoms_1.contact_geoms
-    if type(geoms_2) is str:
-        geoms_2 = [geoms_2]
-    elif isinstance(geoms_2, MujocoModel):
-        geoms_2 = geoms_2.contact_geoms
-    for i in range(sim.data.ncon):
-        contact = sim.data.contact[i]
-        # check contact geom in geoms
-        c1_in_g1 = sim.model.geom_id2name(contact.geom1) in geoms_1
-        c2_in_g2 = sim.model.geom_id2name(contact.geom2) in geoms_2 if geoms_2 is not None else True
-        # check contact geom in geoms (flipped)
-        c2_in_g1 = sim.model.geom_id2name(contact.geom2) in geoms_1
-        c1_in_g2 = sim.model.geom_id2name(contact.geom1) in geoms_2 if geoms_2 is not None else True
-        if (c1_in_g1 and c2_in_g2) or (c1_in_g2 and c2_in_g1):
-            return True
-    return False
+    return get_contact_query(sim).check_contact(geoms_1, geoms_2)
 
 
 def get_contacts(sim, model):
@@ -57,15 +183,7 @@ def get_contacts(sim, model):
     assert isinstance(model, MujocoModel), "Inputted model must be of type MujocoModel; got type {} instead!".format(
         type(model)
     )
-    contact_set = set()
-    for contact in sim.data.contact[: sim.data.ncon]:
-        # check contact geom in geoms; add to contact set if match is found
-        g1, g2 = sim.model.geom_id2name(contact.geom1), sim.model.geom_id2name(contact.geom2)
-        if g1 in model.contact_geoms and g2 not in model.contact_geoms:
-            contact_set.add(g2)
-        elif g2 in model.contact_geoms and g1 not in model.contact_geoms:
-            contact_set.add(g1)
-    return contact_set
+    return get_contact_query(sim).get_contacts(model)
 
 
 def compensate_ft_reading(force_reading, torque_reading, mass, com, world_rot, gravity):
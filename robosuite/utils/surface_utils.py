@@ -0,0 +1,187 @@
+"""
+Utilities for querying analytic surfaces, e.g. the inner surface of the mortar used by the grinding environments.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+import scipy.spatial as spsp
+
+# Coefficients of the polynomial fit of the inner surface of the (SDF) mortar, expressed in the mortar body frame:
+# z = (x^4 + y^4) * quartic + x^2 * y^2 * cross + (x^2 + y^2) * quadratic + offset
+MORTAR_SURFACE_COEFFICIENTS = (11445.39, 22890.7, 3.11558, -0.038811)
+
+
+class MortarSurface:
+    """
+    Closest-point and surface-normal queries on the inner surface of a mortar, modeled as the polynomial
+
+        z = (x^4 + y^4) * quartic + x^2 * y^2 * cross + (x^2 + y^2) * quadratic + offset
+
+    in the mortar frame. Since cross ~= 2 * quartic, the surface is (to numerical precision) a surface of revolution
+    z = g(r), so the 3D closest-point problem reduces to a 2D one in the (r, z) half-plane containing the query point.
+    The radial profile is sampled once into a KD-tree at construction, and each query is a KD-tree lookup followed by
+    a few Newton steps on the distance, bracketed by the neighbouring profile samples.
+
+    All queries are vectorized: single points of shape (3,) / (2,) and batches of shape (N, 3) / (N, 2) are both
+    accepted, and the output has the matching leading shape.
+
+    Args:
+        coefficients (4-tuple): (quartic, cross, quadratic, offset) coefficients of the surface polynomial
+        max_radius (float): Radius of the mortar rim. Closest points are restricted to r <= @max_radius
+        num_samples (int): Number of samples of the radial profile used to seed the closest-point search
+        newton_iterations (int): Number of Newton steps used to refine each closest point
+    """
+
+    def __init__(
+        self, coefficients=MORTAR_SURFACE_COEFFICIENTS, max_radius=0.04, num_samples=2001, newton_iterations=3
+    ):
+        self.quartic, self.cross, self.quadratic, self.offset = (float(c) for c in coefficients)
+        self.max_radius = float(max_radius)
+        self.newton_iterations = newton_iterations
+
+        # Sample the radial profile once, the KD-tree is shared by all subsequent queries
+        self._profile_r = np.linspace(0.0, self.max_radius, num_samples)
+        self._profile = np.stack([self._profile_r, self._profile_height(self._profile_r)], axis=1)
+        self._tree = spsp.cKDTree(self._profile)
+        self._dr = self._profile_r[1] - self._profile_r[0]
+
+    def _profile_height(self, r):
+        r2 = r * r
+        return self.quartic * r2 * r2 + self.quadratic * r2 + self.offset
+
+    def height(self, xy):
+        """
+        Evaluates the height of the surface.
+
+        Args:
+            xy (np.array): (..., 2) x, y coordinates in the mortar frame
+
+        Returns:
+            np.array: (...) z coordinates of the surface
+        """
+        xy = np.asarray(xy, dtype=np.float64)
+        x2, y2 = xy[..., 0] ** 2, xy[..., 1] ** 2
+        return (x2 * x2 + y2 * y2) * self.quartic + x2 * y2 * self.cross + (x2 + y2) * self.quadratic + self.offset
+
+    def normals(self, xy):
+        """
+        Computes the unit surface normals, pointing into the mortar wall, i.e.: normalized (df/dx, df/dy, -1).
+
+        Args:
+            xy (np.array): (..., 2) x, y coordinates in the mortar frame
+
+        Returns:
+            np.array: (..., 3) unit normals
+        """
+        xy = np.asarray(xy, dtype=np.float64)
+        x, y = xy[..., 0], xy[..., 1]
+        x2, y2 = x * x, y * y
+        n = np.empty(xy.shape[:-1] + (3,))
+        n[..., 0] = 4 * x * x2 * self.quartic + 2 * x * y2 * self.cross + 2 * x * self.quadratic
+        n[..., 1] = 4 * y * y2 * self.quartic + 2 * y * x2 * self.cross + 2 * y * self.quadratic
+        n[..., 2] = -1.0
+        return n / np.linalg.norm(n, axis=-1, keepdims=True)
+
+    def closest_points(self, points):
+        """
+        Finds the closest points on the surface to @points, and the surface normals at those points.
+
+        Args:
+            points (np.array): (..., 3) query points in the mortar frame
+
+        Returns:
+            3-tuple:
+
+                - (np.array) (..., 3) closest points on the surface
+                - (np.array) (..., 3) unit surface normals at the closest points (see @normals)
+                - (np.array) (...) distances from the query points to the surface
+        """
+        points = np.asarray(points, dtype=np.float64)
+        rho = np.hypot(points[..., 0], points[..., 1])
+        z = points[..., 2]
+
+        # Seed from the sampled profile, then refine r by minimizing (r - rho)^2 + (g(r) - z)^2
+        _, index = self._tree.query(np.stack([rho, z], axis=-1))
+        r = self._profile_r[index]
+        r_min = np.maximum(r - self._dr, 0.0)
+        r_max = np.minimum(r + self._dr, self.max_radius)
+        for _ in range(self.newton_iterations):
+            r2 = r * r
+            g = self.quartic * r2 * r2 + self.quadratic * r2 + self.offset
+            dg = 4 * self.quartic * r2 * r + 2 * self.quadratic * r
+            ddg = 12 * self.quartic * r2 + 2 * self.quadratic
+            grad = (r - rho) + (g - z) * dg
+            hess = 1.0 + dg * dg + (g - z) * ddg
+            # Only take steps where the distance is locally convex, the KD-tree seed is already within one sample
+            step = np.where(hess > 0, grad / np.where(hess > 0, hess, 1.0), 0.0)
+            r = np.clip(r - step, r_min, r_max)
+
+        # Map back to 3D along the azimuth of the query point (any azimuth is equally close on the axis)
+        safe_rho = np.where(rho > 0, rho, 1.0)
+        closest = np.empty(points.shape)
+        closest[..., 0] = np.where(rho > 0, points[..., 0] / safe_rho, 1.0) * r
+        closest[..., 1] = np.where(rho > 0, points[..., 1] / safe_rho, 0.0) * r
+        closest[..., 2] = self.height(closest[..., :2])
+        distances = np.linalg.norm(points - closest, axis=-1)
+        return closest, self.normals(closest[..., :2]), distances
+
+    def closest_point(self, point):
+        """
+        Single-point version of @closest_points, written with scalar math to avoid the overhead of small array ops
+        when called once per environment step.
+
+        Args:
+            point (np.array): (3,) query point in the mortar frame
+
+        Returns:
+            2-tuple:
+
+                - (np.array) (3,) closest point on the surface
+                - (np.array) (3,) unit surface normal at the closest point
+        """
+        px, py, pz = (float(v) for v in point)
+        rho = math.hypot(px, py)
+        _, index = self._tree.query((rho, pz))
+        r = self._profile_r[index]
+        r_min, r_max = max(r - self._dr, 0.0), min(r + self._dr, self.max_radius)
+        a, b = self.quartic, self.quadratic
+        for _ in range(self.newton_iterations):
+            r2 = r * r
+            g = a * r2 * r2 + b * r2 + self.offset
+            dg = 4 * a * r2 * r + 2 * b * r
+            hess = 1.0 + dg * dg + (g - pz) * (12 * a * r2 + 2 * b)
+            if hess > 0:
+                r = min(max(r - ((r - rho) + (g - pz) * dg) / hess, r_min), r_max)
+
+        if rho > 0:
+            x, y = px / rho * r, py / rho * r
+        else:
+            x, y = r, 0.0
+        x2, y2 = x * x, y * y
+        z = (x2 * x2 + y2 * y2) * a + x2 * y2 * self.cross + (x2 + y2) * b + self.offset
+        n = np.array(
+            [
+                4 * x * x2 * a + 2 * x * y2 * self.cross + 2 * x * b,
+                4 * y * y2 * a + 2 * y * x2 * self.cross + 2 * y * b,
+                -1.0,
+            ]
+        )
+        return np.array([x, y, z]), n / math.sqrt(n @ n)
+
+
+@lru_cache(maxsize=None)
+def get_mortar_surface(coefficients=MORTAR_SURFACE_COEFFICIENTS, max_radius=0.04):
+    """
+    Returns a MortarSurface for the given geometry. Surfaces are cached, so all environments sharing the same mortar
+    geometry reuse a single instance (and its precomputed profile).
+
+    Args:
+        coefficients (4-tuple): (quartic, cross, quadratic, offset) coefficients of the surface polynomial
+        max_radius (float): Radius of the mortar rim
+
+    Returns:
+        MortarSurface: surface query object
+    """
+    return MortarSurface(coefficients=tuple(coefficients), max_radius=float(max_radius))
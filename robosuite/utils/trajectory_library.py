@@ -0,0 +1,269 @@
+"""
+Reference trajectories for the grinding environments: circular paths inside the mortar, with orientations
+perpendicular to the mortar surface, and the per-waypoint quantities the environments need at every step.
+
+Trajectories are generated with vectorized surface normals and orientations, and cached by a TrajectoryLibrary keyed
+by (radius, height, number of waypoints), so that environments randomizing their reference trajectory every episode
+only pay for each distinct trajectory once per process. Libraries are shared by all the environments of a process
+with the same mortar geometry (see get_trajectory_library).
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+import robosuite.utils.kernels as kernels
+from robosuite.utils.numba import jit_decorator
+from robosuite.utils.surface_utils import MORTAR_SURFACE_COEFFICIENTS, get_mortar_surface
+
+# Measured heights of circular grinding paths (above the table) for a few radii. Heights for other radii are
+# interpolated with a quadratic fit of these samples, which is only computed once
+TRAJECTORY_RADII = (0.008, 0.01, 0.012, 0.015)
+TRAJECTORY_HEIGHTS = (0.026, 0.027, 0.03, 0.032)
+RADIUS_TO_HEIGHT_COEFFICIENTS = np.polyfit(TRAJECTORY_RADII, TRAJECTORY_HEIGHTS, deg=2)
+
+# Range of heights of the paths above the table, keeping them inside the mortar
+HEIGHT_LIMITS = (0.01, 0.04)
+
+
+def radius_to_height(radius):
+    """
+    Args:
+        radius (float or np.array): Radius of the circular path(s)
+
+    Returns:
+        float or np.array: height of the path(s) above the table, interpolated from the measured samples
+    """
+    return np.polyval(RADIUS_TO_HEIGHT_COEFFICIENTS, radius)
+
+
+@jit_decorator
+def _surface_frames(normals):
+    """
+    Computes rotation frames whose z axis follows @normals, with the x axis of each frame taken as the one of the
+    previous frame, projected onto the plane perpendicular to the new normal (minimizing the change of orientation
+    between consecutive waypoints). The x axis of the first frame is perpendicular to the world y axis.
+
+    Args:
+        normals (np.array): (N, 3) unit normals
+
+    Returns:
+        np.array: (N, 3, 3) rotation matrices, with columns x, y, z (= normal)
+    """
+    frames = np.zeros((normals.shape[0], 3, 3))
+    for i in range(normals.shape[0]):
+        nx, ny, nz = normals[i, 0], normals[i, 1], normals[i, 2]
+        if i == 0:
+            # x = [0, 1, 0] x n, normalized
+            xx, xy, xz = nz, 0.0, -nx
+            norm = np.sqrt(xx * xx + xz * xz)
+            xx, xz = xx / norm, xz / norm
+            # y = n x x
+            yx, yy, yz = ny * xz - nz * xy, nz * xx - nx * xz, nx * xy - ny * xx
+        else:
+            px, py, pz = frames[i - 1, 0, 0], frames[i - 1, 1, 0], frames[i - 1, 2, 0]
+            # y = n x x_prev, normalized
+            yx, yy, yz = ny * pz - nz * py, nz * px - nx * pz, nx * py - ny * px
+            norm = np.sqrt(yx * yx + yy * yy + yz * yz)
+            yx, yy, yz = yx / norm, yy / norm, yz / norm
+            # x = y x n
+            xx, xy, xz = yy * nz - yz * ny, yz * nx - yx * nz, yx * ny - yy * nx
+        frames[i, 0, 0], frames[i, 1, 0], frames[i, 2, 0] = xx, xy, xz
+        frames[i, 0, 1], frames[i, 1, 1], frames[i, 2, 1] = yx, yy, yz
+        frames[i, 0, 2], frames[i, 1, 2], frames[i, 2, 2] = nx, ny, nz
+    return frames
+
+
+def mats_to_quats(mats):
+    """
+    Converts rotation matrices to quaternions, with the same (w >= 0) convention as T.mat2quat.
+
+    Args:
+        mats (np.array): (N, 3, 3) rotation matrices
+
+    Returns:
+        np.array: (N, 4) (x, y, z, w) quaternions
+    """
+    return kernels.mats2quats(np.ascontiguousarray(mats, dtype=np.float64))
+
+
+def quats_to_mats(quats):
+    """
+    Converts quaternions to rotation matrices.
+
+    Args:
+        quats (np.array): (N, 4) (x, y, z, w) quaternions, normalized by this function
+
+    Returns:
+        np.array: (N, 3, 3) rotation matrices
+    """
+    return kernels.quats2mats(np.ascontiguousarray(quats, dtype=np.float64))
+
+
+def surface_aligned_quaternions(normals):
+    """
+    Computes smoothly varying orientations whose z axis follows @normals (see _surface_frames), with consecutive
+    quaternions in the same hemisphere.
+
+    Args:
+        normals (np.array): (N, 3) unit normals
+
+    Returns:
+        np.array: (N, 4) (x, y, z, w) quaternions
+    """
+    quats = mats_to_quats(_surface_frames(np.ascontiguousarray(normals, dtype=np.float64)))
+    # Flip each quaternion whose dot product with the previous (already flipped) one would be negative
+    flips = np.ones(len(quats))
+    flips[1:] = np.where(np.sum(quats[1:] * quats[:-1], axis=1) < 0, -1.0, 1.0)
+    return quats * np.cumprod(flips)[:, None]
+
+
+def circular_waypoints(radius, z, num_waypoints):
+    """
+    Args:
+        radius (float): Radius of the circle, centered at the world z axis
+        z (float): Height of the circle in the world frame
+        num_waypoints (int): Number of waypoints, the first and last ones are both at (0, @radius, @z)
+
+    Returns:
+        np.array: (@num_waypoints, 3) positions of one revolution along the circle
+    """
+    angles = np.linspace(0, 2 * np.pi, num_waypoints)
+    positions = np.empty((num_waypoints, 3))
+    positions[:, 0] = radius * np.sin(angles)
+    positions[:, 1] = radius * np.cos(angles)
+    positions[:, 2] = z
+    return positions
+
+
+class ReferenceTrajectory:
+    """
+    Reference poses, along with the per-waypoint quantities used at every environment step.
+
+    Args:
+        poses (np.array): (N, 7) waypoints, as (x, y, z) positions and (x, y, z, w) quaternions
+        marker_length (float): Half length of the cylinder marker that visualizes the reference force direction. The
+            marker is placed along the negative z axis of each waypoint
+
+    Attributes:
+        poses (np.array): (N, 7) read-only waypoints
+        rotations (np.array): (N, 3, 3) rotation matrices of the waypoints
+        marker_pos (np.array): (N, 3) positions of the marker body
+        marker_quat (np.array): (N, 4) (w, x, y, z) quaternions of the marker body, as used by mujoco
+    """
+
+    def __init__(self, poses, marker_length=0.005):
+        self.poses = np.array(poses, dtype=np.float64)
+        self.rotations = quats_to_mats(self.poses[:, 3:])
+        self.marker_pos = self.poses[:, :3] - marker_length * self.rotations[:, :, 2]
+        self.marker_quat = self.poses[:, [6, 3, 4, 5]] / np.linalg.norm(self.poses[:, 3:], axis=1, keepdims=True)
+        for array in (self.poses, self.rotations, self.marker_pos, self.marker_quat):
+            array.setflags(write=False)
+
+    def __len__(self):
+        return len(self.poses)
+
+
+class TrajectoryLibrary:
+    """
+    Generates circular reference trajectories inside a mortar, and caches them by (radius, height, number of
+    waypoints).
+
+    Args:
+        mortar_surface (MortarSurface): Surface the orientations of the waypoints are perpendicular to. The mortar is
+            assumed to be centered at the world z axis
+        table_height (float): Height of the table top the mortar is standing on
+        marker_length (float): See ReferenceTrajectory
+        max_size (int): Maximum number of cached trajectories, the least recently used ones are evicted first
+    """
+
+    def __init__(self, mortar_surface, table_height=0.8, marker_length=0.005, max_size=256):
+        self.mortar_surface = mortar_surface
+        self.table_height = table_height
+        self.marker_length = marker_length
+        self.max_size = max_size
+        self._trajectories = OrderedDict()
+
+    @staticmethod
+    def key(radius, height, num_waypoints, repeat_last=False):
+        """
+        Returns:
+            tuple: cache key of a trajectory, with the radius and height rounded to a micrometer
+        """
+        return round(float(radius), 6), round(float(height), 6), int(num_waypoints), bool(repeat_last)
+
+    def get(self, radius, num_waypoints, height=None, repeat_last=False):
+        """
+        Returns the reference trajectory along one revolution of a circle, generating it if it is not cached yet.
+
+        Args:
+            radius (float): Radius of the circle
+            num_waypoints (int): Number of waypoints along the circle
+            height (None or float): Height of the circle above the table, clipped to HEIGHT_LIMITS. Defaults to
+                radius_to_height(@radius)
+            repeat_last (bool): If True, the last waypoint is repeated once, so that environments that move on to the
+                next waypoint once the current one is reached also track the last one
+
+        Returns:
+            ReferenceTrajectory: the (shared, read-only) trajectory
+        """
+        if height is None:
+            height = radius_to_height(radius)
+        height = float(np.clip(height, *HEIGHT_LIMITS))
+        key = self.key(radius, height, num_waypoints, repeat_last)
+        trajectory = self._trajectories.get(key)
+        if trajectory is None:
+            trajectory = self._trajectories[key] = self._generate(radius, height, num_waypoints, repeat_last)
+            while len(self._trajectories) > self.max_size:
+                self._trajectories.popitem(last=False)
+        else:
+            self._trajectories.move_to_end(key)
+        return trajectory
+
+    def generate(self, radii, num_waypoints, repeat_last=False):
+        """
+        Fills the cache with the trajectories of every combination of @radii and @num_waypoints (with default
+        heights), e.g.: ahead of training.
+
+        Args:
+            radii (list of float): Radii of the trajectories
+            num_waypoints (list of int): Numbers of waypoints of the trajectories
+            repeat_last (bool): See get
+        """
+        for radius in radii:
+            for n in num_waypoints:
+                self.get(radius, n, repeat_last=repeat_last)
+
+    def _generate(self, radius, height, num_waypoints, repeat_last):
+        poses = np.empty((num_waypoints + int(repeat_last), 7))
+        poses[:num_waypoints, :3] = circular_waypoints(radius, self.table_height + height, num_waypoints)
+        normals = self.mortar_surface.normals(poses[:num_waypoints, :2])
+        poses[:num_waypoints, 3:] = surface_aligned_quaternions(normals)
+        if repeat_last:
+            poses[-1] = poses[-2]
+        return ReferenceTrajectory(poses, marker_length=self.marker_length)
+
+    def __len__(self):
+        return len(self._trajectories)
+
+
+@lru_cache(maxsize=None)
+def get_trajectory_library(
+    coefficients=MORTAR_SURFACE_COEFFICIENTS, max_radius=0.04, table_height=0.8, marker_length=0.005
+):
+    """
+    Returns a TrajectoryLibrary for the given mortar geometry. Libraries are cached, so all environments of a process
+    sharing the same mortar geometry reuse the trajectories generated by any of them.
+
+    Args:
+        coefficients (4-tuple): (quartic, cross, quadratic, offset) coefficients of the mortar surface polynomial
+        max_radius (float): Radius of the mortar rim
+        table_height (float): See TrajectoryLibrary
+        marker_length (float): See ReferenceTrajectory
+
+    Returns:
+        TrajectoryLibrary: trajectory library
+    """
+    surface = get_mortar_surface(coefficients=tuple(coefficients), max_radius=float(max_radius))
+    return TrajectoryLibrary(surface, table_height=table_height, marker_length=marker_length)
@@ -8,6 +8,8 @@ import math
 
 import numpy as np
 
+import robosuite.macros as macros
+import robosuite.utils.kernels as kernels
 from robosuite.utils.numba import jit_decorator
 
 PI = np.pi
@@ -80,6 +82,10 @@ def quat_multiply(quaternion1, quaternion0):
     Returns:
         np.array: (x,y,z,w) multiplied quaternion
     """
+    if macros.USE_FAST_KERNELS:
+        return kernels.quat_multiply(
+            np.asarray(quaternion1, dtype=np.float64), np.asarray(quaternion0, dtype=np.float64)
+        ).astype(np.float32)
     x0, y0, z0, w0 = quaternion0
     x1, y1, z1, w1 = quaternion1
     return np.array(
@@ -313,10 +319,27 @@ def mat2pose(hmat):
     return pos, orn
 
 
-@jit_decorator
 def mat2quat(rmat):
     """
-    Converts given rotation matrix to quaternion.
+    Converts given rotation matrix to quaternion. If macros.USE_FAST_KERNELS, uses the closed-form double precision
+    conversion of kernels.mat2quat instead of the single precision eigen decomposition.
+
+    Args:
+        rmat (np.array): 3x3 rotation matrix
+
+    Returns:
+        np.array: (x,y,z,w) float quaternion angles
+    """
+    if macros.USE_FAST_KERNELS:
+        return kernels.mat2quat(np.asarray(rmat, dtype=np.float64)[:3, :3]).astype(np.float32)
+    return _mat2quat(rmat)
+
+
+@jit_decorator
+def _mat2quat(rmat):
+    """
+    Converts given rotation matrix to quaternion, as the eigenvector of the largest eigenvalue of the (single
+    precision) symmetric matrix built from @rmat.
 
     Args:
         rmat (np.array): 3x3 rotation matrix
@@ -458,10 +481,26 @@ def pose2mat(pose):
     return homo_pose_mat
 
 
-@jit_decorator
 def quat2mat(quaternion):
     """
-    Converts given quaternion to matrix.
+    Converts given quaternion to matrix. If macros.USE_FAST_KERNELS, the matrix is computed in double precision by
+    kernels.quat2mat instead of in single precision.
+
+    Args:
+        quaternion (np.array): (x,y,z,w) vec4 float angles
+
+    Returns:
+        np.array: 3x3 rotation matrix
+    """
+    if macros.USE_FAST_KERNELS:
+        return kernels.quat2mat(np.asarray(quaternion, dtype=np.float64))
+    return _quat2mat(quaternion)
+
+
+@jit_decorator
+def _quat2mat(quaternion):
+    """
+    Converts given quaternion to matrix, in single precision.
 
     Args:
         quaternion (np.array): (x,y,z,w) vec4 float angles
@@ -581,6 +620,8 @@ def pose_inv(pose):
     # -t in the original frame, which is -R-1*t in the new frame, and then rotate back by
     # R-1 to align the axis again.
 
+    if macros.USE_FAST_KERNELS:
+        return kernels.pose_inv(np.asarray(pose, dtype=np.float64))
     pose_inv = np.zeros((4, 4))
     pose_inv[:3, :3] = pose[:3, :3].T
     pose_inv[:3, 3] = -pose_inv[:3, :3].dot(pose[:3, 3])
@@ -652,6 +693,12 @@ def force_in_A_to_force_in_B(force_A, torque_A, pose_A_in_B):
             - (np.array) (fx,fy,fz) linear forces in frame B
             - (np.array) (tx,ty,tz) moments in frame B
     """
+    if macros.USE_FAST_KERNELS:
+        return kernels.force_in_A_to_force_in_B(
+            np.asarray(force_A, dtype=np.float64),
+            np.asarray(torque_A, dtype=np.float64),
+            np.asarray(pose_A_in_B, dtype=np.float64),
+        )
     pos_A_in_B = pose_A_in_B[:3, 3]
     rot_A_in_B = pose_A_in_B[:3, :3]
     skew_symm = _skew_symmetric_translation(pos_A_in_B)
@@ -904,6 +951,10 @@ def quaternions_orientation_error(target_orn, current_orn):
 
     return vector part
     """
+    if macros.USE_FAST_KERNELS:
+        return kernels.quaternions_orientation_error(
+            np.asarray(target_orn, dtype=np.float64), np.asarray(current_orn, dtype=np.float64)
+        )
     ne = current_orn[3]*target_orn[3] + np.dot(current_orn[:3], target_orn[:3])
     ee = current_orn[3]*target_orn[:3] - target_orn[3] * current_orn[:3] + np.dot(skew(current_orn[:3]), target_orn[:3])
     ee *= np.sign(ne)  # disambiguate the sign of the quaternion
@@ -1130,6 +1181,10 @@ def rotate_vector_by_quaternion(vector, quaternion):
     Returns:
         np.array: Rotated vector
     """
+    if macros.USE_FAST_KERNELS:
+        return kernels.rotate_vector_by_quaternion(
+            np.asarray(vector, dtype=np.float64), np.asarray(quaternion, dtype=np.float64)
+        )
     # Normalize the quaternion
     q = quaternion / np.linalg.norm(quaternion)
     q_x, q_y, q_z, q_w = q
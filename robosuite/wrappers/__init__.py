@@ -3,6 +3,7 @@ from robosuite.wrappers.data_collection_wrapper import DataCollectionWrapper
 from robosuite.wrappers.demo_sampler_wrapper import DemoSamplerWrapper
 from robosuite.wrappers.domain_randomization_wrapper import DomainRandomizationWrapper
 from robosuite.wrappers.visualization_wrapper import VisualizationWrapper
+from robosuite.wrappers.vector_env import VectorMujocoEnv
 
 try:
     from robosuite.wrappers.gym_wrapper import GymWrapper
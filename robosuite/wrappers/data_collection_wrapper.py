@@ -9,12 +9,22 @@ import time
 
 import numpy as np
 
+from robosuite.utils.hdf5_demo_writer import HDF5DemoWriter
 from robosuite.utils.mjcf_utils import save_sim_model
 from robosuite.wrappers import Wrapper
 
 
 class DataCollectionWrapper(Wrapper):
-    def __init__(self, env, directory, collect_freq=1, flush_freq=100):
+    def __init__(
+        self,
+        env,
+        directory,
+        collect_freq=1,
+        flush_freq=100,
+        backend="npz",
+        store_obs=False,
+        env_info=None,
+    ):
         """
         Initializes the data collection wrapper.
 
@@ -22,9 +32,21 @@ class DataCollectionWrapper(Wrapper):
             env (MujocoEnv): The environment to monitor.
             directory (str): Where to store collected data.
             collect_freq (int): How often to save simulation state, in terms of environment steps.
-            flush_freq (int): How frequently to dump data to disk, in terms of environment steps.
+            flush_freq (int): How frequently to dump data to disk, in terms of environment steps. Only used by the
+                "npz" backend.
+            backend (str): How data is stored, one of:
+                `'npz'`: one directory per episode, with the model xml and state_*.npz chunks written every
+                    @flush_freq steps (see gather_demonstrations_as_hdf5 in collect_human_demonstrations.py)
+                `'hdf5'`: states, actions, rewards and dones (and observations if @store_obs) of every episode are
+                    streamed into @directory/demo.hdf5 by a background thread, in the robomimic layout (see
+                    HDF5DemoWriter)
+            store_obs (bool): Whether to also store observations. Only supported by the "hdf5" backend.
+            env_info (None or str): JSON-encoded environment information (e.g.: controller and robot info), stored
+                in the HDF5 file. Only used by the "hdf5" backend.
         """
         super().__init__(env)
+        assert backend in {"npz", "hdf5"}, "backend must be either 'npz' or 'hdf5', got {}".format(backend)
+        assert not store_obs or backend == "hdf5", "Storing observations requires the hdf5 backend"
 
         # the base directory for all logging
         self.directory = directory
@@ -54,6 +76,16 @@ class DataCollectionWrapper(Wrapper):
         self._current_task_instance_state = None
         self._current_task_instance_xml = None
 
+        # streaming hdf5 writer, and the latest observations (recorded along with the next collected action)
+        self.backend = backend
+        self.store_obs = store_obs
+        self._writer = None
+        self._last_obs = None
+        if backend == "hdf5":
+            self._writer = HDF5DemoWriter(
+                os.path.join(directory, "demo.hdf5"), env_name=self._env_name(), env_info=env_info
+            )
+
     def _start_new_episode(self):
         """
         Bookkeeping to do at the start of each new episode.
@@ -61,7 +93,7 @@ class DataCollectionWrapper(Wrapper):
 
         # flush any data left over from the previous episode if any interactions have happened
         if self.has_interaction:
-            self._flush()
+            self._end_episode()
 
         # timesteps in current episode
         self.t = 0
@@ -95,6 +127,10 @@ class DataCollectionWrapper(Wrapper):
 
         self.has_interaction = True
 
+        if self._writer is not None:
+            self._writer.start_episode(self._current_task_instance_xml, ep_meta=self.env.get_ep_meta())
+            return
+
         # create a directory with a timestamp
         t1, t2 = str(time.time()).split(".")
         self.ep_directory = os.path.join(self.directory, "ep_{}_{}".format(t1, t2))
@@ -116,27 +152,41 @@ class DataCollectionWrapper(Wrapper):
         assert len(self.states) == 0
         self.states.append(self._current_task_instance_state)
 
+    def _env_name(self):
+        if hasattr(self.env, "unwrapped"):
+            return self.env.unwrapped.__class__.__name__
+        return self.env.__class__.__name__
+
     def _flush(self):
         """
         Method to flush internal state to disk.
         """
+        if self._writer is not None:
+            # The hdf5 writer streams data on its own
+            return
         t1, t2 = str(time.time()).split(".")
         state_path = os.path.join(self.ep_directory, "state_{}_{}.npz".format(t1, t2))
-        if hasattr(self.env, "unwrapped"):
-            env_name = self.env.unwrapped.__class__.__name__
-        else:
-            env_name = self.env.__class__.__name__
         np.savez(
             state_path,
             states=np.array(self.states),
             action_infos=self.action_infos,
             successful=self.successful,
-            env=env_name,
+            env=self._env_name(),
         )
         self.states = []
         self.action_infos = []
         self.successful = False
 
+    def _end_episode(self):
+        """
+        Writes out the rest of the current episode.
+        """
+        if self._writer is not None:
+            self._writer.end_episode(success=self.successful)
+            self.successful = False
+        else:
+            self._flush()
+
     def reset(self):
         """
         Extends vanilla reset() function call to accommodate data collection
@@ -146,6 +196,8 @@ class DataCollectionWrapper(Wrapper):
         """
         ret = super().reset()
         self._start_new_episode()
+        if self.store_obs:
+            self._last_obs = ret
         return ret
 
     def step(self, action):
@@ -163,6 +215,10 @@ class DataCollectionWrapper(Wrapper):
                 - (bool) whether the current episode is completed or not
                 - (dict) misc information
         """
+        collect = (self.t + 1) % self.collect_freq == 0
+        if collect and self._writer is not None:
+            # the hdf5 layout pairs each action with the state it was applied in
+            state = self.env.sim.get_state().flatten()
         ret = super().step(action)
         self.t += 1
 
@@ -171,7 +227,19 @@ class DataCollectionWrapper(Wrapper):
             self._on_first_interaction()
 
         # collect the current simulation state if necessary
-        if self.t % self.collect_freq == 0:
+        if collect and self._writer is not None:
+            extras = {}
+            if "action_abs" in ret[3].keys():
+                extras["actions_abs"] = ret[3]["action_abs"]
+            self._writer.add_step(
+                state,
+                action,
+                reward=ret[1],
+                done=ret[2],
+                obs=self._last_obs if self.store_obs else None,
+                **extras,
+            )
+        elif collect:
             state = self.env.sim.get_state().flatten()
             self.states.append(state)
 
@@ -185,6 +253,9 @@ class DataCollectionWrapper(Wrapper):
 
             self.action_infos.append(info)
 
+        if self.store_obs:
+            self._last_obs = ret[0]
+
         # check if the demonstration is successful
         if self.env._check_success():
             self.successful = True
@@ -200,5 +271,7 @@ class DataCollectionWrapper(Wrapper):
         Override close method in order to flush left over data
         """
         if self.has_interaction:
-            self._flush()
+            self._end_episode()
+        if self._writer is not None:
+            self._writer.close()
         self.env.close()
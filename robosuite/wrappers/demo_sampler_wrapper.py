@@ -9,9 +9,9 @@ import os
 import random
 import time
 
-import h5py
 import numpy as np
 
+from robosuite.utils.demo_store import open_demo_store
 from robosuite.wrappers import Wrapper
 
 
@@ -26,8 +26,15 @@ class DemoSamplerWrapper(Wrapper):
         env (MujocoEnv): The environment to wrap.
 
         demo_path (str): The path to the folder containing the demonstrations.
-            There should be a `demo.hdf5` file and a folder named `models` with
-            all of the stored model xml files from the demonstrations.
+            There should be a `demo.hdf5` file and, for datasets that store model
+            file names instead of model xml strings, a folder named `models` with
+            all of the stored model xml files from the demonstrations. On first use,
+            the demonstrations are converted into a memory-mapped demo store (see
+            robosuite/utils/demo_store.py), which states are then sampled from.
+
+        store_path (None or str): Directory of the demo store. Defaults to a
+            `demo_store` folder in @demo_path. Processes that sample from the
+            same store share its memory.
 
         need_xml (bool): If True, the mujoco model needs to be reloaded when
             sampling a state from a demonstration. This could be because every
@@ -79,6 +86,7 @@ class DemoSamplerWrapper(Wrapper):
         self,
         env,
         demo_path,
+        store_path=None,
         need_xml=False,
         num_traj=-1,
         sampling_schemes=("uniform", "random"),
@@ -91,10 +99,13 @@ class DemoSamplerWrapper(Wrapper):
 
         self.demo_path = demo_path
         hdf5_path = os.path.join(self.demo_path, "demo.hdf5")
-        self.demo_file = h5py.File(hdf5_path, "r")
+        models_dir = os.path.join(self.demo_path, "models")
+        self.demo_store = open_demo_store(
+            hdf5_path, store_path=store_path, models_dir=models_dir if os.path.isdir(models_dir) else None
+        )
 
         # ensure that wrapped env matches the env on which demonstrations were collected
-        env_name = self.demo_file["data"].attrs["env"]
+        env_name = self.demo_store.env_name
         assert (
             env_name == self.unwrapped.__class__.__name__
         ), "Wrapped env {} does not match env on which demos were collected ({})".format(
@@ -102,12 +113,16 @@ class DemoSamplerWrapper(Wrapper):
         )
 
         # list of all demonstrations episodes
-        self.demo_list = list(self.demo_file["data"].keys())
+        self.demo_list = list(self.demo_store.demo_names)
 
         # subsample a selection of demonstrations if requested
         if num_traj > 0:
             random.seed(3141)  # ensure that the same set is sampled every time
             self.demo_list = random.sample(self.demo_list, num_traj)
+        self.demo_indices = [self.demo_store.demo_index(name) for name in self.demo_list]
+
+        # edited model xml of each xml id of the demo store, edited on first use
+        self._edited_xmls = {}
 
         self.need_xml = need_xml
         self.demo_sampled = 0
@@ -165,7 +180,7 @@ class DemoSamplerWrapper(Wrapper):
             self.sim.set_state_from_flattened(state)
             self.sim.forward()
 
-            return self.env._get_observation()
+            return self.env._get_observations(force_update=True)
 
     def sample(self):
         """
@@ -210,16 +225,13 @@ class DemoSamplerWrapper(Wrapper):
         """
 
         # get a random episode index
-        ep_ind = random.choice(self.demo_list)
+        ep_ind = random.choice(self.demo_indices)
 
         # select a flattened mujoco state uniformly from this episode
-        states = self.demo_file["data/{}/states".format(ep_ind)][()]
-        state = random.choice(states)
+        state = self.demo_store.state(ep_ind, random.randrange(self.demo_store.lengths[ep_ind]))
 
         if self.need_xml:
-            model_xml = self._xml_for_episode_index(ep_ind)
-            xml = self.env.edit_model_xml(model_xml)
-            return state, xml
+            return state, self._xml_for_episode_index(ep_ind)
         return state
 
     def _reverse_sample_open_loop(self):
@@ -237,13 +249,12 @@ class DemoSamplerWrapper(Wrapper):
         """
 
         # get a random episode index
-        ep_ind = random.choice(self.demo_list)
+        ep_ind = random.choice(self.demo_indices)
 
         # sample uniformly in a window that grows backwards from the end of the demos
-        states = self.demo_file["data/{}/states".format(ep_ind)][()]
-        eps_len = states.shape[0]
+        eps_len = self.demo_store.lengths[ep_ind]
         index = np.random.randint(max(eps_len - self.open_loop_window_size, 0), eps_len)
-        state = states[index]
+        state = self.demo_store.state(ep_ind, index)
 
         # increase window size at a fixed frequency (open loop)
         self.demo_sampled += 1
@@ -253,9 +264,7 @@ class DemoSamplerWrapper(Wrapper):
             self.demo_sampled = 0
 
         if self.need_xml:
-            model_xml = self._xml_for_episode_index(ep_ind)
-            xml = self.env.edit_model_xml(model_xml)
-            return state, xml
+            return state, self._xml_for_episode_index(ep_ind)
 
         return state
 
@@ -274,13 +283,12 @@ class DemoSamplerWrapper(Wrapper):
         """
 
         # get a random episode index
-        ep_ind = random.choice(self.demo_list)
+        ep_ind = random.choice(self.demo_indices)
 
         # sample uniformly in a window that grows forwards from the beginning of the demos
-        states = self.demo_file["data/{}/states".format(ep_ind)][()]
-        eps_len = states.shape[0]
+        eps_len = self.demo_store.lengths[ep_ind]
         index = np.random.randint(0, min(self.open_loop_window_size, eps_len))
-        state = states[index]
+        state = self.demo_store.state(ep_ind, index)
 
         # increase window size at a fixed frequency (open loop)
         self.demo_sampled += 1
@@ -290,27 +298,23 @@ class DemoSamplerWrapper(Wrapper):
             self.demo_sampled = 0
 
         if self.need_xml:
-            model_xml = self._xml_for_episode_index(ep_ind)
-            xml = self.env.edit_model_xml(model_xml)
-            return state, xml
+            return state, self._xml_for_episode_index(ep_ind)
 
         return state
 
     def _xml_for_episode_index(self, ep_ind):
         """
         Helper method to retrieve the corresponding model xml string
-        for the passed episode index.
+        for the passed episode index, edited for the wrapped environment.
+        Demonstrations that share a model xml share its edited xml.
 
         Args:
-            ep_ind (int): Episode index to pull from demo file
+            ep_ind (int): Episode index to pull from demo store
 
         Returns:
             str: model xml as a string
         """
-
-        # read the model xml, using the metadata stored in the attribute for this episode
-        model_file = self.demo_file["data/{}".format(ep_ind)].attrs["model_file"]
-        model_path = os.path.join(self.demo_path, "models", model_file)
-        with open(model_path, "r") as model_f:
-            model_xml = model_f.read()
-        return model_xml
+        xml_id = self.demo_store.xml_ids[ep_ind]
+        if xml_id not in self._edited_xmls:
+            self._edited_xmls[xml_id] = self.env.edit_model_xml(self.demo_store.xml(ep_ind))
+        return self._edited_xmls[xml_id]
@@ -0,0 +1,493 @@
+"""
+This file implements a vectorized runner that steps several robosuite environments in parallel.
+Environments are distributed over a pool of worker processes, and observations, rewards and dones are
+exchanged through preallocated shared-memory buffers instead of being pickled back through pipes on every step.
+"""
+
+import multiprocessing as mp
+import traceback
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+import robosuite
+from robosuite.utils.errors import SimulationError
+
+
+class SharedArray:
+    """
+    Thin handle around a numpy array that lives in a named shared-memory block. Only the (name, shape, dtype)
+    triplet is sent between processes, so the handle can be re-attached cheaply from any worker.
+
+    Args:
+        shape (tuple): Shape of the array
+        dtype (np.dtype or str): Data type of the array
+        name (None or str): If specified, attaches to an existing shared-memory block with this name. Else, a new
+            block is created (and owned) by this handle.
+    """
+
+    def __init__(self, shape, dtype, name=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=nbytes)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+        if self._owner:
+            self.array.fill(0)
+
+    @property
+    def descriptor(self):
+        """
+        Returns:
+            3-tuple: (name, shape, dtype string) that can be used to re-attach to this block
+        """
+        return self._shm.name, self.shape, self.dtype.str
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Attaches to an existing shared-memory block.
+
+        Args:
+            descriptor (3-tuple): (name, shape, dtype string) as returned by @descriptor
+
+        Returns:
+            SharedArray: handle pointing to the existing block
+        """
+        name, shape, dtype = descriptor
+        return cls(shape=shape, dtype=dtype, name=name)
+
+    def close(self):
+        """
+        Releases this process' mapping of the block, and frees the block itself if this handle owns it.
+        """
+        # Drop the numpy view first, otherwise the underlying buffer cannot be released
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _obs_layout(obs):
+    """
+    Computes the shared-memory layout of a single environment's observation dict.
+
+    Args:
+        obs (OrderedDict): Observation dict as returned by env.reset() / env.step() / env.observation_spec()
+
+    Returns:
+        OrderedDict: Maps observation names to (shape, dtype string) tuples
+    """
+    layout = OrderedDict()
+    for name, value in obs.items():
+        value = np.asarray(value)
+        layout[name] = (value.shape, value.dtype.str)
+    return layout
+
+
+def _worker(conn, env_name, env_kwargs, env_indices, seeds, auto_reset):
+    """
+    Worker process loop. Instantiates the environments assigned to this worker and serves commands from the parent
+    @VectorMujocoEnv until asked to close.
+
+    Args:
+        conn (Connection): Child end of the pipe connecting this worker to the parent
+        env_name (str): Name of the robosuite environment to instantiate
+        env_kwargs (dict): Keyword arguments to pass to robosuite.make
+        env_indices (list of int): Global indices of the environments hosted by this worker
+        seeds (list of None or int): Per-environment seeds, aligned with @env_indices
+        auto_reset (bool): Whether to reset an environment as soon as its episode is done
+    """
+    envs, rng_states = [], [None] * len(seeds)
+    obs_buffers, reward_buffer, done_buffer, action_buffer = None, None, None, None
+
+    def run_seeded(i, fn, *args, **kwargs):
+        # Every env keeps its own global numpy random state so that results do not depend on how envs are
+        # distributed over the workers
+        if rng_states[i] is not None:
+            np.random.set_state(rng_states[i])
+        result = fn(*args, **kwargs)
+        if rng_states[i] is not None:
+            rng_states[i] = np.random.get_state()
+        return result
+
+    def write_obs(i, obs):
+        idx = env_indices[i]
+        for name, buf in obs_buffers.items():
+            buf.array[idx] = obs[name]
+
+    def seed_env(i, seed):
+        if seed is None:
+            rng_states[i] = None
+            return
+        np.random.seed(seed)
+        rng_states[i] = np.random.get_state()
+        envs[i].rng = np.random.default_rng(seed)
+
+    try:
+        for i, seed in enumerate(seeds):
+            if seed is not None:
+                np.random.seed(seed)
+                rng_states[i] = np.random.get_state()
+            envs.append(run_seeded(i, robosuite.make, env_name, **env_kwargs))
+            if seed is not None:
+                envs[i].rng = np.random.default_rng(seed)
+        first_obs = [run_seeded(i, env.reset) for i, env in enumerate(envs)]
+        conn.send(("ok", (_obs_layout(first_obs[0]), envs[0].action_spec)))
+
+        while True:
+            cmd, data = conn.recv()
+            if cmd == "attach":
+                obs_desc, reward_desc, done_desc, action_desc = data
+                obs_buffers = OrderedDict((name, SharedArray.attach(desc)) for name, desc in obs_desc.items())
+                reward_buffer = SharedArray.attach(reward_desc)
+                done_buffer = SharedArray.attach(done_desc)
+                action_buffer = SharedArray.attach(action_desc)
+                for i, obs in enumerate(first_obs):
+                    write_obs(i, obs)
+                first_obs = None
+                conn.send(("ok", None))
+            elif cmd == "reset":
+                # @data is a list of per-env seeds (or None to keep the current random streams)
+                for i, env in enumerate(envs):
+                    if data is not None:
+                        seed_env(i, data[i])
+                    write_obs(i, run_seeded(i, env.reset))
+                    reward_buffer.array[env_indices[i]] = 0.0
+                    done_buffer.array[env_indices[i]] = False
+                conn.send(("ok", None))
+            elif cmd == "step":
+                infos = []
+                for i, env in enumerate(envs):
+                    idx = env_indices[i]
+                    obs, reward, done, info = run_seeded(i, env.step, action_buffer.array[idx].copy())
+                    if done and auto_reset:
+                        # Keep the final observation of the finished episode, since the buffers will hold the
+                        # first observation of the next one
+                        info["terminal_observation"] = OrderedDict((k, np.array(v)) for k, v in obs.items())
+                        obs = run_seeded(i, env.reset)
+                    write_obs(i, obs)
+                    reward_buffer.array[idx] = reward
+                    done_buffer.array[idx] = done
+                    infos.append(info)
+                conn.send(("ok", infos))
+            elif cmd == "call":
+                name, args, kwargs = data
+                results = []
+                for i, env in enumerate(envs):
+                    attr = getattr(env, name)
+                    results.append(run_seeded(i, attr, *args, **kwargs) if callable(attr) else attr)
+                conn.send(("ok", results))
+            elif cmd == "close":
+                break
+            else:
+                raise ValueError("Unknown command received by VectorMujocoEnv worker: {}".format(cmd))
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        for env in envs:
+            env.close()
+        for buf in [reward_buffer, done_buffer, action_buffer] + list((obs_buffers or {}).values()):
+            if buf is not None:
+                buf.close()
+        conn.close()
+
+
+class VectorMujocoEnv:
+    """
+    Runs @num_envs copies of a robosuite environment in parallel across a pool of worker processes.
+
+    Observations are laid out from the environment's observation_spec() into preallocated shared-memory arrays of
+    shape (num_envs, *obs_shape), so stepping the batch only sends small command messages through the pipes.
+
+    Args:
+        env_name (str): Name of the robosuite environment to instantiate (see robosuite.make)
+        num_envs (int): Number of environment copies to run
+        env_kwargs (None or dict): Keyword arguments passed to robosuite.make for every environment copy
+        num_workers (None or int): Number of worker processes. Environments are split as evenly as possible over
+            the workers. Defaults to min(num_envs, cpu_count)
+        seeds (None or int or list of int): If an int, environment i is seeded with seed + i. If a list, specifies
+            the seed of each environment. If None, environments are left unseeded
+        auto_reset (bool): If True, an environment is reset as soon as its episode ends. The final observation of
+            the finished episode is then returned in its info dict under "terminal_observation"
+        copy_obs (bool): If True, observations returned by reset() / step() are copies. Else, they are views into
+            the shared buffers and will be overwritten by the next call
+        start_method (None or str): multiprocessing start method to use for the workers ("fork", "spawn",
+            "forkserver"). If None, uses the platform default
+
+    Raises:
+        ValueError: [Invalid number of environments / workers / seeds]
+        SimulationError: [Error raised inside a worker, or mismatching observation layouts across workers]
+    """
+
+    def __init__(
+        self,
+        env_name,
+        num_envs,
+        env_kwargs=None,
+        num_workers=None,
+        seeds=None,
+        auto_reset=True,
+        copy_obs=True,
+        start_method=None,
+    ):
+        if num_envs < 1:
+            raise ValueError("VectorMujocoEnv requires at least one environment, got {}".format(num_envs))
+        num_workers = min(num_envs, mp.cpu_count()) if num_workers is None else num_workers
+        if not 1 <= num_workers <= num_envs:
+            raise ValueError("Number of workers must be in [1, {}], got {}".format(num_envs, num_workers))
+
+        self.env_name = env_name
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.auto_reset = auto_reset
+        self.copy_obs = copy_obs
+        self.closed = False
+
+        seeds = self._format_seeds(seeds)
+
+        # Split envs as evenly as possible over the workers
+        self._worker_env_indices = [list(idx) for idx in np.array_split(np.arange(num_envs), num_workers)]
+
+        # Start the resource tracker before the workers so that they share it with this process. Otherwise each
+        # worker would spawn its own tracker, which unlinks the shared buffers as soon as that worker exits
+        resource_tracker.ensure_running()
+        ctx = mp.get_context(start_method)
+        self._conns, self._processes = [], []
+        for env_indices in self._worker_env_indices:
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(
+                    child_conn,
+                    env_name,
+                    dict(env_kwargs or {}),
+                    env_indices,
+                    [seeds[i] for i in env_indices],
+                    auto_reset,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+        self._obs_buffers = OrderedDict()
+        self._reward_buffer, self._done_buffer, self._action_buffer = None, None, None
+        try:
+            # Each worker reports the observation layout and action spec of its environments
+            results = self._gather()
+            layout, self._action_spec = results[0]
+            for other_layout, _ in results[1:]:
+                if other_layout != layout:
+                    raise SimulationError("Workers reported mismatching observation layouts!")
+            self.observation_layout = layout
+
+            # Allocate the shared buffers and let every worker attach to them
+            for name, (shape, dtype) in layout.items():
+                self._obs_buffers[name] = SharedArray((num_envs,) + tuple(shape), dtype)
+            self._reward_buffer = SharedArray((num_envs,), np.float64)
+            self._done_buffer = SharedArray((num_envs,), np.bool_)
+            self._action_buffer = SharedArray((num_envs, self.action_dim), np.float64)
+            descriptors = (
+                OrderedDict((name, buf.descriptor) for name, buf in self._obs_buffers.items()),
+                self._reward_buffer.descriptor,
+                self._done_buffer.descriptor,
+                self._action_buffer.descriptor,
+            )
+            self._broadcast("attach", descriptors)
+            self._gather()
+        except Exception:
+            self.close()
+            raise
+
+    def _format_seeds(self, seeds):
+        """
+        Converts the @seeds argument into a list with one (possibly None) seed per environment.
+        """
+        if seeds is None:
+            return [None] * self.num_envs
+        if isinstance(seeds, (int, np.integer)):
+            return [int(seeds) + i for i in range(self.num_envs)]
+        seeds = list(seeds)
+        if len(seeds) != self.num_envs:
+            raise ValueError("Expected {} seeds, got {}".format(self.num_envs, len(seeds)))
+        return seeds
+
+    def _broadcast(self, cmd, data=None):
+        for conn in self._conns:
+            conn.send((cmd, data))
+
+    def _gather(self):
+        """
+        Collects one reply from every worker.
+
+        Returns:
+            list: Payload of each worker's reply, in worker order
+
+        Raises:
+            SimulationError: [Error raised inside a worker]
+        """
+        results, errors = [], []
+        for conn in self._conns:
+            try:
+                status, payload = conn.recv()
+            except EOFError:
+                status, payload = "error", "Worker process exited unexpectedly"
+            if status == "error":
+                errors.append(payload)
+            results.append(payload)
+        if errors:
+            raise SimulationError("VectorMujocoEnv worker raised an exception:\n{}".format(errors[0]))
+        return results
+
+    def _get_observations(self):
+        """
+        Returns:
+            OrderedDict: Batched observations of shape (num_envs, ...) for every observation key
+        """
+        if self.copy_obs:
+            return OrderedDict((name, buf.array.copy()) for name, buf in self._obs_buffers.items())
+        return OrderedDict((name, buf.array) for name, buf in self._obs_buffers.items())
+
+    def reset(self, seeds=None):
+        """
+        Resets all environments.
+
+        Args:
+            seeds (None or int or list of int): If specified, re-seeds the environments before resetting them (same
+                semantics as the constructor @seeds argument)
+
+        Returns:
+            OrderedDict: Batched observations after reset
+        """
+        per_env_seeds = None if seeds is None else self._format_seeds(seeds)
+        for conn, env_indices in zip(self._conns, self._worker_env_indices):
+            conn.send(("reset", None if per_env_seeds is None else [per_env_seeds[i] for i in env_indices]))
+        self._gather()
+        return self._get_observations()
+
+    def step_async(self, actions):
+        """
+        Sends @actions to the workers without waiting for the results. Must be followed by step_wait().
+
+        Args:
+            actions (np.array): (num_envs, action_dim) array of actions
+        """
+        self._action_buffer.array[:] = actions
+        self._broadcast("step")
+
+    def step_wait(self):
+        """
+        Waits for the step started by step_async() to complete.
+
+        Returns:
+            4-tuple:
+
+                - (OrderedDict) batched observations from the environments
+                - (np.array) (num_envs,) rewards
+                - (np.array) (num_envs,) dones
+                - (list of dict) per-environment info dicts
+        """
+        infos = [info for worker_infos in self._gather() for info in worker_infos]
+        return (
+            self._get_observations(),
+            self._reward_buffer.array.copy(),
+            self._done_buffer.array.copy(),
+            infos,
+        )
+
+    def step(self, actions):
+        """
+        Steps all environments with their respective actions.
+
+        Args:
+            actions (np.array): (num_envs, action_dim) array of actions
+
+        Returns:
+            4-tuple:
+
+                - (OrderedDict) batched observations from the environments
+                - (np.array) (num_envs,) rewards
+                - (np.array) (num_envs,) dones
+                - (list of dict) per-environment info dicts
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def env_method(self, method_name, *args, **kwargs):
+        """
+        Calls @method_name on every environment, or grabs the attribute if it is not callable.
+
+        Args:
+            method_name (str): Name of the environment method / attribute
+            *args: Positional arguments passed to the method
+            **kwargs: Keyword arguments passed to the method
+
+        Returns:
+            list: Per-environment results
+        """
+        self._broadcast("call", (method_name, args, kwargs))
+        return [result for worker_results in self._gather() for result in worker_results]
+
+    def observation_spec(self):
+        """
+        Returns:
+            OrderedDict: Current batched observations, mirroring MujocoEnv.observation_spec()
+        """
+        return self._get_observations()
+
+    def close(self):
+        """
+        Shuts down all workers and frees the shared-memory buffers.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        for buf in [self._reward_buffer, self._done_buffer, self._action_buffer] + list(self._obs_buffers.values()):
+            if buf is not None:
+                buf.close()
+        self._obs_buffers = OrderedDict()
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close()
+
+    @property
+    def action_spec(self):
+        """
+        Action space (low, high) of a single environment
+
+        Returns:
+            2-tuple:
+
+                - (np.array) minimum (low) action values
+                - (np.array) maximum (high) action values
+        """
+        return self._action_spec
+
+    @property
+    def action_dim(self):
+        """
+        Size of the action space of a single environment
+
+        Returns:
+            int: Action space dimension
+        """
+        return len(self._action_spec[0])
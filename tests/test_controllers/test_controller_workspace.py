@@ -0,0 +1,48 @@
+"""
+Tests that the preallocated controller workspace refreshes the robot state in place, with the same values as querying
+the simulator directly (site velocities are products over preallocated buffers, so they are compared up to rounding):
+
+$ pytest -s tests/test_controllers/test_controller_workspace.py
+"""
+
+import mujoco
+import numpy as np
+
+import robosuite as suite
+
+
+def test_update_matches_sim_queries():
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+    env.reset()
+    controller = env.robots[0].composite_controller.part_controllers["right"]
+    buffers = (controller.mass_matrix, controller.J_full, controller.J_pos, controller.ref_pos_vel)
+
+    np.random.seed(0)
+    for _ in range(5):
+        env.step(np.random.uniform(-1, 1, env.action_dim))
+        controller.update(force=True)
+
+        sim, name, idx = env.sim, controller.ref_name, controller.qvel_index
+        full_mass_matrix = np.zeros((sim.model.nv, sim.model.nv))
+        mujoco.mj_fullM(sim.model._model, full_mass_matrix, sim.data.qM)
+        jacp = sim.data.get_site_jacp(name)[:, idx]
+        jacr = sim.data.get_site_jacr(name)[:, idx]
+
+        assert np.array_equal(controller.mass_matrix, full_mass_matrix[idx, :][:, idx])
+        assert np.array_equal(controller.J_pos, jacp)
+        assert np.array_equal(controller.J_ori, jacr)
+        assert np.array_equal(controller.J_full, np.vstack([jacp, jacr]))
+        assert np.allclose(controller.ref_pos_vel, sim.data.get_site_xvelp(name))
+        assert np.allclose(controller.ref_ori_vel, sim.data.get_site_xvelr(name))
+        assert np.array_equal(controller.joint_pos, sim.data.qpos[controller.qpos_index])
+
+    # State is refreshed in place
+    assert buffers[0] is controller.mass_matrix and buffers[1] is controller.J_full
+    assert buffers[2] is controller.J_pos and buffers[3] is controller.ref_pos_vel
+    env.close()
@@ -0,0 +1,80 @@
+"""
+Tests that the camera observables, which render rgb / depth / segmentation from a single scene update and remap
+segmentation ids through a lookup table, match rendering each image type separately and remapping ids pixel by pixel:
+
+$ pytest -s tests/test_environments/test_camera_observables.py
+"""
+
+import numpy as np
+import pytest
+
+import robosuite as suite
+import robosuite.macros as macros
+from robosuite.utils.mjcf_utils import IMAGE_CONVENTION_MAPPING
+
+CAMERA_NAMES = ["agentview", "robot0_eye_in_hand"]
+SIZE = 64
+
+
+def reference_segmentation(env, camera_name, seg_type):
+    """
+    Returns:
+        np.array: @seg_type segmentation of @camera_name, remapped pixel by pixel
+    """
+    convention = IMAGE_CONVENTION_MAPPING[macros.IMAGE_CONVENTION]
+    seg = env.sim.render(camera_name=camera_name, width=SIZE, height=SIZE, segmentation=True)[::convention, :, 1]
+    if seg_type == "element":
+        return np.expand_dims(seg, axis=-1)
+    if seg_type == "instance":
+        names, geom_ids_to_names = env.model.instances_to_ids, env.model.geom_ids_to_instances
+    else:
+        names, geom_ids_to_names = env.model.classes_to_ids, env.model.geom_ids_to_classes
+    name2id = {name: i for i, name in enumerate(names)}
+    mapping = {idn: name2id[name] for idn, name in geom_ids_to_names.items()}
+    return np.fromiter(map(lambda x: mapping.get(x, -1), seg.flatten()), dtype=np.int32).reshape(SIZE, SIZE, 1) + 1
+
+
+@pytest.mark.parametrize("image_convention", ["opengl", "opencv"])
+def test_camera_observables(image_convention):
+    default_image_convention = macros.IMAGE_CONVENTION
+    macros.IMAGE_CONVENTION = image_convention
+    try:
+        check_camera_observables()
+    finally:
+        macros.IMAGE_CONVENTION = default_image_convention
+
+
+def check_camera_observables():
+    np.random.seed(0)
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=True,
+        use_camera_obs=True,
+        camera_names=CAMERA_NAMES,
+        camera_heights=SIZE,
+        camera_widths=SIZE,
+        camera_depths=True,
+        camera_segmentations=["instance", "class", "element"],
+    )
+    env.reset()
+    obs, _, _, _ = env.step(np.random.uniform(-1, 1, env.action_dim))
+
+    convention = IMAGE_CONVENTION_MAPPING[macros.IMAGE_CONVENTION]
+    for camera_name in CAMERA_NAMES:
+        rgb, depth = env.sim.render(camera_name=camera_name, width=SIZE, height=SIZE, depth=True)
+        assert np.array_equal(obs[f"{camera_name}_image"], rgb[::convention])
+        assert np.array_equal(obs[f"{camera_name}_depth"], np.expand_dims(depth[::convention], axis=-1))
+        for seg_type in ("instance", "class", "element"):
+            seg = obs[f"{camera_name}_segmentation_{seg_type}"]
+            assert seg.dtype == np.int32
+            assert np.array_equal(seg, reference_segmentation(env, camera_name, seg_type))
+
+    # Segmentation sensors render on their own if the rgb observable does not
+    env.modify_observable(f"{CAMERA_NAMES[0]}_image", "enabled", False)
+    obs, _, _, _ = env.step(np.zeros(env.action_dim))
+    assert np.array_equal(
+        obs[f"{CAMERA_NAMES[0]}_segmentation_instance"], reference_segmentation(env, CAMERA_NAMES[0], "instance")
+    )
+    env.close()
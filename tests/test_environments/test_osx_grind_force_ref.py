@@ -0,0 +1,84 @@
+"""
+Tests the force reference of OSXGrind when no reference force is given, checking that:
+    - the reference is the mortar surface normal at the point closest to a known world frame position
+    - each step queries the mortar surface with the world frame end effector position, close to the mortar
+
+$ pytest -s tests/test_environments/test_osx_grind_force_ref.py
+"""
+from copy import deepcopy
+
+import numpy as np
+
+import robosuite as suite
+from robosuite.controllers import load_composite_controller_config
+
+ROBOT = "UR5e"
+
+
+def make_env(robot=ROBOT):
+    # Small circle at the bottom of the mortar, followed by a compliance controller without reference force
+    angles = np.linspace(0, 2 * np.pi, 50)
+    trajectory = np.zeros((len(angles), 7))
+    trajectory[:, 0] = 0.01 * np.sin(angles)
+    trajectory[:, 1] = 0.01 * np.cos(angles)
+    trajectory[:, 2] = 0.83
+    trajectory[:, 3:] = [0, 1, 0, 0]
+
+    controller_config = load_composite_controller_config(robot=robot)
+    inner = deepcopy(controller_config["body_parts"]["right"])
+    inner.pop("gripper", None)
+    controller_config["body_parts"]["right"] = {
+        "type": "COMPLIANCE",
+        "inner_controller_config": inner,
+        "input_max": 1,
+        "input_min": -1,
+        "output_max": 0.05,
+        "output_min": -0.05,
+        "interpolation": None,
+        "gripper": {"type": "GRIP"},
+    }
+    return suite.make(
+        "OSXGrind",
+        robots=robot,
+        controller_configs=controller_config,
+        reference_trajectory=trajectory,
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+
+
+def test_force_ref_at_known_point():
+    env = make_env()
+    env.reset()
+    origin = np.array(env._mortar_surface_origin())
+
+    # 1 mm away from a known surface point, inside the mortar: its closest point on the surface is that point, and
+    # the reference is the normal there, tilted away from the center (into the wall)
+    xy = np.array([0.01, 0.005])
+    normal = env.mortar_surface.normals(xy)
+    point = np.array([xy[0], xy[1], env.mortar_surface.height(xy)]) - 0.001 * normal
+    force_ref = env.compute_force_ref(origin + point)
+    assert np.allclose(force_ref, np.concatenate([normal, np.zeros(3)]), atol=1e-6)
+    assert normal[0] > 0 and normal[1] > 0 and normal[2] < 0
+    env.close()
+
+
+def test_force_ref_uses_world_frame_eef_position():
+    env = make_env()
+    env.reset()
+    queries = []
+    compute_force_ref = env.compute_force_ref
+
+    def recording_compute_force_ref(eef_pose):
+        queries.append(np.array(eef_pose))
+        return compute_force_ref(eef_pose)
+
+    env.compute_force_ref = recording_compute_force_ref
+    for _ in range(3):
+        eef_pos = np.array(env.sim.data.site_xpos[env.robots[0].eef_site_id["right"]])
+        env.step(np.zeros(env.action_dim))
+        assert np.allclose(queries[-1], eef_pos)
+        # The grinder starts close to the mortar, while its base frame position is ~0.9 m away from the mortar origin
+        assert np.linalg.norm(queries[-1] - env._mortar_surface_origin()) < 0.25
+    env.close()
@@ -0,0 +1,76 @@
+"""
+Tests the cached camera geometry and the fused point cloud observable against the per-camera helpers in camera_utils
+(get_real_depth_map / get_camera_transform_matrix), including cameras that move with the robot, and the voxel
+downsampling against a brute-force implementation:
+
+$ pytest -s tests/test_environments/test_point_cloud.py
+"""
+
+import numpy as np
+
+import robosuite as suite
+import robosuite.macros as macros
+import robosuite.utils.camera_utils as CU
+from robosuite.utils.mjcf_utils import IMAGE_CONVENTION_MAPPING
+
+CAMERA_NAMES = ["agentview", "robot0_eye_in_hand"]
+SIZE = 32
+
+
+def reference_point_cloud(sim, camera_name, depth_map):
+    """
+    Returns:
+        np.array: (SIZE * SIZE, 3) world-frame points of every pixel of @depth_map, in its pixel order
+    """
+    convention = IMAGE_CONVENTION_MAPPING[macros.IMAGE_CONVENTION]
+    # Helpers work with images in the opencv convention
+    depth_map = CU.get_real_depth_map(sim, depth_map[::-convention])
+    camera_to_world = np.linalg.inv(CU.get_camera_transform_matrix(sim, camera_name, SIZE, SIZE))
+    rows, cols = np.meshgrid(np.arange(SIZE), np.arange(SIZE), indexing="ij")
+    z = depth_map.reshape(-1, 1)
+    pixels = np.concatenate([cols.reshape(-1, 1) * z, rows.reshape(-1, 1) * z, z, np.ones_like(z)], axis=-1)
+    points = (pixels @ camera_to_world.T)[:, :3]
+    return points.reshape(SIZE, SIZE, 3)[::-convention].reshape(-1, 3)
+
+
+def test_point_cloud_observable():
+    np.random.seed(0)
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=True,
+        use_camera_obs=True,
+        camera_names=CAMERA_NAMES,
+        camera_heights=SIZE,
+        camera_widths=SIZE,
+        camera_depths=True,
+    )
+    env.add_observable(CU.create_point_cloud_observable(env, CAMERA_NAMES))
+    bounds = np.array([[-0.5, -0.5, 0.8], [0.5, 0.5, 1.2]])
+    env.add_observable(
+        CU.create_point_cloud_observable(env, CAMERA_NAMES, name="voxels", voxel_size=0.02, bounds=bounds)
+    )
+    env.reset()
+
+    # The eye-in-hand camera moves between steps, so its geometry must be refreshed
+    for _ in range(2):
+        obs, _, _, _ = env.step(np.random.uniform(-1, 1, env.action_dim))
+        expected = np.concatenate(
+            [reference_point_cloud(env.sim, name, obs[f"{name}_depth"]) for name in CAMERA_NAMES], axis=0
+        )
+        assert np.allclose(obs["point_cloud"], expected, atol=1e-4)
+
+        inside = expected[np.all((expected >= bounds[0]) & (expected <= bounds[1]), axis=-1)]
+        assert np.allclose(obs["voxels"], CU.voxel_downsample(inside, 0.02, origin=bounds[0]), atol=1e-4)
+    env.close()
+
+
+def test_voxel_downsample():
+    points = np.random.RandomState(0).uniform(size=(2000, 3))
+    for voxel_size in (0.2, 0.02):
+        voxels = {}
+        for point in points:
+            voxels.setdefault(tuple(np.floor(point / voxel_size).astype(int)), []).append(point)
+        expected = np.array([np.mean(voxels[voxel], axis=0) for voxel in sorted(voxels)])
+        assert np.allclose(CU.voxel_downsample(points, voxel_size, origin=np.zeros(3)), expected)
@@ -0,0 +1,75 @@
+"""
+Tests the snapshot reset mode (hard_reset="snapshot"): the model is compiled once, every reset restores the state
+captured after the first reset and re-runs the per-episode randomization:
+
+$ pytest -s tests/test_environments/test_snapshot_reset.py
+"""
+
+import numpy as np
+import pytest
+
+import robosuite as suite
+
+
+def make_env(hard_reset):
+    # The model itself is randomized (e.g.: the cube size) when it is loaded
+    np.random.seed(0)
+    return suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+        hard_reset=hard_reset,
+    )
+
+
+def rollout(env, seed, num_steps=10):
+    np.random.seed(seed)
+    obs = env.reset()
+    trajectory = [np.concatenate([np.ravel(value) for value in obs.values()])]
+    for _ in range(num_steps):
+        obs, _, _, _ = env.step(np.random.uniform(-1, 1, env.action_dim))
+        trajectory.append(np.concatenate([np.ravel(value) for value in obs.values()]))
+    return np.array(trajectory)
+
+
+def test_snapshot_reset_keeps_sim():
+    env = make_env("snapshot")
+    sim = env.sim
+    env.reset()
+    cube_pos = np.array(env.sim.data.body_xpos[env.cube_body_id])
+    for _ in range(3):
+        env.step(np.random.uniform(-1, 1, env.action_dim))
+    env.reset()
+
+    # The simulation is never recompiled, and the placement sampler still runs on every reset
+    assert env.sim is sim
+    assert env.timestep == 0 and env.sim.data.time == 0
+    assert not np.allclose(env.sim.data.body_xpos[env.cube_body_id], cube_pos)
+    assert np.all(env.sim.data.qvel == 0)
+    env.close()
+
+
+def test_snapshot_reset_matches_soft_reset_observations():
+    soft_env, snapshot_env = make_env(False), make_env("snapshot")
+    for seed in range(3):
+        soft, snapshot = rollout(soft_env, seed, num_steps=0), rollout(snapshot_env, seed, num_steps=0)
+        assert np.array_equal(soft, snapshot)
+    soft_env.close()
+    snapshot_env.close()
+
+
+def test_snapshot_reset_is_independent_of_history():
+    env_1, env_2 = make_env("snapshot"), make_env("snapshot")
+    rollout(env_1, seed=1)
+    rollout(env_1, seed=2)
+    rollout(env_2, seed=3)
+    assert np.array_equal(rollout(env_1, seed=0), rollout(env_2, seed=0))
+    env_1.close()
+    env_2.close()
+
+
+def test_invalid_reset_mode():
+    with pytest.raises(ValueError):
+        make_env("snapshots")
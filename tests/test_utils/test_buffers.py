@@ -0,0 +1,67 @@
+"""
+Tests the HistoryBuffer holding the proprioceptive histories of robots, checking that:
+    - its fields behave as the DeltaBuffer / RingBuffer / FilteredDeltaBuffer objects they replace
+    - the eef acceleration estimated by the robots matches the moving average of finite differences it was previously
+      computed as
+"""
+import numpy as np
+
+import robosuite as suite
+from robosuite.utils.buffers import DeltaBuffer, FilteredDeltaBuffer, HistoryBuffer, HistorySpec, RingBuffer
+from robosuite.utils.filters import ButterworthFilter
+
+
+def test_history_fields():
+    rng = np.random.default_rng(0)
+    history = HistoryBuffer(
+        [
+            HistorySpec("delta", dim=3),
+            HistorySpec("ring", dim=4, length=10, zero_filled=False),
+            HistorySpec("filtered", dim=6, filter=ButterworthFilter(dim=6, cutoff=5.0, fs=20.0)),
+        ]
+    )
+    assert history.data.shape == (3 * 2 + 4 * 10 + 6 * 2,)
+    delta, ring = DeltaBuffer(dim=3), RingBuffer(dim=4, length=10)
+    filtered = FilteredDeltaBuffer(dim=6, filter=ButterworthFilter(dim=6, cutoff=5.0, fs=20.0))
+
+    for t in range(2500):
+        if t == 1200:
+            history.clear()
+            delta.clear(), ring.clear(), filtered.clear()
+        values = {"delta": rng.normal(size=3), "ring": rng.normal(size=4), "filtered": rng.normal(size=6)}
+        history.push(values)
+        delta.push(values["delta"]), ring.push(values["ring"]), filtered.push(values["filtered"])
+
+        for name, buffer in (("delta", delta), ("filtered", filtered)):
+            assert np.array_equal(history[name].current, buffer.current)
+            assert np.array_equal(history[name].last, buffer.last)
+            assert np.allclose(history[name].delta, buffer.delta)
+            assert np.allclose(history[name].average, buffer.average)
+        assert history["ring"].ptr == ring.ptr
+        assert np.array_equal(history["ring"].buf, ring.buf)
+        assert np.array_equal(history["ring"].current, ring.current)
+        assert np.allclose(history["ring"].average, ring.average)
+
+
+def test_ee_acceleration():
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+    np.random.seed(0)
+    for _ in range(2):
+        env.reset()
+        robot = env.robots[0]
+        ee_vel, ee_acc = RingBuffer(dim=6, length=10), DeltaBuffer(dim=6)
+        for _ in range(25):
+            env.step(np.random.uniform(-1, 1, env.action_dim))
+            ee_vel.push(robot.recent_ee_vel["right"].current)
+            diffs = np.vstack([ee_acc.current, robot.control_freq * np.diff(ee_vel.buf, axis=0)])
+            ee_acc.push([np.convolve(col, np.ones(10) / 10.0, mode="valid")[0] for col in diffs.transpose()])
+            assert np.array_equal(robot.recent_ee_vel_buffer["right"].buf, ee_vel.buf)
+            assert np.allclose(robot.recent_ee_acc["right"].current, ee_acc.current)
+            assert np.allclose(robot.recent_ee_acc["right"].last, ee_acc.last)
+    env.close()
@@ -0,0 +1,126 @@
+"""
+Tests the memory-mapped demo store against the demo.hdf5 file it is built from (for both the current layout, with
+model xml strings, and the older one, with model file names), its rebuilding when the file changes, and that
+DemoSamplerWrapper samples demonstration states (and model xmls) from it:
+
+$ pytest -s tests/test_utils/test_demo_store.py
+"""
+
+import os
+
+import h5py
+import numpy as np
+
+import robosuite as suite
+from robosuite.utils.demo_store import DemoStore, open_demo_store
+from robosuite.utils.hdf5_demo_writer import HDF5DemoWriter
+from robosuite.wrappers import DataCollectionWrapper, DemoSamplerWrapper
+
+XMLS = ["<mujoco model='a'/>", "<mujoco model='b'/>"]
+
+
+def write_demos(path, lengths, seed=0):
+    """
+    Writes demonstrations of the given lengths to @path, alternating between the two model xmls.
+
+    Returns:
+        list of np.array: states of each demonstration
+    """
+    rng = np.random.RandomState(seed)
+    writer = HDF5DemoWriter(path, env_name="Lift", chunk_size=8)
+    all_states = []
+    for i, length in enumerate(lengths):
+        writer.start_episode(XMLS[i % 2])
+        states = rng.uniform(size=(length, 6))
+        for state in states:
+            writer.add_step(state, np.zeros(2))
+        writer.end_episode()
+        all_states.append(states)
+    writer.close()
+    return all_states
+
+
+def test_demo_store(tmp_path):
+    hdf5_path = str(tmp_path / "demo.hdf5")
+    all_states = write_demos(hdf5_path, [5, 20, 1, 12])
+    store = open_demo_store(hdf5_path)
+    assert store.store_path == str(tmp_path / "demo_store")
+    assert store.env_name == "Lift"
+    assert store.num_demos == 4
+    assert len(set(store.xml_ids)) == 2
+    assert isinstance(store.states, np.memmap)
+    for i, states in enumerate(all_states):
+        index = store.demo_index("demo_{}".format(i))
+        assert np.array_equal(store.demo_states(index), states)
+        assert np.array_equal(store.state(index, len(states) - 1), states[-1])
+        assert store.xml(index) == XMLS[i % 2]
+
+    # Reopening an up to date store does not rebuild it, while changing the file does
+    states_mtime = os.path.getmtime(os.path.join(store.store_path, "states.npy"))
+    assert os.path.getmtime(os.path.join(open_demo_store(hdf5_path).store_path, "states.npy")) == states_mtime
+    all_states = write_demos(hdf5_path, [3, 4, 5], seed=1)
+    store = open_demo_store(hdf5_path)
+    assert store.num_demos == 3
+    assert np.array_equal(store.demo_states(store.demo_index("demo_2")), all_states[2])
+
+
+def test_model_file_names(tmp_path):
+    # Older datasets store the names of model files in a models folder
+    os.makedirs(str(tmp_path / "models"))
+    states = np.arange(12, dtype=np.float64).reshape(4, 3)
+    with h5py.File(str(tmp_path / "demo.hdf5"), "w") as f:
+        f.create_group("data").attrs["env"] = "Lift"
+        for i, xml in enumerate(XMLS):
+            with open(str(tmp_path / "models" / "model_{}.xml".format(i)), "w") as xml_file:
+                xml_file.write(xml)
+            demo = f["data"].create_group("demo_{}".format(i))
+            demo.attrs["model_file"] = "model_{}.xml".format(i)
+            demo.create_dataset("states", data=states[2 * i : 2 * i + 2])
+    store = open_demo_store(str(tmp_path / "demo.hdf5"), models_dir=str(tmp_path / "models"))
+    assert [store.xml(i) for i in range(2)] == XMLS
+    assert np.array_equal(DemoStore(store.store_path).states, states)
+
+
+def test_demo_sampler_wrapper(tmp_path):
+    np.random.seed(0)
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+        hard_reset=False,
+    )
+    env = DataCollectionWrapper(env, str(tmp_path), backend="hdf5")
+    for _ in range(2):
+        env.reset()
+        for _ in range(10):
+            env.step(np.random.uniform(-1, 1, env.action_dim))
+    env.close()
+    with h5py.File(str(tmp_path / "demo.hdf5"), "r") as f:
+        demo_states = np.concatenate([f["data/demo_{}/states".format(i)][()] for i in range(2)])
+
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+    env = DemoSamplerWrapper(
+        env,
+        str(tmp_path),
+        need_xml=True,
+        sampling_schemes=["uniform", "forward", "reverse"],
+        scheme_ratios=[0.4, 0.3, 0.3],
+    )
+    for _ in range(10):
+        state, xml = env.sample()
+        assert np.any(np.all(demo_states == state, axis=1))
+        assert xml == env._xml_for_episode_index(0)
+    # Without hard resets, both demonstrations share the same model, which is only edited once
+    assert len(env._edited_xmls) == 1
+
+    env.reset()
+    assert np.any(np.all(np.isclose(demo_states, env.sim.get_state().flatten()), axis=1))
+    env.close()
@@ -0,0 +1,122 @@
+"""
+Tests the array-backed DynamicsModder, checking that:
+    - randomize() perturbs the same elements, by the same amounts, as modding each element separately
+    - randomized values stay within their perturbation ranges, and settings changes are taken into account
+    - restore_defaults() restores the original model
+"""
+import numpy as np
+
+import robosuite as suite
+from robosuite.utils.mjmod import DynamicsModder
+
+COLUMNS = (
+    "body_pos",
+    "body_quat",
+    "body_inertia",
+    "body_mass",
+    "geom_friction",
+    "geom_solref",
+    "geom_solimp",
+    "jnt_stiffness",
+    "dof_frictionloss",
+    "dof_damping",
+    "dof_armature",
+)
+
+
+class MaxRandomState:
+    """
+    Random state always sampling the upper bound, so that every perturbation is at its maximum
+    """
+
+    def rand(self, *shape):
+        return np.ones(shape)
+
+
+def snapshot(sim):
+    return {column: np.array(getattr(sim.model, column)) for column in COLUMNS}
+
+
+def reference_randomize(modder):
+    """
+    Per-element randomization (with maximum perturbations), as previously done in DynamicsModder.randomize
+    """
+    model = modder.sim.model
+    for attr, settings in modder.opt_randomizations.items():
+        val = modder.defaults[attr]
+        if settings["randomize"]:
+            perturbation = settings["perturbation"]
+            val = val + perturbation if settings["type"] == "size" else val * (1.0 + perturbation)
+            val = np.clip(val, *settings["clip"])
+        modder.mod(None, attr, val)
+    for group_randomizations, names, name2id in (
+        (modder.body_randomizations, modder.body_names, model.body_name2id),
+        (modder.geom_randomizations, modder.geom_names, model.geom_name2id),
+        (modder.joint_randomizations, modder.joint_names, model.joint_name2id),
+    ):
+        for name in names:
+            for attr, settings in group_randomizations.items():
+                if attr in ("frictionloss", "damping", "armature"):
+                    val = modder.defaults[attr][model.dof_jntid == name2id(name)]
+                else:
+                    val = modder.defaults[attr][name2id(name)]
+                if settings["randomize"]:
+                    perturbation = settings["perturbation"]
+                    val = val + perturbation if settings["type"] == "size" else val * (1.0 + perturbation)
+                    val = np.clip(val, *settings["clip"])
+                modder.mod(name, attr, val)
+    modder.update()
+
+
+def test_dynamics_modder():
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+    env.reset()
+    defaults = snapshot(env.sim)
+    density, viscosity = env.sim.model.opt.density, env.sim.model.opt.viscosity
+
+    # Same values as modding each element separately, on a subset of the elements
+    modder = DynamicsModder(
+        env.sim,
+        random_state=MaxRandomState(),
+        body_names=list(env.sim.model.body_names)[::2],
+        geom_names=list(env.sim.model.geom_names)[1::2],
+        density_perturbation_ratio=0.5,
+    )
+    modder.randomize()
+    randomized = snapshot(env.sim)
+    assert env.sim.model.opt.density == density * 1.5
+    modder.restore_defaults()
+    reference_randomize(modder)
+    for column in COLUMNS:
+        assert np.allclose(randomized[column], getattr(env.sim.model, column)), column
+        assert not np.array_equal(randomized[column], defaults[column]), column
+
+    modder.restore_defaults()
+    for column in COLUMNS:
+        assert np.array_equal(getattr(env.sim.model, column), defaults[column]), column
+    assert env.sim.model.opt.density == density and env.sim.model.opt.viscosity == viscosity
+
+    # Randomized values are within their perturbation ranges
+    modder = DynamicsModder(env.sim, random_state=np.random.RandomState(0))
+    modder.randomize()
+    masses = np.array(env.sim.model.body_mass)
+    assert np.all(np.abs(masses - defaults["body_mass"]) <= 0.02 * defaults["body_mass"])
+    assert np.any(masses != defaults["body_mass"])
+    assert np.all(np.abs(env.sim.model.dof_damping - defaults["dof_damping"]) <= 0.01 + 1e-12)
+    assert np.all(env.sim.model.dof_damping >= 0)
+    assert np.allclose(np.linalg.norm(env.sim.model.body_quat, axis=1), 1.0)
+
+    # Changing the settings is taken into account, and seeded modders sample the same values
+    modder.body_randomizations["mass"]["randomize"] = False
+    modder.randomize()
+    assert np.array_equal(env.sim.model.body_mass, defaults["body_mass"])
+    modder.restore_defaults()
+    DynamicsModder(env.sim, random_state=np.random.RandomState(0)).randomize()
+    assert np.array_equal(env.sim.model.body_mass, masses)
+    env.close()
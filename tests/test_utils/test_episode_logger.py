@@ -0,0 +1,70 @@
+"""
+Tests for the EpisodeLogger, checking that:
+    - logged rows are written in chunks and can be read back while the store is still open
+    - rows are tagged with their episode index, and empty episodes are not counted
+    - synchronous and background writes produce the same store
+    - rows whose columns differ from the first row of their table are rejected
+"""
+import numpy as np
+import pytest
+
+from robosuite.utils.episode_logger import EpisodeLogger, load_episode_log
+
+
+def _log_episodes(logger):
+    for episode in range(2):
+        for t in range(10):
+            logger.log("details", timesteps=t, action=np.full(3, t + 10 * episode, dtype=np.float64))
+            if t % 2 == 0:
+                logger.log("rewards", reward=float(t))
+        logger.end_episode()
+        # A second call without new rows should not start another episode
+        logger.end_episode()
+
+
+def test_episode_logger(tmp_path):
+    logger = EpisodeLogger(str(tmp_path), flush_interval=4)
+    logger.log("details", timesteps=0, action=np.zeros(3))
+    logger.flush(wait=True)
+    assert load_episode_log(str(tmp_path))["details"]["action"].shape == (1, 3)
+    logger.close()
+
+    for background in (True, False):
+        path = tmp_path / str(background)
+        logger = EpisodeLogger(str(path), flush_interval=4, background=background)
+        _log_episodes(logger)
+        logger.close()
+
+        log = load_episode_log(str(path))
+        details, rewards = log["details"], log["rewards"]
+        assert details["action"].shape == (20, 3)
+        assert np.array_equal(details["timesteps"], np.tile(np.arange(10), 2))
+        assert np.array_equal(details["episode"], np.repeat([0, 1], 10))
+        assert np.array_equal(details["action"][:, 0], np.arange(20))
+        assert np.array_equal(rewards["episode"], np.repeat([0, 1], 5))
+
+
+def test_episode_logger_rejects_inconsistent_columns(tmp_path):
+    logger = EpisodeLogger(str(tmp_path), flush_interval=4, background=False)
+    logger.log("details", timesteps=0, action=np.zeros(3))
+    # Missing and new columns are rejected, without logging the row
+    with pytest.raises(ValueError):
+        logger.log("details", timesteps=1)
+    with pytest.raises(ValueError):
+        logger.log("details", timesteps=1, action=np.ones(3), reward=1.0)
+    logger.log("details", timesteps=1, action=np.ones(3))
+    logger.close()
+
+    details = load_episode_log(str(tmp_path))["details"]
+    assert sorted(details) == ["action", "episode", "timesteps"]
+    assert np.array_equal(details["timesteps"], [0, 1])
+    assert np.array_equal(details["action"], [np.zeros(3), np.ones(3)])
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_episode_logger(Path(tempfile.mkdtemp()))
+    test_episode_logger_rejects_inconsistent_columns(Path(tempfile.mkdtemp()))
+    print("Episode logger tests completed.")
@@ -0,0 +1,123 @@
+"""
+Tests the streaming HDF5 demonstration writer: the robomimic layout of the file across chunk boundaries, and that
+DataCollectionWrapper's hdf5 backend records the same states and actions as its npz backend:
+
+$ pytest -s tests/test_utils/test_hdf5_demo_writer.py
+"""
+
+import json
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+import robosuite as suite
+from robosuite.utils.hdf5_demo_writer import HDF5DemoWriter
+from robosuite.wrappers import DataCollectionWrapper
+
+
+@pytest.mark.parametrize("background", [True, False])
+def test_writer_layout(tmp_path, background):
+    path = str(tmp_path / "demo.hdf5")
+    writer = HDF5DemoWriter(
+        path, env_name="Lift", env_info=json.dumps({"robots": "IIWA"}), chunk_size=4, background=background
+    )
+    rng = np.random.RandomState(0)
+    expected = []
+    # Episodes shorter than, equal to, and spanning several chunks
+    for i, length in enumerate((3, 4, 10)):
+        assert writer.start_episode("<mujoco/>", ep_meta={"episode": i}) == "demo_{}".format(i)
+        states, actions, images = rng.uniform(size=(length, 5)), rng.uniform(size=(length, 2)), []
+        for t in range(length):
+            image = rng.randint(0, 255, size=(8, 8, 3), dtype=np.uint8)
+            images.append(image)
+            writer.add_step(states[t], actions[t], reward=t, done=t == length - 1, obs={"image": image})
+        writer.end_episode(success=i != 1)
+        expected.append((states, actions, np.stack(images)))
+    writer.close()
+
+    with h5py.File(path, "r") as f:
+        data = f["data"]
+        assert data.attrs["total"] == 17
+        assert data.attrs["env"] == "Lift"
+        assert json.loads(data.attrs["env_args"])["env_kwargs"] == {"robots": "IIWA"}
+        assert [name.decode() for name in f["mask/successful"][()]] == ["demo_0", "demo_2"]
+        for i, (states, actions, images) in enumerate(expected):
+            demo = data["demo_{}".format(i)]
+            assert demo.attrs["num_samples"] == len(states)
+            assert demo.attrs["model_file"] == "<mujoco/>"
+            assert json.loads(demo.attrs["ep_meta"]) == {"episode": i}
+            assert demo.attrs["success"] == (i != 1)
+            assert np.array_equal(demo["states"][()], states)
+            assert np.array_equal(demo["actions"][()], actions)
+            assert np.array_equal(demo["rewards"][()], np.arange(len(states)))
+            assert np.array_equal(np.nonzero(demo["dones"][()])[0], [len(states) - 1])
+            assert demo["obs/image"].dtype == np.uint8
+            assert np.array_equal(demo["obs/image"][()], images)
+
+
+def test_writer_rejects_inconsistent_keys(tmp_path):
+    writer = HDF5DemoWriter(str(tmp_path / "demo.hdf5"), chunk_size=4, background=False)
+    writer.start_episode("<mujoco/>")
+    writer.add_step(np.zeros(5), np.zeros(2))
+    writer.add_step(np.zeros(5), np.zeros(2))
+    # Keys appearing or missing after the first step of a demonstration are rejected, without recording the step
+    with pytest.raises(ValueError):
+        writer.add_step(np.zeros(5), np.zeros(2), actions_abs=np.zeros(2))
+    with pytest.raises(ValueError):
+        writer.add_step(np.zeros(5), np.zeros(2), obs={"image": np.zeros(3)})
+    writer.end_episode(success=True)
+    # The next demonstration can record other keys
+    writer.start_episode("<mujoco/>")
+    writer.add_step(np.zeros(5), np.zeros(2), actions_abs=np.ones(2))
+    writer.close()
+
+    with h5py.File(str(tmp_path / "demo.hdf5"), "r") as f:
+        assert f["data/demo_0"].attrs["num_samples"] == 2
+        assert len(f["data/demo_0/states"]) == 2 and "actions_abs" not in f["data/demo_0"]
+        assert np.array_equal(f["data/demo_1/actions_abs"][()], np.ones((1, 2)))
+
+
+def collect(directory, backend, num_episodes=2, horizon=12):
+    np.random.seed(0)
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+        control_freq=20,
+    )
+    env = DataCollectionWrapper(env, directory, flush_freq=5, backend=backend, store_obs=backend == "hdf5")
+    for _ in range(num_episodes):
+        env.reset()
+        for _ in range(horizon):
+            env.step(np.random.uniform(-1, 1, env.action_dim))
+    env.close()
+
+
+def test_wrapper_backends_match(tmp_path):
+    npz_dir, hdf5_dir = str(tmp_path / "npz"), str(tmp_path / "hdf5")
+    collect(npz_dir, "npz")
+    collect(hdf5_dir, "hdf5")
+
+    # Episodes of the npz backend, in the order they were recorded
+    npz_episodes = []
+    for ep_directory in sorted(os.listdir(npz_dir)):
+        states, actions = [], []
+        for state_file in sorted(os.listdir(os.path.join(npz_dir, ep_directory))):
+            if state_file.startswith("state_"):
+                dic = np.load(os.path.join(npz_dir, ep_directory, state_file), allow_pickle=True)
+                states.extend(dic["states"])
+                actions.extend(info["actions"] for info in dic["action_infos"])
+        # npz episodes also store the state after the last action
+        npz_episodes.append((np.array(states[:-1]), np.array(actions)))
+
+    with h5py.File(os.path.join(hdf5_dir, "demo.hdf5"), "r") as f:
+        assert f["data"].attrs["total"] == 24
+        for i, (states, actions) in enumerate(npz_episodes):
+            demo = f["data/demo_{}".format(i)]
+            assert np.allclose(demo["states"][()], states)
+            assert np.allclose(demo["actions"][()], actions)
+            assert len(demo["obs/robot0_proprio-state"]) == len(actions)
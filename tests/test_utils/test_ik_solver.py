@@ -0,0 +1,78 @@
+"""
+Tests the Levenberg-Marquardt IK solver, checking that:
+    - it reaches random poses of the workspace (within joint limits) without modifying the simulation state
+    - solutions are cached by discretized target pose, and warm start solves of nearby targets
+"""
+import numpy as np
+
+import robosuite as suite
+import robosuite.utils.transform_utils as T
+from robosuite.utils.ik_solver import IKWarmStartCache, LevenbergMarquardtIKSolver
+
+
+def make_env():
+    return suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+
+
+def test_solve_ik():
+    env = make_env()
+    env.reset()
+    robot = env.robots[0]
+    ik = LevenbergMarquardtIKSolver(env.sim.model, "gripper0_right_grip_site", joint_indexes=robot.joint_indexes)
+    assert np.isclose(ik.reach_radius, sum(np.linalg.norm(pos) for pos in env.sim.model.body_pos))
+
+    state = env.sim.get_state().flatten()
+    rng = np.random.default_rng(0)
+    num_solved = 0
+    for _ in range(20):
+        # Random targets reachable from joint angles close to the initial ones
+        q = np.clip(robot.init_qpos + rng.uniform(-0.5, 0.5, len(robot.init_qpos)), ik.lower, ik.upper)
+        target_pos, target_rot = ik.forward_kinematics(q)
+        result = ik.solve_ik(target_pos, target_rot, initial_guess=robot.init_qpos)
+        num_solved += result.success
+        if result.success:
+            pos, rot = ik.forward_kinematics(result.joint_angles)
+            assert np.linalg.norm(pos - target_pos) <= 1e-4
+            assert np.linalg.norm(T.get_orientation_error(T.mat2quat(target_rot), T.mat2quat(rot))) <= 2e-3
+            assert np.all(result.joint_angles >= ik.lower) and np.all(result.joint_angles <= ik.upper)
+    assert num_solved >= 18
+    assert np.array_equal(env.sim.get_state().flatten(), state)
+
+    # Position only
+    result = ik.solve_ik(target_pos + [0.02, 0.0, 0.0], initial_guess=robot.init_qpos)
+    assert result.success and result.error_rot is None
+    env.close()
+
+
+def test_warm_start_cache():
+    env = make_env()
+    env.reset()
+    robot = env.robots[0]
+    cache = IKWarmStartCache(position_resolution=0.01, rotation_resolution=0.1)
+    ik = LevenbergMarquardtIKSolver(
+        env.sim.model, "gripper0_right_grip_site", joint_indexes=robot.joint_indexes, cache=cache
+    )
+    target_pos, target_rot = ik.forward_kinematics(robot.init_qpos + 0.3)
+    # Target that is in the center of its cell
+    target_pos = (np.round(target_pos / 0.01)) * 0.01
+
+    cold = ik.solve_ik(target_pos, target_rot, initial_guess=robot.init_qpos)
+    assert cold.success and len(cache) == 1
+    assert np.array_equal(cache.get(target_pos, target_rot), cold.joint_angles)
+    # q and -q are the same target
+    assert cache.key(target_pos, target_rot) == cache.key(target_pos, T.quat2mat(-T.mat2quat(target_rot)))
+
+    warm = ik.solve_ik(target_pos + 0.002, target_rot, initial_guess=robot.init_qpos)
+    assert warm.success and warm.iterations < cold.iterations
+    assert len(cache) == 1
+
+    cache.max_size = 1
+    ik.solve_ik(target_pos + 0.05, target_rot, initial_guess=robot.init_qpos)
+    assert len(cache) == 1 and cache.get(target_pos, target_rot) is None
+    env.close()
@@ -0,0 +1,74 @@
+"""
+Tests the lazy import of robosuite, checking that:
+    - importing robosuite stays within its time budget (measured with `python -X importtime` in fresh interpreters),
+      and does not import environments, controllers, numba, scipy or optional integrations
+    - lazy registry entries import their modules on first access, and report modules that cannot be imported
+"""
+import subprocess
+import sys
+
+import pytest
+
+import robosuite as suite
+from robosuite.environments import REGISTERED_ENVS
+from robosuite.utils.registry_utils import LazyEntry, LazyRegistry
+
+# Budget of `import robosuite` (ms), which used to take about a second when everything was imported up front
+IMPORT_TIME_BUDGET = 500
+
+LAZY_MODULES = (
+    "numba",
+    "scipy.signal",
+    "mink",
+    "robosuite_models",
+    "robosuite.environments.manipulation.lift",
+    "robosuite.controllers",
+    "robosuite.robots",
+    "robosuite.models.grippers",
+)
+
+
+def run(code, importtime=False):
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(cmd, capture_output=True, text=True, check=True)
+
+
+def import_time():
+    """
+    Returns:
+        float: cumulative import time of robosuite (ms) in a fresh interpreter
+    """
+    for line in run("import robosuite", importtime=True).stderr.splitlines():
+        if line.startswith("import time:") and line.split("|")[-1] == " robosuite":
+            return int(line.split("|")[1]) / 1e3
+
+
+def test_import_time():
+    loaded = run("import sys, robosuite; print(' '.join(sys.modules))").stdout.split()
+    assert [module for module in LAZY_MODULES if module in loaded] == []
+
+    # Fastest of a few runs, to be robust to noisy machines
+    assert min(import_time() for _ in range(3)) < IMPORT_TIME_BUDGET
+
+
+def test_lazy_registry():
+    # Environments are resolved on first access
+    assert len(suite.ALL_ENVIRONMENTS) == 22
+    assert suite.Lift is REGISTERED_ENVS["Lift"] and suite.Lift.__name__ == "Lift"
+    assert REGISTERED_ENVS.get("Lift") is suite.Lift and REGISTERED_ENVS.get("Unknown") is None
+    assert not any(isinstance(env, LazyEntry) for env in REGISTERED_ENVS.values())
+
+    registry = LazyRegistry(fallback_modules={"robosuite_fake_models": None})
+    registry.register_lazy("Missing", "robosuite_fake_module", hint="Install it")
+    registry.register_lazy("Unregistered", "robosuite.utils.errors")
+    assert "Missing" in registry and "Unknown" not in registry
+    with pytest.raises(ImportError, match="Install it"):
+        registry["Missing"]
+    with pytest.raises(ImportError, match="does not register"):
+        registry["Unregistered"]
+    with pytest.raises(KeyError):
+        registry["Unknown"]
+
+    # Registering a class replaces its lazy entry
+    registry["Missing"] = LazyRegistry
+    assert registry["Missing"] is LazyRegistry
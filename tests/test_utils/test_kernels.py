@@ -0,0 +1,167 @@
+"""
+Tests for the transform / control kernels, checking that:
+    - the kernels agree with the pure NumPy kernels, and with the formulas of the reference implementations
+    - the public transform_utils functions only delegate to the kernels if macros.USE_FAST_KERNELS
+    - the batched kernels agree with stacking the single-element kernels
+    - conversions between rotation matrices and quaternions round trip, including half-turn rotations
+    - numba is only imported, and the kernels compiled, on first use, or for float64 C-contiguous arguments by
+      precompile()
+"""
+import subprocess
+import sys
+
+import numpy as np
+
+import robosuite.macros as macros
+import robosuite.utils.kernels as kernels
+import robosuite.utils.transform_utils as T
+
+NUM_SAMPLES = 50
+
+
+def random_inputs(seed=0):
+    rng = np.random.default_rng(seed)
+    quats = rng.normal(size=(NUM_SAMPLES, 4))
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    mats = kernels.NUMPY_KERNELS["quats2mats"](quats)
+    vectors = rng.normal(size=(NUM_SAMPLES, 3))
+    poses = np.zeros((NUM_SAMPLES, 4, 4))
+    poses[:, :3, :3], poses[:, :3, 3], poses[:, 3, 3] = mats, vectors, 1.0
+    return rng, quats, mats, vectors, poses
+
+
+def assert_allclose(actual, desired, atol=1e-9):
+    if isinstance(desired, tuple):
+        for a, d in zip(actual, desired):
+            np.testing.assert_allclose(a, d, atol=atol)
+    else:
+        np.testing.assert_allclose(actual, desired, atol=atol)
+
+
+def test_kernels_match_numpy():
+    rng, quats, mats, vectors, poses = random_inputs()
+    shuffled = rng.permutation(NUM_SAMPLES)
+    jacobian = rng.normal(size=(6, 7))
+    mass_matrix = np.eye(7) + 0.1 * np.ones((7, 7))
+    args = {
+        "mat2quat": (mats[0],),
+        "quat2mat": (quats[0],),
+        "quat_multiply": (quats[0], quats[1]),
+        "pose_inv": (poses[0],),
+        "force_in_A_to_force_in_B": (vectors[0], vectors[1], poses[0]),
+        "quaternions_orientation_error": (quats[0], quats[1]),
+        "rotate_vector_by_quaternion": (vectors[0], quats[0]),
+        "orientation_error": (mats[0], mats[1]),
+        "opspace_matrices": (mass_matrix, jacobian, jacobian[:3].copy(), jacobian[3:].copy()),
+        "nullspace_torques": (mass_matrix, np.eye(7), np.zeros(7), rng.normal(size=7), rng.normal(size=7), 10.0),
+        "mats2quats": (mats,),
+        "quats2mats": (quats,),
+        "quats_multiply": (quats, quats[shuffled]),
+        "poses_inv": (poses,),
+        "quaternions_orientation_errors": (quats, quats[shuffled]),
+        "rotate_vectors_by_quaternions": (vectors, quats),
+        "orientation_errors": (mats, mats[shuffled]),
+    }
+    assert set(args) == set(kernels.NUMPY_KERNELS)
+    for name, fn_args in args.items():
+        assert_allclose(getattr(kernels, name)(*fn_args), kernels.NUMPY_KERNELS[name](*fn_args))
+
+
+def test_batched_kernels():
+    rng, quats, mats, vectors, poses = random_inputs(seed=1)
+    other_quats, other_mats = quats[rng.permutation(NUM_SAMPLES)], mats[rng.permutation(NUM_SAMPLES)]
+    batched = {
+        "mats2quats": ("mat2quat", (mats,)),
+        "quats2mats": ("quat2mat", (quats,)),
+        "quats_multiply": ("quat_multiply", (quats, other_quats)),
+        "poses_inv": ("pose_inv", (poses,)),
+        "quaternions_orientation_errors": ("quaternions_orientation_error", (quats, other_quats)),
+        "rotate_vectors_by_quaternions": ("rotate_vector_by_quaternion", (vectors, quats)),
+        "orientation_errors": ("orientation_error", (mats, other_mats)),
+    }
+    for name, (single_name, fn_args) in batched.items():
+        for kernel_set in (vars(kernels), kernels.NUMPY_KERNELS):
+            stacked = np.array([kernel_set[single_name](*element_args) for element_args in zip(*fn_args)])
+            assert_allclose(kernel_set[name](*fn_args), stacked)
+
+
+def test_legacy_formulas():
+    # Both the reference implementations (default) and the kernels (opt-in) of the public functions
+    use_fast_kernels = macros.USE_FAST_KERNELS
+    try:
+        for macros_value in (False, True):
+            macros.USE_FAST_KERNELS = macros_value
+            check_legacy_formulas()
+    finally:
+        macros.USE_FAST_KERNELS = use_fast_kernels
+
+
+def check_legacy_formulas():
+    rng, quats, mats, vectors, poses = random_inputs(seed=2)
+    for q0, q1, R, v, pose in zip(quats, quats[::-1], mats, vectors, poses):
+        # Hamilton product through the quaternion matrices (quat_multiply returns single precision quaternions)
+        assert_allclose(T.quat2mat(T.quat_multiply(q1, q0)), T.quat2mat(q1) @ T.quat2mat(q0), atol=1e-6)
+        assert_allclose(T.pose_inv(pose), np.linalg.inv(pose))
+        assert_allclose(T.rotate_vector_by_quaternion(v, 2.0 * q0), R @ v)
+
+        force_B, torque_B = T.force_in_A_to_force_in_B(v, v[::-1], pose)
+        skew = T._skew_symmetric_translation(pose[:3, 3])
+        assert_allclose(force_B, R.T.dot(v))
+        assert_allclose(torque_B, -R.T.dot(skew.dot(v)) + R.T.dot(v[::-1]))
+
+        ne = q0[3] * q1[3] + np.dot(q0[:3], q1[:3])
+        ee = q0[3] * q1[:3] - q1[3] * q0[:3] + np.dot(T.skew(q0[:3]), q1[:3])
+        assert_allclose(T.quaternions_orientation_error(q1, q0), ee * np.sign(ne))
+
+
+def test_mat2quat_round_trip():
+    _, quats, mats, _, _ = random_inputs(seed=3)
+    # Half-turn rotations, where the trace based conversion is ill-conditioned
+    half_turns = np.array([[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.6, 0.8, 0.0, 0.0]])
+    quats = np.concatenate([quats, half_turns])
+    mats = np.concatenate([mats, kernels.quats2mats(half_turns)])
+    for mats2quats in (kernels.mats2quats, kernels.NUMPY_KERNELS["mats2quats"]):
+        converted = mats2quats(mats)
+        # Same rotations, up to the sign of the quaternions
+        np.testing.assert_allclose(np.abs(np.sum(converted * quats, axis=1)), 1.0, atol=1e-9)
+        assert np.all(converted[:, 3] >= 0.0)
+        np.testing.assert_allclose(kernels.quats2mats(converted), mats, atol=1e-9)
+
+    # Zero quaternions map to the identity
+    np.testing.assert_allclose(T.quat2mat(np.zeros(4)), np.eye(3))
+    np.testing.assert_allclose(kernels.quats2mats(np.zeros((2, 4))), np.stack([np.eye(3)] * 2))
+
+
+def test_public_functions_opt_in():
+    _, quats, mats, _, _ = random_inputs(seed=4)
+    use_fast_kernels = macros.USE_FAST_KERNELS
+    try:
+        macros.USE_FAST_KERNELS = False
+        legacy_quat, legacy_mat = T.mat2quat(mats[0]), T.quat2mat(quats[0])
+        macros.USE_FAST_KERNELS = True
+        quat, mat = T.mat2quat(mats[0]), T.quat2mat(quats[0])
+    finally:
+        macros.USE_FAST_KERNELS = use_fast_kernels
+
+    # Both paths agree up to single precision, and keep returning single precision quaternions
+    assert legacy_quat.dtype == quat.dtype == np.float32
+    np.testing.assert_allclose(np.abs(np.dot(quat, legacy_quat)), 1.0, atol=1e-6)
+    np.testing.assert_allclose(mat, legacy_mat, atol=1e-6)
+    np.testing.assert_allclose(np.abs(np.dot(quat, quats[0])), 1.0, atol=1e-6)
+    # The public conversions keep accepting homogeneous matrices
+    np.testing.assert_array_equal(T.mat2quat(T.make_pose(np.zeros(3), mats[0])), T.mat2quat(mats[0]))
+
+
+def test_precompile():
+    if not macros.ENABLE_NUMBA:
+        assert all(getattr(kernels, name) is fn for name, fn in kernels.NUMPY_KERNELS.items())
+        return
+    # Importing the kernels (and the modules using them) neither compiles them nor imports numba
+    code = "import sys, robosuite.utils.control_utils, robosuite.utils.kernels; print('numba' in sys.modules)"
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert loaded.strip() == "False"
+
+    kernels.precompile(batched=True)
+    assert set(kernels.SIGNATURES) | set(kernels.BATCHED_SIGNATURES) == set(kernels.NUMPY_KERNELS)
+    for name, signatures in dict(kernels.SIGNATURES, **kernels.BATCHED_SIGNATURES).items():
+        assert len(getattr(kernels, name).signatures) >= len(signatures), name
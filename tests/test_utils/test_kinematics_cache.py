@@ -0,0 +1,107 @@
+"""
+Tests for the simulation-step-scoped KinematicsCache shared by the part controllers of a robot:
+
+$ pytest -s tests/test_utils/test_kinematics_cache.py
+"""
+
+import mujoco
+import numpy as np
+
+import robosuite as suite
+import robosuite.utils.transform_utils as T
+from robosuite.utils.mjmod import DynamicsModder
+
+
+def make_env():
+    return suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+
+
+def test_cached_quantities_match_sim():
+    env = make_env()
+    env.reset()
+    robot = env.robots[0]
+    cache = robot.composite_controller.kinematics_cache
+    controller = robot.part_controllers["right"]
+    assert controller.kinematics_cache is cache
+
+    np.random.seed(0)
+    for _ in range(3):
+        env.step(np.random.uniform(-1, 1, env.action_dim))
+        sim = env.sim
+        mass_matrix = np.zeros((sim.model.nv, sim.model.nv))
+        mujoco.mj_fullM(sim.model._model, mass_matrix, sim.data.qM)
+        site_id = sim.model.site_name2id(controller.ref_name)
+        eef_name = robot.robot_model.eef_name["right"]
+
+        assert np.array_equal(cache.mass_matrix(), mass_matrix)
+        assert np.array_equal(cache.site_jacobian(site_id)[:3], sim.data.get_site_jacp(controller.ref_name))
+        assert np.array_equal(cache.site_jacobian(site_id)[3:], sim.data.get_site_jacr(controller.ref_name))
+        assert np.array_equal(
+            cache.body_jacobian(sim.model.body_name2id(eef_name))[:3], sim.data.get_body_jacp(eef_name)
+        )
+        for name, sensor in robot.gripper["right"].important_sensors.items():
+            sensor_id = sim.model.sensor_name2id(sensor)
+            start = np.sum(sim.model.sensor_dim[:sensor_id])
+            assert np.array_equal(
+                robot.get_sensor_measurement(sensor),
+                sim.data.sensordata[start : start + sim.model.sensor_dim[sensor_id]],
+            )
+    env.close()
+
+
+def test_cache_is_invalidated_on_state_change():
+    env = make_env()
+    env.reset()
+    robot = env.robots[0]
+    cache = robot.composite_controller.kinematics_cache
+    eef_name = robot.robot_model.eef_name["right"]
+
+    pose = cache.pose_in_base(eef_name, robot.robot_model.root_body)
+    assert cache.pose_in_base(eef_name, robot.robot_model.root_body) is pose
+
+    # Setting the robot state (at the same sim time) drops the cached entries, and so does stepping the simulation
+    env.sim.data.qpos[robot._ref_joint_pos_indexes] += 0.1
+    env.sim.forward()
+    moved_pose = cache.pose_in_base(eef_name, robot.robot_model.root_body)
+    assert not np.allclose(moved_pose, pose)
+    base_pose = T.make_pose(
+        env.sim.data.get_body_xpos(robot.robot_model.root_body),
+        env.sim.data.get_body_xmat(robot.robot_model.root_body),
+    )
+    eef_pose = T.make_pose(env.sim.data.get_body_xpos(eef_name), env.sim.data.get_body_xmat(eef_name))
+    assert np.allclose(moved_pose, T.pose_inv(base_pose) @ eef_pose)
+
+    env.step(np.zeros(env.action_dim))
+    assert cache.pose_in_base(eef_name, robot.robot_model.root_body) is not moved_pose
+    env.close()
+
+
+def test_cache_is_invalidated_on_forward_and_model_edits():
+    env = make_env()
+    env.reset()
+    robot = env.robots[0]
+    cache = robot.composite_controller.kinematics_cache
+    eef_name = robot.robot_model.eef_name["right"]
+    root_name = robot.robot_model.root_body
+
+    # Editing the model (at the same state) and forwarding the simulation drops the cached entries
+    pose = cache.pose_in_base(eef_name, root_name)
+    modder = DynamicsModder(env.sim)
+    modder.mod_position(eef_name, env.sim.model.body_pos[env.sim.model.body_name2id(eef_name)] + 0.1)
+    env.sim.forward()
+    moved_pose = cache.pose_in_base(eef_name, root_name)
+    assert not np.allclose(moved_pose, pose)
+
+    # Writing only the velocities (at the same time and qpos) makes the cache forward the simulation again
+    cache.forward()
+    env.sim.data.qvel[robot._ref_joint_vel_indexes] += 0.1
+    qfrc_bias = np.array(env.sim.data.qfrc_bias)
+    cache.forward()
+    assert not np.allclose(env.sim.data.qfrc_bias, qfrc_bias)
+    env.close()
@@ -0,0 +1,93 @@
+"""
+Tests the vectorized marker field of the wiping tasks, checking that:
+    - markers found under a wiping tool match the per-marker projection / point-in-rectangle test
+    - wiped markers are tracked incrementally, and made transparent once
+    - the centroid / radius of the remaining markers match a direct computation
+"""
+import numpy as np
+
+import robosuite as suite
+import robosuite.utils.transform_utils as T
+from robosuite.utils.marker_field import MarkerField
+
+
+def reference_under_tool(marker_positions, corners):
+    """
+    Per-marker test, as previously done in Wipe._get_active_markers
+    """
+    corner1_pos, corner2_pos, corner3_pos, corner4_pos = corners
+    v1 = corner1_pos - corner2_pos
+    v1 /= np.linalg.norm(v1)
+    v2 = corner4_pos - corner2_pos
+    v2 /= np.linalg.norm(v2)
+    pp = [np.array([np.dot(c - corner2_pos, v1), np.dot(c - corner2_pos, v2)]) for c in corners]
+    pp = [pp[0], pp[1], pp[3], pp[2]]
+    n = np.cross(v1, v2)
+    n /= np.linalg.norm(n)
+
+    def isLeft(P0, P1, P2):
+        return (P1[0] - P0[0]) * (P2[1] - P0[1]) - (P2[0] - P0[0]) * (P1[1] - P0[1])
+
+    def PointInRectangle(X, Y, Z, W, P):
+        return isLeft(X, Y, P) < 0 and isLeft(Y, Z, P) < 0 and isLeft(Z, W, P) < 0 and isLeft(W, X, P) < 0
+
+    active = []
+    for marker_pos in marker_positions:
+        dist = np.dot(marker_pos - corner2_pos, n)
+        projected_point = marker_pos - dist * n
+        pp_2 = np.array([np.dot(projected_point - corner2_pos, v1), np.dot(projected_point - corner2_pos, v2)])
+        active.append(0.0 < dist < 0.02 and PointInRectangle(pp[0], pp[1], pp[2], pp[3], pp_2))
+    return np.array(active)
+
+
+def test_marker_field():
+    env = suite.make(
+        "Wipe",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+    env.reset()
+    field = MarkerField(env.sim, env.model.mujoco_arena.markers)
+    positions = field.update_positions()
+    assert len(field) == env.num_markers
+    assert np.array_equal(
+        positions, [env.sim.data.body_xpos[env.sim.model.body_name2id(m.root_body)] for m in field.markers]
+    )
+
+    # Random tool poses (rectangles of random sizes) hovering around the markers
+    rng = np.random.default_rng(0)
+    num_active = 0
+    for _ in range(500):
+        center = positions[rng.integers(len(field))] + rng.uniform(-0.03, 0.03, 3) - [0, 0, 0.01]
+        rot = T.quat2mat(T.axisangle2quat(rng.normal(scale=[0.2, 0.2, 2.0])))
+        half = rng.uniform(0.01, 0.05, 2)
+        # Corners in the order of the wiping gripper: 1 -> 2 -> 4 span the plane, with a normal pointing up
+        corners = center + np.array([[half[0], 0, 0], [0, 0, 0], [half[0], half[1], 0], [0, half[1], 0]]) @ rot.T
+        expected = reference_under_tool(positions, corners)
+        assert np.array_equal(field.under_tool(corners), expected)
+        num_active += expected.sum()
+    assert num_active > 0
+
+    # Wiping
+    mask = np.zeros(len(field), dtype=bool)
+    mask[[3, 5, 7]] = True
+    assert list(field.wipe(mask)) == [3, 5, 7]
+    mask[[5, 9]] = True
+    assert list(field.wipe(mask)) == [9]
+    assert field.num_wiped == 4 and list(np.flatnonzero(field.wiped)) == [3, 5, 7, 9]
+    assert np.all(env.sim.model.geom_rgba[field.geom_ids[[3, 5, 7, 9]], 3] == 0)
+    assert np.all(env.sim.model.geom_rgba[field.geom_ids[[0, 1, 2]], 3] == 1)
+
+    radius, centroid = field.remaining_information()
+    remaining = np.delete(positions, [3, 5, 7, 9], axis=0)
+    assert np.allclose(centroid, remaining.mean(axis=0))
+    assert np.isclose(radius, np.max(np.linalg.norm(remaining - remaining.mean(axis=0), axis=1)))
+
+    field.wipe(np.ones(len(field), dtype=bool))
+    assert field.num_wiped == len(field)
+    assert field.remaining_information()[0] == 0
+    field.reset()
+    assert field.num_wiped == 0 and not field.wiped.any()
+    env.close()
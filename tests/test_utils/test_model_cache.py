@@ -0,0 +1,87 @@
+"""
+Tests the compiled model cache (in-memory LRU and on-disk .mjb files) and its use by MjSim.from_xml_string:
+
+$ pytest -s tests/test_utils/test_model_cache.py
+"""
+
+import numpy as np
+
+import robosuite as suite
+import robosuite.macros as macros
+from robosuite.utils.model_cache import ModelCache, get_model_cache, get_model_cache_stats
+
+XML = """
+<mujoco model="{name}">
+  <worldbody>
+    <body name="box" pos="0 0 {height}">
+      <freejoint/>
+      <geom name="box_geom" type="box" size="0.1 0.1 0.1" rgba="1 0 0 1"/>
+    </body>
+  </worldbody>
+</mujoco>
+"""
+
+
+def make_xml(i):
+    return XML.format(name="model_{}".format(i), height=i)
+
+
+def test_lru_cache():
+    cache = ModelCache(max_size=2)
+    model, model_xml = cache.get(make_xml(0))
+    assert 'model="model_0"' in model_xml
+    cache.get(make_xml(1))
+    cache.get(make_xml(0))
+    # Evicts model 1, the least recently used one
+    cache.get(make_xml(2))
+    cache.get(make_xml(1))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 4, 2, 2)
+    assert stats["hit_rate"] == 0.2
+
+    # Models are private copies of the cached model
+    model.geom_rgba[0] = [0, 1, 0, 1]
+    assert np.array_equal(cache.get(make_xml(0))[0].geom_rgba[0], [1, 0, 0, 1])
+
+
+def test_disk_cache(tmp_path):
+    model, model_xml = ModelCache(max_size=0, cache_dir=str(tmp_path)).get(make_xml(3))
+
+    # A new cache (e.g.: in another process) loads the model from disk instead of compiling it
+    cache = ModelCache(max_size=0, cache_dir=str(tmp_path))
+    cached_model, cached_model_xml = cache.get(make_xml(3))
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["misses"] == 0
+    assert cached_model_xml == model_xml
+    assert np.array_equal(cached_model.body_pos, model.body_pos)
+
+    cache.clear(disk=True)
+    cache.get(make_xml(3))
+    assert cache.stats()["misses"] == 1
+
+
+def test_env_hard_resets_use_cache():
+    cache_size = macros.MODEL_CACHE_SIZE
+    macros.MODEL_CACHE_SIZE = 8
+    try:
+        env = suite.make(
+            "Door",
+            robots="IIWA",
+            has_renderer=False,
+            has_offscreen_renderer=False,
+            use_camera_obs=False,
+        )
+        get_model_cache().reset_stats()
+        env.reset()
+        env.reset()
+        # The Door task generates the same XML on every hard reset
+        assert get_model_cache_stats()["misses"] == 0
+
+        # get_xml must return this model's XML, even though the model was not the last one parsed
+        xml = env.sim.model.get_xml()
+        assert "Door" in xml
+        env.reset_from_xml_string(xml)
+        env.reset_from_xml_string(xml)
+        assert env.sim.model.get_xml() == xml
+        env.close()
+    finally:
+        macros.MODEL_CACHE_SIZE = cache_size
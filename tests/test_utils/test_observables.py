@@ -0,0 +1,150 @@
+"""
+Tests for the ObservableScheduler, checking that:
+    - scheduled updates produce exactly the same readings as updating every observable after every substep,
+      for different sampling rates and delays
+    - inactive observables are only evaluated when an active observable depends on them
+    - observables reading the last value of inactive observables with other sampling rates / delays get the same
+      readings as with eager updates
+    - observables disabled and re-enabled mid-episode resume updating
+"""
+import numpy as np
+
+from robosuite.utils.observables import (
+    Observable,
+    ObservableCache,
+    ObservableScheduler,
+    create_deterministic_delayer,
+    sensor,
+)
+
+TIMESTEP = 0.002
+
+
+def make_observables(clock, calls):
+    @sensor(modality="test")
+    def time(obs_cache):
+        calls["time"] = calls.get("time", 0) + 1
+        return np.array([clock[0], 2 * clock[0]])
+
+    @sensor(modality="test", requires=["time"])
+    def double_time(obs_cache):
+        calls["double_time"] = calls.get("double_time", 0) + 1
+        return 2 * obs_cache["time"] if "time" in obs_cache else np.zeros(2)
+
+    @sensor(modality="test")
+    def unused(obs_cache):
+        calls["unused"] = calls.get("unused", 0) + 1
+        return clock[0]
+
+    return {
+        "time": Observable("time", time, sampling_rate=20, active=False),
+        "double_time": Observable("double_time", double_time, sampling_rate=20),
+        "slow": Observable("slow", time, sampling_rate=7, delayer=create_deterministic_delayer(0.01)),
+        "fast": Observable("fast", time, sampling_rate=100, delayer=create_deterministic_delayer(0.003)),
+        "unused": Observable("unused", unused, sampling_rate=20, active=False),
+    }
+
+
+def test_scheduler_matches_eager_updates():
+    clock, calls = [0.0], {}
+    eager = make_observables(clock, {})
+    scheduled = make_observables(clock, calls)
+    scheduler = ObservableScheduler(scheduled)
+    # Don't count the sensor validity checks
+    calls.clear()
+    eager_cache, cache = {}, ObservableCache()
+
+    for substep in range(500):
+        clock[0] = substep * TIMESTEP
+        force = substep == 0
+        for observable in eager.values():
+            observable.update(TIMESTEP, eager_cache, force=force)
+        scheduler.update(TIMESTEP, cache, force=force)
+        if substep == 200:
+            # Changing the timing of an observable mid-way should be handled as well
+            eager["slow"].set_sampling_rate(13)
+            scheduled["slow"].set_sampling_rate(13)
+        for name, observable in scheduled.items():
+            if observable.is_active():
+                assert np.array_equal(observable.obs, eager[name].obs), (substep, name)
+
+    # The inactive "time" observable is still evaluated for "double_time", but "unused" is only evaluated once
+    assert calls["unused"] == 1
+    assert calls["double_time"] == 500 * TIMESTEP * 20
+
+
+def make_multi_rate_observables(clock):
+    @sensor(modality="test")
+    def slow_time(obs_cache):
+        return clock[0]
+
+    @sensor(modality="test")
+    def stamped_time(obs_cache):
+        # Also writes another cache key as a side effect
+        obs_cache["stamp"] = np.array(-clock[0])
+        return clock[0]
+
+    @sensor(modality="test", requires=["slow_time", "stamp"])
+    def elapsed(obs_cache):
+        if "slow_time" not in obs_cache or "stamp" not in obs_cache:
+            return np.zeros(2)
+        return np.array([clock[0] - obs_cache["slow_time"], clock[0] + obs_cache["stamp"]])
+
+    return {
+        "slow_time": Observable(
+            "slow_time", slow_time, sampling_rate=7, delayer=create_deterministic_delayer(0.01), active=False
+        ),
+        "stamped_time": Observable("stamped_time", stamped_time, sampling_rate=13, active=False),
+        "elapsed": Observable("elapsed", elapsed, sampling_rate=20),
+        "elapsed_fast": Observable(
+            "elapsed_fast", elapsed, sampling_rate=100, delayer=create_deterministic_delayer(0.003)
+        ),
+    }
+
+
+def test_multi_rate_dependencies():
+    clock = [0.0]
+    eager = make_multi_rate_observables(clock)
+    scheduled = make_multi_rate_observables(clock)
+    scheduler = ObservableScheduler(scheduled)
+    eager_cache, cache = {}, ObservableCache()
+
+    for substep in range(500):
+        clock[0] = (substep + 1) * TIMESTEP
+        for observable in eager.values():
+            observable.update(TIMESTEP, eager_cache, force=substep == 0)
+        scheduler.update(TIMESTEP, cache, force=substep == 0)
+        for name in ("elapsed", "elapsed_fast"):
+            assert np.array_equal(scheduled[name].obs, eager[name].obs), (substep, name)
+    # The readings do depend on the sampling times of the inactive observables
+    assert np.any(scheduled["elapsed"].obs > 0)
+
+
+def test_toggle_enabled():
+    clock = [0.0]
+    eager = make_observables(clock, {})
+    scheduled = make_observables(clock, {})
+    scheduler = ObservableScheduler(scheduled)
+    eager_cache, cache = {}, ObservableCache()
+
+    for substep in range(300):
+        clock[0] = (substep + 1) * TIMESTEP
+        for observable in eager.values():
+            observable.update(TIMESTEP, eager_cache, force=substep == 0)
+        scheduler.update(TIMESTEP, cache, force=substep == 0)
+        if substep in (50, 100):
+            # Disable, then re-enable the observables mid-episode
+            for observables in (eager, scheduled):
+                observables["fast"].set_enabled(substep == 100)
+                observables["double_time"].set_enabled(substep == 100)
+        for name in ("fast", "double_time", "slow"):
+            assert np.array_equal(scheduled[name].obs, eager[name].obs), (substep, name)
+    # The re-enabled observables are updated again
+    assert np.any(scheduled["fast"].obs > 100 * TIMESTEP)
+
+
+if __name__ == "__main__":
+    test_scheduler_matches_eager_updates()
+    test_multi_rate_dependencies()
+    test_toggle_enabled()
+    print("Observable tests completed.")
@@ -0,0 +1,85 @@
+"""
+Tests that rendering a batch of cameras concurrently with MjRenderPool (one render context per worker thread and
+simulation) gives the same images as rendering them one by one with each simulation's own render context, and that
+closing the pool frees the render contexts its worker threads created:
+
+$ pytest -s tests/test_utils/test_render_pool.py
+"""
+
+import threading
+
+import numpy as np
+
+import robosuite as suite
+from robosuite.utils.binding_utils import MjRenderPool, RenderRequest
+
+CAMERA_NAMES = ["agentview", "frontview", "robot0_eye_in_hand"]
+SIZE = 48
+
+
+def make_env(seed):
+    np.random.seed(seed)
+    env = suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=True,
+        use_camera_obs=False,
+    )
+    env.reset()
+    return env
+
+
+def test_render_pool():
+    envs = [make_env(seed) for seed in range(2)]
+    requests = [
+        RenderRequest(env.sim, camera_name, SIZE, SIZE, depth=True, segmentation=True)
+        for env in envs
+        for camera_name in CAMERA_NAMES
+    ]
+    expected = [
+        request.sim.render_images(SIZE, SIZE, camera_name=request.camera_name, depth=True, segmentation=True)
+        for request in requests
+    ]
+
+    pool = MjRenderPool(num_threads=3)
+    try:
+        # Render twice, so that the second batch reuses the contexts the worker threads created
+        for _ in range(2):
+            for images, expected_images in zip(pool.render(requests), expected):
+                for image, expected_image in zip(images, expected_images):
+                    assert np.array_equal(image, expected_image)
+    finally:
+        pool.close()
+
+    # The simulations' own render contexts are still usable from any thread
+    images = []
+    thread = threading.Thread(target=lambda: images.append(envs[0].sim.render(SIZE, SIZE, camera_name="agentview")))
+    thread.start()
+    thread.join()
+    assert np.array_equal(images[0], expected[0][0])
+    for env in envs:
+        env.close()
+
+
+def test_render_pool_frees_contexts():
+    env = make_env(0)
+    requests = [RenderRequest(env.sim, camera_name, SIZE, SIZE) for camera_name in CAMERA_NAMES]
+    # Create and close a pool twice: each pool frees its worker threads' contexts, without touching the other's
+    for _ in range(2):
+        pool = MjRenderPool(num_threads=2)
+        try:
+            pool.render(requests)
+            assert len(env.sim._thread_render_contexts) > 0
+        finally:
+            pool.close()
+        assert env.sim._thread_render_contexts == {}
+
+    # Freeing the simulation frees the contexts of threads outside of any pool too
+    thread = threading.Thread(target=env.sim.get_thread_render_context)
+    thread.start()
+    thread.join()
+    sim = env.sim
+    assert len(sim._thread_render_contexts) == 1
+    env.close()
+    assert sim._thread_render_contexts == {}
@@ -0,0 +1,106 @@
+"""
+Tests the vectorized contact queries in sim_utils against a direct loop over the active contacts, and that the
+contact query of a simulation does not keep it alive:
+
+$ pytest -s tests/test_utils/test_sim_utils.py
+"""
+
+import gc
+import weakref
+
+import numpy as np
+
+import robosuite as suite
+import robosuite.utils.sim_utils as SU
+from robosuite.models.base import MujocoModel
+from robosuite.utils.binding_utils import MjSim
+
+
+def contact_names(sim):
+    return [
+        (sim.model.geom_id2name(contact.geom1), sim.model.geom_id2name(contact.geom2))
+        for contact in sim.data.contact[: sim.data.ncon]
+    ]
+
+
+def contact_geoms(geoms):
+    if isinstance(geoms, str):
+        return [geoms]
+    return geoms.contact_geoms if isinstance(geoms, MujocoModel) else geoms
+
+
+def reference_check_contact(sim, geoms_1, geoms_2=None):
+    geoms_1 = contact_geoms(geoms_1)
+    geoms_2 = contact_geoms(geoms_2) if geoms_2 is not None else None
+    for g1, g2 in contact_names(sim):
+        if geoms_2 is None:
+            if g1 in geoms_1 or g2 in geoms_1:
+                return True
+        elif (g1 in geoms_1 and g2 in geoms_2) or (g1 in geoms_2 and g2 in geoms_1):
+            return True
+    return False
+
+
+def reference_get_contacts(sim, model):
+    contact_set = set()
+    for g1, g2 in contact_names(sim):
+        if g1 in model.contact_geoms and g2 not in model.contact_geoms:
+            contact_set.add(g2)
+        elif g2 in model.contact_geoms and g1 not in model.contact_geoms:
+            contact_set.add(g1)
+    return contact_set
+
+
+def test_contact_queries_match_reference():
+    env = suite.make(
+        "Stack",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=False,
+        use_camera_obs=False,
+    )
+    np.random.seed(0)
+    env.reset()
+    gripper = env.robots[0].gripper["right"]
+    models = [env.robots[0].robot_model, gripper, env.cubeA, env.cubeB]
+    groups = models + [gripper.important_geoms["left_fingerpad"], "table_collision", ["missing_geom"]]
+
+    num_contacts = 0
+    for _ in range(40):
+        # Push down so that the gripper ends up touching the table / cubes
+        env.step(np.random.uniform(-1, 1, env.action_dim) + np.array([0, 0, -0.5, 0, 0, 0, 0]))
+        for geoms_1 in groups:
+            for geoms_2 in groups + [None]:
+                in_contact = SU.check_contact(env.sim, geoms_1, geoms_2)
+                assert in_contact == reference_check_contact(env.sim, geoms_1, geoms_2)
+                num_contacts += in_contact
+        for model in models:
+            assert SU.get_contacts(env.sim, model) == reference_get_contacts(env.sim, model)
+            assert env.get_contacts(model) == reference_get_contacts(env.sim, model)
+
+    # Make sure the comparison was not vacuous
+    assert num_contacts > 0
+    env.close()
+
+
+def test_discarded_sim_is_collected():
+    xml = """
+    <mujoco>
+        <worldbody>
+            <geom name="floor" type="plane" size="1 1 0.1"/>
+            <body name="box" pos="0 0 0.04">
+                <freejoint/>
+                <geom name="box_geom" type="box" size="0.05 0.05 0.05"/>
+            </body>
+        </worldbody>
+    </mujoco>
+    """
+    sim = MjSim.from_xml_string(xml)
+    sim.forward()
+    assert SU.check_contact(sim, "box_geom", "floor")
+    query = weakref.ref(SU.get_contact_query(sim))
+    sim_ref = weakref.ref(sim)
+
+    del sim
+    gc.collect()
+    assert sim_ref() is None and query() is None
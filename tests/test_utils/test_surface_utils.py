@@ -0,0 +1,46 @@
+"""
+Tests for the mortar surface queries, checking that:
+    - closest points match a brute-force search over a dense sampling of the surface
+    - the batched and single-point queries agree
+    - normals are unit vectors pointing into the mortar wall
+"""
+import numpy as np
+import scipy.spatial as spsp
+
+from robosuite.utils.surface_utils import get_mortar_surface
+
+
+def test_closest_points_match_brute_force():
+    surface = get_mortar_surface(max_radius=0.04)
+    rng = np.random.default_rng(0)
+    points = np.column_stack([rng.uniform(-0.03, 0.03, (200, 2)), rng.uniform(-0.04, 0.02, 200)])
+
+    grid = np.mgrid[-0.04:0.04:0.0002, -0.04:0.04:0.0002].reshape(2, -1).T
+    grid = grid[np.linalg.norm(grid, axis=1) <= 0.04]
+    samples = np.column_stack([grid, surface.height(grid)])
+    brute_distances, _ = spsp.cKDTree(samples).query(points)
+
+    closest, normals, distances = surface.closest_points(points)
+    # The analytic solve should never be worse than the brute-force search
+    assert np.all(distances <= brute_distances + 1e-9)
+    assert np.allclose(closest[:, 2], surface.height(closest[:, :2]))
+    assert np.allclose(np.linalg.norm(normals, axis=1), 1.0)
+
+    for point, closest_ref, normal_ref in zip(points[:20], closest, normals):
+        closest_single, normal_single = surface.closest_point(point)
+        assert np.allclose(closest_single, closest_ref)
+        assert np.allclose(normal_single, normal_ref)
+
+
+def test_normals():
+    surface = get_mortar_surface(max_radius=0.04)
+    assert np.allclose(surface.normals(np.zeros(2)), [0, 0, -1])
+    # Away from the center, the normal tilts outwards (towards the wall)
+    normal = surface.normals(np.array([0.02, 0.0]))
+    assert normal[0] > 0 and normal[2] < 0 and np.isclose(normal[1], 0)
+
+
+if __name__ == "__main__":
+    test_closest_points_match_brute_force()
+    test_normals()
+    print("Surface utils tests completed.")
@@ -0,0 +1,83 @@
+"""
+Tests the batched TextureModder, checking that:
+    - bitmaps generated in place match the ones of the per-geom set_checker / set_gradient / set_rgb functions
+    - modified textures are uploaded right before the next rendering only, and restoring the defaults restores the
+      rendered images
+"""
+import numpy as np
+
+import robosuite as suite
+from robosuite.utils.mjmod import TextureModder
+
+
+def make_env():
+    return suite.make(
+        "Lift",
+        robots="IIWA",
+        has_renderer=False,
+        has_offscreen_renderer=True,
+        use_camera_obs=False,
+    )
+
+
+def test_generate_bitmap():
+    env = make_env()
+    env.reset()
+    rgb1, rgb2 = np.array([255, 0, 30], dtype=np.uint8), np.array([10, 200, 0], dtype=np.uint8)
+    for randomize_local in (False, True):
+        modder = TextureModder(env.sim, randomize_local=randomize_local, local_rgb_interpolation=0.25)
+        name = next(name for name in modder.geom_names if modder._check_geom_for_texture(name))
+        tex_id = modder._name_to_tex_id(name)
+        bitmap = modder.get_texture(name).bitmap
+
+        for variation, set_pattern in (
+            ("checker", lambda: modder.set_checker(name, rgb1, rgb2, perturb=randomize_local)),
+            ("rgb", lambda: modder.set_rgb(name, rgb1, perturb=randomize_local)),
+            ("gradient", lambda: modder.set_gradient(name, rgb1, rgb2, vertical=False, perturb=randomize_local)),
+        ):
+            set_pattern()
+            expected = np.array(bitmap)
+            modder.restore_defaults()
+            # Seeded to generate a horizontal gradient
+            modder.random_state = np.random.RandomState(1)
+            assert np.random.RandomState(1).uniform() < 0.5
+            modder._generate_bitmap(tex_id, variation, rgb1, rgb2)
+            # Perturbed bitmaps are blended in single precision
+            assert np.max(np.abs(bitmap.astype(int) - expected)) <= (1 if randomize_local else 0), variation
+            modder.restore_defaults()
+
+        # Noise covers the requested fraction of pixels
+        modder.random_state = np.random.RandomState(0)
+        modder.randomize_local = False
+        modder._generate_bitmap(tex_id, "noise", rgb1, rgb2)
+        fraction = 0.1 + np.random.RandomState(0).uniform() * 0.8
+        assert np.all((bitmap == rgb1).all(axis=-1) | (bitmap == rgb2).all(axis=-1))
+        assert np.isclose(np.mean((bitmap == rgb2).all(axis=-1)), fraction, atol=0.01)
+        modder.restore_defaults()
+    env.close()
+
+
+def test_deferred_upload():
+    env = make_env()
+    env.reset()
+    sim = env.sim
+    render_context = sim._render_context_offscreen
+    modder = TextureModder(sim, random_state=np.random.RandomState(0), randomize_skybox=True)
+    default_image = sim.render(width=64, height=64, camera_name="agentview")
+    assert len(sim.get_dirty_textures(render_context._texture_versions.copy())) == 0
+
+    # Textures are marked as dirty, and uploaded by the next rendering
+    default_bitmaps = [np.array(texture.bitmap) for texture in modder.textures]
+    modder.randomize()
+    modder.randomize()
+    assert np.all(sim.texture_versions[modder._tex_ids] == 2)
+    assert any(not np.array_equal(modder.textures[i].bitmap, default_bitmaps[i]) for i in modder._tex_ids)
+    image = sim.render(width=64, height=64, camera_name="agentview")
+    assert not np.array_equal(image, default_image)
+    assert np.array_equal(render_context._texture_versions, sim.texture_versions)
+
+    modder.restore_defaults()
+    for texture, default_bitmap in zip(modder.textures, default_bitmaps):
+        assert np.array_equal(texture.bitmap, default_bitmap)
+    assert np.array_equal(sim.render(width=64, height=64, camera_name="agentview"), default_image)
+    env.close()
@@ -0,0 +1,93 @@
+"""
+Tests for the reference trajectory library, checking that:
+    - generated trajectories match the per-waypoint orientation computation (frame by frame, with T.mat2quat)
+    - the batched quaternion conversions agree with transform_utils
+    - the precomputed marker poses match rotating the marker offset by each waypoint's quaternion
+    - trajectories are cached by radius / height / number of waypoints
+"""
+import numpy as np
+
+import robosuite.utils.transform_utils as T
+from robosuite.utils.surface_utils import get_mortar_surface
+from robosuite.utils.trajectory_library import (
+    HEIGHT_LIMITS,
+    circular_waypoints,
+    get_trajectory_library,
+    mats_to_quats,
+    quats_to_mats,
+    radius_to_height,
+)
+
+
+def reference_orientations(normals):
+    """
+    Per-waypoint orientations: the x axis of each frame is the previous one, adjusted to the new normal.
+    """
+    quats, prev_quat, prev_R = [], None, None
+    for n in normals:
+        if prev_R is None:
+            R = np.zeros((3, 3))
+            R[:, 2] = n
+            R[:, 0] = np.cross([0, 1, 0], n)
+            R[:, 0] /= np.linalg.norm(R[:, 0])
+            R[:, 1] = np.cross(n, R[:, 0])
+        else:
+            R = prev_R.copy()
+            R[:, 2] = n
+            R[:, 1] = np.cross(n, R[:, 0])
+            R[:, 1] /= np.linalg.norm(R[:, 1])
+            R[:, 0] = np.cross(R[:, 1], n)
+        quat = T.mat2quat(R)
+        if prev_quat is not None and np.dot(quat, prev_quat) < 0:
+            quat = -quat
+        quats.append(quat)
+        prev_quat, prev_R = quat, R
+    return np.array(quats)
+
+
+def test_trajectories_match_reference():
+    library = get_trajectory_library(max_radius=0.04)
+    surface = get_mortar_surface(max_radius=0.04)
+    for radius, num_waypoints in ((0.008, 100), (0.015, 333)):
+        trajectory = library.get(radius, num_waypoints)
+        height = np.clip(radius_to_height(radius), *HEIGHT_LIMITS)
+        positions = circular_waypoints(radius, 0.8 + height, num_waypoints)
+        assert np.allclose(trajectory.poses[:, :3], positions)
+
+        quats = reference_orientations(surface.normals(positions[:, :2]))
+        # Both sequences are consistent, but the first quaternion may have either sign if its w component is 0
+        sign = np.sign(np.dot(quats[0], trajectory.poses[0, 3:]))
+        assert np.allclose(trajectory.poses[:, 3:], sign * quats, atol=1e-6)
+        assert np.all(np.sum(trajectory.poses[1:, 3:] * trajectory.poses[:-1, 3:], axis=1) >= 0)
+
+        for pose, marker_pos, marker_quat in zip(trajectory.poses, trajectory.marker_pos, trajectory.marker_quat):
+            assert np.allclose(marker_pos, pose[:3] + T.rotate_vector_by_quaternion([0, 0, -0.005], pose[3:]))
+            assert np.allclose(marker_quat, T.convert_quat(pose[3:], "wxyz"))
+
+
+def test_quaternion_conversions():
+    rng = np.random.default_rng(0)
+    quats = rng.normal(size=(500, 4))
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    mats = quats_to_mats(quats)
+    # transform_utils converts in single precision
+    assert np.allclose(mats, [T.quat2mat(q) for q in quats], atol=1e-6)
+    assert np.allclose(mats_to_quats(mats), [T.mat2quat(m) for m in mats], atol=1e-6)
+    # Rotations of (close to) 180 degrees
+    for axis in np.eye(3):
+        mat = T.quat2mat(np.append(axis, 0.0))
+        assert np.allclose(quats_to_mats(mats_to_quats(mat[None])), mat[None])
+
+
+def test_library_cache():
+    library = get_trajectory_library(max_radius=0.04)
+    assert get_trajectory_library(max_radius=0.04) is library
+    trajectory = library.get(0.01, 120)
+    assert library.get(0.01 + 1e-9, 120) is trajectory
+    assert library.get(0.01, 121) is not trajectory
+
+    extended = library.get(0.01, 120, repeat_last=True)
+    assert len(extended) == 121
+    assert np.array_equal(extended.poses[:120], trajectory.poses)
+    assert np.array_equal(extended.poses[120], trajectory.poses[119])
+    assert not trajectory.poses.flags.writeable